@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from dell_unisphere_mock_api.core import alerts
+from dell_unisphere_mock_api.core.alerts import AlertEngine, alert_engine
+from dell_unisphere_mock_api.core.query import matches_filter, parse_filter
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.schemas.alert import Alert, AlertComponent, Event
+
+# Filterable fields of alerts and events, by API name
+_ALERT_FIELDS = {
+    "id": "id",
+    "severity": "severity",
+    "state": "state",
+    "isAcknowledged": "acknowledged",
+    "messageId": "message_id",
+    "message": "message",
+}
+_EVENT_FIELDS = {"id": "id", "severity": "severity", "messageId": "message_id", "message": "message"}
+
+
+def _field_getter(fields: Dict[str, str]):
+    def get(obj: Any, field: str, default: Any = None) -> Any:
+        name = fields.get(field)
+        return getattr(obj, name, default) if name is not None else default
+
+    return get
+
+
+def _alert(alert: alerts.Alert) -> Alert:
+    return Alert(
+        id=alert.id,
+        timestamp=datetime.fromtimestamp(alert.timestamp, timezone.utc),
+        severity=alert.severity,
+        component=AlertComponent(id=alert.object_id, resource=alert.object_type),
+        messageId=alert.message_id,
+        message=alert.message,
+        state=alert.state,
+        isAcknowledged=alert.acknowledged,
+    )
+
+
+def _event(event: alerts.Event) -> Event:
+    return Event(
+        id=event.id,
+        creationTime=datetime.fromtimestamp(event.timestamp, timezone.utc),
+        severity=event.severity,
+        messageId=event.message_id,
+        message=event.message,
+        source=AlertComponent(id=event.object_id, resource=event.object_type),
+    )
+
+
+class AlertController:
+    """Controller for alerts and events.
+
+    Changes not yet evaluated are processed before every request, so responses
+    reflect all changes made before them; that costs O(changes since the last request).
+    """
+
+    def __init__(self, engine: AlertEngine = alert_engine):
+        self.engine = engine
+
+    async def list_alerts(self, request: Request, filter: Optional[str] = None) -> ApiResponse[List[Alert]]:
+        """List alerts, oldest first, optionally filtered on severity, state, isAcknowledged or messageId."""
+        self.engine.process()
+        filters = parse_filter(filter)
+        get = _field_getter(_ALERT_FIELDS)
+        entries = [_alert(alert) for alert in self.engine.store.alerts.values() if matches_filter(alert, filters, get)]
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
+
+    def _get(self, alert_id: int) -> alerts.Alert:
+        self.engine.process()
+        alert = self.engine.store.get(alert_id)
+        if alert is None:
+            raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
+        return alert
+
+    async def get_alert(self, alert_id: int, request: Request) -> ApiResponse[Alert]:
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(_alert(self._get(alert_id)))
+
+    async def acknowledge_alert(self, alert_id: int) -> None:
+        self._get(alert_id)
+        self.engine.store.acknowledge(alert_id)
+
+    async def delete_alert(self, alert_id: int) -> None:
+        self._get(alert_id)
+        self.engine.store.delete(alert_id)
+
+    async def list_events(self, request: Request, filter: Optional[str] = None) -> ApiResponse[List[Event]]:
+        """List the logged events, oldest first, optionally filtered on severity or messageId."""
+        self.engine.process()
+        filters = parse_filter(filter)
+        get = _field_getter(_EVENT_FIELDS)
+        entries = [_event(event) for event in self.engine.store.events if matches_filter(event, filters, get)]
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
+
+    async def get_event(self, event_id: int, request: Request) -> ApiResponse[Event]:
+        self.engine.process()
+        event = self.engine.store.event(event_id)
+        if event is None:
+            raise HTTPException(status_code=404, detail=f"Event {event_id} not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(_event(event))
@@ -0,0 +1,129 @@
+from typing import List, Optional, Sequence
+
+from dell_unisphere_mock_api.core.alerts import Facts
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, capacity_ledger
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.filesystem import FilesystemModel
+from dell_unisphere_mock_api.models.job import JobModel
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+
+POOL_FULL_PERCENT = 100.0
+
+
+class PoolAlertSource:
+    """Lets the alert engine read the used space and thresholds of pools."""
+
+    def __init__(self, model: PoolModel, ledger: CapacityLedger = capacity_ledger):
+        self.model = model
+        self.ledger = ledger
+
+    def ids(self) -> List[str]:
+        return list(self.model.pools)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        facts = []
+        for pool_id in obj_ids:
+            record = self.model.pools.get(pool_id)
+            if record is None:
+                facts.append(None)
+                continue
+            usage = self.ledger.usage(pool_id)
+            size_total = usage.size_total if usage is not None else record.sizeTotal
+            size_used = usage.used if usage is not None else record.sizeUsed
+            facts.append(
+                {
+                    "name": record.name,
+                    "percentUsed": 100.0 * size_used / size_total if size_total else 0.0,
+                    "alertThreshold": record.alertThreshold,
+                    "harvestHighThreshold": record.poolSpaceHarvestHighThreshold if record.isHarvestEnabled else None,
+                    "fullThreshold": POOL_FULL_PERCENT,
+                }
+            )
+        return facts
+
+
+class DiskAlertSource:
+    """Lets the alert engine read the health of disks."""
+
+    def __init__(self, model: DiskModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.disks)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        facts = []
+        for disk_id in obj_ids:
+            disk = self.model.disks.get(disk_id)
+            facts.append(None if disk is None else {"name": disk.name or disk_id, "health": disk.health_status})
+        return facts
+
+
+class LUNAlertSource:
+    """Lets the alert engine read the health of LUNs."""
+
+    def __init__(self, model: LUNModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.luns)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        facts = []
+        for lun_id in obj_ids:
+            record = self.model.luns.get(lun_id)
+            if record is None:
+                facts.append(None)
+                continue
+            health = record.health
+            facts.append(
+                {
+                    "name": record.name,
+                    "health": health.value if health is not None else 5,
+                    "description": " ".join(health.descriptions) if health is not None else "",
+                }
+            )
+        return facts
+
+
+class FilesystemAlertSource:
+    """Lets the alert engine read the health of filesystems."""
+
+    def __init__(self, model: FilesystemModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.filesystems)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        facts = []
+        for filesystem_id in obj_ids:
+            filesystem = self.model.filesystems.get(filesystem_id)
+            if filesystem is None:
+                facts.append(None)
+                continue
+            health = filesystem.get("health", "OK")
+            facts.append({"name": filesystem.get("name", filesystem_id), "health": getattr(health, "value", health)})
+        return facts
+
+
+class JobAlertSource:
+    """Lets the alert engine read the state of jobs."""
+
+    def __init__(self, model: JobModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.jobs)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        facts = []
+        for job_id in obj_ids:
+            job = self.model.jobs.get(job_id)
+            facts.append(
+                None
+                if job is None
+                else {"description": job.description, "state": job.state.value, "errorMessage": job.errorMessage or ""}
+            )
+        return facts
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import Message
+
+from dell_unisphere_mock_api.core.auth import BATCH_USER_SCOPE_KEY
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse, create_error_response
+from dell_unisphere_mock_api.schemas.batch import BatchOperation, BatchRequest, BatchResult
+
+logger = logging.getLogger(__name__)
+
+# Paths that cannot run inside a batch: batches do not nest and event streams never end
+EXCLUDED_PATHS = ("/api/batch", "/api/changes")
+
+# Headers that describe the batch request's own body
+BODY_HEADERS = (b"content-length", b"content-type")
+
+# Scope keys that belong to the route that matched the batch request itself
+ROUTE_SCOPE_KEYS = ("endpoint", "route", "path_params")
+
+
+def _error(status: int, message: str) -> BatchResult:
+    body = create_error_response(error_code=status, http_status_code=status, messages=[message])
+    return BatchResult(status=status, body=body.model_dump(by_alias=True))
+
+
+class BatchController:
+    """Runs the operations of a batch request through the application's router in process.
+
+    The batch request has already been through the middleware, authentication and
+    CSRF checks, so its operations skip them: each is dispatched straight to the
+    router with the batch's user in its scope. Runs of consecutive GETs are executed
+    concurrently, up to ``BATCH_READ_CONCURRENCY`` at a time; every other operation
+    waits for the ones before it and runs alone, so writes keep their order.
+    """
+
+    def __init__(self, read_concurrency: Optional[int] = None):
+        self.read_concurrency = read_concurrency or settings.BATCH_READ_CONCURRENCY
+
+    async def execute(self, batch: BatchRequest, request: Request, user: Dict[str, str]) -> ApiResponse[BatchResult]:
+        """Run a batch and return the result of every operation, in order."""
+        if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+            raise HTTPException(
+                status_code=413, detail=f"A batch may contain at most {settings.BATCH_MAX_OPERATIONS} operations"
+            )
+
+        results: List[BatchResult] = []
+        limit = asyncio.Semaphore(self.read_concurrency)
+
+        async def read(operation: BatchOperation) -> BatchResult:
+            async with limit:
+                return await self.dispatch(operation, request, user)
+
+        reads: List[BatchOperation] = []
+        for operation in batch.operations:
+            if operation.method == "GET":
+                reads.append(operation)
+                continue
+            if reads:
+                results.extend(await asyncio.gather(*map(read, reads)))
+                reads = []
+            results.append(await self.dispatch(operation, request, user))
+        if reads:
+            results.extend(await asyncio.gather(*map(read, reads)))
+
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(results)
+
+    async def dispatch(self, operation: BatchOperation, request: Request, user: Dict[str, str]) -> BatchResult:
+        """Run one operation through the router and collect its response."""
+        path, _, query = operation.path.partition("?")
+        if not path.startswith("/api/") or path.startswith(EXCLUDED_PATHS):
+            return _error(400, f"Path cannot be used in a batch: {path}")
+
+        body = b"" if operation.body is None else json.dumps(operation.body).encode()
+        headers = [(name, value) for name, value in request.scope["headers"] if name not in BODY_HEADERS]
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        scope = {key: value for key, value in request.scope.items() if key not in ROUTE_SCOPE_KEYS}
+        scope.update(
+            method=operation.method,
+            path=path,
+            raw_path=path.encode(),
+            query_string=query.encode(),
+            headers=headers,
+        )
+        scope[BATCH_USER_SCOPE_KEY] = user
+
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive() -> Message:
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        status = 500
+        chunks: List[bytes] = []
+
+        async def send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await request.app.router(scope, receive, send)
+        except StarletteHTTPException as e:
+            # Raised by the router itself for unknown paths and methods
+            return _error(e.status_code, str(e.detail))
+        except Exception as e:
+            logger.exception(f"Batch operation {operation.method} {path} failed")
+            return _error(500, str(e))
+
+        content: Any = b"".join(chunks)
+        content = json.loads(content) if content else None
+        if status >= 400 and isinstance(content, dict) and "detail" in content:
+            return _error(status, str(content["detail"]))
+        return BatchResult(status=status, body=content)
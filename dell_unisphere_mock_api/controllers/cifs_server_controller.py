@@ -5,6 +5,7 @@ from fastapi import HTTPException, Request
 
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.trusted import trusted
 from dell_unisphere_mock_api.models.cifs_server import CIFSServer, CIFSServerCreate, CIFSServerUpdate
 
 logger = logging.getLogger(__name__)
@@ -67,7 +68,7 @@ class CIFSServerController:
         server_dict.update(update_data)
         logger.info(f"Updated server dict: {server_dict}")
 
-        updated_server = CIFSServer(**server_dict)
+        updated_server = trusted(CIFSServer, **server_dict)
         self.servers[server_id] = updated_server  # Update the server in the dictionary
         logger.info(f"Final server state: {self.servers[server_id].model_dump()}")
 
@@ -1,13 +1,24 @@
+from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, Request
 
+from dell_unisphere_mock_api.core.bulk import select_for_delete
+from dell_unisphere_mock_api.core.capacity import InsufficientCapacity
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
 from dell_unisphere_mock_api.models.filesystem import FilesystemModel
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
 from dell_unisphere_mock_api.schemas.filesystem import FilesystemCreate, FilesystemResponse, FilesystemUpdate
 
 
+def _share_blocker(filesystem: dict) -> Optional[str]:
+    if filesystem["cifsShares"] or filesystem["nfsShares"]:
+        return "Cannot delete filesystem with active shares"
+    return None
+
+
 class FilesystemController:
     def __init__(self):
         self.filesystem_model = FilesystemModel()
@@ -33,12 +44,20 @@ class FilesystemController:
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection([filesystem_response])
 
-    async def list_filesystems(self, request: Request) -> ApiResponse:
-        filesystems = self.filesystem_model.list_filesystems()
+    async def list_filesystems(
+        self, request: Request, change_seq: Optional[int] = None, modified_since: Optional[datetime] = None
+    ) -> ApiResponse:
+        changes = changes_since("filesystem", change_seq, modified_since)
+        if changes is None:
+            filesystems = self.filesystem_model.list_filesystems()
+        else:
+            filesystems = [fs for fs in map(self.filesystem_model.get_filesystem, changes.modified) if fs is not None]
         filesystem_responses = [FilesystemResponse.model_validate(fs) for fs in filesystems]
 
         formatter = UnityResponseFormatter(request)
-        return await formatter.format_collection(filesystem_responses)
+        response = await formatter.format_collection(filesystem_responses)
+        response.metadata = change_metadata(changes)
+        return response
 
     async def update_filesystem(
         self, request: Request, filesystem_id: str, update_data: FilesystemUpdate
@@ -53,7 +72,10 @@ class FilesystemController:
 
         update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
 
-        filesystem = self.filesystem_model.update_filesystem(filesystem_id, update_dict)
+        try:
+            filesystem = self.filesystem_model.update_filesystem(filesystem_id, update_dict)
+        except InsufficientCapacity as e:
+            raise HTTPException(status_code=400, detail=str(e))
         if not filesystem:
             raise HTTPException(status_code=404, detail=f"Filesystem {filesystem_id} not found")
 
@@ -75,6 +97,18 @@ class FilesystemController:
             return None
         raise HTTPException(status_code=500, detail="Failed to delete filesystem")
 
+    async def delete_filesystems(self, request: Request, bulk_delete: BulkDeleteRequest) -> ApiResponse:
+        """Delete the filesystems given by ID or matching a filter in one batch, skipping those with shares."""
+        filesystem_ids, skipped, not_found = select_for_delete(
+            bulk_delete, self.filesystem_model.filesystems, get=dict.get, blocked=_share_blocker
+        )
+        deleted = self.filesystem_model.delete_filesystems(filesystem_ids)
+
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(
+            [BulkDeleteResponse(deleted=deleted, skipped=skipped, notFound=not_found)]
+        )
+
     async def add_share(self, request: Request, filesystem_id: str, share_id: str, share_type: str) -> ApiResponse:
         if not self.filesystem_model.add_share(filesystem_id, share_id, share_type):
             raise HTTPException(status_code=404, detail=f"Filesystem {filesystem_id} not found")
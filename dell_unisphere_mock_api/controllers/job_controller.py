@@ -1,22 +1,34 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 
-from dell_unisphere_mock_api.models.job import JobModel
-from dell_unisphere_mock_api.schemas.job import Job, JobCreate, JobState
+from dell_unisphere_mock_api.core.changes import ChangeSet
+from dell_unisphere_mock_api.core.job_engine import JobEngine
+from dell_unisphere_mock_api.models.job import TERMINAL_STATES, JobModel
+from dell_unisphere_mock_api.schemas.job import Job, JobCreate, JobEngineMetrics, JobState
+
+# One engine runs the jobs of the shared job store
+job_engine = JobEngine(JobModel())
 
 
 class JobController:
     def __init__(self):
         self.model = JobModel()
+        self.engine = job_engine
 
     async def create_job(self, job_data: JobCreate) -> Job:
-        """Create a new job."""
-        return await self.model.create_job(job_data)
+        """Create a new job and queue it for execution."""
+        job = await self.model.create_job(job_data)
+        self.engine.submit(job.id, job_data.priority)
+        return job
 
-    async def get_job(self, job_id: str) -> Job:
-        """Get a job by ID."""
-        job = await self.model.get_job(job_id)
+    async def get_job(self, job_id: str, wait_timeout: Optional[float] = None) -> Job:
+        """Get a job by ID, optionally waiting up to ``wait_timeout`` seconds for its state to change."""
+        self.engine.ensure_started()
+        if wait_timeout:
+            job = await self.model.wait_for_state_change(job_id, wait_timeout)
+        else:
+            job = await self.model.get_job(job_id)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -24,18 +36,33 @@ class JobController:
             )
         return job
 
-    async def list_jobs(self) -> List[Job]:
-        """List all jobs."""
-        return await self.model.list_jobs()
+    async def list_jobs(self, state: Optional[JobState] = None, changes: Optional[ChangeSet] = None) -> List[Job]:
+        """List all jobs, or only those in the given state and/or among the changed ones."""
+        self.engine.ensure_started()
+        if changes is None:
+            return await self.model.list_jobs(state)
+        jobs = [job for job in map(self.model.jobs.get, changes.modified) if job is not None]
+        return [job for job in jobs if state is None or job.state == state]
 
     async def delete_job(self, job_id: str) -> None:
-        """Delete a job."""
+        """Delete a job, cancelling it first if it is still queued or running."""
+        self.engine.discard(job_id)
         if not await self.model.delete_job(job_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found",
             )
 
+    async def cancel_job(self, job_id: str) -> Job:
+        """Cancel a queued or running job."""
+        job = await self.get_job(job_id)
+        if job.state in TERMINAL_STATES or not await self.engine.cancel(job_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job in state {job.state.value} cannot be cancelled",
+            )
+        return job
+
     async def update_job_state(self, job_id: str, state: JobState) -> None:
         """Update the state of a job."""
         if not await self.model.update_job_state(job_id, state):
@@ -43,3 +70,7 @@ class JobController:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found",
             )
+
+    def get_metrics(self) -> JobEngineMetrics:
+        """Return job engine queue and latency metrics."""
+        return JobEngineMetrics(**self.engine.metrics())
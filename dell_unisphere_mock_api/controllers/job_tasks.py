@@ -0,0 +1,178 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from dell_unisphere_mock_api.controllers.filesystem_controller import FilesystemController
+from dell_unisphere_mock_api.controllers.lun_controller import LUNController
+from dell_unisphere_mock_api.controllers.pool_controller import PoolController
+from dell_unisphere_mock_api.core.job_engine import JobTaskError
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.tiering import tiering_engine
+from dell_unisphere_mock_api.models.nas_server import NasServerModel
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+from dell_unisphere_mock_api.schemas.filesystem import FilesystemCreate, FilesystemUpdate
+from dell_unisphere_mock_api.schemas.job import JobTask
+from dell_unisphere_mock_api.schemas.lun import LUNCreate, LUNUpdate
+from dell_unisphere_mock_api.schemas.nas_server import NasServerCreate
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, PoolUpdate
+from dell_unisphere_mock_api.schemas.storage_resource import StorageResourceCreate
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def _content(response: Optional[ApiResponse]) -> Optional[Dict[str, Any]]:
+    """Return the first entry of a controller response as a dict."""
+    if response is None or not response.entries:
+        return None
+    content = response.entries[0].content
+    return content.model_dump() if isinstance(content, BaseModel) else dict(content)
+
+
+def _split_id(parameters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Separate the target ``id`` of a modify/delete task from its other parameters."""
+    changes = dict(parameters)
+    object_id = changes.pop("id", None)
+    if not object_id:
+        raise JobTaskError("Missing required parameter: id")
+    return str(object_id), changes
+
+
+class JobTaskDispatcher:
+    """Executes job tasks in process by calling the controllers and stores behind the REST API.
+
+    Tasks are looked up by ``(object, action)``. Each handler receives the task's
+    parameters, with references to earlier tasks already resolved, and returns the
+    created or modified object so that later tasks can refer to it.
+    """
+
+    def __init__(
+        self,
+        pool_controller: Optional[PoolController] = None,
+        lun_controller: Optional[LUNController] = None,
+        filesystem_controller: Optional[FilesystemController] = None,
+        storage_resource_model: Optional[StorageResourceModel] = None,
+        nas_server_model: Optional[NasServerModel] = None,
+    ):
+        self.pool_controller = pool_controller or PoolController()
+        self.lun_controller = lun_controller or LUNController()
+        self.filesystem_controller = filesystem_controller or FilesystemController()
+        self.storage_resource_model = storage_resource_model or StorageResourceModel()
+        self.nas_server_model = nas_server_model or NasServerModel()
+        # Controllers only use the request to build links in their responses
+        self.request = Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "scheme": "http",
+                "server": ("localhost", 8000),
+                "root_path": "",
+                "path": "/api/types/job/instances",
+                "query_string": b"",
+                "headers": [],
+            }
+        )
+        self.handlers: Dict[Tuple[str, str], TaskHandler] = {
+            ("pool", "create"): self._create_pool,
+            ("pool", "modify"): self._modify_pool,
+            ("pool", "delete"): self._delete_pool,
+            ("pool", "relocate"): self._relocate_pool,
+            ("lun", "create"): self._create_lun,
+            ("lun", "modify"): self._modify_lun,
+            ("lun", "delete"): self._delete_lun,
+            ("storageResource", "createLun"): self._create_storage_resource_lun,
+            ("storageResource", "modifyHostAccess"): self._modify_host_access,
+            ("storageResource", "delete"): self._delete_storage_resource,
+            ("filesystem", "create"): self._create_filesystem,
+            ("filesystem", "modify"): self._modify_filesystem,
+            ("filesystem", "delete"): self._delete_filesystem,
+            ("nasServer", "create"): self._create_nas_server,
+        }
+
+    def handles(self, task: JobTask) -> bool:
+        return (task.object, task.action) in self.handlers
+
+    async def run(self, task: JobTask, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Execute a task, turning API and validation errors into a task failure."""
+        handler = self.handlers[(task.object, task.action)]
+        try:
+            return await handler(parameters)
+        except HTTPException as e:
+            raise JobTaskError(f"Task {task.name} failed: {e.detail}") from e
+        except (ValidationError, ValueError, JobTaskError) as e:
+            raise JobTaskError(f"Task {task.name} failed: {e}") from e
+
+    # Pools
+
+    async def _create_pool(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _content(await self.pool_controller.create_pool(PoolCreate(**parameters), self.request))
+
+    async def _modify_pool(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        pool_id, changes = _split_id(parameters)
+        return _content(await self.pool_controller.update_pool(pool_id, PoolUpdate(**changes), self.request))
+
+    async def _delete_pool(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        pool_id, _ = _split_id(parameters)
+        await self.pool_controller.delete_pool(pool_id, self.request)
+        return {"id": pool_id}
+
+    async def _relocate_pool(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        pool_id, options = _split_id(parameters)
+        if not self.pool_controller.pool_model.get_pool(pool_id):
+            raise HTTPException(status_code=404, detail=f"Pool with ID '{pool_id}' not found")
+        moved = await tiering_engine.relocate(pool_id, options.get("rate"), options.get("scheduled", False))
+        return {"id": pool_id, "dataRelocated": moved * tiering_engine.slice_size}
+
+    # LUNs
+
+    async def _create_lun(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _content(await self.lun_controller.create_lun(LUNCreate(**parameters), self.request))
+
+    async def _modify_lun(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        lun_id, changes = _split_id(parameters)
+        return _content(await self.lun_controller.update_lun(lun_id, LUNUpdate(**changes), self.request))
+
+    async def _delete_lun(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        lun_id, _ = _split_id(parameters)
+        await self.lun_controller.delete_lun(lun_id, self.request)
+        return {"id": lun_id}
+
+    # Storage resources
+
+    async def _create_storage_resource_lun(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        resource = self.storage_resource_model.create_lun(StorageResourceCreate(**parameters))
+        return resource.model_dump()
+
+    async def _modify_host_access(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        resource_id, changes = _split_id(parameters)
+        resource = self.storage_resource_model.manage_host_access(resource_id, changes.get("hostAccess", []))
+        if not resource:
+            raise HTTPException(status_code=404, detail="Storage resource not found")
+        return resource.model_dump()
+
+    async def _delete_storage_resource(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        resource_id, _ = _split_id(parameters)
+        if not self.storage_resource_model.delete_storage_resource(resource_id):
+            raise HTTPException(status_code=404, detail="Storage resource not found")
+        return {"id": resource_id}
+
+    # Filesystems and NAS servers
+
+    async def _create_filesystem(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _content(
+            await self.filesystem_controller.create_filesystem(self.request, FilesystemCreate(**parameters))
+        )
+
+    async def _modify_filesystem(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        filesystem_id, changes = _split_id(parameters)
+        return _content(
+            await self.filesystem_controller.update_filesystem(self.request, filesystem_id, FilesystemUpdate(**changes))
+        )
+
+    async def _delete_filesystem(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        filesystem_id, _ = _split_id(parameters)
+        await self.filesystem_controller.delete_filesystem(self.request, filesystem_id)
+        return {"id": filesystem_id}
+
+    async def _create_nas_server(self, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.nas_server_model.create_nas_server(NasServerCreate(**parameters).model_dump())
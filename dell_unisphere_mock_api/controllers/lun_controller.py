@@ -1,10 +1,25 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
 from fastapi import HTTPException, Request
 
 from dell_unisphere_mock_api.controllers.pool_controller import PoolController
+from dell_unisphere_mock_api.core.bulk import select_for_delete
+from dell_unisphere_mock_api.core.capacity import InsufficientCapacity, capacity_ledger
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
 from dell_unisphere_mock_api.models.lun import LUNModel
-from dell_unisphere_mock_api.schemas.lun import LUN, LUNCreate, LUNUpdate
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
+from dell_unisphere_mock_api.schemas.lun import (
+    LUN,
+    LUNBulkCreate,
+    LUNBulkCreateResponse,
+    LUNBulkCreateResult,
+    LUNCreate,
+    LUNUpdate,
+)
 
 
 class LUNController:
@@ -15,22 +30,12 @@ class LUNController:
     async def create_lun(self, lun_create: LUNCreate, request: Request) -> ApiResponse[LUN]:
         """Create a new LUN."""
         print(f"LUN controller: Creating LUN with pool_id: {lun_create.pool_id}")
-        # Validate pool exists and has enough space
+        # Validate pool exists; its free space is checked when the LUN is charged to it
         print(f"LUN controller: Looking for pool with ID: {lun_create.pool_id}")
-        pool_response = await self.pool_controller.get_pool(str(lun_create.pool_id), request)
-        print(f"LUN controller: Found pool: {pool_response}")
-        if not pool_response.entries:
+        if str(lun_create.pool_id) not in self.pool_controller.pool_model.pools:
             print(f"LUN controller: Pool not found with ID: {lun_create.pool_id}")
             raise HTTPException(status_code=404, detail=f"Pool not found with ID: {lun_create.pool_id}")
 
-        pool = pool_response.entries[0].content
-        if pool.sizeFree < lun_create.size:
-            print(
-                f"LUN controller: Pool {pool.id} does not have enough free space. "
-                f"Required: {lun_create.size}, Available: {pool.sizeFree}"
-            )
-            raise HTTPException(status_code=400, detail="Pool does not have enough free space")
-
         # Check if LUN with same name exists
         print(f"LUN controller: Checking if LUN with name {lun_create.name} exists")
         existing_lun = self.lun_model.get_lun_by_name(lun_create.name)
@@ -40,12 +45,87 @@ class LUNController:
 
         # Create the LUN
         print(f"LUN controller: Creating LUN with data: {lun_create.model_dump()}")
-        result = self.lun_model.create_lun(lun_create)
+        try:
+            result = self.lun_model.create_lun(lun_create)
+        except InsufficientCapacity as e:
+            print(f"LUN controller: {e}")
+            raise HTTPException(status_code=400, detail="Pool does not have enough free space")
         print(f"LUN controller: Created LUN: {result}")
 
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection([result], entry_links={0: [{"rel": "self", "href": f"/{result.id}"}]})
 
+    async def create_luns(self, bulk_create: LUNBulkCreate, request: Request) -> ApiResponse[LUNBulkCreateResponse]:
+        """Create many LUNs at once.
+
+        Names are checked against the name index and pool capacity once per pool for
+        the whole request. With ``atomic`` any failure means nothing is created;
+        otherwise the LUNs that pass are created and the rest are reported.
+        """
+        luns = bulk_create.luns
+        errors: Dict[int, LUNBulkCreateResult] = {}
+
+        # Names must be unused and unique within the request
+        seen = set()
+        for index, lun in enumerate(luns):
+            if lun.name in seen or self.lun_model.name_in_use(lun.name):
+                errors[index] = LUNBulkCreateResult(index=index, status=409, error="LUN with this name already exists")
+            seen.add(lun.name)
+
+        # Capacity is checked per pool against the sum of the LUNs placed in it
+        by_pool: Dict[str, List[int]] = defaultdict(list)
+        for index, lun in enumerate(luns):
+            if index not in errors:
+                by_pool[str(lun.pool_id)].append(index)
+        for pool_id, indexes in by_pool.items():
+            pool = self.pool_controller.pool_model.pools.get(pool_id)
+            if pool is None:
+                for index in indexes:
+                    errors[index] = LUNBulkCreateResult(
+                        index=index, status=404, error=f"Pool not found with ID: {pool_id}"
+                    )
+                continue
+            free = capacity_ledger.free(pool_id)
+            if free is None:
+                free = pool.sizeFree
+            if bulk_create.atomic and sum(luns[index].size for index in indexes) > free:
+                overflow = indexes
+            else:
+                overflow = []
+                for index in indexes:
+                    if luns[index].size > free:
+                        overflow.append(index)
+                    else:
+                        free -= luns[index].size
+            for index in overflow:
+                errors[index] = LUNBulkCreateResult(
+                    index=index, status=400, error="Pool does not have enough free space"
+                )
+
+        if bulk_create.atomic and errors:
+            to_create = []
+        else:
+            to_create = [index for index in range(len(luns)) if index not in errors]
+        created = self.lun_model.create_luns([luns[index] for index in to_create])
+        print(f"LUN controller: Bulk created {len(created)} of {len(luns)} LUNs")
+
+        results = dict(errors)
+        for index, lun in zip(to_create, created):
+            results[index] = LUNBulkCreateResult(index=index, id=lun.id, wwn=lun.wwn, status=201)
+        for index in range(len(luns)):
+            if index not in results:
+                results[index] = LUNBulkCreateResult(
+                    index=index, status=424, error="Not created because another LUN in the request failed"
+                )
+
+        summary = LUNBulkCreateResponse(
+            created=len(created),
+            failed=len(luns) - len(created),
+            results=[results[index] for index in range(len(luns))],
+        )
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([summary])
+
     async def get_lun(self, lun_id: str, request: Request) -> ApiResponse[LUN]:
         """Get a LUN by ID."""
         print(f"LUN controller: Looking for LUN with ID: {lun_id}")
@@ -70,15 +150,23 @@ class LUNController:
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection([lun], entry_links={0: [{"rel": "self", "href": f"/{lun.id}"}]})
 
-    async def list_luns(self, request: Request) -> ApiResponse[LUN]:
-        """List all LUNs."""
+    async def list_luns(
+        self, request: Request, change_seq: Optional[int] = None, modified_since: Optional[datetime] = None
+    ) -> ApiResponse[LUN]:
+        """List all LUNs, or only those changed since a point."""
         print("LUN controller: Listing all LUNs")
-        luns = self.lun_model.list_luns()
+        changes = changes_since("lun", change_seq, modified_since)
+        if changes is None:
+            luns = self.lun_model.list_luns()
+        else:
+            luns = [lun for lun in map(self.lun_model.get_lun, changes.modified) if lun is not None]
         print(f"LUN controller: Listed LUNs: {luns}")
 
         formatter = UnityResponseFormatter(request)
         entry_links = {i: [{"rel": "self", "href": f"/{lun.id}"}] for i, lun in enumerate(luns)}
-        return await formatter.format_collection(luns, entry_links=entry_links)
+        response = await formatter.format_collection(luns, entry_links=entry_links)
+        response.metadata = change_metadata(changes)
+        return response
 
     async def get_luns_by_pool(self, pool_id: str, request: Request) -> ApiResponse[LUN]:
         """Get all LUNs in a pool."""
@@ -108,7 +196,11 @@ class LUNController:
                 raise HTTPException(status_code=409, detail="LUN with this name already exists")
 
         print(f"LUN controller: Updating LUN with data: {lun_update.model_dump()}")
-        result = self.lun_model.update_lun(lun_id, lun_update)
+        try:
+            result = self.lun_model.update_lun(lun_id, lun_update)
+        except InsufficientCapacity as e:
+            print(f"LUN controller: {e}")
+            raise HTTPException(status_code=400, detail="Pool does not have enough free space")
         print(f"LUN controller: Updated LUN: {result}")
 
         formatter = UnityResponseFormatter(request)
@@ -124,3 +216,16 @@ class LUNController:
 
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection([], entry_links={})
+
+    async def delete_luns(self, bulk_delete: BulkDeleteRequest, request: Request) -> ApiResponse[BulkDeleteResponse]:
+        """Delete the LUNs given by ID or matching a filter in one batch."""
+        lun_ids, skipped, not_found = select_for_delete(
+            bulk_delete, self.lun_model.luns, name_index=self.lun_model.id_by_name
+        )
+        deleted = self.lun_model.delete_luns(lun_ids)
+        print(f"LUN controller: Bulk deleted {len(deleted)} LUNs")
+
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(
+            [BulkDeleteResponse(deleted=deleted, skipped=skipped, notFound=not_found)]
+        )
@@ -0,0 +1,147 @@
+import math
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import HTTPException, Request
+
+from dell_unisphere_mock_api.core.metric_queries import RealTimeQuery, metric_query_scheduler
+from dell_unisphere_mock_api.core.metrics import METRICS, RAW, ROLLUP_INTERVALS, MetricDefinition, metric_store
+from dell_unisphere_mock_api.core.query import parse_filter
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.schemas.metric import (
+    Metric,
+    MetricQueryResult,
+    MetricRealTimeQuery,
+    MetricRealTimeQueryCreate,
+    MetricValue,
+)
+
+
+def _metric(definition: MetricDefinition) -> Metric:
+    return Metric(
+        id=definition.id,
+        name=definition.name,
+        path=definition.path,
+        description=definition.description,
+        unitDisplayString=definition.unit,
+    )
+
+
+def _real_time_query(query: RealTimeQuery) -> MetricRealTimeQuery:
+    return MetricRealTimeQuery(
+        id=query.id,
+        paths=query.paths,
+        interval=query.interval,
+        expiration=datetime.fromtimestamp(query.expiration, timezone.utc),
+    )
+
+
+class MetricController:
+    def __init__(self):
+        self.store = metric_store
+        self.scheduler = metric_query_scheduler
+
+    async def list_metrics(self, request: Request) -> ApiResponse[List[Metric]]:
+        """List the metric catalogue."""
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_metric(definition) for definition in METRICS])
+
+    async def get_metric(self, metric_id: int, request: Request) -> ApiResponse[Metric]:
+        """Get a metric by ID."""
+        if not 1 <= metric_id <= len(METRICS):
+            raise HTTPException(status_code=404, detail=f"Metric {metric_id} not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_metric(METRICS[metric_id - 1])])
+
+    async def query_values(
+        self,
+        request: Request,
+        filter: Optional[str],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        interval: int = RAW,
+    ) -> ApiResponse[List[MetricValue]]:
+        """Return the values of one metric path over a time range, one entry per sample time.
+
+        The path comes from a ``path eq '...'`` filter. Without a time range the
+        last hour is returned.
+        """
+        condition = parse_filter(filter).get("path")
+        if condition is None or condition["operator"] != "EQ":
+            raise HTTPException(status_code=400, detail="A filter of the form path eq '<metric path>' is required")
+        path = str(condition["value"])
+        if interval != RAW and interval not in ROLLUP_INTERVALS:
+            raise HTTPException(status_code=400, detail=f"Unsupported interval {interval}")
+
+        end = end_time.timestamp() if end_time is not None else time.time()
+        start = start_time.timestamp() if start_time is not None else end - 3600
+        try:
+            _, timestamps, obj_ids, values = self.store.query(path, start, end, interval)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Metric path {path} not found")
+
+        entries = []
+        for column, timestamp in enumerate(timestamps.tolist()):
+            samples = values[:, column].tolist()
+            entries.append(
+                MetricValue(
+                    path=path,
+                    timestamp=datetime.fromtimestamp(timestamp, timezone.utc),
+                    interval=interval,
+                    values={obj_id: value for obj_id, value in zip(obj_ids, samples) if not math.isnan(value)},
+                )
+            )
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
+
+    async def create_query(
+        self, request: Request, query_create: MetricRealTimeQueryCreate
+    ) -> ApiResponse[MetricRealTimeQuery]:
+        """Start a real-time query."""
+        try:
+            query = self.scheduler.create(query_create.paths, query_create.interval)
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=f"Metric path {e.args[0]} not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_real_time_query(query)])
+
+    async def list_queries(self, request: Request) -> ApiResponse[List[MetricRealTimeQuery]]:
+        """List the real-time queries that have not expired."""
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_real_time_query(query) for query in self.scheduler.active()])
+
+    async def get_query(self, query_id: int, request: Request) -> ApiResponse[MetricRealTimeQuery]:
+        """Get a real-time query by ID."""
+        query = self.scheduler.get(query_id)
+        if query is None:
+            raise HTTPException(status_code=404, detail=f"Metric real-time query {query_id} not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_real_time_query(query)])
+
+    async def delete_query(self, query_id: int) -> None:
+        """Stop a real-time query."""
+        if not self.scheduler.delete(query_id):
+            raise HTTPException(status_code=404, detail=f"Metric real-time query {query_id} not found")
+
+    async def list_query_results(self, request: Request, filter: Optional[str]) -> ApiResponse[List[MetricQueryResult]]:
+        """Return the recent results of the query named by a ``queryId eq <id>`` filter."""
+        condition = parse_filter(filter).get("queryId")
+        if condition is None or condition["operator"] != "EQ":
+            raise HTTPException(status_code=400, detail="A filter of the form queryId eq <id> is required")
+        try:
+            query_id = int(condition["value"])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Invalid query ID {condition['value']}")
+        results = self.scheduler.results(query_id)
+        if results is None:
+            raise HTTPException(status_code=404, detail=f"Metric real-time query {query_id} not found")
+        entries = [
+            MetricQueryResult(
+                queryId=query_id, path=path, timestamp=datetime.fromtimestamp(timestamp, timezone.utc), values=values
+            )
+            for timestamp, path, values in results
+        ]
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
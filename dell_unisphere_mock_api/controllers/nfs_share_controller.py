@@ -4,6 +4,7 @@ from fastapi import HTTPException, Request
 
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.trusted import trusted
 from dell_unisphere_mock_api.models.nfs_share import NFSShare, NFSShareCreate, NFSShareUpdate
 
 
@@ -64,7 +65,7 @@ class NFSShareController:
         update_data = share_data.model_dump(exclude_unset=True)
         share_dict = share.model_dump()
         share_dict.update(update_data)
-        updated_share = NFSShare(**share_dict)
+        updated_share = trusted(NFSShare, **share_dict)
         self.shares[share_id] = updated_share
 
         formatter = UnityResponseFormatter(request)
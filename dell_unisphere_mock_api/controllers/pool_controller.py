@@ -1,11 +1,37 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from fastapi import HTTPException, Request
 
+from dell_unisphere_mock_api.controllers.job_controller import JobController
+from dell_unisphere_mock_api.core.forecast import CapacityForecast, capacity_forecaster
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.tiering import RUNNING, tiering_engine
+from dell_unisphere_mock_api.models.job import JobModel
 from dell_unisphere_mock_api.models.pool import PoolModel
-from dell_unisphere_mock_api.schemas.pool import Pool, PoolAutoConfigurationResponse, PoolCreate, PoolUpdate
+from dell_unisphere_mock_api.schemas.job import Job, JobCreate, JobState, JobTask
+from dell_unisphere_mock_api.schemas.pool import (
+    Pool,
+    PoolAutoConfigurationResponse,
+    PoolCapacityForecast,
+    PoolCreate,
+    PoolStartRelocation,
+    PoolUpdate,
+)
+
+
+def _forecast_entry(forecast: CapacityForecast) -> PoolCapacityForecast:
+    return PoolCapacityForecast(
+        id=forecast.pool_id,
+        sizeTotal=forecast.size_total,
+        sizeUsed=forecast.size_used,
+        growthPerDay=forecast.growth_per_day,
+        daysToFull=forecast.days_to_full,
+        fullTime=datetime.fromtimestamp(forecast.full_time, timezone.utc) if forecast.full_time is not None else None,
+        sampleCount=forecast.samples,
+    )
 
 
 class PoolController:
@@ -67,7 +93,8 @@ class PoolController:
     async def get_pool(self, pool_id: str, request: Request) -> ApiResponse[Pool]:
         """Get a pool by ID."""
         print(f"Pool controller: Getting pool with ID: {pool_id}")
-        # Get the pool
+        # Get the pool, with its tiers as of the latest allocations
+        tiering_engine.sync()
         pool = self.pool_model.get_pool(pool_id)
         if not pool:
             raise HTTPException(status_code=404, detail=f"Pool with ID '{pool_id}' not found")
@@ -80,7 +107,8 @@ class PoolController:
     async def get_pool_by_name(self, name: str, request: Request) -> ApiResponse[Pool]:
         """Get a pool by name."""
         print(f"Pool controller: Getting pool with name: {name}")
-        # Get the pool
+        # Get the pool, with its tiers as of the latest allocations
+        tiering_engine.sync()
         pool = self.pool_model.get_pool_by_name(name)
         if not pool:
             raise HTTPException(status_code=404, detail=f"Pool with name '{name}' not found")
@@ -98,11 +126,18 @@ class PoolController:
         page: Optional[int] = None,
         per_page: Optional[int] = None,
         orderby: Optional[str] = None,
+        change_seq: Optional[int] = None,
+        modified_since: Optional[datetime] = None,
     ) -> ApiResponse[List[Pool]]:
-        """List all pools with filtering and pagination."""
+        """List all pools with filtering and pagination, or only those changed since a point."""
         print("Pool controller: Listing pools")
-        # Get pools from model
-        pools = list(self.pool_model.list_pools())  # Convert to list to ensure it's not a tuple
+        tiering_engine.sync()
+        changes = changes_since("pool", change_seq, modified_since)
+        if changes is None:
+            # Get pools from model
+            pools = list(self.pool_model.list_pools())  # Convert to list to ensure it's not a tuple
+        else:
+            pools = [pool for pool in map(self.pool_model.get_pool, changes.modified) if pool is not None]
 
         # Create entry links for each pool
         entry_links = {}
@@ -111,7 +146,9 @@ class PoolController:
 
         # Format response
         formatter = UnityResponseFormatter(request)
-        return await formatter.format_collection(pools, entry_links=entry_links)
+        response = await formatter.format_collection(pools, entry_links=entry_links)
+        response.metadata = change_metadata(changes)
+        return response
 
     async def update_pool(self, pool_id: str, pool_update: PoolUpdate, request: Request) -> ApiResponse[Pool]:
         """Update a pool."""
@@ -152,3 +189,58 @@ class PoolController:
         # Format response
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection(configs)
+
+    async def forecast_pools(self, request: Request) -> ApiResponse[List[PoolCapacityForecast]]:
+        """Get the capacity forecast of every pool."""
+        forecasts = capacity_forecaster.forecast()
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([_forecast_entry(forecast) for forecast in forecasts])
+
+    async def forecast_pool(self, pool_id: str, request: Request) -> ApiResponse[PoolCapacityForecast]:
+        """Get the capacity forecast of a pool."""
+        forecasts = capacity_forecaster.forecast([pool_id])
+        if not forecasts:
+            raise HTTPException(status_code=404, detail=f"Pool with ID '{pool_id}' not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(_forecast_entry(forecasts[0]))
+
+    async def start_relocation(self, pool_id: str, relocation: Optional[PoolStartRelocation] = None) -> Job:
+        """Start a FAST VP relocation of a pool's slices as a job."""
+        pool = self.pool_model.get_pool(pool_id)
+        if not pool:
+            raise HTTPException(status_code=404, detail=f"Pool with ID '{pool_id}' not found")
+        if await self._relocation_active(pool_id):
+            raise HTTPException(status_code=409, detail=f"Relocation of pool '{pool.name}' is already running")
+        rate = relocation.relocationRate.value if relocation and relocation.relocationRate else None
+        return await self._relocation_job(pool_id, f"Relocate slices of pool {pool.name}", rate=rate)
+
+    async def stop_relocation(self, pool_id: str) -> None:
+        """Stop a running FAST VP relocation of a pool."""
+        if not self.pool_model.get_pool(pool_id):
+            raise HTTPException(status_code=404, detail=f"Pool with ID '{pool_id}' not found")
+        if not tiering_engine.stop(pool_id):
+            raise HTTPException(status_code=409, detail=f"No relocation of pool '{pool_id}' is running")
+
+    async def schedule_relocation(self, pool_id: str) -> Optional[Job]:
+        """Start the relocation of a pool in its scheduled relocation window, unless one is queued or running."""
+        if await self._relocation_active(pool_id):
+            return None
+        return await self._relocation_job(pool_id, f"Scheduled relocation of pool {pool_id}", scheduled=True)
+
+    async def _relocation_active(self, pool_id: str) -> bool:
+        """Whether a relocation of the pool is running, or its job is queued and not yet started."""
+        state = tiering_engine.relocation(pool_id)
+        if state.status == RUNNING:
+            return True
+        if state.job is not None:
+            job = await JobModel().get_job(state.job)
+            if job is not None and job.state in (JobState.PENDING, JobState.RUNNING):
+                return True
+            state.job = None
+        return False
+
+    async def _relocation_job(self, pool_id: str, description: str, **parameters) -> Job:
+        task = JobTask(name="Relocate", object="pool", action="relocate", parametersIn={"id": pool_id, **parameters})
+        job = await JobController().create_job(JobCreate(description=description, tasks=[task]))
+        tiering_engine.relocation(pool_id).job = job.id
+        return job
@@ -0,0 +1,142 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from dell_unisphere_mock_api.core import snapshots
+from dell_unisphere_mock_api.core.query import matches_filter, parse_filter
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.snapshots import SnapshotEngine, SnapshotLimitExceeded, snapshot_engine
+from dell_unisphere_mock_api.schemas.snap import Snap, SnapCreate, SnapReference, SnapRestore, SnapRestoreResult
+
+# Filterable fields of snapshots, by API name
+_SNAP_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "storageResource": "resource_id",
+    "creatorType": "creator",
+    "isReadOnly": "read_only",
+    "isAutoDelete": "auto_delete",
+}
+
+
+def _get_field(snap: snapshots.Snapshot, field: str, default: Any = None) -> Any:
+    name = _SNAP_FIELDS.get(field)
+    return getattr(snap, name, default) if name is not None else default
+
+
+def _time(timestamp: Optional[float]) -> Optional[datetime]:
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _wwn(snap_id: str) -> str:
+    """A stable WWN in the array's vendor range for an attached snapshot."""
+    digest = hashlib.sha1(snap_id.encode()).hexdigest()[:24]
+    return ":".join(["60", "06", "01", "60"] + [digest[index : index + 2] for index in range(0, 24, 2)]).upper()
+
+
+def _snap(snap: snapshots.Snapshot) -> Snap:
+    return Snap(
+        id=snap.id,
+        name=snap.name,
+        description=snap.description,
+        storageResource=SnapReference(id=snap.resource_id),
+        creationTime=_time(snap.created),
+        expirationTime=_time(snap.expires),
+        creatorType=snap.creator,
+        isSystemSnap=snap.creator == snapshots.SYSTEM,
+        isReadOnly=snap.read_only,
+        isAutoDelete=snap.auto_delete,
+        size=snap.size,
+        attachedWWN=_wwn(snap.id) if snap.attached else None,
+        lastWritableTime=_time(snap.last_writable),
+    )
+
+
+class SnapController:
+    """Controller for snapshots of storage resources.
+
+    The space snapshots hold is accounted up to the current time before every
+    read, so responses and the storage resources and pools they change are current.
+    """
+
+    def __init__(self, engine: SnapshotEngine = snapshot_engine):
+        self.engine = engine
+
+    def _get(self, snap_id: str) -> snapshots.Snapshot:
+        snap = self.engine.snaps.get(snap_id)
+        if snap is None:
+            raise HTTPException(status_code=404, detail=f"Snapshot {snap_id} not found")
+        return snap
+
+    def _detached(self, snap_id: str) -> snapshots.Snapshot:
+        snap = self._get(snap_id)
+        if snap.attached:
+            raise HTTPException(status_code=409, detail=f"Snapshot {snap_id} is attached")
+        return snap
+
+    async def list_snaps(self, request: Request, filter: Optional[str] = None) -> ApiResponse[List[Snap]]:
+        """List snapshots, optionally filtered on name, storageResource, creatorType, isReadOnly or isAutoDelete."""
+        self.engine.advance()
+        filters = parse_filter(filter)
+        resource_id = filters.get("storageResource", {})
+        # Snapshots of one resource are read from its chain
+        if resource_id.get("operator") == "EQ" and "*" not in str(resource_id["value"]):
+            candidates = self.engine.snapshots(str(resource_id["value"]))
+        else:
+            candidates = self.engine.snapshots()
+        entries = [_snap(snap) for snap in candidates if matches_filter(snap, filters, _get_field)]
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
+
+    async def get_snap(self, snap_id: str, request: Request) -> ApiResponse[Snap]:
+        self.engine.advance()
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(_snap(self._get(snap_id)))
+
+    async def create_snap(self, request: Request, snap_create: SnapCreate) -> ApiResponse[Snap]:
+        resource_id = snap_create.storageResource.id
+        try:
+            snap = self.engine.create(
+                resource_id,
+                name=snap_create.name,
+                description=snap_create.description,
+                retention=snap_create.retentionDuration,
+                read_only=snap_create.isReadOnly,
+                auto_delete=snap_create.isAutoDelete,
+            )
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Storage resource {resource_id} not found")
+        except SnapshotLimitExceeded as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(
+            [_snap(snap)], entry_links={0: [{"rel": "self", "href": f"/api/instances/snap/{snap.id}"}]}
+        )
+
+    async def delete_snap(self, snap_id: str) -> None:
+        self._detached(snap_id)
+        self.engine.delete(snap_id)
+
+    async def restore_snap(
+        self, snap_id: str, restore: SnapRestore, request: Request
+    ) -> ApiResponse[SnapRestoreResult]:
+        """Restore the storage resource of a snapshot to it, after taking a snapshot of the resource as it is."""
+        self._detached(snap_id)
+        try:
+            backup = self.engine.restore(snap_id, restore.copyName)
+        except SnapshotLimitExceeded as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(SnapRestoreResult(backup=SnapReference(id=backup.id)))
+
+    async def attach_snap(self, snap_id: str) -> None:
+        self._detached(snap_id)
+        self.engine.attach(snap_id)
+
+    async def detach_snap(self, snap_id: str) -> None:
+        if not self._get(snap_id).attached:
+            raise HTTPException(status_code=409, detail=f"Snapshot {snap_id} is not attached")
+        self.engine.detach(snap_id)
@@ -0,0 +1,128 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Request
+
+from dell_unisphere_mock_api.core import snap_schedules
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.snap_schedules import DAYS, HOURLY, WEEKLY, SnapScheduleEngine, snap_schedule_engine
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+from dell_unisphere_mock_api.schemas.snap import SnapReference
+from dell_unisphere_mock_api.schemas.snap_schedule import (
+    SnapSchedule,
+    SnapScheduleCreate,
+    SnapScheduleModify,
+    SnapScheduleRule,
+    SnapScheduleRuleCreate,
+)
+
+
+def _rule_arguments(rule: SnapScheduleRuleCreate) -> Dict[str, Any]:
+    return {
+        "type": rule.type.value,
+        "minute": rule.minute,
+        "hours": rule.hours,
+        "interval": rule.interval,
+        "days": [DAYS.index(day.value) for day in rule.daysOfWeek],
+        "retention": rule.retentionTime,
+        "auto_delete": rule.isAutoDelete,
+    }
+
+
+def _rule(rule: snap_schedules.ScheduleRule) -> SnapScheduleRule:
+    return SnapScheduleRule(
+        id=rule.id,
+        type=rule.type,
+        minute=rule.minute,
+        hours=[] if rule.type == HOURLY else list(rule.hours),
+        interval=rule.interval,
+        daysOfWeek=[DAYS[day] for day in rule.days] if rule.type == WEEKLY else [],
+        retentionTime=rule.retention,
+        isAutoDelete=rule.auto_delete,
+    )
+
+
+class SnapScheduleController:
+    """Controller for snapshot schedules.
+
+    Rules that fell due are fired before every request, so responses show the
+    next time each schedule takes snapshots.
+    """
+
+    def __init__(
+        self, engine: SnapScheduleEngine = snap_schedule_engine, resources: Optional[StorageResourceModel] = None
+    ):
+        self.engine = engine
+        self.resources = resources or StorageResourceModel()
+
+    def _schedule(self, schedule: snap_schedules.SnapSchedule) -> SnapSchedule:
+        next_snap_time = self.engine.next_snap_time(schedule)
+        return SnapSchedule(
+            id=schedule.id,
+            name=schedule.name,
+            rules=[_rule(rule) for rule in schedule.rules.values()],
+            storageResources=[SnapReference(id=resource_id) for resource_id in schedule.resources],
+            nextSnapTime=None if next_snap_time is None else datetime.fromtimestamp(next_snap_time, timezone.utc),
+        )
+
+    def _get(self, schedule_id: str) -> snap_schedules.SnapSchedule:
+        self.engine.advance()
+        schedule = self.engine.schedules.get(schedule_id)
+        if schedule is None:
+            raise HTTPException(status_code=404, detail=f"Snapshot schedule {schedule_id} not found")
+        return schedule
+
+    def _resource_ids(self, references: Iterable[SnapReference]) -> List[str]:
+        resource_ids = [reference.id for reference in references]
+        missing = [resource_id for resource_id in resource_ids if resource_id not in self.resources.storage_resources]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Storage resources not found: {', '.join(missing[:10])}")
+        return resource_ids
+
+    async def list_schedules(self, request: Request) -> ApiResponse[List[SnapSchedule]]:
+        self.engine.advance()
+        entries = [self._schedule(schedule) for schedule in self.engine.schedules.values()]
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(entries)
+
+    async def get_schedule(self, schedule_id: str, request: Request) -> ApiResponse[SnapSchedule]:
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(self._schedule(self._get(schedule_id)))
+
+    async def create_schedule(self, request: Request, schedule_create: SnapScheduleCreate) -> ApiResponse[SnapSchedule]:
+        """Create a schedule; storage resources following another schedule move to the new one."""
+        if any(schedule.name == schedule_create.name for schedule in self.engine.schedules.values()):
+            raise HTTPException(
+                status_code=409, detail=f"Snapshot schedule with name '{schedule_create.name}' already exists"
+            )
+        schedule = self.engine.create(
+            schedule_create.name,
+            [_rule_arguments(rule) for rule in schedule_create.rules],
+            self._resource_ids(schedule_create.storageResources),
+        )
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(
+            [self._schedule(schedule)],
+            entry_links={0: [{"rel": "self", "href": f"/api/instances/snapSchedule/{schedule.id}"}]},
+        )
+
+    async def modify_schedule(self, schedule_id: str, modify: SnapScheduleModify) -> None:
+        schedule = self._get(schedule_id)
+        unknown = [rule_id for rule_id in modify.removeRuleIds if rule_id not in schedule.rules]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Snapshot schedule rules not found: {', '.join(unknown)}")
+        if len(schedule.rules) + len(modify.addRules) <= len(set(modify.removeRuleIds)):
+            raise HTTPException(status_code=400, detail="A snapshot schedule needs at least one rule")
+        self.engine.modify(
+            schedule_id,
+            name=modify.name,
+            add_rules=[_rule_arguments(rule) for rule in modify.addRules],
+            remove_rule_ids=modify.removeRuleIds,
+            add_resources=self._resource_ids(modify.addStorageResources),
+            remove_resources=[reference.id for reference in modify.removeStorageResources],
+        )
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        self._get(schedule_id)
+        self.engine.delete(schedule_id)
@@ -0,0 +1,23 @@
+from typing import List, Optional, Sequence
+
+from dell_unisphere_mock_api.core.snapshots import SnapshotState
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+
+
+class StorageResourceSnapshotTarget:
+    """Lets the snapshot engine read storage resources and record the space their snapshots hold."""
+
+    def __init__(self, model: StorageResourceModel):
+        self.model = model
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[SnapshotState]]:
+        states = []
+        for resource_id in obj_ids:
+            record = self.model.storage_resources.get(resource_id)
+            states.append(None if record is None else (record.sizeTotal, record.sizeAllocated))
+        return states
+
+    def apply(
+        self, obj_ids: Sequence[str], counts: Sequence[int], sizes: Sequence[int], allocated: Sequence[int]
+    ) -> None:
+        self.model.set_snapshot_usage(list(obj_ids), list(counts), list(sizes), list(allocated))
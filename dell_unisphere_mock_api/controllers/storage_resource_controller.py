@@ -134,7 +134,7 @@ class StorageResourceController:
         if not self.storage_resource_model.remove_host_access(resource_id, host_id):
             raise HTTPException(status_code=404, detail="Storage resource not found")
 
-        resource = await self.get_storage_resource(request, resource_id)
+        resource = self.storage_resource_model.get_storage_resource(resource_id)
         formatter = UnityResponseFormatter(request)
         return await formatter.format_collection(
             items=[resource], entry_links={0: [{"rel": "self", "href": f"/{resource_id}"}]}
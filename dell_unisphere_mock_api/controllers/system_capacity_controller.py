@@ -0,0 +1,69 @@
+from typing import List
+
+from fastapi import HTTPException, Request
+
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, TierCapacity, capacity_ledger
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.models.pool import DISK_TIER_TYPES
+from dell_unisphere_mock_api.schemas.system_capacity import SystemCapacity, SystemTierCapacity
+
+SYSTEM_CAPACITY_ID = "0"
+
+
+class SystemCapacityController:
+    """Serves the system and tier capacity rollups kept by the capacity ledger.
+
+    Nothing is summed over pools, disks or storage objects here: every figure is
+    a running total of the ledger, so each read is O(1) in the size of the inventory.
+    """
+
+    def __init__(self, ledger: CapacityLedger = capacity_ledger):
+        self.ledger = ledger
+
+    def _tiers(self) -> List[SystemTierCapacity]:
+        tiers = []
+        for disk_tier, (tier_type, _) in DISK_TIER_TYPES.items():
+            capacity = self.ledger.tiers.get(disk_tier.value) or TierCapacity()
+            tiers.append(
+                SystemTierCapacity(
+                    id=tier_type.value,
+                    tierType=tier_type,
+                    sizeTotal=capacity.size_total,
+                    sizeUsed=capacity.size_used,
+                    sizeFree=capacity.free,
+                )
+            )
+        return tiers
+
+    def _system_capacity(self) -> SystemCapacity:
+        system = self.ledger.system
+        return SystemCapacity(
+            id=SYSTEM_CAPACITY_ID,
+            sizeTotal=system.size_total,
+            sizeUsed=system.used,
+            sizeFree=system.free,
+            sizeSubscribed=system.subscribed,
+            tiers=self._tiers(),
+        )
+
+    async def list_system_capacity(self, request: Request) -> ApiResponse[List[SystemCapacity]]:
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection([self._system_capacity()])
+
+    async def get_system_capacity(self, capacity_id: str, request: Request) -> ApiResponse[SystemCapacity]:
+        if capacity_id != SYSTEM_CAPACITY_ID:
+            raise HTTPException(status_code=404, detail=f"System capacity with ID '{capacity_id}' not found")
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_item(self._system_capacity())
+
+    async def list_tier_capacity(self, request: Request) -> ApiResponse[List[SystemTierCapacity]]:
+        formatter = UnityResponseFormatter(request)
+        return await formatter.format_collection(self._tiers())
+
+    async def get_tier_capacity(self, tier_id: str, request: Request) -> ApiResponse[SystemTierCapacity]:
+        for tier in self._tiers():
+            if tier.id == tier_id:
+                formatter = UnityResponseFormatter(request)
+                return await formatter.format_item(tier)
+        raise HTTPException(status_code=404, detail=f"System tier capacity with ID '{tier_id}' not found")
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 from fastapi import HTTPException, Request
 
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
 from dell_unisphere_mock_api.core.response_models import ApiResponse, Entry, Link
 from dell_unisphere_mock_api.models.tenant import Tenant, TenantCreate, TenantUpdate
 
@@ -44,6 +45,7 @@ class TenantController:
             new_tenant = Tenant(**{**tenant.model_dump(), "id": tenant_id})
             self.tenants[tenant_id] = new_tenant
             self.name_to_id[new_tenant.name] = tenant_id
+            change_feed.publish("tenant", CREATED, tenant_id)
             return self._create_api_response([self._create_entry(new_tenant, request)], request)
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -85,6 +87,7 @@ class TenantController:
 
         updated_tenant = Tenant(**{**tenant.model_dump(), **update_dict})
         self.tenants[tenant_id] = updated_tenant
+        change_feed.publish("tenant", MODIFIED, tenant_id)
         return self._create_api_response([self._create_entry(updated_tenant, request)], request)
 
     async def delete_tenant(self, request: Request, tenant_id: str) -> ApiResponse:
@@ -95,4 +98,5 @@ class TenantController:
         tenant = self.tenants[tenant_id]
         del self.name_to_id[tenant.name]
         del self.tenants[tenant_id]
+        change_feed.publish("tenant", DELETED, tenant_id)
         return self._create_api_response([], request)
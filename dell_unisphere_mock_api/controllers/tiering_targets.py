@@ -0,0 +1,35 @@
+from typing import Dict, List, Optional, Sequence
+
+from dell_unisphere_mock_api.core.tiering import TieringState
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+
+
+class StorageResourceTieringTarget:
+    """Lets the tiering engine read storage resources and record where their slices are."""
+
+    def __init__(self, model: StorageResourceModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.storage_resources)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[TieringState]]:
+        states = []
+        for resource_id in obj_ids:
+            record = self.model.storage_resources.get(resource_id)
+            states.append(
+                None
+                if record is None
+                # Slices hold what is allocated after data reduction
+                else (record.pool, record.sizeAllocated - record.dataReductionSizeSaved, record.tieringPolicy)
+            )
+        return states
+
+    def apply(self, obj_ids: Sequence[str], per_tier: Sequence[Dict[str, int]]) -> None:
+        self.model.set_tier_usage(list(obj_ids), list(per_tier))
+
+
+def pool_tier_capacity(pool_id: str) -> Dict[str, int]:
+    """Return ``{tier name: healthy size}`` of a pool, from the disks assigned to it."""
+    return {tier.name: size for tier, (size, _) in DiskModel.inventory.pool_capacity(pool_id).items()}
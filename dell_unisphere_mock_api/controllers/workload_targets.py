@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Sequence
+
+from dell_unisphere_mock_api.core.workload import ObjectState
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.filesystem import FilesystemModel
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+
+
+class LUNWorkloadTarget:
+    """Lets the workload simulator read and grow LUNs."""
+
+    def __init__(self, model: LUNModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.luns)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[ObjectState]]:
+        states = []
+        for lun_id in obj_ids:
+            record = self.model.luns.get(lun_id)
+            states.append(
+                None
+                if record is None
+                # LUNs report no used size; what is allocated has been written
+                else (record.pool_id, record.size, record.sizeAllocated, record.sizeAllocated, record.isThinEnabled)
+            )
+        return states
+
+    def apply(self, obj_ids: Sequence[str], allocated: Sequence[int], used: Sequence[int]) -> List[int]:
+        return self.model.set_allocations(list(obj_ids), list(allocated))
+
+
+class FilesystemWorkloadTarget:
+    """Lets the workload simulator read and grow filesystems."""
+
+    def __init__(self, model: FilesystemModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.filesystems)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[ObjectState]]:
+        states = []
+        for filesystem_id in obj_ids:
+            filesystem = self.model.filesystems.get(filesystem_id)
+            states.append(
+                None
+                if filesystem is None
+                else (
+                    filesystem["pool"],
+                    filesystem["size"],
+                    filesystem["sizeAllocated"],
+                    filesystem["sizeUsed"],
+                    filesystem.get("isThinEnabled", True),
+                )
+            )
+        return states
+
+    def apply(self, obj_ids: Sequence[str], allocated: Sequence[int], used: Sequence[int]) -> List[int]:
+        return self.model.set_allocations(list(obj_ids), list(allocated), list(used))
+
+
+class StorageResourceWorkloadTarget:
+    """Lets the workload simulator read and grow storage resources."""
+
+    def __init__(self, model: StorageResourceModel):
+        self.model = model
+
+    def ids(self) -> List[str]:
+        return list(self.model.storage_resources)
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[ObjectState]]:
+        states = []
+        for resource_id in obj_ids:
+            record = self.model.storage_resources.get(resource_id)
+            states.append(
+                None
+                if record is None
+                else (record.pool, record.sizeTotal, record.sizeAllocated, record.sizeUsed, record.isThinEnabled)
+            )
+        return states
+
+    def apply(self, obj_ids: Sequence[str], allocated: Sequence[int], used: Sequence[int]) -> List[int]:
+        return self.model.set_allocations(list(obj_ids), list(allocated), list(used))
+
+
+def pool_tiers(pool_model: Optional[PoolModel] = None) -> Dict[str, Dict[str, int]]:
+    """Return ``{pool ID: {tier name: healthy size}}`` for every pool, from the disks assigned to it."""
+    pool_model = pool_model or PoolModel()
+    capacities = DiskModel.inventory.capacity_by_pool()
+    return {
+        pool_id: {tier.name: size for tier, (size, _) in capacities.get(pool_id, {}).items()}
+        for pool_id in pool_model.pools
+    }
@@ -0,0 +1,377 @@
+"""Alerts raised and cleared by rules evaluated on changed objects.
+
+Each object type has a list of rules over a small dict of facts about an object
+(its used percentage, health, state, ...), which a source for the type looks
+up. The engine learns which objects changed from the change logs of their
+types, and which pools gained or lost used space from the capacity ledger, and
+evaluates the rules of those objects only, so the cost of an evaluation is
+O(changed objects) whatever the size of the inventory. Like the workload
+simulator, it re-reads all objects of a type only if its change log no longer
+reaches back far enough.
+
+A rule that starts to hold raises an alert and a rule that stops holding
+clears it again. Threshold rules clear only once the value has fallen a
+hysteresis margin below the threshold, so a pool hovering around its threshold
+does not raise an alert on every change. Raising, clearing and deleting the
+object of an alert also write an event.
+
+Alerts and events are kept in bounded stores indexed by ID; the oldest are
+dropped when a store is full.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, capacity_ledger
+from dell_unisphere_mock_api.core.changes import ChangeFeed, ChangeHistoryExpired, change_feed
+from dell_unisphere_mock_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Severities, as in syslog
+CRITICAL = 2
+ERROR = 3
+WARNING = 4
+NOTICE = 5
+INFO = 6
+
+# Alert states
+ACTIVE = 1
+INACTIVE = 2
+
+Facts = Dict[str, Any]
+
+
+class AlertRule(NamedTuple):
+    """A condition of an object that raises an alert while it holds."""
+
+    name: str
+    severity: int
+    message_id: str
+    # Formatted with the facts of the object
+    message: str
+    # Returns whether the condition holds, given the facts and whether it held before
+    test: Callable[[Facts, bool], bool]
+
+
+def threshold_rule(
+    name: str, severity: int, message_id: str, message: str, measure: str, threshold: str, hysteresis: float
+) -> AlertRule:
+    """Rule that holds from when ``facts[measure]`` reaches ``facts[threshold]`` until it falls ``hysteresis`` below."""
+
+    def test(facts: Facts, held: bool) -> bool:
+        limit = facts.get(threshold)
+        if limit is None:
+            return False
+        value = facts[measure]
+        return value >= limit or (held and value > limit - hysteresis)
+
+    return AlertRule(name, severity, message_id, message, test)
+
+
+def condition_rule(
+    name: str, severity: int, message_id: str, message: str, predicate: Callable[[Facts], bool]
+) -> AlertRule:
+    """Rule that holds while ``predicate(facts)`` is true."""
+    return AlertRule(name, severity, message_id, message, lambda facts, held: predicate(facts))
+
+
+def default_rules(hysteresis: Optional[float] = None) -> Dict[str, List[AlertRule]]:
+    """Return the alert rules of every object type."""
+    hysteresis = settings.ALERT_HYSTERESIS_PCT if hysteresis is None else hysteresis
+    return {
+        "pool": [
+            threshold_rule(
+                "spaceThreshold",
+                WARNING,
+                "14000003",
+                "Storage pool {name} has exceeded its user-specified threshold: {percentUsed:.1f}% used.",
+                "percentUsed",
+                "alertThreshold",
+                hysteresis,
+            ),
+            threshold_rule(
+                "harvestThreshold",
+                NOTICE,
+                "14000010",
+                "Storage pool {name} has reached its space harvesting high threshold: {percentUsed:.1f}% used.",
+                "percentUsed",
+                "harvestHighThreshold",
+                hysteresis,
+            ),
+            threshold_rule(
+                "full",
+                CRITICAL,
+                "14000004",
+                "Storage pool {name} is full.",
+                "percentUsed",
+                "fullThreshold",
+                hysteresis,
+            ),
+        ],
+        "disk": [
+            condition_rule(
+                "health",
+                CRITICAL,
+                "13200001",
+                "Disk {name} has faulted: health status {health}.",
+                lambda facts: facts["health"] != "OK",
+            ),
+        ],
+        "lun": [
+            condition_rule(
+                "health",
+                ERROR,
+                "13400001",
+                "LUN {name} is degraded: {description}",
+                # 5 is OK and 7 OK_BUT; higher values are degraded or worse
+                lambda facts: facts["health"] > 7,
+            ),
+        ],
+        "filesystem": [
+            condition_rule(
+                "health",
+                ERROR,
+                "13500001",
+                "File system {name} is not healthy: health status {health}.",
+                lambda facts: facts["health"] not in ("OK", "UNKNOWN"),
+            ),
+        ],
+        "job": [
+            condition_rule(
+                "failed",
+                ERROR,
+                "13900001",
+                "Job {description} failed: {errorMessage}",
+                lambda facts: facts["state"] == "FAILED",
+            ),
+        ],
+    }
+
+
+class AlertSource(Protocol):
+    """Looks up the facts that the alert rules of one object type are evaluated on."""
+
+    def ids(self) -> List[str]:
+        """IDs of all objects of the type."""
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[Facts]]:
+        """Facts of each object, or None for objects that no longer exist."""
+
+
+class Alert:
+    """An alert about one object, raised by one rule."""
+
+    __slots__ = (
+        "id",
+        "timestamp",
+        "severity",
+        "object_type",
+        "object_id",
+        "rule",
+        "message_id",
+        "message",
+        "state",
+        "acknowledged",
+    )
+
+    def __init__(
+        self,
+        alert_id: int,
+        timestamp: float,
+        severity: int,
+        object_type: str,
+        object_id: str,
+        rule: str,
+        message_id: str,
+        message: str,
+    ) -> None:
+        self.id = alert_id
+        self.timestamp = timestamp
+        self.severity = severity
+        self.object_type = object_type
+        self.object_id = object_id
+        self.rule = rule
+        self.message_id = message_id
+        self.message = message
+        self.state = ACTIVE
+        self.acknowledged = False
+
+
+class Event(NamedTuple):
+    """An entry of the event log."""
+
+    id: int
+    timestamp: float
+    severity: int
+    message_id: str
+    message: str
+    object_type: str
+    object_id: str
+
+
+class AlertStore:
+    """Alerts by ID and the event log, each bounded; the oldest entries are dropped first."""
+
+    def __init__(self, max_alerts: Optional[int] = None, max_events: Optional[int] = None) -> None:
+        self.max_alerts = max_alerts or settings.ALERTS_MAX_COUNT
+        self.alerts: "OrderedDict[int, Alert]" = OrderedDict()
+        self.events: Deque[Event] = deque(maxlen=max_events or settings.EVENTS_MAX_COUNT)
+        self._alert_ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+
+    def log(self, severity: int, message_id: str, message: str, object_type: str, object_id: str) -> Event:
+        event = Event(next(self._event_ids), time.time(), severity, message_id, message, object_type, object_id)
+        self.events.append(event)
+        return event
+
+    def add(self, severity: int, object_type: str, object_id: str, rule: str, message_id: str, message: str) -> Alert:
+        """Store a new active alert and log it."""
+        alert = Alert(next(self._alert_ids), time.time(), severity, object_type, object_id, rule, message_id, message)
+        self.alerts[alert.id] = alert
+        while len(self.alerts) > self.max_alerts:
+            self.alerts.popitem(last=False)
+        self.log(severity, message_id, message, object_type, object_id)
+        return alert
+
+    def get(self, alert_id: int) -> Optional[Alert]:
+        return self.alerts.get(alert_id)
+
+    def event(self, event_id: int) -> Optional[Event]:
+        """Return a logged event; event IDs are consecutive, so its position follows from its ID."""
+        events = self.events
+        if not events:
+            return None
+        index = event_id - events[0].id
+        return events[index] if 0 <= index < len(events) else None
+
+    def deactivate(self, alert_id: int, message: str) -> None:
+        """Mark an alert inactive, if it is still stored, and log that it cleared."""
+        alert = self.alerts.get(alert_id)
+        if alert is not None and alert.state == ACTIVE:
+            alert.state = INACTIVE
+            self.log(INFO, alert.message_id, message, alert.object_type, alert.object_id)
+
+    def acknowledge(self, alert_id: int) -> Optional[Alert]:
+        alert = self.alerts.get(alert_id)
+        if alert is not None:
+            alert.acknowledged = True
+        return alert
+
+    def delete(self, alert_id: int) -> bool:
+        return self.alerts.pop(alert_id, None) is not None
+
+    def clear(self) -> None:
+        self.alerts.clear()
+        self.events.clear()
+        self._alert_ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+
+
+class AlertEngine:
+    """Evaluates the alert rules of changed objects and keeps their alerts in a store."""
+
+    def __init__(
+        self,
+        store: Optional[AlertStore] = None,
+        feed: Optional[ChangeFeed] = None,
+        ledger: Optional[CapacityLedger] = None,
+        rules: Optional[Dict[str, List[AlertRule]]] = None,
+    ) -> None:
+        self.store = store or AlertStore()
+        self.feed = feed or change_feed
+        self.ledger = ledger or capacity_ledger
+        self.rules = rules if rules is not None else default_rules()
+        # Fact lookups of the object types with rules, by type
+        self.sources: Dict[str, AlertSource] = {}
+        # (object type, object ID) -> {rule name: ID of the alert it raised}
+        self.raised: Dict[Tuple[str, str], Dict[str, int]] = {}
+        # Number of objects evaluated
+        self.evaluated = 0
+        self._seq = 0
+        self._synced = False
+
+    def process(self) -> None:
+        """Evaluate the objects changed since the last call."""
+        # The feed was cleared if it is behind what was already seen
+        stale = not self._synced or self.feed.last_seq < self._seq
+        changed_pools = self.ledger.take_changed_pools()
+        for object_type, source in self.sources.items():
+            resync = stale
+            if not resync:
+                try:
+                    modified, deleted = self.feed.log(object_type).since(self._seq)
+                except ChangeHistoryExpired:
+                    resync = True
+            if resync:
+                modified = source.ids()
+                present = set(modified)
+                deleted = [key[1] for key in self.raised if key[0] == object_type and key[1] not in present]
+            if object_type == "pool" and changed_pools:
+                modified = list(dict.fromkeys(itertools.chain(modified, changed_pools)))
+            if modified:
+                self._evaluate(object_type, modified, source.describe(modified))
+            for obj_id in deleted:
+                self._clear_object(object_type, obj_id)
+        self._seq = self.feed.last_seq
+        self._synced = True
+
+    def _evaluate(self, object_type: str, obj_ids: Sequence[str], facts: List[Optional[Facts]]) -> None:
+        rules = self.rules.get(object_type, ())
+        for obj_id, object_facts in zip(obj_ids, facts):
+            self.evaluated += 1
+            key = (object_type, obj_id)
+            if object_facts is None:
+                self._clear_object(object_type, obj_id)
+                continue
+            raised = self.raised.get(key)
+            for rule in rules:
+                held = raised is not None and rule.name in raised
+                holds = rule.test(object_facts, held)
+                if holds and not held:
+                    alert = self.store.add(
+                        rule.severity,
+                        object_type,
+                        obj_id,
+                        rule.name,
+                        rule.message_id,
+                        rule.message.format(**object_facts),
+                    )
+                    if raised is None:
+                        raised = self.raised[key] = {}
+                    raised[rule.name] = alert.id
+                elif held and not holds:
+                    self.store.deactivate(raised.pop(rule.name), f"Cleared: {rule.message.format(**object_facts)}")
+            if raised is not None and not raised:
+                del self.raised[key]
+
+    def _clear_object(self, object_type: str, obj_id: str) -> None:
+        """Clear the alerts of a deleted object."""
+        raised = self.raised.pop((object_type, obj_id), None)
+        if raised:
+            for alert_id in raised.values():
+                self.store.deactivate(alert_id, f"Cleared: {object_type} {obj_id} was deleted.")
+
+    async def run(self, interval: float) -> None:
+        """Evaluate changes as they are published, and at least every ``interval`` seconds, until cancelled."""
+        while True:
+            try:
+                await self.feed.wait(self._seq, interval)
+                self.process()
+            except Exception:
+                logger.exception("Alert evaluation failed")
+                await asyncio.sleep(interval)
+
+    def clear(self) -> None:
+        self.store.clear()
+        self.raised.clear()
+        self.evaluated = 0
+        self._seq = 0
+        self._synced = False
+
+
+alert_engine = AlertEngine()
@@ -17,6 +17,9 @@ session_controller = SessionController()
 # Use a consistent time source
 start_time = time.time()
 
+# Scope key under which the operations of a /batch request carry the batch's user
+BATCH_USER_SCOPE_KEY = "unisphere.batch_user"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hashed password.
@@ -64,6 +67,11 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails.
     """
+    # Operations of a batch were authenticated with the batch request itself
+    batch_user = request.scope.get(BATCH_USER_SCOPE_KEY)
+    if batch_user is not None:
+        return batch_user
+
     # First try cookie-based auth
     session_id = _get_session_id_from_cookie(request)
     if session_id:
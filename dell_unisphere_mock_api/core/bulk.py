@@ -0,0 +1,77 @@
+"""Selection of the objects a bulk delete applies to.
+
+A bulk delete names its targets by ID or with a filter expression. IDs and
+exact ``id``/``name`` matches are resolved through the store's indexes; other
+filters read only the filtered fields of each stored object, without building
+response models. Dependencies are then checked in the same pass, so the store
+can remove everything that is left in one batch.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+
+from dell_unisphere_mock_api.core.query import matches_filter, parse_filter
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteSkipped
+
+
+def _exact(filters: Dict[str, Any], field: str) -> Optional[str]:
+    """Return the value of an ``eq`` condition on ``field`` without wildcards."""
+    condition = filters.get(field)
+    if condition is None or condition["operator"] != "EQ":
+        return None
+    value = str(condition["value"])
+    return None if "*" in value else value
+
+
+def select_for_delete(
+    bulk: BulkDeleteRequest,
+    store: Mapping[str, Any],
+    get: Callable[[Any, str, Any], Any] = getattr,
+    name_index: Optional[Callable[[str], Optional[str]]] = None,
+    blocked: Optional[Callable[[Any], Optional[str]]] = None,
+) -> Tuple[List[str], List[BulkDeleteSkipped], List[str]]:
+    """Return ``(IDs to delete, skipped objects, requested IDs not found)``.
+
+    Args:
+        store: Stored objects by ID
+        get: Reads a field of a stored object, with a default
+        name_index: Looks up the ID of the object with a name
+        blocked: Returns why an object cannot be deleted, or None
+
+    Raises:
+        HTTPException: If the filter expression has a condition that cannot be parsed, or none at all;
+            a bulk delete never ignores part of its filter
+    """
+    not_found: List[str] = []
+    if bulk.ids is not None:
+        candidates = []
+        for obj_id in dict.fromkeys(bulk.ids):
+            (candidates if obj_id in store else not_found).append(obj_id)
+    else:
+        try:
+            filters = parse_filter(bulk.filter, strict=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filter expression: {e}")
+        if not filters:
+            raise HTTPException(status_code=400, detail=f"Invalid filter expression: {bulk.filter}")
+        obj_id = _exact(filters, "id")
+        name = _exact(filters, "name")
+        if obj_id is not None:
+            candidates = [obj_id] if obj_id in store else []
+        elif name is not None and name_index is not None:
+            obj_id = name_index(name)
+            candidates = [obj_id] if obj_id is not None else []
+        else:
+            candidates = list(store)
+        candidates = [obj_id for obj_id in candidates if matches_filter(store[obj_id], filters, get)]
+
+    to_delete: List[str] = []
+    skipped: List[BulkDeleteSkipped] = []
+    for obj_id in candidates:
+        reason = blocked(store[obj_id]) if blocked is not None else None
+        if reason is None:
+            to_delete.append(obj_id)
+        else:
+            skipped.append(BulkDeleteSkipped(id=obj_id, reason=reason))
+    return to_delete, skipped, not_found
@@ -0,0 +1,312 @@
+"""Capacity accounting for pools and for the system as a whole.
+
+Every create, expand, delete and allocation change of a LUN, filesystem or
+storage resource is posted to the ledger as a delta against its pool. The
+ledger keeps running totals per pool and for the system, so each change costs
+O(1) and reading a pool's counters never sums over the objects in it.
+
+Capacity per storage tier is kept the same way. The disk model posts the
+healthy size its disks add to or remove from each tier of a pool, and the used
+space of a pool is apportioned to its tiers in proportion to their sizes, so
+system tier totals are adjusted on every change instead of being summed over
+pools and disks when read.
+
+Admission is part of posting: a delta that needs more free space than its pool
+has is refused before anything is applied. Check and update happen in one
+synchronous call with no await in between, so provisioning requests running
+concurrently on the event loop cannot both be admitted against the same free
+space.
+
+The ledger also keeps a history of every pool's used space, sampled at most
+once per ``CAPACITY_HISTORY_INTERVAL_S`` as changes are posted and on every
+workload simulator tick, which capacity forecasts are fitted to.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.config import settings
+
+
+class InsufficientCapacity(Exception):
+    """Raised when a pool does not have the free space a change needs."""
+
+    def __init__(self, pool_id: str, required: int, free: int) -> None:
+        super().__init__(f"Pool {pool_id} does not have enough free space: required {required}, available {free}")
+        self.pool_id = pool_id
+        self.required = required
+        self.free = free
+
+
+class CapacityUsage:
+    """Running capacity counters of a pool or of the system, in bytes."""
+
+    __slots__ = ("size_total", "subscribed", "allocated", "snapshot", "metadata", "objects", "version")
+
+    def __init__(self, size_total: int = 0) -> None:
+        self.size_total = size_total
+        self.subscribed = 0
+        self.allocated = 0
+        self.snapshot = 0
+        self.metadata = 0
+        self.objects = 0
+        # Incremented on every change, so cached figures derived from the counters can tell they are stale
+        self.version = 0
+
+    @property
+    def used(self) -> int:
+        return self.allocated + self.snapshot + self.metadata
+
+    @property
+    def free(self) -> int:
+        return max(self.size_total - self.used, 0)
+
+    def add(self, subscribed: int, allocated: int, snapshot: int, metadata: int, objects: int) -> None:
+        self.subscribed += subscribed
+        self.allocated += allocated
+        self.snapshot += snapshot
+        self.metadata += metadata
+        self.objects += objects
+        self.version += 1
+
+
+class TierCapacity:
+    """Capacity of one storage tier across all pools, in bytes."""
+
+    __slots__ = ("size_total", "used")
+
+    def __init__(self) -> None:
+        self.size_total = 0
+        # Share of the used space of the pools with disks in the tier; fractional while apportioned
+        self.used = 0.0
+
+    @property
+    def size_used(self) -> int:
+        return min(max(round(self.used), 0), self.size_total)
+
+    @property
+    def free(self) -> int:
+        return self.size_total - self.size_used
+
+
+class CapacityHistory:
+    """Used space of every pool over time, in one ring of samples shared by all pools.
+
+    Each sample is a row of the ring holding the used bytes of all pools at that
+    time; each pool owns a column. A column freed by a removed pool is reused by
+    the next pool added, with its old samples blanked out.
+    """
+
+    def __init__(self, samples: Optional[int] = None, interval: Optional[float] = None, columns: int = 16) -> None:
+        self.capacity = samples or settings.CAPACITY_HISTORY_SAMPLES
+        self.interval = settings.CAPACITY_HISTORY_INTERVAL_S if interval is None else interval
+        self.columns: Dict[str, int] = {}
+        self._free: List[int] = []
+        self.times = np.full(self.capacity, np.nan)
+        self.used = np.full((self.capacity, columns), np.nan)
+        # Number of samples ever recorded
+        self.written = 0
+        self.last_time: Optional[float] = None
+
+    def add_pool(self, pool_id: str) -> None:
+        if pool_id in self.columns:
+            return
+        if self._free:
+            column = self._free.pop()
+        else:
+            column = len(self.columns)
+            if column == self.used.shape[1]:
+                grown = np.full((self.capacity, column * 2), np.nan)
+                grown[:, :column] = self.used
+                self.used = grown
+        self.used[:, column] = np.nan
+        self.columns[pool_id] = column
+
+    def remove_pool(self, pool_id: str) -> None:
+        column = self.columns.pop(pool_id, None)
+        if column is not None:
+            self._free.append(column)
+
+    def record(self, timestamp: float, pools: Dict[str, CapacityUsage]) -> None:
+        """Add a sample of the used space of every pool."""
+        slot = self.written % self.capacity
+        self.times[slot] = timestamp
+        row = self.used[slot]
+        row[:] = np.nan
+        for pool_id, column in self.columns.items():
+            row[column] = pools[pool_id].used
+        self.written += 1
+        self.last_time = timestamp
+
+    def due(self, timestamp: float) -> bool:
+        """Return True if the last sample is at least one interval older than ``timestamp``."""
+        return self.last_time is None or timestamp - self.last_time >= self.interval
+
+    def series(self, pool_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(times, used)`` of the held samples for the given pools, oldest first.
+
+        ``used`` has one row per sample and one column per pool, NaN where a pool
+        did not exist yet.
+        """
+        held = min(self.written, self.capacity)
+        order = np.arange(self.written - held, self.written) % self.capacity
+        columns = [self.columns[pool_id] for pool_id in pool_ids]
+        return self.times[order], self.used[np.ix_(order, columns)]
+
+    def clear(self) -> None:
+        self.columns.clear()
+        self._free.clear()
+        self.times[:] = np.nan
+        self.used[:] = np.nan
+        self.written = 0
+        self.last_time = None
+
+
+class CapacityLedger:
+    """Capacity counters of every pool, kept current by the models that place objects in pools.
+
+    Pools the ledger does not know (for example the placeholder pool of a storage
+    resource created without one) are not tracked: changes posted against them are
+    accepted and ignored.
+    """
+
+    def __init__(self, history: Optional[CapacityHistory] = None, clock: Optional[Callable[[], float]] = None) -> None:
+        self.pools: Dict[str, CapacityUsage] = {}
+        self.system = CapacityUsage()
+        self.history = history or CapacityHistory()
+        self.tiers: Dict[str, TierCapacity] = {}
+        # Healthy disk size of each tier of a pool, also for pools not (yet) tracked
+        self.pool_tiers: Dict[str, Dict[str, int]] = {}
+        # Pools whose used space or size changed since take_changed_pools() was last called
+        self.changed_pools: Set[str] = set()
+        # Time of the samples taken when changes are posted
+        self.clock = clock or time.time
+
+    def add_pool(self, pool_id: str, size_total: int) -> None:
+        """Start tracking an empty pool."""
+        self.remove_pool(pool_id)
+        self.pools[pool_id] = CapacityUsage(size_total)
+        self.system.size_total += size_total
+        self.history.add_pool(pool_id)
+        self._apportion(pool_id, 0, 1)
+
+    def remove_pool(self, pool_id: str) -> None:
+        """Stop tracking a pool, removing its usage from the system totals."""
+        usage = self.pools.pop(pool_id, None)
+        if usage is not None:
+            self._apportion(pool_id, usage.used, -1)
+            self.system.size_total -= usage.size_total
+            self.system.add(-usage.subscribed, -usage.allocated, -usage.snapshot, -usage.metadata, -usage.objects)
+            self.history.remove_pool(pool_id)
+
+    def resize_pool(self, pool_id: str, size_total: int) -> None:
+        usage = self.pools.get(pool_id)
+        if usage is not None:
+            self.system.size_total += size_total - usage.size_total
+            usage.size_total = size_total
+            usage.version += 1
+            self.changed_pools.add(pool_id)
+
+    def _apportion(self, pool_id: str, used: int, sign: int) -> None:
+        """Add (``sign`` 1) or remove (-1) a tracked pool's tier sizes and used space to the system tiers."""
+        sizes = self.pool_tiers.get(pool_id)
+        if not sizes:
+            return
+        total = sum(sizes.values())
+        for tier, size in sizes.items():
+            capacity = self.tiers.get(tier)
+            if capacity is None:
+                capacity = self.tiers[tier] = TierCapacity()
+            capacity.size_total += sign * size
+            if total:
+                capacity.used += sign * used * size / total
+
+    def add_tier_capacity(self, pool_id: str, tier: str, size: int) -> None:
+        """Add ``size`` bytes of disk (negative to remove) to a tier of a pool."""
+        usage = self.pools.get(pool_id)
+        if usage is not None:
+            self._apportion(pool_id, usage.used, -1)
+        sizes = self.pool_tiers.setdefault(pool_id, {})
+        sizes[tier] = sizes.get(tier, 0) + size
+        if sizes[tier] <= 0:
+            del sizes[tier]
+        if not sizes:
+            del self.pool_tiers[pool_id]
+        if usage is not None:
+            self._apportion(pool_id, usage.used, 1)
+
+    def clear_tiers(self) -> None:
+        """Forget the disks of all pools."""
+        for pool_id, usage in self.pools.items():
+            self._apportion(pool_id, usage.used, -1)
+        self.pool_tiers.clear()
+        self.tiers.clear()
+
+    def take_changed_pools(self) -> Set[str]:
+        """Return the pools whose used space or size changed since the last call, and start collecting anew."""
+        changed, self.changed_pools = self.changed_pools, set()
+        return changed
+
+    def usage(self, pool_id: str) -> Optional[CapacityUsage]:
+        return self.pools.get(pool_id)
+
+    def free(self, pool_id: str) -> Optional[int]:
+        """Free bytes of a pool, or None if the pool is not tracked."""
+        usage = self.pools.get(pool_id)
+        return usage.free if usage is not None else None
+
+    def post(
+        self,
+        pool_id: str,
+        subscribed: int = 0,
+        allocated: int = 0,
+        snapshot: int = 0,
+        metadata: int = 0,
+        objects: int = 0,
+        required: Optional[int] = None,
+    ) -> None:
+        """Apply a change to a pool's counters if the pool has room for it.
+
+        Args:
+            required: Free bytes the change needs; defaults to the growth in used space
+
+        Raises:
+            InsufficientCapacity: If the pool has less free space than required
+        """
+        usage = self.pools.get(str(pool_id))
+        if usage is None:
+            return
+        if required is None:
+            required = allocated + snapshot + metadata
+        if required > 0 and required > usage.free:
+            raise InsufficientCapacity(str(pool_id), required, usage.free)
+        usage.add(subscribed, allocated, snapshot, metadata, objects)
+        self.system.add(subscribed, allocated, snapshot, metadata, objects)
+        used = allocated + snapshot + metadata
+        if used:
+            self.changed_pools.add(str(pool_id))
+        sizes = self.pool_tiers.get(str(pool_id))
+        if used and sizes:
+            total = sum(sizes.values())
+            for tier, size in sizes.items():
+                self.tiers[tier].used += used * size / total
+        self.sample()
+
+    def sample(self, now: Optional[float] = None) -> None:
+        """Record the used space of every pool in the history, unless it was sampled less than an interval ago."""
+        now = self.clock() if now is None else now
+        if self.history.due(now):
+            self.history.record(now, self.pools)
+
+    def clear(self) -> None:
+        self.pools.clear()
+        self.system = CapacityUsage()
+        self.history.clear()
+        self.tiers.clear()
+        self.pool_tiers.clear()
+        self.changed_pools.clear()
+
+
+capacity_ledger = CapacityLedger()
@@ -0,0 +1,256 @@
+"""Feed of changes to stored objects.
+
+Models publish a change whenever they create, modify or delete an object. Each
+change gets the next sequence number and is written into a fixed-size ring,
+which is all the write path does, so its cost does not depend on the number of
+subscribers.
+
+Subscribers each hold a cursor into the ring and read the changes after it,
+filtered by object type, at their own pace. A subscriber that falls more than
+the ring's capacity behind has missed changes: it is told so with an overflow
+marker and continues from the oldest change still held, and should re-list the
+collections it follows. Writers never wait for slow subscribers.
+
+Every change also updates the change log of its object type, which keeps the
+latest change of each object in sequence order and a tombstone for each
+deleted one. Asking a log what changed since a sequence number or time walks
+back from the newest entry, so incremental syncs cost O(changes) rather than
+O(collection). Only the most recent tombstones are kept; a sync from before
+the oldest dropped one has to re-list instead.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from dell_unisphere_mock_api.core.config import settings
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# Object types whose models publish changes
+OBJECT_TYPES = frozenset({"pool", "lun", "storageResource", "filesystem", "nasServer", "tenant", "job", "disk", "snap"})
+
+# (sequence number, object type, action, object ID or IDs of a batch, unix time)
+Change = Tuple[int, str, str, Union[str, Tuple[str, ...]], float]
+
+
+class ChangeHistoryExpired(Exception):
+    """Raised when the changes asked for are older than the retained history."""
+
+
+class ChangeSet(BaseModel):
+    """Objects of one type changed since a sequence number or time."""
+
+    modified: List[str]
+    deleted: List[str]
+    changeSeq: int
+
+
+class ChangeLog:
+    """Latest change of every object of one type, oldest first, with tombstones for deleted objects."""
+
+    def __init__(self, max_tombstones: Optional[int] = None) -> None:
+        self.max_tombstones = max_tombstones or settings.CHANGE_LOG_MAX_TOMBSTONES
+        # object ID -> (sequence number, unix time, deleted)
+        self.entries: "OrderedDict[str, Tuple[int, float, bool]]" = OrderedDict()
+        self._tombstones: Deque[Tuple[int, str]] = deque()
+        # Changes at or before this point may no longer be reported
+        self.horizon_seq = 0
+        self.horizon_time = 0.0
+
+    def record(self, seq: int, obj_id: str, timestamp: float, deleted: bool) -> None:
+        entries = self.entries
+        entries[obj_id] = (seq, timestamp, deleted)
+        entries.move_to_end(obj_id)
+        if deleted:
+            self._tombstones.append((seq, obj_id))
+            if len(self._tombstones) > self.max_tombstones:
+                self._drop_oldest_tombstone()
+
+    def _drop_oldest_tombstone(self) -> None:
+        seq, obj_id = self._tombstones.popleft()
+        entry = self.entries.get(obj_id)
+        # The object may have been re-created since it was deleted
+        if entry is not None and entry[0] == seq:
+            del self.entries[obj_id]
+            self.horizon_seq = seq
+            self.horizon_time = entry[1]
+
+    def since(
+        self, seq: Optional[int] = None, modified_since: Optional[datetime] = None
+    ) -> Tuple[List[str], List[str]]:
+        """Return ``(modified IDs, deleted IDs)`` for changes after ``seq`` and/or ``modified_since``.
+
+        Raises:
+            ChangeHistoryExpired: If deletions from that period may have been forgotten
+        """
+        timestamp = modified_since.timestamp() if modified_since is not None else None
+        if (seq is not None and seq < self.horizon_seq) or (timestamp is not None and timestamp < self.horizon_time):
+            raise ChangeHistoryExpired(
+                f"Changes before sequence number {self.horizon_seq} are no longer available; re-list the collection"
+            )
+        modified: List[str] = []
+        deleted: List[str] = []
+        for obj_id, (entry_seq, entry_time, is_deleted) in reversed(self.entries.items()):
+            if (seq is not None and entry_seq <= seq) or (timestamp is not None and entry_time <= timestamp):
+                break
+            (deleted if is_deleted else modified).append(obj_id)
+        modified.reverse()
+        deleted.reverse()
+        return modified, deleted
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._tombstones.clear()
+        self.horizon_seq = 0
+        self.horizon_time = 0.0
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ChangeFeed:
+    """Ring buffer of recent changes with sequence numbers, shared by all subscribers."""
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = capacity or settings.CHANGE_FEED_CAPACITY
+        self._ring: List[Optional[Change]] = [None] * self.capacity
+        self.last_seq = 0
+        # One future per waiting subscriber, each bound to the event loop it waits in
+        self._waiters: List[asyncio.Future] = []
+        self.logs: Dict[str, ChangeLog] = {}
+
+    @property
+    def oldest_seq(self) -> int:
+        """Sequence number of the oldest change still held."""
+        return max(self.last_seq - self.capacity, 0) + 1
+
+    def publish(self, obj_type: str, action: str, obj_id: str) -> int:
+        """Record a change and wake waiting subscribers. Returns its sequence number."""
+        seq = self.last_seq + 1
+        obj_id = str(obj_id)
+        timestamp = time.time()
+        self._ring[seq % self.capacity] = (seq, obj_type, action, obj_id, timestamp)
+        self.last_seq = seq
+        self.log(obj_type).record(seq, obj_id, timestamp, action == DELETED)
+        self._wake()
+        return seq
+
+    def publish_batch(self, obj_type: str, action: str, obj_ids: Iterable[str]) -> int:
+        """Record the same change to many objects as one change. Returns its sequence number."""
+        seq = self.last_seq + 1
+        obj_ids = tuple(map(str, obj_ids))
+        timestamp = time.time()
+        self._ring[seq % self.capacity] = (seq, obj_type, action, obj_ids, timestamp)
+        self.last_seq = seq
+        log = self.log(obj_type)
+        for obj_id in obj_ids:
+            log.record(seq, obj_id, timestamp, action == DELETED)
+        self._wake()
+        return seq
+
+    def _wake(self) -> None:
+        if self._waiters:
+            waiters, self._waiters = self._waiters, []
+            for waiter in waiters:
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+                except RuntimeError:
+                    # Its event loop was closed
+                    pass
+
+    def read(self, after: int, limit: int) -> List[Change]:
+        """Return up to ``limit`` changes with sequence numbers above ``after``."""
+        start = max(after + 1, self.oldest_seq)
+        stop = min(self.last_seq, start + limit - 1)
+        ring = self._ring
+        return [ring[seq % self.capacity] for seq in range(start, stop + 1)]
+
+    async def wait(self, after: int, timeout: float) -> bool:
+        """Wait until a change newer than ``after`` exists. Returns False on timeout."""
+        if self.last_seq > after:
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return True
+
+    def log(self, obj_type: str) -> ChangeLog:
+        """Return the change log of an object type."""
+        log = self.logs.get(obj_type)
+        if log is None:
+            log = self.logs[obj_type] = ChangeLog()
+        return log
+
+    def changes_since(
+        self, obj_type: str, seq: Optional[int] = None, modified_since: Optional[datetime] = None
+    ) -> ChangeSet:
+        """Return the objects of a type created, modified or deleted after ``seq`` and/or ``modified_since``."""
+        modified, deleted = self.log(obj_type).since(seq, modified_since)
+        return ChangeSet(modified=modified, deleted=deleted, changeSeq=self.last_seq)
+
+    def subscribe(self, types: Optional[Iterable[str]] = None, since: Optional[int] = None) -> "ChangeSubscription":
+        """Follow changes of the given types after sequence number ``since`` (default: from now on)."""
+        return ChangeSubscription(self, types, self.last_seq if since is None else since)
+
+    def clear(self) -> None:
+        self._ring = [None] * self.capacity
+        self.last_seq = 0
+        self._waiters.clear()
+        for log in self.logs.values():
+            log.clear()
+
+
+class ChangeSubscription:
+    """Cursor of one subscriber into a change feed."""
+
+    def __init__(self, feed: ChangeFeed, types: Optional[Iterable[str]], cursor: int) -> None:
+        self.feed = feed
+        self.types: Optional[FrozenSet[str]] = frozenset(types) if types else None
+        self.cursor = cursor
+
+    @property
+    def lag(self) -> int:
+        """Number of changes published that this subscriber has not read yet."""
+        return self.feed.last_seq - self.cursor
+
+    def overflowed(self) -> bool:
+        """Return True if changes after the cursor have already left the ring."""
+        return self.cursor + 1 < self.feed.oldest_seq
+
+    def skip_overflow(self) -> int:
+        """Move the cursor to just before the oldest change held. Returns the first missed sequence number."""
+        missed = self.cursor + 1
+        self.cursor = self.feed.oldest_seq - 1
+        return missed
+
+    def poll(self, limit: int = 256) -> List[Change]:
+        """Return the matching changes after the cursor and advance past them."""
+        changes = self.feed.read(self.cursor, limit)
+        if not changes:
+            return []
+        self.cursor = changes[-1][0]
+        if self.types is None:
+            return changes
+        return [change for change in changes if change[1] in self.types]
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until there are unread changes. Returns False on timeout."""
+        return await self.feed.wait(self.cursor, timeout)
+
+
+change_feed = ChangeFeed()
@@ -0,0 +1,292 @@
+"""Compact in-memory records for stored API objects.
+
+Stored objects are kept as slotted records instead of full pydantic models.
+A record interns low-cardinality values (pool references, standard sizes),
+freezes lists into tuples (so every empty list shares the ``()`` singleton),
+replaces values equal to a registered shared default with that single shared
+instance, and does not store sparse fields at all while they hold their usual
+value. List fields whose entries are identified by a key (such as host access
+entries keyed by host) are stored as dicts, so single entries are added,
+replaced or removed in O(1). Pydantic models are only materialized when an object leaves the model
+layer.
+
+Updates are applied to records in place: only the changed fields are validated
+(against the field types of the schema) and rewritten, and every other value
+stays shared, so the cost of an update does not depend on the width of the
+object.
+"""
+
+import copy
+import sys
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from dell_unisphere_mock_api.core.trusted import trusted
+
+R = TypeVar("R", bound="CompactRecord")
+
+_EMPTY_DICT: Dict[str, Any] = {}
+
+# Upper bound on distinct non-string values interned per record type
+INTERN_TABLE_LIMIT = 65536
+
+# Value types that are safe to hand out without copying
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, bytes, type(None), date, datetime, time, timedelta})
+
+
+def _freeze(value: Any) -> Any:
+    """Convert mutable containers into their compact, shareable form."""
+    if type(value) is list:
+        return tuple(value)
+    if type(value) is dict and not value:
+        return _EMPTY_DICT
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Convert a stored value back into the type the schema expects.
+
+    Mutable values (nested dicts, lists, models) are deep-copied, so nothing
+    handed out aliases what the record stores.
+    """
+    if type(value) in _IMMUTABLE_TYPES or isinstance(value, Enum):
+        return value
+    if type(value) is tuple:
+        return [_thaw(item) for item in value]
+    if value is _EMPTY_DICT:
+        return {}
+    return copy.deepcopy(value)
+
+
+class CompactRecord:
+    """Base class for slotted records created by :func:`compact_record_type`."""
+
+    __slots__ = ("_extra",)
+
+    _model: ClassVar[Type[BaseModel]]
+    _fields: ClassVar[Tuple[str, ...]]
+    _shared: ClassVar[Dict[str, Any]]
+    _sparse: ClassVar[Dict[str, Any]]
+    _interned: ClassVar[FrozenSet[str]]
+    _intern_table: ClassVar[Dict[Any, Any]]
+    _adapters: ClassVar[Dict[str, TypeAdapter]]
+    _keyed: ClassVar[Dict[str, str]]
+
+    def __init__(self, **values: Any) -> None:
+        """Initialize the record from keyword field values."""
+        self._extra: Optional[Dict[str, Any]] = None
+        for name in self._fields:
+            self._set(name, values.get(name))
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolve sparse fields that are not stored in a slot."""
+        sparse = type(self)._sparse
+        if name not in sparse:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        return sparse[name]
+
+    def _set(self, name: str, value: Any) -> None:
+        """Store a single field value in its compact form."""
+        key = self._keyed.get(name)
+        if key is not None and type(value) is not dict:
+            value = {entry[key]: dict(entry) for entry in value or ()}
+        if name in self._sparse:
+            self._set_sparse(name, value)
+            return
+        shared = self._shared.get(name)
+        if shared is not None and value == shared:
+            value = shared
+        elif name in self._interned:
+            value = self._intern(value)
+        else:
+            value = _freeze(value)
+        object.__setattr__(self, name, value)
+
+    def _set_sparse(self, name: str, value: Any) -> None:
+        """Store a sparse field, keeping it out of the record while it holds its default."""
+        extra = self._extra
+        value = _freeze(value)
+        if value == self._sparse[name]:
+            if extra is not None and name in extra:
+                del extra[name]
+                if not extra:
+                    self._extra = None
+            return
+        if extra is None:
+            extra = self._extra = {}
+        extra[name] = value
+
+    def get_item(self, name: str, key: Any) -> Optional[Dict[str, Any]]:
+        """Return a copy of the entry stored under ``key`` in a keyed list field."""
+        entry = getattr(self, name).get(key)
+        return copy.deepcopy(entry) if entry is not None else None
+
+    def put_item(self, name: str, entry: Dict[str, Any]) -> None:
+        """Add or replace one entry of a keyed list field."""
+        items = getattr(self, name)
+        if items is _EMPTY_DICT:
+            # Never mutate the shared empty mapping
+            self._set(name, {entry[self._keyed[name]]: dict(entry)})
+        else:
+            items[entry[self._keyed[name]]] = dict(entry)
+
+    def pop_item(self, name: str, key: Any) -> Optional[Dict[str, Any]]:
+        """Remove and return one entry of a keyed list field, if present."""
+        items = getattr(self, name)
+        if key not in items:
+            return None
+        entry = items.pop(key)
+        if not items:
+            self._set(name, {})
+        return entry
+
+    @classmethod
+    def _intern(cls, value: Any) -> Any:
+        """Return the canonical instance of a repeated string or number."""
+        if type(value) is str:
+            return sys.intern(value)
+        if type(value) in (int, float):
+            canonical = cls._intern_table.get(value)
+            if canonical is not None:
+                return canonical
+            if len(cls._intern_table) < INTERN_TABLE_LIMIT:
+                cls._intern_table[value] = value
+        return value
+
+    @classmethod
+    def _adapter(cls, name: str) -> TypeAdapter:
+        """Return the (cached) validator for a single schema field."""
+        adapter = cls._adapters.get(name)
+        if adapter is None:
+            field = cls._model.model_fields[name]
+            annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+            adapter = cls._adapters[name] = TypeAdapter(annotation)
+        return adapter
+
+    @classmethod
+    def validate_changes(cls, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate only the given fields against the schema.
+
+        Keys that are not fields of the schema are dropped, as they would be by
+        the model constructor. Entries of keyed list fields must have their key.
+
+        Raises:
+            ValidationError: If any of the changed values is invalid.
+        """
+        validated: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for name, value in changes.items():
+            if name not in cls._model.model_fields:
+                continue
+            try:
+                validated[name] = cls._adapter(name).validate_python(value)
+            except ValidationError as exc:
+                for error in exc.errors():
+                    detail = {"type": error["type"], "loc": (name, *error["loc"]), "input": error["input"]}
+                    if "ctx" in error:
+                        detail["ctx"] = error["ctx"]
+                    errors.append(detail)
+                continue
+            key = cls._keyed.get(name)
+            if key is not None:
+                for index, entry in enumerate(validated[name] or ()):
+                    if key not in entry:
+                        errors.append({"type": "missing", "loc": (name, index, key), "input": entry})
+        if errors:
+            raise ValidationError.from_exception_data(cls._model.__name__, errors)
+        return validated
+
+    def update(self: R, changes: Dict[str, Any]) -> R:
+        """Validate and apply a partial update, sharing every unchanged value.
+
+        Nothing is applied if any change fails validation.
+        """
+        for name, value in self.validate_changes(changes).items():
+            self._set(name, value)
+        return self
+
+    @classmethod
+    def from_model(cls: Type[R], obj: BaseModel) -> R:
+        """Pack a pydantic model instance into a record."""
+        record = cls.__new__(cls)
+        record._extra = None
+        for name in cls._fields:
+            record._set(name, getattr(obj, name, None))
+        return record
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any]) -> R:
+        """Pack a plain dictionary into a record."""
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dictionary of field values."""
+        data = {name: _thaw(getattr(self, name)) for name in self._fields}
+        for name in self._keyed:
+            data[name] = list(data[name].values())
+        return data
+
+    def to_model(self) -> BaseModel:
+        """Materialize the pydantic model for this record without re-validation."""
+        return trusted(self._model, **self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactRecord) or other._model is not self._model:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+def compact_record_type(
+    model: Type[BaseModel],
+    shared: Optional[Dict[str, Any]] = None,
+    sparse: Optional[Dict[str, Any]] = None,
+    interned: Iterable[str] = (),
+    keyed: Optional[Dict[str, str]] = None,
+) -> Type[CompactRecord]:
+    """Create a slotted record class mirroring the fields of ``model``.
+
+    Args:
+        model: Pydantic model whose fields the record stores.
+        shared: Field name to canonical value; equal values are replaced by the
+            canonical instance so all records share one object. Like every
+            mutable value, it is copied when the record is materialized.
+        sparse: Field name to its usual value. Sparse fields get no slot and
+            only cost memory on records where they differ from that value.
+        interned: Names of string or numeric fields with few distinct values.
+        keyed: List field name to the entry key identifying each of its entries.
+            The field is stored as a dict keyed by that value and edited with
+            ``put_item``/``pop_item``; entries are returned in insertion order.
+
+    Returns:
+        The generated record class.
+    """
+    fields = tuple(model.model_fields)
+    keyed = dict(keyed or {})
+    # Keyed fields are stored as dicts, so their usual value is the empty mapping
+    sparse = {name: _freeze({} if name in keyed else value) for name, value in (sparse or {}).items()}
+    unknown = set(sparse).union(shared or {}, interned, keyed).difference(fields)
+    if unknown:
+        raise ValueError(f"Unknown {model.__name__} fields: {sorted(unknown)}")
+    namespace = {
+        "__slots__": tuple(name for name in fields if name not in sparse),
+        "_model": model,
+        "_fields": fields,
+        "_shared": dict(shared or {}),
+        "_sparse": sparse,
+        "_interned": frozenset(interned),
+        "_intern_table": {},
+        "_adapters": {},
+        "_keyed": keyed,
+    }
+    return type(f"{model.__name__}Record", (CompactRecord,), namespace)
@@ -11,6 +11,36 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Dell Unisphere Mock API"
     VERSION: str = "1.0.0"
     CSRF_ENABLED: bool = False  # Default to False to disable CSRF
+    VALIDATE_INTERNAL: bool = False  # Debug mode: fully validate internally built objects too
+    CHANGE_FEED_CAPACITY: int = 65536  # Recent changes kept for /changes subscribers to catch up from
+    CHANGE_LOG_MAX_TOMBSTONES: int = 10000  # Deleted objects remembered per type for incremental syncs
+    CHANGE_FEED_HEARTBEAT_S: float = 15.0  # Idle interval after which /changes sends a keep-alive
+    BATCH_MAX_OPERATIONS: int = 1000  # Most operations accepted in one /batch request
+    BATCH_READ_CONCURRENCY: int = 16  # Number of consecutive GETs of a batch run concurrently
+    METRICS_RAW_SAMPLES: int = 30  # Raw samples kept per metric series
+    METRICS_ROLLUP_SAMPLES: int = 24  # 5 minute and 1 hour means kept per metric series
+    METRICS_MAX_OBJECTS: int = 100000  # Objects per type that metrics are kept for
+    METRICS_QUERY_IDLE_TIMEOUT_S: float = 300.0  # Real-time metric queries not polled for this long expire
+    METRICS_QUERY_RESULTS: int = 10  # Results kept per path of a real-time metric query
+    WORKLOAD_TICK_S: float = 60.0  # Seconds between workload simulator ticks; 0 disables them
+    WORKLOAD_SLICE_BYTES: int = 256 * 1024**2  # Granularity in which thin objects allocate pool space
+    CAPACITY_HISTORY_SAMPLES: int = 720  # Samples of pool used space kept for capacity forecasts
+    CAPACITY_HISTORY_INTERVAL_S: float = 3600.0  # Shortest interval between two pool used space samples
+    ALERTS_MAX_COUNT: int = 10000  # Alerts kept; the oldest are dropped beyond this many
+    EVENTS_MAX_COUNT: int = 10000  # Events kept; the oldest are dropped beyond this many
+    ALERT_HYSTERESIS_PCT: float = 5.0  # Points a pool's used percentage must drop below a threshold to clear its alert
+    ALERT_POLL_INTERVAL_S: float = 10.0  # Longest interval between alert evaluations while no changes are published
+    FASTVP_RELOCATION_INTERVAL_S: float = 86400.0  # Seconds between scheduled FAST VP relocations; 0 disables them
+    FASTVP_STEP_S: float = 0.1  # Pause between two batches of slices moved by a FAST VP relocation
+    SNAPS_MAX_PER_RESOURCE: int = 256  # Snapshots a storage resource can have
+    SNAP_SCHEDULE_TICK_S: float = 60.0  # Seconds between checks for due snapshot schedule rules; 0 disables them
+    JOB_WORKERS: int = 4  # Number of concurrently running jobs
+    JOB_TASK_CONCURRENCY: int = 8  # Number of concurrently running tasks of one job
+    JOB_TASK_DURATION_MS: float = 20.0  # Mean simulated duration of a job task
+    JOB_FAILURE_RATE: float = 0.0  # Probability that a job task fails
+    JOB_MAX_WAIT_TIMEOUT_S: float = 300.0  # Longest waitTimeout accepted when polling a job
+    JOB_RETENTION_MAX_COUNT: int = 10000  # Finished jobs beyond this many jobs in total are evicted
+    JOB_RETENTION_MAX_AGE_S: float = 3600.0  # Finished jobs older than this are evicted
 
     model_config = ConfigDict(env_prefix="UNISPHERE_", case_sensitive=False)
 
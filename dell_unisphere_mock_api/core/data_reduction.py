@@ -0,0 +1,170 @@
+"""Simulated data reduction of storage resources.
+
+Every storage resource is given a compression ratio and a deduplication ratio
+the first time it is seen, drawn like workload profiles, and held in NumPy
+columns with one row per resource. Compression applies while it is enabled on
+the resource, and advanced deduplication on top of it only together with
+compression, as on the array.
+
+A resource's allocation is its logical allocation; what it takes from its pool
+is that allocation after reduction, and the difference is what it saves. The
+savings of a batch of resources are computed in one array pass, and per-pool
+totals of reduced allocation and savings are adjusted by the difference to what
+each resource contributed before. So a pool's ``dataReduction*`` fields are
+read in O(1), and toggling compression on one resource is an O(1) update.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Median compression and deduplication ratios, and the spread of their logarithms across resources
+COMPRESSION_RATIO = 2.0
+DEDUP_RATIO = 1.3
+RATIO_SIGMA = 0.35
+
+NO_POOL = -1
+
+
+def summary(logical: int, saved: int) -> Tuple[int, int, float]:
+    """Return ``(size saved, percent saved, reduction ratio)`` for ``saved`` of ``logical`` bytes allocated."""
+    if logical <= 0 or saved <= 0:
+        return 0, 0, 1.0
+    return saved, round(100 * saved / logical), round(logical / (logical - saved), 2)
+
+
+class DataReductionModel:
+    """Compression and deduplication ratios of storage resources, and the savings of every pool."""
+
+    def __init__(self, seed: Optional[int] = None, capacity: int = 64) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._next_row = 0
+        # Per resource: compression and deduplication ratio, pool code, logical allocation if reduced, bytes saved
+        self.ratios = np.ones((capacity, 2), dtype=np.float64)
+        self.pool = np.full(capacity, NO_POOL, dtype=np.int64)
+        self.logical = np.zeros(capacity, dtype=np.int64)
+        self.saved = np.zeros(capacity, dtype=np.int64)
+        # Per pool: logical allocation of reduced resources and bytes saved
+        self.pool_codes: Dict[str, int] = {}
+        self.pool_logical = np.zeros(16, dtype=np.int64)
+        self.pool_saved = np.zeros(16, dtype=np.int64)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.pool)
+        ratios = np.ones((capacity, 2), dtype=np.float64)
+        ratios[: len(self.ratios)] = self.ratios
+        self.ratios = ratios
+        for name, fill in (("pool", NO_POOL), ("logical", 0), ("saved", 0)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=np.int64)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def _rows(self, obj_ids: Sequence[str]) -> np.ndarray:
+        """Return the rows of the given resources, drawing ratios for those not seen before."""
+        rows = np.empty(len(obj_ids), dtype=np.int64)
+        new = []
+        for index, obj_id in enumerate(obj_ids):
+            row = self.rows.get(obj_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = self._next_row
+                    self._next_row += 1
+                    if row == len(self.pool):
+                        self._grow()
+                self.rows[obj_id] = row
+                new.append(row)
+            rows[index] = row
+        if new:
+            draws = np.exp(self.rng.normal(0.0, RATIO_SIGMA, (len(new), 2)))
+            # A ratio below 1 would make data grow; incompressible data stays as it is
+            self.ratios[new] = np.maximum(draws * (COMPRESSION_RATIO, DEDUP_RATIO), 1.0)
+        return rows
+
+    def _pool_code(self, pool_id: str) -> int:
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            code = self.pool_codes[pool_id] = len(self.pool_codes)
+            if code == len(self.pool_saved):
+                self.pool_logical = np.concatenate([self.pool_logical, np.zeros_like(self.pool_logical)])
+                self.pool_saved = np.concatenate([self.pool_saved, np.zeros_like(self.pool_saved)])
+        return code
+
+    def savings(
+        self, obj_ids: Sequence[str], logical: Sequence[int], compression: Sequence[bool], dedup: Sequence[bool]
+    ) -> np.ndarray:
+        """Return the bytes each resource saves of its logical allocation with the given settings."""
+        rows = self._rows(obj_ids)
+        compressed = np.asarray(compression, dtype=bool)
+        deduplicated = compressed & np.asarray(dedup, dtype=bool)
+        ratios = self.ratios[rows]
+        factor = np.where(compressed, ratios[:, 0], 1.0) * np.where(deduplicated, ratios[:, 1], 1.0)
+        logical = np.asarray(logical, dtype=np.int64)
+        return logical - np.ceil(logical / factor).astype(np.int64)
+
+    def ratio(self, obj_id: str, compression: bool, dedup: bool) -> float:
+        """Return the factor by which a resource's data shrinks with the given settings."""
+        compression_ratio, dedup_ratio = self.ratios[self._rows([obj_id])[0]]
+        return (compression_ratio if compression else 1.0) * (dedup_ratio if compression and dedup else 1.0)
+
+    def record(
+        self,
+        obj_ids: Sequence[str],
+        pool_ids: Sequence[str],
+        logical: Sequence[int],
+        saved: Sequence[int],
+        reduced: Sequence[bool],
+    ) -> None:
+        """Store what resources now allocate and save, adjusting the totals of their pools."""
+        rows = self._rows(obj_ids)
+        self._withdraw(rows)
+        codes = np.fromiter((self._pool_code(str(pool_id)) for pool_id in pool_ids), dtype=np.int64, count=len(rows))
+        reduced = np.asarray(reduced, dtype=bool)
+        self.pool[rows] = codes
+        self.logical[rows] = np.where(reduced, np.asarray(logical, dtype=np.int64), 0)
+        self.saved[rows] = np.where(reduced, np.asarray(saved, dtype=np.int64), 0)
+        np.add.at(self.pool_logical, codes, self.logical[rows])
+        np.add.at(self.pool_saved, codes, self.saved[rows])
+
+    def _withdraw(self, rows: np.ndarray) -> None:
+        """Take what the given rows contribute out of their pools' totals."""
+        counted = rows[self.pool[rows] != NO_POOL]
+        np.subtract.at(self.pool_logical, self.pool[counted], self.logical[counted])
+        np.subtract.at(self.pool_saved, self.pool[counted], self.saved[counted])
+        self.pool[counted] = NO_POOL
+
+    def forget(self, obj_ids: Sequence[str]) -> None:
+        """Drop deleted resources."""
+        rows = [self.rows.pop(obj_id) for obj_id in obj_ids if obj_id in self.rows]
+        if rows:
+            rows = np.asarray(rows, dtype=np.int64)
+            self._withdraw(rows)
+            self.logical[rows] = 0
+            self.saved[rows] = 0
+            self._free.extend(rows.tolist())
+
+    def pool_summary(self, pool_id: str) -> Tuple[int, int, float]:
+        """Return ``(size saved, percent saved, reduction ratio)`` of a pool."""
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            return summary(0, 0)
+        return summary(int(self.pool_logical[code]), int(self.pool_saved[code]))
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self._free.clear()
+        self._next_row = 0
+        self.ratios[:] = 1.0
+        self.pool[:] = NO_POOL
+        self.logical[:] = 0
+        self.saved[:] = 0
+        self.pool_codes.clear()
+        self.pool_logical[:] = 0
+        self.pool_saved[:] = 0
+
+
+data_reduction = DataReductionModel()
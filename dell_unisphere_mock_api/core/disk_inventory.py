@@ -0,0 +1,245 @@
+"""Columnar inventory of physical disks.
+
+The numeric attributes of every disk (size, tier, rpm, pool, disk group and
+health) are held in parallel NumPy columns, one row per disk, so capacity
+rollups by tier, pool and disk group are single vectorized passes instead of
+per-request loops over disk objects. Pool, disk group and health labels are
+stored as small integer codes.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.schemas.disk import DiskTierEnum
+
+TIERS: Tuple[DiskTierEnum, ...] = tuple(DiskTierEnum)
+TIER_CODES: Dict[DiskTierEnum, int] = {tier: code for code, tier in enumerate(TIERS)}
+
+HEALTH_OK = "OK"
+NO_LABEL = -1
+
+
+class _Labels:
+    """Bidirectional mapping between string labels and dense integer codes."""
+
+    def __init__(self, *initial: str) -> None:
+        self.codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+        for label in initial:
+            self.encode(label)
+
+    def encode(self, label: Optional[str]) -> int:
+        """Return the code for ``label``, assigning a new one if needed."""
+        if not label:
+            return NO_LABEL
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def lookup(self, label: Optional[str]) -> int:
+        """Return the code for ``label`` without assigning one."""
+        if not label:
+            return NO_LABEL
+        return self.codes.get(label, NO_LABEL)
+
+    def clear(self, *initial: str) -> None:
+        self.codes.clear()
+        self.labels.clear()
+        for label in initial:
+            self.encode(label)
+
+
+class DiskInventory:
+    """Parallel NumPy columns holding the numeric attributes of every disk."""
+
+    _COLUMNS = {
+        "size": (np.int64, 0),
+        "tier": (np.int8, 0),
+        "rpm": (np.int32, 0),
+        "pool": (np.int32, NO_LABEL),
+        "disk_group": (np.int32, NO_LABEL),
+        "health": (np.int16, 0),
+    }
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.pools = _Labels()
+        self.disk_groups = _Labels()
+        self.health_labels = _Labels(HEALTH_OK)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.full(capacity, fill, dtype=dtype) for name, (dtype, fill) in self._COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, disk_id: object) -> bool:
+        return disk_id in self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the live slice of a column."""
+        return self.columns[name][: len(self.ids)]
+
+    def _grow(self) -> None:
+        for name, (dtype, fill) in self._COLUMNS.items():
+            old = self.columns[name]
+            new = np.full(max(2 * len(old), 64), fill, dtype=dtype)
+            new[: len(old)] = old
+            self.columns[name] = new
+
+    def _write(
+        self,
+        row: int,
+        size: int,
+        tier: DiskTierEnum,
+        rpm: Optional[int],
+        pool_id: Optional[str],
+        disk_group_id: Optional[str],
+        health: Optional[str],
+    ) -> None:
+        columns = self.columns
+        columns["size"][row] = size
+        columns["tier"][row] = TIER_CODES[DiskTierEnum(tier)]
+        columns["rpm"][row] = rpm or 0
+        columns["pool"][row] = self.pools.encode(pool_id)
+        columns["disk_group"][row] = self.disk_groups.encode(disk_group_id)
+        columns["health"][row] = self.health_labels.encode(health or HEALTH_OK)
+
+    def add(
+        self,
+        disk_id: str,
+        size: int,
+        tier: DiskTierEnum,
+        rpm: Optional[int] = None,
+        pool_id: Optional[str] = None,
+        disk_group_id: Optional[str] = None,
+        health: Optional[str] = HEALTH_OK,
+    ) -> None:
+        """Add a disk, or overwrite its row if it is already present."""
+        row = self.rows.get(disk_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.columns["size"]):
+                self._grow()
+            self.ids.append(disk_id)
+            self.rows[disk_id] = row
+        self._write(row, size, tier, rpm, pool_id, disk_group_id, health)
+
+    def remove(self, disk_id: str) -> bool:
+        """Remove a disk in O(1) by moving the last row into its place."""
+        row = self.rows.pop(disk_id, None)
+        if row is None:
+            return False
+        last = len(self.ids) - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.ids[row] = self.ids[last]
+            self.rows[moved] = row
+        self.ids.pop()
+        return True
+
+    def clear(self) -> None:
+        self.ids.clear()
+        self.rows.clear()
+        self.pools.clear()
+        self.disk_groups.clear()
+        self.health_labels.clear(HEALTH_OK)
+
+    def placement(self, disk_id: str) -> Optional[Tuple[str, DiskTierEnum, int]]:
+        """Return ``(pool ID, tier, healthy size)`` of a disk, or None if it is not in a pool."""
+        row = self.rows.get(disk_id)
+        if row is None:
+            return None
+        columns = self.columns
+        pool = int(columns["pool"][row])
+        if pool == NO_LABEL:
+            return None
+        size = int(columns["size"][row]) if columns["health"][row] == 0 else 0
+        return self.pools.labels[pool], TIERS[columns["tier"][row]], size
+
+    def ids_in_pool(self, pool_id: str) -> List[str]:
+        """Return the IDs of all disks assigned to a pool."""
+        return self._ids_where("pool", self.pools.lookup(pool_id))
+
+    def ids_in_disk_group(self, disk_group_id: str) -> List[str]:
+        """Return the IDs of all disks assigned to a disk group."""
+        return self._ids_where("disk_group", self.disk_groups.lookup(disk_group_id))
+
+    def _ids_where(self, name: str, code: int) -> List[str]:
+        if code == NO_LABEL:
+            return []
+        ids = self.ids
+        return [ids[row] for row in np.flatnonzero(self.column(name) == code)]
+
+    def pool_capacity(self, pool_id: str) -> Dict[DiskTierEnum, Tuple[int, int]]:
+        """Return ``{tier: (healthy size, disk count)}`` for the disks of one pool."""
+        return self._tiers_where("pool", self.pools.lookup(pool_id))
+
+    def disk_group_capacity(self, disk_group_id: str) -> Tuple[int, int]:
+        """Return ``(healthy size, disk count)`` for the disks of one disk group."""
+        tiers = self._tiers_where("disk_group", self.disk_groups.lookup(disk_group_id))
+        return sum(size for size, _ in tiers.values()), sum(count for _, count in tiers.values())
+
+    def _tiers_where(self, name: str, code: int) -> Dict[DiskTierEnum, Tuple[int, int]]:
+        if code == NO_LABEL:
+            return {}
+        mask = self.column(name) == code
+        tiers = self.column("tier")[mask]
+        counts = np.bincount(tiers, minlength=len(TIERS))
+        sizes = np.zeros(len(TIERS), dtype=np.int64)
+        np.add.at(sizes, tiers, self._healthy_sizes()[mask])
+        return {TIERS[tier]: (int(sizes[tier]), int(counts[tier])) for tier in np.flatnonzero(counts)}
+
+    def _healthy_sizes(self) -> np.ndarray:
+        """Return disk sizes with unhealthy disks contributing no capacity."""
+        return np.where(self.column("health") == 0, self.column("size"), 0)
+
+    def _rollup(self, name: str, labels: _Labels) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return per-label (tier size matrix, tier disk count matrix, total size) for a label column."""
+        width = len(TIERS)
+        codes = self.column(name)
+        assigned = codes != NO_LABEL
+        keys = codes[assigned].astype(np.int64) * width + self.column("tier")[assigned]
+        length = len(labels.labels) * width
+        counts = np.bincount(keys, minlength=length).reshape(-1, width)
+        sizes = np.zeros(length, dtype=np.int64)
+        np.add.at(sizes, keys, self._healthy_sizes()[assigned])
+        sizes = sizes.reshape(-1, width)
+        return sizes, counts, sizes.sum(axis=1)
+
+    def capacity_by_tier(self) -> Dict[DiskTierEnum, int]:
+        """Return total healthy capacity per tier across all disks."""
+        sizes = np.zeros(len(TIERS), dtype=np.int64)
+        np.add.at(sizes, self.column("tier"), self._healthy_sizes())
+        return {tier: int(size) for tier, size in zip(TIERS, sizes)}
+
+    def capacity_by_pool(self) -> Dict[str, Dict[DiskTierEnum, Tuple[int, int]]]:
+        """Return ``{pool_id: {tier: (healthy size, disk count)}}`` for pools with disks."""
+        return self._by_label("pool", self.pools)
+
+    def capacity_by_disk_group(self) -> Dict[str, Tuple[int, int]]:
+        """Return ``{disk_group_id: (healthy size, disk count)}`` for disk groups with disks."""
+        sizes, counts, totals = self._rollup("disk_group", self.disk_groups)
+        disk_counts = counts.sum(axis=1)
+        return {
+            label: (int(totals[code]), int(disk_counts[code]))
+            for code, label in enumerate(self.disk_groups.labels)
+            if disk_counts[code]
+        }
+
+    def _by_label(self, name: str, labels: _Labels) -> Dict[str, Dict[DiskTierEnum, Tuple[int, int]]]:
+        sizes, counts, _ = self._rollup(name, labels)
+        result = {}
+        for code, label in enumerate(labels.labels):
+            tiers = {
+                TIERS[tier]: (int(sizes[code, tier]), int(counts[code, tier]))
+                for tier in np.flatnonzero(counts[code])
+            }
+            if tiers:
+                result[label] = tiers
+        return result
@@ -0,0 +1,102 @@
+"""Capacity forecasts fitted to the used space history of pools.
+
+A pool's forecast is a least-squares line through its used space samples and
+its current used space, projected forward to the pool's total size. The slopes
+of all pools that need one are fitted together, as column sums over the
+history's sample-by-pool matrix, with pools that did not exist yet at a sample
+masked out.
+
+Fits are cached per pool and keyed by the pool's counter version and the
+number of history samples written, so a forecast is only refitted after its
+pool changed or a new sample was taken, and asking for the forecast of every
+pool on every dashboard load is a dictionary lookup per pool.
+"""
+
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, capacity_ledger
+
+DAY = 86400.0
+
+
+class CapacityForecast(NamedTuple):
+    """Projected growth of one pool."""
+
+    pool_id: str
+    size_total: int
+    size_used: int
+    # Bytes per day; negative if the pool is shrinking
+    growth_per_day: float
+    # None if the pool is not growing
+    days_to_full: Optional[float]
+    full_time: Optional[float]
+    samples: int
+
+
+class CapacityForecaster:
+    """Fits and caches the capacity forecasts of the pools in a ledger."""
+
+    def __init__(self, ledger: Optional[CapacityLedger] = None) -> None:
+        self.ledger = ledger or capacity_ledger
+        # pool ID -> ((counter version, history samples written), forecast)
+        self._cache: Dict[str, Tuple[Tuple[int, int], CapacityForecast]] = {}
+        self.fits = 0
+
+    def forecast(self, pool_ids: Optional[Sequence[str]] = None, now: Optional[float] = None) -> List[CapacityForecast]:
+        """Return the forecasts of the given pools (default: all), skipping pools the ledger does not track."""
+        pools = self.ledger.pools
+        pool_ids = list(pools) if pool_ids is None else [pool_id for pool_id in pool_ids if pool_id in pools]
+        written = self.ledger.history.written
+        cache = self._cache
+        stale = []
+        for pool_id in pool_ids:
+            cached = cache.get(pool_id)
+            if cached is None or cached[0] != (pools[pool_id].version, written):
+                stale.append(pool_id)
+        if stale:
+            self._fit(stale, time.time() if now is None else now)
+        if len(cache) > 2 * len(pools):
+            for pool_id in [pool_id for pool_id in cache if pool_id not in pools]:
+                del cache[pool_id]
+        return [cache[pool_id][1] for pool_id in pool_ids]
+
+    def _fit(self, pool_ids: List[str], now: float) -> None:
+        """Fit the growth of the given pools in one pass and cache their forecasts."""
+        ledger = self.ledger
+        usages = [ledger.pools[pool_id] for pool_id in pool_ids]
+        times, used = ledger.history.series(pool_ids)
+        # The current usage is the newest point of every series
+        times = np.append(times, now) - now
+        used = np.vstack([used, np.array([usage.used for usage in usages], dtype=np.float64)])
+
+        mask = ~np.isnan(used)
+        counts = mask.sum(axis=0)
+        t = np.where(mask, times[:, None], 0.0)
+        u = np.where(mask, used, 0.0)
+        t_mean = t.sum(axis=0) / counts
+        u_mean = u.sum(axis=0) / counts
+        dt = np.where(mask, t - t_mean, 0.0)
+        variance = (dt * dt).sum(axis=0)
+        covariance = (dt * (u - u_mean)).sum(axis=0)
+        slope = np.divide(covariance, variance, out=np.zeros_like(covariance), where=variance > 0)
+        growth = slope * DAY
+
+        key_written = ledger.history.written
+        for pool_id, usage, per_day, samples in zip(pool_ids, usages, growth.tolist(), counts.tolist()):
+            days_to_full = usage.free / per_day if per_day > 0 else None
+            full_time = now + days_to_full * DAY if days_to_full is not None else None
+            forecast = CapacityForecast(
+                pool_id, usage.size_total, usage.used, per_day, days_to_full, full_time, samples
+            )
+            self._cache[pool_id] = ((usage.version, key_written), forecast)
+        self.fits += 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.fits = 0
+
+
+capacity_forecaster = CapacityForecaster()
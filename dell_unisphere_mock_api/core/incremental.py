@@ -0,0 +1,32 @@
+"""Incremental sync support for collection endpoints.
+
+Collection endpoints that accept ``changeSeq`` or ``modifiedSince`` return only
+the objects created or modified after that point, with the IDs of objects
+deleted since then and the current change sequence number in the response
+metadata. Full listings report the current change sequence number too, so a
+client can start syncing incrementally from any listing.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from dell_unisphere_mock_api.core.changes import ChangeHistoryExpired, ChangeSet, change_feed
+
+
+def changes_since(obj_type: str, change_seq: Optional[int], modified_since: Optional[datetime]) -> Optional[ChangeSet]:
+    """Return the changes to ``obj_type`` a client asked for, or None for a full listing."""
+    if change_seq is None and modified_since is None:
+        return None
+    try:
+        return change_feed.changes_since(obj_type, change_seq, modified_since)
+    except ChangeHistoryExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+
+def change_metadata(changes: Optional[ChangeSet]) -> Dict[str, Any]:
+    """Return response metadata for a full (``changes`` is None) or incremental listing."""
+    if changes is None:
+        return {"changeSeq": change_feed.last_seq}
+    return {"changeSeq": changes.changeSeq, "deleted": changes.deleted}
@@ -0,0 +1,375 @@
+"""In-process asynchronous job engine.
+
+Submitted jobs wait in a priority queue (higher priority first, FIFO within a
+priority) and are executed by a fixed pool of asyncio workers. Tasks that the
+engine's dispatcher knows are executed in process against the controllers and
+stores that serve the REST API; other tasks are only simulated. A simulated
+task takes an amount of time drawn from the duration distribution of its
+``object.action`` profile, and may fail according to the profile's failure
+rate. Every task advances the job's ``progressPct`` as it goes. Running and
+queued jobs can be cancelled, and the engine keeps metrics on queue depth,
+wait time and run time.
+
+Task parameters may refer to the output of another task of the same job with
+``"@<task name>.<path>"`` strings, e.g. ``"@CreatePool.id"``. A task starts
+once every task it refers to has finished; tasks without pending references
+run concurrently, at most ``JOB_TASK_CONCURRENCY`` at a time per job.
+
+Workers are started on demand, up to the configured pool size, and exit when
+the queue is empty, so an idle engine holds no tasks. They are bound to the
+event loop they were started on; if the engine is used from a different loop
+(a new test client or server process), jobs that were still running on the old
+loop are re-queued and run on the new one.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Protocol, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.schemas.job import Job, JobState, JobTask
+
+logger = logging.getLogger(__name__)
+
+# Number of progress updates issued while a single task is running
+PROGRESS_STEPS = 4
+# Number of recent wait/run times kept for percentile metrics
+METRICS_WINDOW = 1024
+
+REFERENCE = re.compile(r"^@([^.]+)\.(.+)$")
+
+
+class JobTaskError(Exception):
+    """Raised when a job task fails."""
+
+
+class TaskDispatcher(Protocol):
+    """Executes job tasks in process."""
+
+    def handles(self, task: JobTask) -> bool:
+        """Return True if ``task`` can be executed rather than only simulated."""
+
+    async def run(self, task: JobTask, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute ``task`` with resolved parameters and return the resulting object."""
+
+
+def task_references(value: Any) -> Set[str]:
+    """Return the names of the tasks referred to anywhere in ``value``."""
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        return {match.group(1)} if match else set()
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return set()
+    names: Set[str] = set()
+    for item in value:
+        names |= task_references(item)
+    return names
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace ``"@<task name>.<path>"`` strings in ``value`` with task output."""
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        if not match:
+            return value
+        name, path = match.groups()
+        resolved = results[name]
+        for key in path.split("."):
+            if isinstance(resolved, dict) and key in resolved:
+                resolved = resolved[key]
+            elif isinstance(resolved, list) and key.isdigit() and int(key) < len(resolved):
+                resolved = resolved[int(key)]
+            else:
+                raise JobTaskError(f"Reference {value} does not match the output of task {name}")
+        return resolved
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    return value
+
+
+class TaskProfile(BaseModel):
+    """Simulated duration distribution and failure rate for one kind of job task."""
+
+    distribution: str = Field("uniform", pattern="^(fixed|uniform|exponential|lognormal)$")
+    mean_ms: float = Field(20.0, ge=0)
+    spread: float = Field(0.5, ge=0, description="Relative +/- range for uniform, sigma for lognormal")
+    failure_rate: float = Field(0.0, ge=0, le=1)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one task duration, in seconds."""
+        mean = self.mean_ms / 1000.0
+        if mean == 0 or self.distribution == "fixed":
+            return mean
+        if self.distribution == "uniform":
+            return rng.uniform(mean * max(1 - self.spread, 0), mean * (1 + self.spread))
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / mean)
+        # Lognormal with the requested mean
+        sigma = self.spread
+        return rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+
+
+class JobEngine:
+    """Priority queue of jobs executed by a pool of asyncio workers."""
+
+    def __init__(
+        self,
+        store: Any,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        dispatcher: Optional[TaskDispatcher] = None,
+    ) -> None:
+        """Create an engine that runs the jobs of ``store`` (a JobModel)."""
+        self.store = store
+        self.workers = workers or settings.JOB_WORKERS
+        self.task_concurrency = settings.JOB_TASK_CONCURRENCY
+        self.default_profile = TaskProfile(
+            mean_ms=settings.JOB_TASK_DURATION_MS, failure_rate=settings.JOB_FAILURE_RATE
+        )
+        self.profiles: Dict[Tuple[str, str], TaskProfile] = {}
+        self.dispatcher = dispatcher
+        self.rng = random.Random(seed)
+
+        self._heap: List[Tuple[int, int, str]] = []
+        self._pending: Dict[str, Tuple[int, int, str]] = {}
+        self._enqueued_at: Dict[str, float] = {}
+        self._running: Dict[str, "asyncio.Task[None]"] = {}
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_tasks: Set["asyncio.Task[None]"] = set()
+
+        self.counters: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+        }
+        self.max_queue_depth = 0
+        self._wait_times: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._run_times: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    # Configuration
+
+    def set_profile(self, obj: str, action: str, profile: TaskProfile) -> None:
+        """Set the simulated duration and failure rate for ``obj.action`` tasks."""
+        self.profiles[(obj, action)] = profile
+
+    def profile_for(self, task: JobTask, dispatched: bool = False) -> Optional[TaskProfile]:
+        """Return the profile of a task; executed tasks are only delayed by an explicit profile."""
+        profile = self.profiles.get((task.object, task.action))
+        if profile is None and not dispatched:
+            return self.default_profile
+        return profile
+
+    # Queue management
+
+    def ensure_started(self) -> None:
+        """Start enough workers on the running event loop for the queued jobs."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # The previous loop is gone; its running jobs never finished
+                for job_id in list(self._running):
+                    self._running.pop(job_id)
+                    self._push(job_id, 0)
+            self._loop = loop
+            self._worker_tasks = set()
+        while len(self._worker_tasks) < min(self.workers, len(self._running) + len(self._pending)):
+            worker = loop.create_task(self._worker())
+            self._worker_tasks.add(worker)
+            worker.add_done_callback(self._worker_tasks.discard)
+
+    def _push(self, job_id: str, priority: int) -> None:
+        entry = (-priority, next(self._sequence), job_id)
+        heapq.heappush(self._heap, entry)
+        self._pending[job_id] = entry
+        self._enqueued_at.setdefault(job_id, time.monotonic())
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+
+    def submit(self, job_id: str, priority: int = 0) -> None:
+        """Queue a job for execution."""
+        self._push(job_id, priority)
+        self.counters["submitted"] += 1
+        self.ensure_started()
+
+    def _next_job(self) -> Optional[str]:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            job_id = entry[2]
+            # Skip stale entries of jobs cancelled, deleted or re-queued while waiting
+            if self._pending.get(job_id) is entry:
+                del self._pending[job_id]
+                return job_id
+        return None
+
+    async def _worker(self) -> None:
+        while (job_id := self._next_job()) is not None:
+            wait = time.monotonic() - self._enqueued_at.pop(job_id, time.monotonic())
+            self._wait_times.append(wait)
+            task = asyncio.get_running_loop().create_task(self._execute(job_id))
+            self._running[job_id] = task
+            started = time.monotonic()
+            try:
+                await asyncio.wait({task})
+            finally:
+                if self._running.get(job_id) is task:
+                    del self._running[job_id]
+            self._run_times.append(time.monotonic() - started)
+
+    async def _execute(self, job_id: str) -> None:
+        job = await self.store.get_job(job_id)
+        # RUNNING jobs here were re-queued after their event loop went away
+        if job is None or job.state not in (JobState.PENDING, JobState.RUNNING):
+            return
+        await self.store.update_job_state(job_id, JobState.RUNNING)
+        try:
+            await self._run_tasks(job)
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            await self.store.update_job_state(job_id, JobState.CANCELLED)
+            raise
+        except Exception as exc:
+            logger.debug(f"Job {job_id} failed: {exc}")
+            self.counters["failed"] += 1
+            await self.store.update_job_state(job_id, JobState.FAILED, error_message=str(exc))
+            return
+        self.counters["completed"] += 1
+        await self.store.update_job_state(job_id, JobState.COMPLETED)
+
+    async def _run_tasks(self, job: Job) -> None:
+        """Run the tasks of a job in reference order, up to ``task_concurrency`` at a time."""
+        tasks = job.tasks
+        index = {task.name: position for position, task in enumerate(tasks)}
+        waiting_on: List[Set[int]] = []
+        dependents: List[List[int]] = [[] for _ in tasks]
+        for position, task in enumerate(tasks):
+            names = task_references(task.parametersIn)
+            unknown = names - index.keys()
+            if unknown:
+                raise JobTaskError(f"Task {task.name} refers to unknown task {sorted(unknown)[0]}")
+            waiting_on.append({index[name] for name in names})
+            for dependency in waiting_on[-1]:
+                dependents[dependency].append(position)
+
+        total = len(tasks)
+        progress = [0.0]
+        results: Dict[str, Any] = {}
+        ready = deque(position for position, waits in enumerate(waiting_on) if not waits)
+        running: Dict["asyncio.Task[Any]", int] = {}
+        finished = 0
+        loop = asyncio.get_running_loop()
+        try:
+            while ready or running:
+                while ready and len(running) < self.task_concurrency:
+                    position = ready.popleft()
+                    running[loop.create_task(self._run_task(job, tasks[position], results, progress))] = position
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for child in done:
+                    position = running.pop(child)
+                    results[tasks[position].name] = child.result()
+                    finished += 1
+                    for dependent in dependents[position]:
+                        waiting_on[dependent].discard(position)
+                        if not waiting_on[dependent]:
+                            ready.append(dependent)
+        finally:
+            for child in running:
+                child.cancel()
+            if running:
+                await asyncio.wait(running)
+        if finished < total:
+            raise JobTaskError("Circular references between the tasks of the job")
+
+    async def _run_task(self, job: Job, task: JobTask, results: Dict[str, Any], progress: List[float]) -> Any:
+        total = len(job.tasks)
+        dispatched = self.dispatcher is not None and self.dispatcher.handles(task)
+        profile = self.profile_for(task, dispatched)
+        done = 0.0
+        if profile is not None:
+            duration = profile.sample(self.rng)
+            if duration > 0:
+                step = duration / PROGRESS_STEPS
+                for _ in range(PROGRESS_STEPS):
+                    await asyncio.sleep(step)
+                    done += 1 / PROGRESS_STEPS
+                    progress[0] += 1 / PROGRESS_STEPS
+                    await self.store.set_progress(job.id, 100.0 * min(progress[0], total) / total)
+            if profile.failure_rate and self.rng.random() < profile.failure_rate:
+                raise JobTaskError(f"Task {task.name} failed: injected failure for {task.object}.{task.action}")
+        result: Any = None
+        if dispatched:
+            result = await self.dispatcher.run(task, resolve_references(task.parametersIn, results))
+            if isinstance(result, dict) and "id" in result:
+                task.parametersOut = {"id": result["id"]}
+        progress[0] += 1 - done
+        await self.store.set_progress(job.id, 100.0 * min(progress[0], total) / total)
+        return result
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it is neither."""
+        if self._pending.pop(job_id, None) is not None:
+            self._enqueued_at.pop(job_id, None)
+            self.counters["cancelled"] += 1
+            await self.store.update_job_state(job_id, JobState.CANCELLED)
+            return True
+        task = self._running.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        await asyncio.wait({task})
+        return True
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job that is being deleted, cancelling it if it is still active."""
+        self._pending.pop(job_id, None)
+        self._enqueued_at.pop(job_id, None)
+        task = self._running.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+
+    def reset(self) -> None:
+        """Drop all queued jobs and cancel running ones."""
+        for job_id in list(self._pending) + list(self._running):
+            self.discard(job_id)
+        self._heap.clear()
+
+    # Metrics
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"count": 0, "meanMs": 0.0, "p50Ms": 0.0, "p95Ms": 0.0, "maxMs": 0.0}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            "count": len(ordered),
+            "meanMs": 1000 * sum(ordered) / len(ordered),
+            "p50Ms": 1000 * ordered[last // 2],
+            "p95Ms": 1000 * ordered[math.ceil(0.95 * last)],
+            "maxMs": 1000 * ordered[last],
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth, throughput counters and wait/run time statistics."""
+        return {
+            "workers": self.workers,
+            "queueDepth": len(self._pending),
+            "maxQueueDepth": self.max_queue_depth,
+            "running": len(self._running),
+            **self.counters,
+            "waitTime": self._summary(self._wait_times),
+            "runTime": self._summary(self._run_times),
+        }
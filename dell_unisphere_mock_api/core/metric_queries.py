@@ -0,0 +1,234 @@
+"""Real-time metric queries served by one shared sampling scheduler.
+
+A client creates a query for some metric paths and a sampling interval, then
+polls its results. Due times are aligned to multiples of the interval, so all
+queries with the same interval come due at the same tick however many there
+are. At each tick the scheduler takes every due query, samples each object
+type they ask about once, for all of its objects in one vectorized step, and
+builds the values of each distinct path once. Subscribers share those values;
+the work per subscriber is appending a reference per path to its results.
+
+A query that is not polled for ``METRICS_QUERY_IDLE_TIMEOUT_S`` expires. It is
+dropped when it next comes due, so idle queries cost nothing to expire, and the
+scheduler's task exits once no queries are left.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.metrics import MetricBlock, MetricDefinition, MetricStore, metric_store, resolve_path
+
+# (sample time, metric path, value per object ID); the values are shared by all queries for the path
+QueryResult = Tuple[float, str, Dict[str, float]]
+
+# Typical magnitude of a metric by unit, used to seed simulated values
+_UNIT_SCALE = {"IO/s": 1000.0, "Bytes/s": 8.0e6, "microseconds": 2000.0, "": 4.0, "%": 50.0}
+
+
+class MetricSampler(Protocol):
+    """Produces metric samples."""
+
+    def sample(self, block: MetricBlock, timestamp: float) -> None:
+        """Record one sample of every metric of ``block`` for all of its objects."""
+
+
+class RandomWalkSampler:
+    """Simulates metrics as a multiplicative random walk from each object's previous sample."""
+
+    def __init__(self, seed: Optional[int] = None, volatility: float = 0.1) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.volatility = volatility
+
+    def sample(self, block: MetricBlock, timestamp: float) -> None:
+        _, _, previous = block.latest()
+        _, rows = block.tracked_rows()
+        scales = np.array([_UNIT_SCALE.get(metric.unit, 1.0) for metric in block.metrics], dtype=np.float32)
+        # Objects without a previous sample start at a random level
+        start = self.rng.random(previous.shape, dtype=np.float32) * scales
+        previous = np.where(np.isnan(previous), start, previous)
+        values = previous * np.exp(self.rng.normal(0.0, self.volatility, previous.shape)).astype(np.float32)
+        percent = np.array([metric.unit == "%" for metric in block.metrics])
+        values[:, percent] = np.minimum(values[:, percent], 100.0)
+        block.record(timestamp, rows, values)
+
+
+class RealTimeQuery:
+    """A real-time metric query and its recent results."""
+
+    __slots__ = ("id", "paths", "targets", "interval", "expiration", "next_due", "results")
+
+    def __init__(self, query_id: int, paths: Sequence[str], interval: int, expiration: float, next_due: float) -> None:
+        self.id = query_id
+        self.paths = list(paths)
+        # (path, metric, object ID or None) of each path
+        self.targets: List[Tuple[str, MetricDefinition, Optional[str]]] = [
+            (path,) + resolve_path(path) for path in self.paths
+        ]
+        self.interval = interval
+        self.expiration = expiration
+        self.next_due = next_due
+        self.results: Deque[QueryResult] = deque(maxlen=settings.METRICS_QUERY_RESULTS * len(self.paths))
+
+
+class MetricQueryScheduler:
+    """Samples the metrics of all active real-time queries on a shared schedule."""
+
+    def __init__(
+        self,
+        store: Optional[MetricStore] = None,
+        sampler: Optional[MetricSampler] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        self.store = store or metric_store
+        self.sampler = sampler or RandomWalkSampler()
+        self.idle_timeout = idle_timeout or settings.METRICS_QUERY_IDLE_TIMEOUT_S
+        self.queries: Dict[int, RealTimeQuery] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.counters: Dict[str, int] = {"ticks": 0, "sampledTypes": 0, "sampledPaths": 0, "expired": 0}
+
+    def create(self, paths: Sequence[str], interval: int, now: Optional[float] = None) -> RealTimeQuery:
+        """Start sampling ``paths`` every ``interval`` seconds.
+
+        Raises:
+            KeyError: If a path matches no metric
+        """
+        now = time.time() if now is None else now
+        next_due = math.floor(now / interval) * interval + interval
+        query = RealTimeQuery(next(self._ids), paths, interval, now + self.idle_timeout, next_due)
+        self.queries[query.id] = query
+        heapq.heappush(self._heap, (next_due, query.id))
+        self._ensure_started()
+        return query
+
+    def get(self, query_id: int, now: Optional[float] = None) -> Optional[RealTimeQuery]:
+        """Return a query unless it does not exist or has expired."""
+        query = self.queries.get(query_id)
+        if query is None:
+            return None
+        if query.expiration <= (time.time() if now is None else now):
+            self._expire(query)
+            return None
+        return query
+
+    def active(self, now: Optional[float] = None) -> List[RealTimeQuery]:
+        """Return the queries that have not expired."""
+        now = time.time() if now is None else now
+        return [query for query in list(self.queries.values()) if self.get(query.id, now) is not None]
+
+    def delete(self, query_id: int) -> bool:
+        # The query's heap entry is skipped when it comes due
+        return self.queries.pop(query_id, None) is not None
+
+    def results(self, query_id: int, now: Optional[float] = None) -> Optional[List[QueryResult]]:
+        """Return the recent results of a query, oldest first, and keep it from expiring."""
+        now = time.time() if now is None else now
+        query = self.get(query_id, now)
+        if query is None:
+            return None
+        query.expiration = now + self.idle_timeout
+        return list(query.results)
+
+    def _expire(self, query: RealTimeQuery) -> None:
+        del self.queries[query.id]
+        self.counters["expired"] += 1
+
+    def _due(self, now: float) -> List[RealTimeQuery]:
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due_at, query_id = heapq.heappop(heap)
+            query = self.queries.get(query_id)
+            # Skip entries of deleted queries
+            if query is None or query.next_due != due_at:
+                continue
+            if query.expiration <= now:
+                self._expire(query)
+                continue
+            due.append(query)
+        return due
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Sample the metrics of every query due at ``now``. Returns the number of distinct paths sampled."""
+        now = time.time() if now is None else now
+        due = self._due(now)
+        if not due:
+            return 0
+        self.counters["ticks"] += 1
+
+        targets = {target[0]: target for query in due for target in query.targets}
+        latest = {}
+        for object_type in {metric.object_type for _, metric, _ in targets.values()}:
+            block = self.store.block(object_type)
+            self.sampler.sample(block, now)
+            latest[object_type] = block.latest()
+        self.counters["sampledTypes"] += len(latest)
+
+        values: Dict[str, Dict[str, float]] = {}
+        for path, metric, obj_id in targets.values():
+            block = self.store.block(metric.object_type)
+            _, ids, samples = latest[metric.object_type]
+            column = samples[:, block.metric_index[metric.name]].tolist()
+            values[path] = {
+                id_: value
+                for id_, value in zip(ids, column)
+                if not math.isnan(value) and (obj_id is None or id_ == obj_id)
+            }
+        self.counters["sampledPaths"] += len(values)
+
+        for query in due:
+            for path in query.paths:
+                query.results.append((now, path, values[path]))
+            query.next_due += query.interval
+            if query.next_due <= now:
+                query.next_due = math.floor(now / query.interval) * query.interval + query.interval
+            heapq.heappush(self._heap, (query.next_due, query.id))
+        return len(values)
+
+    # Background sampling
+
+    def _ensure_started(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Without an event loop, sampling only happens through tick()
+            return
+        if self._runner is None or self._runner.done() or self._loop is not loop:
+            self._loop = loop
+            self._runner = loop.create_task(self._run())
+        elif self._wakeup is not None:
+            # Re-plan the sleep, a new query may be due earlier
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self.queries:
+            self._wakeup = asyncio.Event()
+            delay = self._heap[0][0] - time.time() if self._heap else self.idle_timeout
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+            self.tick()
+        self._wakeup = None
+
+    def clear(self) -> None:
+        self.queries.clear()
+        self._heap.clear()
+        if self._runner is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._runner.cancel)
+        self._runner = None
+        self._wakeup = None
+
+
+metric_query_scheduler = MetricQueryScheduler()
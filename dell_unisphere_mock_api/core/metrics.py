@@ -0,0 +1,407 @@
+"""Performance metric samples kept in preallocated NumPy ring buffers.
+
+Each object type (LUN, pool, filesystem, storage processor) has a fixed set of
+metrics and one block of arrays shaped ``(slots, objects, metrics)``. A sample
+is one contiguous slot written for all objects of a type at once, and every
+resolution has a single time ring shared by all of its series, so recording
+costs a few vectorized array writes whatever the number of objects.
+
+Besides the raw samples, each block keeps 5 minute and 1 hour rollups. The
+samples of the current bucket are summed into an accumulator as they arrive;
+when a sample falls into a new bucket, the accumulator's means are written to
+the rollup ring in one pass and the accumulator is reset.
+
+Memory is bounded: a block grows by doubling up to ``METRICS_MAX_OBJECTS`` rows
+and each row holds ``4 * (raw + 5 min + 1 h slots) + 24`` bytes per metric.
+With the default 30 + 24 + 24 slots that is 336 bytes per series, about 670 MB
+for 100,000 objects with 20 metrics each. Rows of deleted objects are reused.
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RAW = 0
+FIVE_MINUTES = 300
+ONE_HOUR = 3600
+ROLLUP_INTERVALS = (FIVE_MINUTES, ONE_HOUR)
+
+# IDs of the storage processors, which always have metrics
+STORAGE_PROCESSORS = ("spa", "spb")
+
+
+class MetricDefinition(NamedTuple):
+    """A metric in the catalogue."""
+
+    id: int
+    object_type: str
+    name: str
+    path: str
+    unit: str
+    description: str
+
+
+class MetricStoreFull(Exception):
+    """Raised when an object type already has samples for the maximum number of objects."""
+
+
+# (object type, path prefix, [(metric name, unit, description)])
+_CATALOGUE = (
+    (
+        "lun",
+        "sp.*.storage.lun.*",
+        [
+            ("readsRate", "IO/s", "Read requests per second"),
+            ("writesRate", "IO/s", "Write requests per second"),
+            ("readBytesRate", "Bytes/s", "Bytes read per second"),
+            ("writeBytesRate", "Bytes/s", "Bytes written per second"),
+            ("responseTime", "microseconds", "Average response time"),
+            ("queueLength", "", "Average number of outstanding requests"),
+        ],
+    ),
+    (
+        "pool",
+        "sp.*.storage.pool.*",
+        [
+            ("readsRate", "IO/s", "Read requests per second"),
+            ("writesRate", "IO/s", "Write requests per second"),
+            ("readBytesRate", "Bytes/s", "Bytes read per second"),
+            ("writeBytesRate", "Bytes/s", "Bytes written per second"),
+            ("responseTime", "microseconds", "Average response time"),
+        ],
+    ),
+    (
+        "filesystem",
+        "sp.*.storage.filesystem.*",
+        [
+            ("readsRate", "IO/s", "Read requests per second"),
+            ("writesRate", "IO/s", "Write requests per second"),
+            ("readBytesRate", "Bytes/s", "Bytes read per second"),
+            ("writeBytesRate", "Bytes/s", "Bytes written per second"),
+            ("responseTime", "microseconds", "Average response time"),
+        ],
+    ),
+    (
+        "sp",
+        "sp.*",
+        [
+            ("cpu.summary.utilization", "%", "Storage processor CPU utilization"),
+            ("storage.summary.readsRate", "IO/s", "Read requests per second"),
+            ("storage.summary.writesRate", "IO/s", "Write requests per second"),
+            ("storage.summary.readBytesRate", "Bytes/s", "Bytes read per second"),
+            ("storage.summary.writeBytesRate", "Bytes/s", "Bytes written per second"),
+        ],
+    ),
+)
+
+METRICS: Tuple[MetricDefinition, ...] = tuple(
+    MetricDefinition(metric_id, object_type, name, f"{prefix}.{name}", unit, description)
+    for metric_id, (object_type, prefix, (name, unit, description)) in enumerate(
+        ((object_type, prefix, metric) for object_type, prefix, metrics in _CATALOGUE for metric in metrics), start=1
+    )
+)
+METRICS_BY_PATH: Dict[str, MetricDefinition] = {metric.path: metric for metric in METRICS}
+
+
+def resolve_path(path: str) -> Tuple[MetricDefinition, Optional[str]]:
+    """Return the metric a query path refers to and the object ID it names, if any.
+
+    The object segment of a catalogue path (its last ``*``) may be replaced by an
+    object ID to ask for that object only.
+
+    Raises:
+        KeyError: If the path matches no metric
+    """
+    metric = METRICS_BY_PATH.get(path)
+    if metric is not None:
+        return metric, None
+    segments = path.split(".")
+    for metric in METRICS:
+        template = metric.path.split(".")
+        if len(template) != len(segments):
+            continue
+        object_index = len(template) - 1 - template[::-1].index("*")
+        if all(s == t or t == "*" for i, (s, t) in enumerate(zip(segments, template)) if i != object_index):
+            return metric, segments[object_index]
+    raise KeyError(path)
+
+
+class _Ring:
+    """Values of every series of a block at one resolution, with their shared time ring."""
+
+    def __init__(self, rows: int, metrics: int, slots: int) -> None:
+        self.values = np.full((slots, rows, metrics), np.nan, dtype=np.float32)
+        self.times = np.full(slots, np.nan, dtype=np.float64)
+        self.written = 0
+
+    @property
+    def slots(self) -> int:
+        return len(self.times)
+
+    def next_slot(self, timestamp: float) -> int:
+        """Claim the slot for a new sample, clearing what it held."""
+        slot = self.written % self.slots
+        self.written += 1
+        self.times[slot] = timestamp
+        self.values[slot] = np.nan
+        return slot
+
+    def grow(self, rows: int) -> None:
+        slots, old_rows, metrics = self.values.shape
+        values = np.full((slots, rows, metrics), np.nan, dtype=np.float32)
+        values[:, :old_rows] = self.values
+        self.values = values
+
+    def select(self, start: float, end: float) -> np.ndarray:
+        """Return the slots holding samples taken in ``[start, end]``, oldest first."""
+        times = self.times
+        slots = np.flatnonzero((times >= start) & (times <= end))
+        return slots[np.argsort(times[slots], kind="stable")]
+
+
+class _Rollup(_Ring):
+    """A ring of bucket means, fed by an accumulator for the bucket in progress."""
+
+    def __init__(self, rows: int, metrics: int, slots: int, interval: int) -> None:
+        super().__init__(rows, metrics, slots)
+        self.interval = interval
+        self.bucket: Optional[float] = None
+        self.sums = np.zeros((rows, metrics), dtype=np.float64)
+        self.counts = np.zeros((rows, metrics), dtype=np.uint32)
+
+    def grow(self, rows: int) -> None:
+        super().grow(rows)
+        sums = np.zeros((rows, self.sums.shape[1]), dtype=np.float64)
+        counts = np.zeros((rows, self.counts.shape[1]), dtype=np.uint32)
+        sums[: len(self.sums)] = self.sums
+        counts[: len(self.counts)] = self.counts
+        self.sums, self.counts = sums, counts
+
+    def add(self, timestamp: float, rows: Union[np.ndarray, slice], values: np.ndarray) -> None:
+        bucket = timestamp - timestamp % self.interval
+        if self.bucket is not None and bucket != self.bucket:
+            self.flush()
+        self.bucket = bucket
+        present = ~np.isnan(values)
+        self.sums[rows] += np.where(present, values, 0.0)
+        self.counts[rows] += present
+
+    def flush(self) -> None:
+        """Write the means of the bucket in progress to the ring."""
+        if self.bucket is None:
+            return
+        slot = self.next_slot(self.bucket)
+        counts = self.counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.values[slot] = np.where(counts > 0, self.sums / counts, np.nan)
+        self.sums[:] = 0.0
+        counts[:] = 0
+        self.bucket = None
+
+    def clear_rows(self, rows: List[int]) -> None:
+        self.sums[rows] = 0.0
+        self.counts[rows] = 0
+
+
+class MetricBlock:
+    """Samples of every metric of one object type."""
+
+    def __init__(
+        self,
+        object_type: str,
+        metrics: Sequence[MetricDefinition],
+        raw_slots: int,
+        rollup_slots: int,
+        max_objects: int,
+        rows: int = 64,
+    ) -> None:
+        self.object_type = object_type
+        self.metrics = tuple(metrics)
+        self.metric_index = {metric.name: index for index, metric in enumerate(self.metrics)}
+        self.max_objects = max_objects
+        rows = min(rows, max_objects)
+        self.rows: Dict[str, int] = {}
+        self.ids: List[Optional[str]] = [None] * rows
+        self._free: List[int] = []
+        self._used = 0
+        self.raw = _Ring(rows, len(self.metrics), raw_slots)
+        self.rollups = {
+            interval: _Rollup(rows, len(self.metrics), rollup_slots, interval) for interval in ROLLUP_INTERVALS
+        }
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sample arrays of this block."""
+        total = self.raw.values.nbytes + self.raw.times.nbytes
+        for rollup in self.rollups.values():
+            total += rollup.values.nbytes + rollup.times.nbytes + rollup.sums.nbytes + rollup.counts.nbytes
+        return total
+
+    def _grow(self) -> None:
+        rows = min(2 * self.capacity, self.max_objects)
+        if rows <= self.capacity:
+            raise MetricStoreFull(f"Metrics are already kept for {self.max_objects} objects of type {self.object_type}")
+        self.raw.grow(rows)
+        for rollup in self.rollups.values():
+            rollup.grow(rows)
+        self.ids.extend([None] * (rows - self.capacity))
+
+    def rows_for(self, obj_ids: Sequence[str]) -> np.ndarray:
+        """Return the rows of the given objects, assigning rows to new ones.
+
+        Callers that record for the same objects repeatedly can keep the result.
+        """
+        rows = np.empty(len(obj_ids), dtype=np.int64)
+        known = self.rows
+        for i, obj_id in enumerate(obj_ids):
+            row = known.get(obj_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    if self._used == self.capacity:
+                        self._grow()
+                    row = self._used
+                    self._used += 1
+                known[obj_id] = row
+                self.ids[row] = obj_id
+            rows[i] = row
+        return rows
+
+    def forget(self, obj_ids: Sequence[str]) -> None:
+        """Drop the samples of deleted objects and make their rows reusable."""
+        rows = [self.rows.pop(obj_id) for obj_id in obj_ids if obj_id in self.rows]
+        if not rows:
+            return
+        self.raw.values[:, rows] = np.nan
+        for rollup in self.rollups.values():
+            rollup.values[:, rows] = np.nan
+            rollup.clear_rows(rows)
+        for row in rows:
+            self.ids[row] = None
+        self._free.extend(rows)
+
+    def record(self, timestamp: float, rows: Optional[np.ndarray], values: np.ndarray) -> None:
+        """Record one sample of every metric for the objects in ``rows``.
+
+        Args:
+            rows: Rows from ``rows_for``, or None to write every row of the block
+            values: Array shaped ``(len(rows), metrics)``, or ``(capacity, metrics)`` without rows;
+                NaN marks a missing value
+        """
+        values = np.asarray(values, dtype=np.float32)
+        # Writing whole rows avoids the gathers of fancy indexing
+        index = slice(None) if rows is None else rows
+        slot = self.raw.next_slot(timestamp)
+        self.raw.values[slot, index] = values
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, index, values)
+
+    def tracked_rows(self) -> Tuple[List[str], np.ndarray]:
+        """Return the IDs and rows of all objects metrics are kept for, in row order."""
+        rows = np.fromiter(sorted(self.rows.values()), dtype=np.int64, count=len(self.rows))
+        return [self.ids[row] for row in rows.tolist()], rows
+
+    def latest(self) -> Tuple[Optional[float], List[str], np.ndarray]:
+        """Return ``(timestamp, object IDs, values shaped (objects, metrics))`` of the newest raw sample."""
+        ids, rows = self.tracked_rows()
+        if not self.raw.written:
+            return None, ids, np.full((len(ids), len(self.metrics)), np.nan, dtype=np.float32)
+        slot = (self.raw.written - 1) % self.raw.slots
+        return float(self.raw.times[slot]), ids, self.raw.values[slot, rows]
+
+    def query(
+        self, metric: str, start: float, end: float, interval: int = RAW, obj_id: Optional[str] = None
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Return ``(timestamps, object IDs, values shaped (objects, timestamps))`` for a time range."""
+        ring = self.raw if interval == RAW else self.rollups[interval]
+        slots = ring.select(start, end)
+        if obj_id is not None:
+            rows = [self.rows[obj_id]] if obj_id in self.rows else []
+        else:
+            rows = sorted(self.rows.values())
+        ids = [self.ids[row] for row in rows]
+        values = ring.values[:, :, self.metric_index[metric]][np.ix_(slots, np.asarray(rows, dtype=np.int64))]
+        return ring.times[slots], ids, values.T
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self.ids = [None] * self.capacity
+        self._free.clear()
+        self._used = 0
+        self.raw = _Ring(self.capacity, len(self.metrics), self.raw.slots)
+        self.rollups = {
+            interval: _Rollup(self.capacity, len(self.metrics), rollup.slots, interval)
+            for interval, rollup in self.rollups.items()
+        }
+
+
+class MetricStore:
+    """Metric samples of all object types."""
+
+    def __init__(
+        self,
+        raw_slots: Optional[int] = None,
+        rollup_slots: Optional[int] = None,
+        max_objects: Optional[int] = None,
+    ) -> None:
+        raw_slots = raw_slots or settings.METRICS_RAW_SAMPLES
+        rollup_slots = rollup_slots or settings.METRICS_ROLLUP_SAMPLES
+        max_objects = max_objects or settings.METRICS_MAX_OBJECTS
+        self.blocks: Dict[str, MetricBlock] = {}
+        for object_type, _, _ in _CATALOGUE:
+            metrics = [metric for metric in METRICS if metric.object_type == object_type]
+            self.blocks[object_type] = MetricBlock(object_type, metrics, raw_slots, rollup_slots, max_objects)
+        self.track("sp", STORAGE_PROCESSORS)
+
+    def block(self, object_type: str) -> MetricBlock:
+        return self.blocks[object_type]
+
+    def track(self, object_type: str, obj_ids: Sequence[str]) -> None:
+        """Start keeping metrics for new objects. Objects beyond ``max_objects`` get none."""
+        try:
+            self.blocks[object_type].rows_for(obj_ids)
+        except MetricStoreFull as e:
+            logger.warning("%s", e)
+
+    def forget(self, object_type: str, obj_ids: Sequence[str]) -> None:
+        """Drop the metrics of deleted objects."""
+        self.blocks[object_type].forget(obj_ids)
+
+    def record(self, object_type: str, timestamp: float, obj_ids: Sequence[str], values: np.ndarray) -> None:
+        """Record one sample of every metric of a type for the given objects."""
+        block = self.blocks[object_type]
+        block.record(timestamp, block.rows_for(obj_ids), values)
+
+    def query(
+        self, path: str, start: float, end: float, interval: int = RAW
+    ) -> Tuple[MetricDefinition, np.ndarray, List[str], np.ndarray]:
+        """Return ``(metric, timestamps, object IDs, values)`` for a metric path over a time range.
+
+        Raises:
+            KeyError: If the path matches no metric
+        """
+        metric, obj_id = resolve_path(path)
+        block = self.blocks[metric.object_type]
+        return (metric,) + block.query(metric.name, start, end, interval, obj_id)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.blocks.values())
+
+    def clear(self) -> None:
+        for block in self.blocks.values():
+            block.clear()
+        self.track("sp", STORAGE_PROCESSORS)
+
+
+metric_store = MetricStore()
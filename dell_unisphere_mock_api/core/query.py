@@ -1,9 +1,73 @@
 import re
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import Query
 
 
+def parse_filter(filter_str: Optional[str], strict: bool = False) -> Dict[str, Any]:
+    """Parse a filter expression such as ``name eq 'test*' and size gt 100`` into conditions by field.
+
+    Conditions that cannot be parsed are ignored, unless ``strict`` is set.
+
+    Raises:
+        ValueError: In strict mode, if a condition cannot be parsed or a field has several conditions
+    """
+    filters: Dict[str, Any] = {}
+    if not filter_str:
+        return filters
+
+    for condition in re.split(r"\s+and\s+", filter_str, flags=re.IGNORECASE):
+        match = re.match(r"(\w+)\s+(eq|ne|gt|lt)\s+(.+)", condition, re.IGNORECASE)
+        if match:
+            field, op, value = match.groups()
+            if strict and field in filters:
+                raise ValueError(f"Several conditions on {field}: {filter_str}")
+            filters[field] = {"operator": op.upper(), "value": parse_value(value)}
+        elif strict:
+            raise ValueError(f"Unsupported filter condition: {condition}")
+    return filters
+
+
+def parse_value(value: str):
+    """Convert string values to appropriate types; unquoted ``true`` and ``false`` are booleans"""
+    value = value.strip()
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    value = value.strip("'\"")
+    if value.isdigit():
+        return int(value)
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def matches_filter(obj: Any, filters: Dict[str, Any], get: Callable[[Any, str], Any] = getattr) -> bool:
+    """Return True if ``obj`` meets every condition; ``eq`` and ``ne`` accept ``*`` wildcards in strings."""
+    for field, condition in filters.items():
+        actual = get(obj, field, None)
+        if isinstance(actual, Enum):
+            actual = actual.value
+        expected = condition["value"]
+        operator = condition["operator"]
+        if operator in ("EQ", "NE"):
+            if isinstance(expected, str) and "*" in expected:
+                equal = isinstance(actual, str) and fnmatchcase(actual, expected)
+            else:
+                equal = actual == expected or str(actual) == str(expected)
+            if equal != (operator == "EQ"):
+                return False
+        else:
+            try:
+                if not (actual > expected if operator == "GT" else actual < expected):
+                    return False
+            except TypeError:
+                return False
+    return True
+
+
 class QueryParams:
     def __init__(
         self,
@@ -23,18 +87,7 @@ class QueryParams:
 
     def _parse_filters(self, filter_str: Optional[str]) -> Dict[str, Any]:
         """Parse filter string into structured query filters"""
-        filters = {}
-        if not filter_str:
-            return filters
-
-        # Example filter: "name eq 'test*' and size gt 100"
-        # This simplified parser handles basic equality checks
-        for condition in re.split(r"\s+and\s+", filter_str, flags=re.IGNORECASE):
-            match = re.match(r"(\w+)\s+(eq|ne|gt|lt)\s+(.+)", condition, re.IGNORECASE)
-            if match:
-                field, op, value = match.groups()
-                filters[field] = {"operator": op.upper(), "value": self._parse_value(value)}
-        return filters
+        return parse_filter(filter_str)
 
     def _parse_sort(self, orderby: Optional[str]) -> List[Dict[str, str]]:
         """Parse orderby string into sort directives"""
@@ -52,10 +105,4 @@ class QueryParams:
 
     def _parse_value(self, value: str):
         """Convert string values to appropriate types"""
-        value = value.strip("'\"")
-        if value.isdigit():
-            return int(value)
-        try:
-            return float(value)
-        except ValueError:
-            return value
+        return parse_value(value)
@@ -0,0 +1,338 @@
+"""Snapshot schedules, fired from a hierarchical timer wheel.
+
+A schedule is a set of rules, each taking snapshots at hourly, daily or weekly
+times with a retention, and the storage resources it protects. Rules fire on
+whole minutes, so time is counted in minute ticks. Each rule has one timer,
+whatever the number of resources, held in a hierarchical timer wheel: levels
+of 64 slots, each slot of a level spanning a full turn of the level below.
+Adding a timer and firing one cost O(1); a timer due in a later turn sits in a
+higher level and is spread over the level below when that turn begins, which
+happens at most once per level. Minutes with nothing due are skipped a whole
+turn of the lowest level at a time, so fast-forwarding a month costs a few
+thousand steps.
+
+The rules due at a tick fire together, and each takes a snapshot of all the
+resources of its schedule through the snapshot engine as one change. Before a
+tick fires, the snapshots whose retention ended by then are expired from the
+snapshot engine's min-heap. Removed or changed rules leave their old timers
+behind; those are recognised and dropped when they come due.
+
+Time is the clock plus an offset, which fast-forwarding adds to, so tests can
+run a month of schedules in seconds. The snapshot engine is given the same time.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dell_unisphere_mock_api.core.snapshots import SCHEDULER, SnapshotEngine, snapshot_engine
+
+logger = logging.getLogger(__name__)
+
+# Rule types
+HOURLY = "N_HOURS_AT_MM"
+DAILY = "DAY_AT_HHMM"
+WEEKLY = "SELDAYS_AT_HHMM"
+RULE_TYPES = (HOURLY, DAILY, WEEKLY)
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MINUTE = 60.0
+_HOUR = 60
+_DAY = 24 * _HOUR
+# 1 January 1970, minute 0, was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+class TimerWheel:
+    """Hierarchical timer wheel of items due at integer ticks."""
+
+    def __init__(self, now: int, levels: int = 4, bits: int = 6) -> None:
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.slots: List[List[List[Tuple[int, Any]]]] = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        # Timers per level, and those beyond the top level
+        self.counts = [0] * levels
+        self.overflow: List[Tuple[int, Any]] = []
+        # Next tick to fire
+        self.current = now
+
+    def __len__(self) -> int:
+        return sum(self.counts) + len(self.overflow)
+
+    def add(self, when: int, item: Any) -> None:
+        """Add an item due at tick ``when``; items already due fire at the next tick."""
+        self._place(max(when, self.current), item)
+
+    def _place(self, when: int, item: Any) -> None:
+        # The lowest level whose current turn ``when`` falls in
+        for level in range(len(self.slots)):
+            shift = self.bits * (level + 1)
+            if when >> shift == self.current >> shift:
+                self.slots[level][(when >> (self.bits * level)) & self.mask].append((when, item))
+                self.counts[level] += 1
+                return
+        self.overflow.append((when, item))
+
+    def _cascade(self, tick: int) -> None:
+        """Spread the timers of the turns beginning at ``tick`` over the levels below."""
+        levels = len(self.slots)
+        if not tick & ((1 << (self.bits * levels)) - 1) and self.overflow:
+            overflow, self.overflow = self.overflow, []
+            for when, item in overflow:
+                self._place(when, item)
+        for level in range(levels - 1, 0, -1):
+            if tick & ((1 << (self.bits * level)) - 1) or not self.counts[level]:
+                continue
+            slot = self.slots[level][(tick >> (self.bits * level)) & self.mask]
+            if slot:
+                timers = slot[:]
+                slot.clear()
+                self.counts[level] -= len(timers)
+                for when, item in timers:
+                    self._place(when, item)
+
+    def advance(self, until: int) -> Iterator[Tuple[int, List[Any]]]:
+        """Fire the ticks up to ``until``, yielding each tick with items due and its items."""
+        while self.current <= until:
+            if not len(self):
+                self.current = until + 1
+                return
+            tick = self.current
+            self._cascade(tick)
+            if not self.counts[0]:
+                # Nothing left in this turn of the lowest level
+                self.current = min(((tick >> self.bits) + 1) << self.bits, until + 1)
+                continue
+            self.current = tick + 1
+            slot = self.slots[0][tick & self.mask]
+            if slot:
+                items = [item for _, item in slot]
+                slot.clear()
+                self.counts[0] -= len(items)
+                yield tick, items
+
+    def clear(self, now: int) -> None:
+        for level in self.slots:
+            for slot in level:
+                slot.clear()
+        self.counts = [0] * len(self.slots)
+        self.overflow.clear()
+        self.current = now
+
+
+class ScheduleRule:
+    """When a schedule takes snapshots, and how long it keeps them."""
+
+    __slots__ = ("id", "type", "minute", "hours", "interval", "days", "retention", "auto_delete", "next")
+
+    def __init__(
+        self,
+        rule_id: str,
+        type: str,
+        minute: int = 0,
+        hours: Iterable[int] = (),
+        interval: int = 1,
+        days: Iterable[int] = (),
+        retention: Optional[float] = None,
+        auto_delete: bool = False,
+    ) -> None:
+        if type not in RULE_TYPES:
+            raise ValueError(f"Unknown schedule rule type {type}")
+        self.id = rule_id
+        self.type = type
+        self.minute = minute
+        self.hours = tuple(sorted(set(hours))) or (0,)
+        self.interval = max(interval, 1)
+        # Days of the week, Monday being 0
+        self.days = tuple(sorted(set(days))) or tuple(range(7))
+        self.retention = retention
+        self.auto_delete = auto_delete
+        # Tick the rule fires at next
+        self.next: Optional[int] = None
+
+    def next_after(self, tick: int) -> int:
+        """The first minute after ``tick`` the rule fires at."""
+        if self.type == HOURLY:
+            # Every ``interval`` hours since the epoch, at the minute
+            hour = tick // _HOUR + (tick % _HOUR >= self.minute)
+            hour = -(-hour // self.interval) * self.interval
+            return hour * _HOUR + self.minute
+        day = tick // _DAY
+        for offset in range(8):
+            weekday = (day + offset + _EPOCH_WEEKDAY) % 7
+            if self.type == WEEKLY and weekday not in self.days:
+                continue
+            for hour in self.hours:
+                when = (day + offset) * _DAY + hour * _HOUR + self.minute
+                if when > tick:
+                    return when
+        raise AssertionError("A rule fires at least once a week")
+
+
+class SnapSchedule:
+    """Rules taking snapshots of a set of storage resources."""
+
+    __slots__ = ("id", "name", "rules", "resources")
+
+    def __init__(self, schedule_id: str, name: str) -> None:
+        self.id = schedule_id
+        self.name = name
+        self.rules: Dict[str, ScheduleRule] = {}
+        # Insertion-ordered set of resource IDs
+        self.resources: Dict[str, None] = {}
+
+
+class SnapScheduleEngine:
+    """Keeps snapshot schedules and takes their snapshots when due."""
+
+    def __init__(self, snapshots: Optional[SnapshotEngine] = None, clock: Callable[[], float] = time.time) -> None:
+        self.snapshots = snapshots or snapshot_engine
+        self.clock = clock
+        # Seconds time was fast-forwarded by
+        self.offset = 0.0
+        # Snapshots are taken, accounted and expired on the same, fast-forwardable time
+        self.snapshots.clock = self.now
+        self.schedules: Dict[str, SnapSchedule] = {}
+        # Schedule of each protected resource; a resource follows one schedule at a time
+        self.schedule_of: Dict[str, str] = {}
+        self.wheel = TimerWheel(self._tick(self.now()))
+        self._next_id = itertools.count(1)
+        self._next_rule_id = itertools.count(1)
+
+    def now(self) -> float:
+        return self.clock() + self.offset
+
+    @staticmethod
+    def _tick(timestamp: float) -> int:
+        return int(timestamp // MINUTE)
+
+    # Schedules
+
+    def _add_rules(self, schedule: SnapSchedule, rules: Iterable[Dict[str, Any]]) -> None:
+        # Build all rules first so an invalid one adds none
+        built = [ScheduleRule(f"{schedule.id}_rule_{next(self._next_rule_id)}", **rule) for rule in rules]
+        tick = max(self._tick(self.now()), self.wheel.current - 1)
+        for rule in built:
+            schedule.rules[rule.id] = rule
+            rule.next = rule.next_after(tick)
+            self.wheel.add(rule.next, (schedule.id, rule.id))
+
+    def _add_resources(self, schedule: SnapSchedule, resource_ids: Iterable[str]) -> None:
+        for resource_id in resource_ids:
+            previous = self.schedule_of.get(resource_id)
+            if previous is not None and previous != schedule.id:
+                self.schedules[previous].resources.pop(resource_id, None)
+            self.schedule_of[resource_id] = schedule.id
+            schedule.resources[resource_id] = None
+
+    def create(self, name: str, rules: Sequence[Dict[str, Any]], resource_ids: Iterable[str] = ()) -> SnapSchedule:
+        """Create a schedule of rules given as ScheduleRule arguments, protecting the given resources.
+
+        Resources following another schedule are moved to this one.
+
+        Raises:
+            ValueError: If a rule is invalid
+        """
+        schedule = SnapSchedule(f"snapSch_{next(self._next_id)}", name)
+        self._add_rules(schedule, rules)
+        self.schedules[schedule.id] = schedule
+        self._add_resources(schedule, resource_ids)
+        return schedule
+
+    def modify(
+        self,
+        schedule_id: str,
+        name: Optional[str] = None,
+        add_rules: Sequence[Dict[str, Any]] = (),
+        remove_rule_ids: Iterable[str] = (),
+        add_resources: Iterable[str] = (),
+        remove_resources: Iterable[str] = (),
+    ) -> SnapSchedule:
+        """Rename a schedule, change its rules and the resources it protects.
+
+        Raises:
+            KeyError: If the schedule does not exist
+            ValueError: If a rule to add is invalid
+        """
+        schedule = self.schedules[schedule_id]
+        self._add_rules(schedule, add_rules)
+        if name is not None:
+            schedule.name = name
+        for rule_id in remove_rule_ids:
+            # Its timer is dropped when it comes due
+            schedule.rules.pop(rule_id, None)
+        for resource_id in remove_resources:
+            if resource_id in schedule.resources:
+                del schedule.resources[resource_id]
+                del self.schedule_of[resource_id]
+        self._add_resources(schedule, add_resources)
+        return schedule
+
+    def delete(self, schedule_id: str) -> Optional[SnapSchedule]:
+        """Delete a schedule; the snapshots it took are kept. Returns it, or None if it does not exist."""
+        schedule = self.schedules.pop(schedule_id, None)
+        if schedule is not None:
+            for resource_id in schedule.resources:
+                del self.schedule_of[resource_id]
+        return schedule
+
+    def next_snap_time(self, schedule: SnapSchedule) -> Optional[float]:
+        """Time the schedule takes its next snapshots at, if it protects any resource."""
+        if not schedule.resources or not schedule.rules:
+            return None
+        return min(rule.next for rule in schedule.rules.values()) * MINUTE
+
+    # Firing
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire the rules due by ``now`` and expire snapshots. Returns the number of snapshots taken."""
+        now = self.now() if now is None else now
+        taken = 0
+        for tick, timers in self.wheel.advance(self._tick(now)):
+            at = tick * MINUTE
+            self.snapshots.expire(at)
+            for schedule_id, rule_id in timers:
+                schedule = self.schedules.get(schedule_id)
+                rule = schedule.rules.get(rule_id) if schedule is not None else None
+                if rule is None or rule.next != tick:
+                    continue
+                if schedule.resources:
+                    snaps = self.snapshots.create_many(
+                        list(schedule.resources),
+                        now=at,
+                        retention=rule.retention,
+                        creator=SCHEDULER,
+                        auto_delete=rule.auto_delete,
+                    )
+                    taken += len(snaps)
+                rule.next = rule.next_after(tick)
+                self.wheel.add(rule.next, (schedule_id, rule_id))
+        self.snapshots.expire(now)
+        return taken
+
+    def fast_forward(self, seconds: float) -> int:
+        """Move time forward and fire what falls due. Returns the number of snapshots taken."""
+        self.offset += seconds
+        return self.advance()
+
+    async def run(self, interval: float) -> None:
+        """Fire due rules every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.advance()
+            except Exception:
+                logger.exception("Snapshot schedule tick failed")
+
+    def clear(self) -> None:
+        self.offset = 0.0
+        self.schedules.clear()
+        self.schedule_of.clear()
+        self.wheel.clear(self._tick(self.now()))
+        self._next_id = itertools.count(1)
+        self._next_rule_id = itertools.count(1)
+
+
+snap_schedule_engine = SnapScheduleEngine()
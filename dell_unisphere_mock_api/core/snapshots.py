@@ -0,0 +1,586 @@
+"""Snapshots of storage resources, with their space accounted per changed block.
+
+Snapshots are redirect-on-write: taking one only records the point in time, so
+creating one costs O(1) whatever the size of its resource. A snapshot holds the
+blocks of its resource that were overwritten after it was taken and before the
+next snapshot was; blocks overwritten later are shared with the newer
+snapshots and held by them. Each snapshot keeps a counter of the bytes only it
+holds, and each resource the sum of its snapshots' counters, so snapCount,
+snapSize and the snapshot space charged to the pool follow every creation,
+deletion and write without rescanning blocks.
+
+Writes are modelled as uniformly random over the allocated space of a
+resource: after ``w`` more bytes are written to a resource with ``a`` bytes
+allocated, of which ``c`` changed since its newest snapshot,
+``a - (a - c) * exp(-w / a)`` have. By the same independence, of the blocks a
+deleted snapshot holds, the share that was also overwritten before it was
+taken belonged to it alone and is freed; the others were shared with the
+previous snapshot, which holds them from then on. Deleting the oldest
+snapshot frees all it holds.
+
+Resources with snapshots are kept in NumPy columns, like the workload
+simulator's objects, so advancing the accounting of all of them to the current
+time is a few array passes. Write rates come from the workload simulator.
+Resources are written back only when their snapshot count changes or their
+snapshot space crosses a slice boundary, in one batch.
+
+Snapshots of many resources can be taken as one change, as schedules do.
+Snapshots kept for a retention are queued on a min-heap of expiration times,
+so deleting those that expired costs O(log n) each without looking at the
+others.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.changes import (
+    CREATED,
+    DELETED,
+    MODIFIED,
+    ChangeFeed,
+    ChangeHistoryExpired,
+    change_feed,
+)
+from dell_unisphere_mock_api.core.config import settings
+
+# Who took a snapshot
+USER = "User"
+SCHEDULER = "Scheduler"
+SYSTEM = "System"
+
+# (size, allocated bytes) of a storage resource
+SnapshotState = Tuple[int, int]
+
+
+class SnapshotTarget(Protocol):
+    """Store of the resources snapshots are taken of."""
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[SnapshotState]]:
+        """State of each resource, or None for resources that no longer exist."""
+
+    def apply(
+        self, obj_ids: Sequence[str], counts: Sequence[int], sizes: Sequence[int], allocated: Sequence[int]
+    ) -> None:
+        """Record the snapshot count, size and allocated snapshot space of several resources."""
+
+
+class SnapshotLimitExceeded(Exception):
+    """A resource already has as many snapshots as it may have."""
+
+    def __init__(self, resource_id: str, limit: int):
+        super().__init__(f"Storage resource {resource_id} already has {limit} snapshots")
+        self.resource_id = resource_id
+        self.limit = limit
+
+
+class Snapshot:
+    """A point-in-time copy of a storage resource."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "resource_id",
+        "created",
+        "expires",
+        "creator",
+        "read_only",
+        "auto_delete",
+        "size",
+        "attached",
+        "last_writable",
+        "held",
+        "older",
+        "newer",
+    )
+
+    def __init__(
+        self,
+        snap_id: str,
+        name: str,
+        resource_id: str,
+        created: float,
+        size: int,
+        description: Optional[str] = None,
+        expires: Optional[float] = None,
+        creator: str = USER,
+        read_only: bool = False,
+        auto_delete: bool = False,
+    ) -> None:
+        self.id = snap_id
+        self.name = name
+        self.description = description
+        self.resource_id = resource_id
+        self.created = created
+        self.expires = expires
+        self.creator = creator
+        self.read_only = read_only
+        self.auto_delete = auto_delete
+        # Size of the resource when the snapshot was taken
+        self.size = size
+        self.attached = False
+        self.last_writable: Optional[float] = None
+        # Bytes only this snapshot holds; kept in the engine's columns while it is the newest
+        self.held = 0.0
+        # Neighbours in the chain of its resource's snapshots, oldest first
+        self.older: Optional["Snapshot"] = None
+        self.newer: Optional["Snapshot"] = None
+
+
+def _default_name(timestamp: float) -> str:
+    """Snapshots are named after the time they were taken unless given a name."""
+    return time.strftime("%Y-%m-%d_%H.%M.%S", time.gmtime(timestamp))
+
+
+def _union(first: float, second: float, allocated: float) -> float:
+    """Bytes in either of two independent random sets of changed blocks."""
+    if allocated <= 0:
+        return first + second
+    return min(first + second - first * second / allocated, max(allocated, first, second))
+
+
+class SnapshotEngine:
+    """Takes and deletes snapshots and accounts the space they hold."""
+
+    def __init__(
+        self,
+        feed: Optional[ChangeFeed] = None,
+        slice_size: Optional[int] = None,
+        max_per_resource: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        rows: int = 64,
+    ) -> None:
+        self.feed = feed or change_feed
+        self.slice_size = slice_size or settings.WORKLOAD_SLICE_BYTES
+        self.max_per_resource = max_per_resource or settings.SNAPS_MAX_PER_RESOURCE
+        self.clock = clock
+        # Store of the resources; set where it is available
+        self.target: Optional[SnapshotTarget] = None
+        self.object_type = "storageResource"
+        # Returns the mean bytes written per second to each resource
+        self.write_rate: Callable[[Sequence[str]], np.ndarray] = lambda obj_ids: np.zeros(len(obj_ids))
+
+        self.snaps: Dict[str, Snapshot] = {}
+        self._next_id = itertools.count(1)
+        # (expiration time, snapshot ID) of snapshots kept for a retention, soonest first
+        self._expiry: List[Tuple[float, str]] = []
+
+        # Resources with snapshots
+        self.rows: Dict[str, int] = {}
+        self.resource_ids: List[Optional[str]] = [None] * rows
+        self.oldest: List[Optional[Snapshot]] = [None] * rows
+        self.newest: List[Optional[Snapshot]] = [None] * rows
+        self._free: List[int] = []
+        self._used = 0
+        self.live = np.zeros(rows, dtype=np.bool_)
+        self.size = np.zeros(rows, dtype=np.int64)
+        self.allocated = np.zeros(rows, dtype=np.float64)
+        self.rate = np.zeros(rows, dtype=np.float64)
+        # Time up to which a resource's writes were accounted
+        self.since = np.zeros(rows, dtype=np.float64)
+        # Bytes changed since the newest snapshot, and held by all snapshots together
+        self.head = np.zeros(rows, dtype=np.float64)
+        self.total = np.zeros(rows, dtype=np.float64)
+        self.count = np.zeros(rows, dtype=np.int64)
+        # Count and allocated snapshot space last written back to the store
+        self.written_count = np.zeros(rows, dtype=np.int64)
+        self.written_allocated = np.zeros(rows, dtype=np.int64)
+        self._seq = 0
+        self._synced = False
+
+    # Rows
+
+    _COLUMNS = (
+        "live",
+        "size",
+        "allocated",
+        "rate",
+        "since",
+        "head",
+        "total",
+        "count",
+        "written_count",
+        "written_allocated",
+    )
+
+    def _grow(self) -> None:
+        rows = 2 * len(self.resource_ids)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(rows, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+        extra = [None] * (rows - len(self.resource_ids))
+        self.resource_ids.extend(extra)
+        self.oldest.extend(extra)
+        self.newest.extend(extra)
+
+    def _row(self, resource_id: str, state: SnapshotState, now: float) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._used == len(self.resource_ids):
+                self._grow()
+            row = self._used
+            self._used += 1
+        self.resource_ids[row] = resource_id
+        for name in self._COLUMNS:
+            getattr(self, name)[row] = 0
+        self.live[row] = True
+        self.size[row], self.allocated[row] = state
+        self.rate[row] = float(self.write_rate([resource_id])[0])
+        self.since[row] = now
+        return row
+
+    def _forget(self, row: int) -> None:
+        resource_id = self.resource_ids[row]
+        snap = self.oldest[row]
+        while snap is not None:
+            self.snaps.pop(snap.id, None)
+            snap = snap.newer
+        self.rows.pop(resource_id, None)
+        self.resource_ids[row] = self.oldest[row] = self.newest[row] = None
+        self.live[row] = False
+        self._free.append(row)
+
+    # Keeping up with the store
+
+    def sync(self) -> None:
+        """Re-read the allocated space of resources with snapshots changed since the last call."""
+        if self.target is None:
+            return
+        resync = not self._synced or self.feed.last_seq < self._seq
+        if not resync:
+            try:
+                modified, deleted = self.feed.log(self.object_type).since(self._seq)
+            except ChangeHistoryExpired:
+                resync = True
+        if resync:
+            modified, deleted = list(self.rows), []
+        for resource_id in deleted:
+            row = self.rows.get(resource_id)
+            if row is not None:
+                self._forget(row)
+        modified = [resource_id for resource_id in modified if resource_id in self.rows]
+        if modified:
+            for resource_id, state in zip(modified, self.target.describe(modified)):
+                if state is None:
+                    self._forget(self.rows[resource_id])
+                else:
+                    row = self.rows[resource_id]
+                    self.size[row], self.allocated[row] = state
+        self._seq = self.feed.last_seq
+        self._synced = True
+
+    def _account(self, rows: np.ndarray, now: float) -> None:
+        """Account the writes to the given resources up to ``now``."""
+        written = self.rate[rows] * np.maximum(now - self.since[rows], 0.0)
+        allocated = np.maximum(self.allocated[rows], 1.0)
+        head = self.head[rows]
+        changed = np.maximum(allocated - (allocated - np.minimum(head, allocated)) * np.exp(-written / allocated), head)
+        self.total[rows] += changed - head
+        self.head[rows] = changed
+        self.since[rows] = now
+
+    def _write_back(self, rows: np.ndarray) -> None:
+        """Write back the resources whose snapshot count or allocated slices changed."""
+        allocated = (np.ceil(self.total[rows] / self.slice_size) * self.slice_size).astype(np.int64)
+        changed = (allocated != self.written_allocated[rows]) | (self.count[rows] != self.written_count[rows])
+        rows, allocated = rows[changed], allocated[changed]
+        if not len(rows):
+            return
+        self.written_allocated[rows] = allocated
+        self.written_count[rows] = self.count[rows]
+        if self.target is not None:
+            self.target.apply(
+                [self.resource_ids[row] for row in rows.tolist()],
+                self.count[rows].tolist(),
+                np.rint(self.total[rows]).astype(np.int64).tolist(),
+                allocated.tolist(),
+            )
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """Account the writes to every resource with snapshots up to ``now``."""
+        now = self.clock() if now is None else now
+        self.sync()
+        rows = np.flatnonzero(self.live[: self._used])
+        if len(rows):
+            self._account(rows, now)
+            self._write_back(rows)
+
+    def _account_row(self, row: int, now: float) -> np.ndarray:
+        rows = np.array([row], dtype=np.int64)
+        self._account(rows, now)
+        return rows
+
+    def _rows_for(self, resource_ids: Sequence[str], now: float) -> List[Optional[int]]:
+        """Rows of resources, adding those without snapshots yet; None for resources that do not exist."""
+        new = [resource_id for resource_id in dict.fromkeys(resource_ids) if resource_id not in self.rows]
+        if new and self.target is not None:
+            for resource_id, state in zip(new, self.target.describe(new)):
+                if state is not None:
+                    self.rows[resource_id] = self._row(resource_id, state, now)
+        return [self.rows.get(resource_id) for resource_id in resource_ids]
+
+    def _release(self, rows: np.ndarray) -> None:
+        """Write back resources after snapshots were deleted, and drop those left without any."""
+        self._write_back(rows)
+        for row in rows.tolist():
+            if not self.count[row]:
+                self._forget(row)
+
+    # Snapshots
+
+    def _take(
+        self,
+        rows: np.ndarray,
+        now: float,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        retention: Optional[float] = None,
+        creator: str = USER,
+        read_only: bool = False,
+        auto_delete: Optional[bool] = None,
+    ) -> List[Snapshot]:
+        """Link a new snapshot into the chain of each of several accounted resources."""
+        name = name or _default_name(now)
+        expires = now + retention if retention else None
+        # Snapshots kept for a retention expire instead of being deleted when space runs low
+        auto_delete = not retention if auto_delete is None else auto_delete
+        taken = []
+        for row, size, head in zip(rows.tolist(), self.size[rows].tolist(), self.head[rows].tolist()):
+            snap_id = f"snap_{next(self._next_id)}"
+            snap = Snapshot(
+                snap_id,
+                name,
+                self.resource_ids[row],
+                now,
+                size,
+                description=description,
+                expires=expires,
+                creator=creator,
+                read_only=read_only,
+                auto_delete=auto_delete,
+            )
+            previous = self.newest[row]
+            if previous is None:
+                self.oldest[row] = snap
+            else:
+                # What changed since the previous snapshot is held by it from now on
+                previous.held = head
+                previous.newer, snap.older = snap, previous
+            self.newest[row] = snap
+            self.snaps[snap_id] = snap
+            if expires is not None:
+                heapq.heappush(self._expiry, (expires, snap_id))
+            taken.append(snap)
+        self.head[rows] = 0.0
+        self.count[rows] += 1
+        return taken
+
+    def create(self, resource_id: str, name: Optional[str] = None, now: Optional[float] = None, **options) -> Snapshot:
+        """Take a snapshot of a resource.
+
+        Args:
+            options: description, retention (seconds), creator, read_only and auto_delete of the snapshot
+
+        Raises:
+            KeyError: If the resource does not exist
+            SnapshotLimitExceeded: If the resource has as many snapshots as it may have
+        """
+        now = self.clock() if now is None else now
+        row = self._rows_for([resource_id], now)[0]
+        if row is None:
+            raise KeyError(resource_id)
+        if self.count[row] >= self.max_per_resource:
+            raise SnapshotLimitExceeded(resource_id, self.max_per_resource)
+        rows = self._account_row(row, now)
+        snap = self._take(rows, now, name, **options)[0]
+        self._write_back(rows)
+        self.feed.publish("snap", CREATED, snap.id)
+        return snap
+
+    def create_many(self, resource_ids: Sequence[str], now: Optional[float] = None, **options) -> List[Snapshot]:
+        """Take a snapshot of each of several resources as one change.
+
+        Resources that do not exist or have as many snapshots as they may have
+        are skipped. Returns the snapshots taken.
+        """
+        now = self.clock() if now is None else now
+        rows = [row for row in self._rows_for(resource_ids, now) if row is not None]
+        rows = np.unique(np.array(rows, dtype=np.int64))
+        rows = rows[self.count[rows] < self.max_per_resource]
+        if not len(rows):
+            return []
+        self._account(rows, now)
+        taken = self._take(rows, now, **options)
+        self._write_back(rows)
+        self.feed.publish_batch("snap", CREATED, [snap.id for snap in taken])
+        return taken
+
+    def _remove(self, snap: Snapshot) -> int:
+        """Unlink a snapshot from its accounted resource's chain, freeing the blocks only it held. Returns the row."""
+        row = self.rows[snap.resource_id]
+        newest = self.newest[row] is snap
+        held = float(self.head[row]) if newest else snap.held
+        older, newer = snap.older, snap.newer
+        freed = held
+        if older is not None:
+            # Blocks not overwritten before this snapshot was taken are in the previous one too
+            merged = _union(older.held, held, float(self.allocated[row]))
+            freed = older.held + held - merged
+            if newest:
+                self.head[row] = merged
+            else:
+                older.held = merged
+            older.newer = newer
+        if newer is not None:
+            newer.older = older
+        if newest:
+            self.newest[row] = older
+        if self.oldest[row] is snap:
+            self.oldest[row] = newer
+        self.total[row] = max(float(self.total[row]) - freed, 0.0)
+        self.count[row] -= 1
+        if not self.count[row]:
+            self.total[row] = self.head[row] = 0.0
+        return row
+
+    def delete(self, snap_id: str, now: Optional[float] = None) -> Optional[Snapshot]:
+        """Delete a snapshot, freeing the blocks only it held. Returns it, or None if it does not exist."""
+        snap = self.snaps.pop(snap_id, None)
+        if snap is None:
+            return None
+        rows = self._account_row(self.rows[snap.resource_id], self.clock() if now is None else now)
+        self._remove(snap)
+        self._release(rows)
+        self.feed.publish("snap", DELETED, snap_id)
+        return snap
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Delete the snapshots whose retention ended by ``now`` as one change. Returns their IDs.
+
+        Attached snapshots are kept until they are deleted by hand.
+        """
+        now = self.clock() if now is None else now
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, snap_id = heapq.heappop(self._expiry)
+            snap = self.snaps.pop(snap_id, None)
+            if snap is None:
+                continue
+            if snap.attached:
+                self.snaps[snap_id] = snap
+                continue
+            expired.append(snap)
+        if not expired:
+            return []
+        rows = np.unique(np.array([self.rows[snap.resource_id] for snap in expired], dtype=np.int64))
+        self._account(rows, now)
+        for snap in expired:
+            self._remove(snap)
+        self._release(rows)
+        snap_ids = [snap.id for snap in expired]
+        self.feed.publish_batch("snap", DELETED, snap_ids)
+        return snap_ids
+
+    def restore(self, snap_id: str, backup_name: Optional[str] = None, now: Optional[float] = None) -> Snapshot:
+        """Return a resource to a snapshot, first taking a snapshot of it as it is. Returns that backup.
+
+        Raises:
+            KeyError: If the snapshot does not exist
+        """
+        now = self.clock() if now is None else now
+        snap = self.snaps[snap_id]
+        backup = self.create(snap.resource_id, backup_name, creator=SYSTEM, now=now)
+        row = self.rows[snap.resource_id]
+        allocated = float(self.allocated[row])
+        # Every block changed since the snapshot is rewritten, and held by the backup
+        changed, older = 0.0, snap
+        while older is not backup:
+            changed = _union(changed, older.held, allocated)
+            older = older.newer
+        self.total[row] += changed
+        self.head[row] = changed
+        self._write_back(np.array([row], dtype=np.int64))
+        return backup
+
+    def attach(self, snap_id: str) -> Snapshot:
+        """Give hosts access to a snapshot.
+
+        Raises:
+            KeyError: If the snapshot does not exist
+        """
+        snap = self.snaps[snap_id]
+        snap.attached = True
+        self.feed.publish("snap", MODIFIED, snap_id)
+        return snap
+
+    def detach(self, snap_id: str, now: Optional[float] = None) -> Snapshot:
+        """Take hosts' access to a snapshot away.
+
+        Raises:
+            KeyError: If the snapshot does not exist
+        """
+        snap = self.snaps[snap_id]
+        snap.attached = False
+        snap.last_writable = self.clock() if now is None else now
+        self.feed.publish("snap", MODIFIED, snap_id)
+        return snap
+
+    def write(self, resource_id: str, nbytes: float, now: Optional[float] = None) -> None:
+        """Account ``nbytes`` written to a resource at random, besides its simulated workload."""
+        row = self.rows.get(resource_id)
+        if row is None:
+            return
+        rows = self._account_row(row, self.clock() if now is None else now)
+        allocated = max(float(self.allocated[row]), 1.0)
+        head = float(self.head[row])
+        changed = max(allocated - (allocated - min(head, allocated)) * np.exp(-nbytes / allocated), head)
+        self.total[row] += changed - head
+        self.head[row] = changed
+        self._write_back(rows)
+
+    def held(self, snap: Snapshot) -> int:
+        """Bytes only a snapshot holds, as of the last accounting."""
+        row = self.rows[snap.resource_id]
+        return int(round(self.head[row] if self.newest[row] is snap else snap.held))
+
+    def usage(self, resource_id: str) -> Tuple[int, int]:
+        """Snapshot count and bytes held by the snapshots of a resource."""
+        row = self.rows.get(resource_id)
+        if row is None:
+            return 0, 0
+        return int(self.count[row]), int(round(self.total[row]))
+
+    def snapshots(self, resource_id: Optional[str] = None) -> Iterator[Snapshot]:
+        """Snapshots of one resource, oldest first, or of all resources."""
+        if resource_id is None:
+            yield from list(self.snaps.values())
+            return
+        row = self.rows.get(resource_id)
+        snap = self.oldest[row] if row is not None else None
+        while snap is not None:
+            yield snap
+            snap = snap.newer
+
+    def clear(self) -> None:
+        self.snaps.clear()
+        self._next_id = itertools.count(1)
+        self._expiry.clear()
+        self.rows.clear()
+        self.resource_ids = [None] * len(self.resource_ids)
+        self.oldest = [None] * len(self.oldest)
+        self.newest = [None] * len(self.newest)
+        self._free.clear()
+        self._used = 0
+        self.live[:] = False
+        self._seq = 0
+        self._synced = False
+
+
+snapshot_engine = SnapshotEngine()
@@ -0,0 +1,518 @@
+"""FAST VP tiering of storage resource slices.
+
+Pool space is allocated in slices of ``WORKLOAD_SLICE_BYTES``, and every slice
+of an object sits in one tier of its pool. The engine keeps, per object, how
+many of its slices are in each tier, in an objects-by-tiers array like the
+columns of the workload simulator. An object's slices are ordered by how hot
+they are, slice ``k`` taking a Zipf share ``(k + 1) ** -skew`` of the object's
+IOPS, so its hottest slices are the ones in its fastest tier and the counts
+alone say which slice is where.
+
+New slices are placed in the fastest tier with free space, or the slowest for
+``LowestAvailable`` objects. Planning a relocation ranks every slice of a pool
+by temperature in one sort and fills the tiers from the fastest down, keeping
+objects with no data movement where they are and ``HighestAvailable`` and
+``LowestAvailable`` objects at either end. A relocation then moves the planned
+slices object by object, in batches whose size depends on the pool's
+relocation rate, and writes the new per-tier usage of the objects it moved
+back to their stores. Relocations run as jobs, either started through the API
+or scheduled for every pool with slices to move once per relocation window.
+
+Like the workload simulator, the engine learns which objects were created,
+resized or deleted from the change logs of their types.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.changes import ChangeFeed, ChangeHistoryExpired, change_feed
+from dell_unisphere_mock_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tiers from fastest to slowest
+TIERS = ("EXTREME_PERFORMANCE", "PERFORMANCE", "CAPACITY")
+# Assumed for pools whose tiers are unknown
+DEFAULT_TIER = 1
+# Share of each tier that relocations fill, leaving room for new slices
+TIER_FILL = 0.9
+# Slices moved per relocation step at each relocation rate
+RATE_SLICES = {"LOW": 64, "MEDIUM": 256, "HIGH": 1024}
+
+# Tiering policies
+AUTOTIER = 0
+HIGHEST = 1
+LOWEST = 2
+NO_MOVEMENT = 3
+START_HIGH = 4
+POLICY_CODES = {
+    "Autotier": AUTOTIER,
+    "HighestAvailable": HIGHEST,
+    "LowestAvailable": LOWEST,
+    "NoData": NO_MOVEMENT,
+    "StartHighThenAutotier": START_HIGH,
+}
+# Policy of objects that do not set one
+DEFAULT_POLICY = START_HIGH
+
+# Relocation states, as in FastVPStatusEnum
+IDLE = "IDLE"
+RUNNING = "RUNNING"
+PAUSED = "PAUSED"
+COMPLETED = "COMPLETED"
+
+# (pool ID, allocated bytes, tiering policy) of an object
+TieringState = Tuple[str, int, Optional[str]]
+
+
+class TieringTarget(Protocol):
+    """Store of one object type whose slices are tiered."""
+
+    def ids(self) -> List[str]:
+        """Return the IDs of all objects."""
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[TieringState]]:
+        """Return the state of each object, or None for objects that no longer exist."""
+
+    def apply(self, obj_ids: Sequence[str], per_tier: Sequence[Dict[str, int]]) -> None:
+        """Record the bytes each object has in each tier."""
+
+
+class PoolRelocation:
+    """FAST VP relocation state of one pool."""
+
+    __slots__ = ("status", "rate", "schedule_enabled", "scheduled", "planned", "moved", "start", "end", "stop", "job")
+
+    def __init__(self) -> None:
+        self.status = IDLE
+        self.rate = "MEDIUM"
+        self.schedule_enabled = True
+        # Whether the last relocation was started by the schedule
+        self.scheduled = False
+        # Slices to move when the last relocation started, and moved since
+        self.planned = 0
+        self.moved = 0
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.stop = False
+        # ID of the last job started to relocate the pool; it is queued before it runs
+        self.job: Optional[str] = None
+
+
+class TieringEngine:
+    """Places the slices of tiered objects in the tiers of their pools and relocates them."""
+
+    def __init__(
+        self,
+        feed: Optional[ChangeFeed] = None,
+        slice_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        rows: int = 64,
+    ) -> None:
+        self.feed = feed or change_feed
+        self.slice_size = slice_size or settings.WORKLOAD_SLICE_BYTES
+        self.rng = np.random.default_rng(seed)
+        self.step_interval = settings.FASTVP_STEP_S
+        # Stores of the tiered object types, by type
+        self.targets: Dict[str, TieringTarget] = {}
+        # Returns the bytes of a pool in each tier, by tier name
+        self.pool_capacity: Callable[[str], Dict[str, int]] = lambda pool_id: {}
+        # Returns the mean IOPS of objects of a type
+        self.heat: Callable[[str, Sequence[str]], np.ndarray] = lambda object_type, obj_ids: np.zeros(len(obj_ids))
+        # Starts a relocation job for a pool; set where jobs can be created
+        self.schedule: Optional[Callable[[str], Awaitable[Any]]] = None
+
+        self.rows: Dict[Tuple[str, str], int] = {}
+        self.keys: List[Optional[Tuple[str, str]]] = [None] * rows
+        self._free: List[int] = []
+        self._used = 0
+        self.live = np.zeros(rows, dtype=np.bool_)
+        self.pool = np.full(rows, -1, dtype=np.int32)
+        self.policy = np.full(rows, DEFAULT_POLICY, dtype=np.int8)
+        self.skew = np.zeros(rows, dtype=np.float32)
+        # Slices of each object in each tier, where they are and where the last plan puts them
+        self.placement = np.zeros((rows, len(TIERS)), dtype=np.int64)
+        self.target = np.zeros((rows, len(TIERS)), dtype=np.int64)
+
+        self.pool_codes: Dict[str, int] = {}
+        self.pool_ids: List[str] = []
+        # Slices of each pool in each tier
+        self.pool_used = np.zeros((16, len(TIERS)), dtype=np.int64)
+        self.relocations: Dict[str, PoolRelocation] = {}
+        self._seq = 0
+        self._synced = False
+
+    # Rows
+
+    def _grow(self) -> None:
+        rows = 2 * len(self.keys)
+        for name in ("live", "pool", "policy", "skew", "placement", "target"):
+            old = getattr(self, name)
+            new = np.zeros((rows,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+        self.keys.extend([None] * (rows - len(self.keys)))
+
+    def _row(self, key: Tuple[str, str]) -> int:
+        row = self.rows.get(key)
+        if row is not None:
+            return row
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._used == len(self.keys):
+                self._grow()
+            row = self._used
+            self._used += 1
+        self.rows[key] = row
+        self.keys[row] = key
+        self.live[row] = True
+        self.pool[row] = -1
+        # How unevenly an object's IOPS fall on its slices
+        self.skew[row] = self.rng.uniform(0.5, 1.5)
+        return row
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self._set_placement(np.array([row]), np.zeros((1, len(TIERS)), dtype=np.int64))
+        self.target[row] = 0
+        self.keys[row] = None
+        self.live[row] = False
+        self.pool[row] = -1
+        self._free.append(row)
+
+    def _pool_code(self, pool_id: str) -> int:
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            code = self.pool_codes[pool_id] = len(self.pool_ids)
+            self.pool_ids.append(pool_id)
+            if code == len(self.pool_used):
+                self.pool_used = np.vstack([self.pool_used, np.zeros_like(self.pool_used)])
+        return code
+
+    def _set_placement(self, rows: np.ndarray, placement: np.ndarray) -> None:
+        """Move the given rows' slices, keeping the per-pool totals in step."""
+        pools = self.pool[rows]
+        counted = pools >= 0
+        np.add.at(self.pool_used, pools[counted], placement[counted] - self.placement[rows[counted]])
+        self.placement[rows] = placement
+
+    def _capacity(self, pool_id: str) -> np.ndarray:
+        """Slices that fit in each tier of a pool."""
+        sizes = self.pool_capacity(pool_id)
+        capacity = np.array([sizes.get(tier, 0) // self.slice_size for tier in TIERS], dtype=np.int64)
+        if not capacity.any():
+            capacity[DEFAULT_TIER] = np.iinfo(np.int64).max // 4
+        return capacity
+
+    # Keeping up with the stores
+
+    def sync(self) -> None:
+        """Apply the changes made to the tiered stores since the last call."""
+        # The feed was cleared if it is behind what was already seen
+        stale = not self._synced or self.feed.last_seq < self._seq
+        for object_type, target in self.targets.items():
+            resync = stale
+            if not resync:
+                try:
+                    modified, deleted = self.feed.log(object_type).since(self._seq)
+                except ChangeHistoryExpired:
+                    resync = True
+            if resync:
+                modified = target.ids()
+                present = set(modified)
+                deleted = [key[1] for key in self.rows if key[0] == object_type and key[1] not in present]
+            for obj_id in deleted:
+                self._forget((object_type, obj_id))
+            if modified:
+                self._describe(object_type, modified, target.describe(modified))
+        self._seq = self.feed.last_seq
+        self._synced = True
+
+    def _describe(self, object_type: str, obj_ids: Sequence[str], states: List[Optional[TieringState]]) -> None:
+        changed = []
+        for obj_id, state in zip(obj_ids, states):
+            key = (object_type, obj_id)
+            if state is None:
+                self._forget(key)
+                continue
+            row = self._row(key)
+            pool_id, allocated, policy = state
+            code = self._pool_code(str(pool_id))
+            placement = self.placement[row].copy()
+            if self.pool[row] != code:
+                # New, or moved to another pool: its slices are placed afresh
+                self._set_placement(np.array([row]), np.zeros((1, len(TIERS)), dtype=np.int64))
+                self.pool[row] = code
+                placement[:] = 0
+            self.policy[row] = POLICY_CODES.get(getattr(policy, "value", policy), DEFAULT_POLICY)
+            slices = -(-int(allocated) // self.slice_size)
+            placed = int(placement.sum())
+            if slices == placed and (placement == self.placement[row]).all():
+                continue
+            if slices > placed:
+                placement += self._place(str(pool_id), code, slices - placed, self.policy[row] == LOWEST)
+            else:
+                # Shrinking frees the coldest slices, which are the last ones in the slowest tiers
+                excess = placed - slices
+                for tier in reversed(range(len(TIERS))):
+                    taken = min(excess, int(placement[tier]))
+                    placement[tier] -= taken
+                    excess -= taken
+            self._set_placement(np.array([row]), placement[None, :])
+            self.target[row] = placement
+            changed.append(row)
+        if changed:
+            self._write_back(np.asarray(changed, dtype=np.int64))
+
+    def _place(self, pool_id: str, code: int, count: int, lowest: bool) -> np.ndarray:
+        """Return how many of ``count`` new slices go to each tier of a pool."""
+        capacity = self._capacity(pool_id)
+        free = np.maximum(capacity - self.pool_used[code], 0)
+        order = range(len(TIERS) - 1, -1, -1) if lowest else range(len(TIERS))
+        placed = np.zeros(len(TIERS), dtype=np.int64)
+        for tier in order:
+            placed[tier] = min(count, int(free[tier]))
+            count -= int(placed[tier])
+        if count:
+            # A full pool still holds them; they overflow into the last tier it has
+            placed[[tier for tier in order if capacity[tier]][-1]] += count
+        return placed
+
+    def _write_back(self, rows: np.ndarray) -> None:
+        by_type: Dict[str, Tuple[List[str], List[Dict[str, int]]]] = {}
+        for row, placement in zip(rows.tolist(), self.placement[rows].tolist()):
+            object_type, obj_id = self.keys[row]
+            obj_ids, per_tier = by_type.setdefault(object_type, ([], []))
+            obj_ids.append(obj_id)
+            per_tier.append(
+                {tier: slices * self.slice_size for tier, slices in zip(TIERS, placement) if slices}
+            )
+        for object_type, (obj_ids, per_tier) in by_type.items():
+            target = self.targets.get(object_type)
+            if target is not None:
+                target.apply(obj_ids, per_tier)
+
+    # Planning and relocation
+
+    def _pool_rows(self, pool_id: str) -> np.ndarray:
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.live & (self.pool == code))
+
+    def _heat(self, rows: np.ndarray) -> np.ndarray:
+        heat = np.zeros(len(rows), dtype=np.float64)
+        by_type: Dict[str, List[int]] = {}
+        for index, row in enumerate(rows.tolist()):
+            by_type.setdefault(self.keys[row][0], []).append(index)
+        for object_type, indexes in by_type.items():
+            obj_ids = [self.keys[rows[index]][1] for index in indexes]
+            heat[indexes] = self.heat(object_type, obj_ids)
+        return heat
+
+    def plan(self, pool_id: str) -> int:
+        """Work out where every slice of a pool belongs. Returns the number of slices to move."""
+        rows = self._pool_rows(pool_id)
+        if not len(rows):
+            return 0
+        policy = self.policy[rows]
+        capacity = self._capacity(pool_id)
+        present = np.flatnonzero(capacity)
+        fastest, slowest = int(present[0]), int(present[-1])
+        fixed = policy == NO_MOVEMENT
+        capacity = np.maximum((capacity * TIER_FILL).astype(np.int64) - self.placement[rows[fixed]].sum(axis=0), 0)
+        self.target[rows[fixed]] = self.placement[rows[fixed]]
+        rows, policy = rows[~fixed], policy[~fixed]
+        slices = self.placement[rows].sum(axis=1)
+        target = np.zeros((len(rows), len(TIERS)), dtype=np.int64)
+
+        # LowestAvailable objects fill the tiers from the slowest up
+        lowest = policy == LOWEST
+        owners = np.repeat(np.flatnonzero(lowest), slices[lowest])
+        tiers = len(TIERS) - 1 - _fill(len(owners), capacity[::-1], len(TIERS) - 1 - fastest)
+        np.add.at(target, (owners, tiers), 1)
+        capacity = capacity - np.bincount(tiers, minlength=len(TIERS))
+
+        # All other slices fill them from the fastest down, hottest first
+        others = np.flatnonzero(~lowest)
+        counts = slices[others]
+        owners = np.repeat(others, counts)
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(len(owners)) - np.repeat(starts, counts)
+        weights = (rank + 1.0) ** -np.repeat(self.skew[rows[others]].astype(np.float64), counts)
+        shares = weights / np.repeat(np.bincount(owners, weights, minlength=len(rows))[others], counts)
+        # Every object counts as slightly busy, so that its slices keep their order when it is idle
+        temperature = (np.repeat(self._heat(rows[others]), counts) + 1.0) * shares
+        temperature[policy[owners] == HIGHEST] = np.inf
+        order = np.argsort(-temperature, kind="stable")
+        tiers = np.empty(len(owners), dtype=np.int64)
+        tiers[order] = _fill(len(owners), capacity, slowest)
+        np.add.at(target, (owners, tiers), 1)
+
+        self.target[rows] = target
+        return int(np.maximum(target - self.placement[rows], 0).sum())
+
+    def pending(self, pool_id: str) -> int:
+        """Slices of a pool that the last plan moves and that have not moved yet."""
+        rows = self._pool_rows(pool_id)
+        return int(np.maximum(self.target[rows] - self.placement[rows], 0).sum())
+
+    def step(self, pool_id: str, budget: int) -> int:
+        """Move the planned slices of whole objects of a pool, about ``budget`` slices. Returns the number moved."""
+        rows = self._pool_rows(pool_id)
+        moves = np.maximum(self.target[rows] - self.placement[rows], 0).sum(axis=1)
+        pending = moves > 0
+        rows, moves = rows[pending], moves[pending]
+        if not len(rows):
+            return 0
+        # Objects start moving while the budget lasts; the one it runs out on finishes
+        selected = (np.cumsum(moves) - moves) < budget
+        rows = rows[selected]
+        self._set_placement(rows, self.target[rows])
+        self._write_back(rows)
+        return int(moves[selected].sum())
+
+    def movement(self, pool_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Slices planned to move out of each tier to the tier above it, and to the tier below it."""
+        rows = self._pool_rows(pool_id)
+        # Net slices crossing each boundary between two tiers upwards; negative ones cross it downwards
+        flows = np.cumsum(self.target[rows] - self.placement[rows], axis=1)[:, :-1]
+        up = np.maximum(flows, 0).sum(axis=0)
+        down = np.maximum(-flows, 0).sum(axis=0)
+        return np.concatenate([[0], up]), np.concatenate([down, [0]])
+
+    def relocation(self, pool_id: str) -> PoolRelocation:
+        state = self.relocations.get(pool_id)
+        if state is None:
+            state = self.relocations[pool_id] = PoolRelocation()
+        return state
+
+    async def relocate(self, pool_id: str, rate: Optional[str] = None, scheduled: bool = False) -> int:
+        """Plan and carry out a relocation of a pool's slices, until done or stopped. Returns the slices moved."""
+        state = self.relocation(pool_id)
+        if rate is not None:
+            state.rate = getattr(rate, "value", rate)
+        self.sync()
+        state.status = RUNNING
+        state.scheduled = scheduled
+        state.planned = self.plan(pool_id)
+        state.moved = 0
+        state.start, state.end = time.time(), None
+        state.stop = False
+        try:
+            while not state.stop:
+                moved = self.step(pool_id, RATE_SLICES[state.rate])
+                if not moved:
+                    break
+                state.moved += moved
+                await asyncio.sleep(self.step_interval)
+        except asyncio.CancelledError:
+            state.status = PAUSED
+            raise
+        finally:
+            state.end = time.time()
+        state.status = PAUSED if state.stop else COMPLETED
+        return state.moved
+
+    def stop(self, pool_id: str) -> bool:
+        """Stop a running relocation of a pool after its current step. Returns False if none is running."""
+        state = self.relocations.get(pool_id)
+        if state is None or state.status != RUNNING:
+            return False
+        state.stop = True
+        return True
+
+    # Reporting
+
+    def tier_usage(self, pool_id: str) -> Dict[str, Tuple[int, int, int]]:
+        """Return ``{tier: (bytes used, bytes moving up, bytes moving down)}`` of a pool."""
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            return {}
+        up, down = self.movement(pool_id)
+        size = self.slice_size
+        return {
+            tier: (int(self.pool_used[code, index]) * size, int(up[index]) * size, int(down[index]) * size)
+            for index, tier in enumerate(TIERS)
+        }
+
+    def fast_vp(self, pool_id: str) -> Dict[str, Any]:
+        """Return the FAST VP fields of a pool."""
+        state = self.relocation(pool_id)
+        up, down = self.movement(pool_id)
+        pending = self.pending(pool_id)
+        estimate = None
+        if state.status == RUNNING:
+            estimate = time.time() + pending / RATE_SLICES[state.rate] * self.step_interval
+        planned = state.planned or 1
+        return {
+            "status": state.status,
+            "relocationRate": state.rate,
+            "isScheduleEnabled": state.schedule_enabled,
+            "relocationDurationEstimate": estimate,
+            "sizeMovingDown": int(down.sum()) * self.slice_size,
+            "sizeMovingUp": int(up.sum()) * self.slice_size,
+            "sizeMovingWithin": 0,
+            "percentComplete": 100 if state.status == COMPLETED else min(100, 100 * state.moved // planned),
+            "type": "Scheduled" if state.scheduled else "Manual",
+            "dataRelocated": state.moved * self.slice_size,
+            "lastStartTime": state.start,
+            "lastEndTime": state.end,
+        }
+
+    # Running
+
+    async def run(self, interval: float) -> None:
+        """Start a relocation of every pool with slices to move once per ``interval`` seconds, until cancelled.
+
+        The schedule callback skips pools whose relocation job is still queued.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self.schedule is None:
+                continue
+            try:
+                self.sync()
+                for pool_id in list(self.pool_ids):
+                    state = self.relocation(pool_id)
+                    if state.schedule_enabled and state.status != RUNNING and self.plan(pool_id):
+                        await self.schedule(pool_id)
+            except Exception:
+                logger.exception("Scheduling FAST VP relocations failed")
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self.keys = [None] * len(self.keys)
+        self._free.clear()
+        self._used = 0
+        self.live[:] = False
+        self.pool[:] = -1
+        self.policy[:] = DEFAULT_POLICY
+        self.placement[:] = 0
+        self.target[:] = 0
+        self.pool_codes.clear()
+        self.pool_ids.clear()
+        self.pool_used[:] = 0
+        self.relocations.clear()
+        self._seq = 0
+        self._synced = False
+
+
+def _fill(count: int, capacity: np.ndarray, overflow: int) -> np.ndarray:
+    """Return the tier of each of ``count`` slices put in tiers of the given capacity in order.
+
+    Slices that do not fit go to tier ``overflow``.
+    """
+    tiers = np.searchsorted(np.cumsum(capacity), np.arange(count), side="right")
+    tiers[tiers >= len(capacity)] = overflow
+    return tiers
+
+
+tiering_engine = TieringEngine()
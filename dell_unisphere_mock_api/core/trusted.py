@@ -0,0 +1,32 @@
+"""Trusted construction of API objects from internally generated data.
+
+Client input is validated exactly once, by the request schemas at the API edge.
+Objects the mock builds itself (defaults filled in by the models, stored
+records materialized for a response, model results re-wrapped by a router) are
+constructed with ``model_construct`` and skip validation. Setting
+``UNISPHERE_VALIDATE_INTERNAL=true`` re-enables full validation of these
+objects to catch bugs in internally generated data.
+"""
+
+from typing import Any, Dict, Iterable, List, Type, TypeVar
+
+from pydantic import BaseModel
+
+from dell_unisphere_mock_api.core.config import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def trusted(model: Type[M], /, **data: Any) -> M:
+    """Build ``model`` from internally generated data."""
+    if settings.VALIDATE_INTERNAL:
+        return model(**data)
+    return model.model_construct(**data)
+
+
+def trusted_many(model: Type[M], items: Iterable[Dict[str, Any]]) -> List[M]:
+    """Build a list of ``model`` objects from internally generated data."""
+    if settings.VALIDATE_INTERNAL:
+        return [model(**data) for data in items]
+    construct = model.model_construct
+    return [construct(**data) for data in items]
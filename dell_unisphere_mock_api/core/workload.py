@@ -0,0 +1,423 @@
+"""Synthetic workload driving object metrics and thin capacity growth.
+
+Every simulated LUN, filesystem and storage resource is given a workload
+profile when the simulator first sees it: peak IOPS, the phase of its daily
+cycle, read/write mix, IO size, burstiness and how fast it writes new data.
+Profiles and state are held in parallel NumPy columns per object type, like the
+disk inventory, so a tick advances every object in a handful of array passes:
+
+* IOPS follow a diurnal curve with lognormal bursts, split into reads and
+  writes, and bandwidth is IOPS times IO size.
+* Response time comes from the tier mix of the object's pool, and grows as the
+  pool's total IOPS approach what its tiers can serve.
+* Thin objects write new data at their growth rate and allocate pool space in
+  slices of ``WORKLOAD_SLICE_BYTES``. Only objects that crossed a slice
+  boundary are written back to their stores, in one batch per type, and
+  growth stops when the pool has no free space left.
+
+Samples are recorded in the metrics store for LUNs, filesystems, pools and
+storage processors, engines that account what the workload writes (such as
+snapshot space) are advanced with it, and each tick offers a sample of pool
+used space to the capacity ledger's history. The simulator learns about
+created, modified and deleted objects from the change logs of their types, so
+keeping up costs O(changes) per tick; if the logs no longer reach back far
+enough it re-reads all objects.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, capacity_ledger
+from dell_unisphere_mock_api.core.changes import ChangeFeed, ChangeHistoryExpired, change_feed
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.metrics import STORAGE_PROCESSORS, MetricBlock, MetricStore, metric_store
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400.0
+TB = 1024**4
+
+# (response time in microseconds, IOPS per TB) of each tier
+TIER_PROFILES: Dict[str, Tuple[float, float]] = {
+    "EXTREME_PERFORMANCE": (250.0, 20000.0),
+    "PERFORMANCE": (4000.0, 1500.0),
+    "CAPACITY": (9000.0, 400.0),
+}
+# Assumed for pools whose tiers are unknown
+DEFAULT_POOL_TIERS = {"PERFORMANCE": 10 * TB}
+# Pools are never modelled as more than this busy
+MAX_UTILIZATION = 0.95
+# IOPS at which a storage processor's CPU is fully used
+SP_MAX_IOPS = 200000.0
+IO_SIZES = np.array([4096, 8192, 16384, 65536, 262144], dtype=np.float32)
+
+# (pool ID, size, allocated, used, thin) of an object
+ObjectState = Tuple[str, int, int, int, bool]
+
+
+class WorkloadTarget(Protocol):
+    """Store of one simulated object type."""
+
+    def ids(self) -> List[str]:
+        """Return the IDs of all objects."""
+
+    def describe(self, obj_ids: Sequence[str]) -> List[Optional[ObjectState]]:
+        """Return the state of each object, or None for objects that no longer exist."""
+
+    def apply(self, obj_ids: Sequence[str], allocated: Sequence[int], used: Sequence[int]) -> List[int]:
+        """Record new allocated and used sizes. Returns the allocated size each object ended up with."""
+
+
+class _Population:
+    """Parallel columns holding the profile and state of every simulated object of one type."""
+
+    _COLUMNS = {
+        "live": (np.bool_, False),
+        "pool": (np.int32, -1),
+        "metric_row": (np.int64, -1),
+        "thin": (np.bool_, False),
+        "size": (np.float64, 0.0),
+        "allocated": (np.float64, 0.0),
+        "used": (np.float64, 0.0),
+        "peak_iops": (np.float32, 0.0),
+        "phase": (np.float32, 0.0),
+        "read_fraction": (np.float32, 0.0),
+        "io_size": (np.float32, 0.0),
+        "burstiness": (np.float32, 0.0),
+        "growth_rate": (np.float64, 0.0),
+    }
+
+    def __init__(self, object_type: str, rows: int = 64) -> None:
+        self.object_type = object_type
+        self.rows: Dict[str, int] = {}
+        self.ids: List[Optional[str]] = [None] * rows
+        self._free: List[int] = []
+        self._used = 0
+        self.columns = {name: np.full(rows, default, dtype=dtype) for name, (dtype, default) in self._COLUMNS.items()}
+
+    def _grow(self) -> None:
+        rows = 2 * len(self.ids)
+        for name, (dtype, default) in self._COLUMNS.items():
+            column = np.full(rows, default, dtype=dtype)
+            column[: len(self.ids)] = self.columns[name]
+            self.columns[name] = column
+        self.ids.extend([None] * (rows - len(self.ids)))
+
+    def row_for(self, obj_id: str) -> Tuple[int, bool]:
+        """Return the row of an object and whether it was just assigned."""
+        row = self.rows.get(obj_id)
+        if row is not None:
+            return row, False
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._used == len(self.ids):
+                self._grow()
+            row = self._used
+            self._used += 1
+        self.rows[obj_id] = row
+        self.ids[row] = obj_id
+        return row, True
+
+    def forget(self, obj_id: str) -> None:
+        row = self.rows.pop(obj_id, None)
+        if row is not None:
+            self.ids[row] = None
+            self.columns["live"][row] = False
+            self._free.append(row)
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.columns["live"])
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self.ids = [None] * len(self.ids)
+        self._free.clear()
+        self._used = 0
+        for name, (_, default) in self._COLUMNS.items():
+            self.columns[name].fill(default)
+
+
+class WorkloadSimulator:
+    """Advances the synthetic workload of every simulated object."""
+
+    def __init__(
+        self,
+        store: Optional[MetricStore] = None,
+        feed: Optional[ChangeFeed] = None,
+        seed: Optional[int] = None,
+        slice_size: Optional[int] = None,
+        ledger: Optional[CapacityLedger] = None,
+    ) -> None:
+        self.store = store or metric_store
+        self.feed = feed or change_feed
+        self.ledger = ledger or capacity_ledger
+        self.rng = np.random.default_rng(seed)
+        self.slice_size = slice_size or settings.WORKLOAD_SLICE_BYTES
+        # Stores of the simulated object types, by type
+        self.targets: Dict[str, WorkloadTarget] = {}
+        # Returns {pool ID: {tier name: size}} for all pools
+        self.pool_tiers: Callable[[], Dict[str, Dict[str, int]]] = dict
+        # Called with the time of every tick, by engines that account what the workload writes
+        self.followers: List[Callable[[float], None]] = []
+        self.populations: Dict[str, _Population] = {}
+        self.pool_codes: Dict[str, int] = {}
+        self.pool_ids: List[str] = []
+        self.last_time: Optional[float] = None
+        self._seq = 0
+        self._synced = False
+
+    # Keeping up with the stores
+
+    def _population(self, object_type: str) -> _Population:
+        population = self.populations.get(object_type)
+        if population is None:
+            population = self.populations[object_type] = _Population(object_type)
+        return population
+
+    def _pool_code(self, pool_id: str) -> int:
+        code = self.pool_codes.get(pool_id)
+        if code is None:
+            code = self.pool_codes[pool_id] = len(self.pool_ids)
+            self.pool_ids.append(pool_id)
+        return code
+
+    def _sync(self) -> None:
+        """Apply the changes made to the simulated stores since the last tick."""
+        # The feed was cleared if it is behind what was already seen
+        stale = not self._synced or self.feed.last_seq < self._seq
+        for object_type, target in self.targets.items():
+            population = self._population(object_type)
+            resync = stale
+            if not resync:
+                try:
+                    modified, deleted = self.feed.log(object_type).since(self._seq)
+                except ChangeHistoryExpired:
+                    resync = True
+            if resync:
+                population.clear()
+                modified, deleted = target.ids(), []
+            for obj_id in deleted:
+                population.forget(obj_id)
+            if modified:
+                self._describe(population, modified, target.describe(modified))
+        self._seq = self.feed.last_seq
+        self._synced = True
+
+    def _describe(self, population: _Population, obj_ids: Sequence[str], states: List[Optional[ObjectState]]) -> None:
+        columns = population.columns
+        new_rows = []
+        for obj_id, state in zip(obj_ids, states):
+            if state is None:
+                population.forget(obj_id)
+                continue
+            row, new = population.row_for(obj_id)
+            pool_id, size, allocated, used, thin = state
+            columns["live"][row] = True
+            columns["pool"][row] = self._pool_code(str(pool_id))
+            columns["size"][row] = size
+            columns["allocated"][row] = allocated
+            columns["used"][row] = used
+            columns["thin"][row] = thin
+            if new:
+                new_rows.append(row)
+        if new_rows:
+            self._assign_profiles(population, np.asarray(new_rows, dtype=np.int64))
+
+    def _assign_profiles(self, population: _Population, rows: np.ndarray) -> None:
+        columns, rng, count = population.columns, self.rng, len(rows)
+        columns["peak_iops"][rows] = np.minimum(rng.lognormal(math.log(200.0), 1.0, count), 50000.0)
+        columns["phase"][rows] = rng.uniform(0.0, 2 * math.pi, count)
+        columns["read_fraction"][rows] = rng.beta(7.0, 3.0, count)
+        columns["io_size"][rows] = rng.choice(IO_SIZES, count)
+        columns["burstiness"][rows] = rng.uniform(0.05, 0.5, count)
+        # Thin objects fill up by 0-2% of their size a day
+        columns["growth_rate"][rows] = columns["size"][rows] * rng.uniform(0.0, 0.02, count) / DAY
+        if population.object_type in self.store.blocks:
+            obj_ids = [population.ids[row] for row in rows.tolist()]
+            columns["metric_row"][rows] = self.store.block(population.object_type).rows_for(obj_ids)
+
+    def _pool_profiles(self, tiers_by_pool: Dict[str, Dict[str, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the base response time and IOPS limit of every pool code."""
+        latency = np.empty(len(self.pool_ids), dtype=np.float64)
+        capacity = np.empty(len(self.pool_ids), dtype=np.float64)
+        for code, pool_id in enumerate(self.pool_ids):
+            tiers = {
+                tier: size for tier, size in tiers_by_pool.get(pool_id, {}).items() if tier in TIER_PROFILES and size
+            }
+            tiers = tiers or DEFAULT_POOL_TIERS
+            total = sum(tiers.values())
+            latency[code] = sum(TIER_PROFILES[tier][0] * size / total for tier, size in tiers.items())
+            capacity[code] = sum(TIER_PROFILES[tier][1] * size / TB for tier, size in tiers.items())
+        return latency, np.maximum(capacity, 1.0)
+
+    # Simulation
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Advance every simulated object to ``now`` and record a metric sample."""
+        now = time.time() if now is None else now
+        if self.last_time is not None and now <= self.last_time:
+            return
+        elapsed = 0.0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+        self._sync()
+        tiers_by_pool = self.pool_tiers()
+        live_pools = sorted(tiers_by_pool)
+        pool_codes = np.fromiter(map(self._pool_code, live_pools), dtype=np.int64, count=len(live_pools))
+
+        # IOPS of every live object
+        loads = {}
+        for object_type, population in self.populations.items():
+            rows = population.live_rows()
+            columns = population.columns
+            diurnal = 0.6 + 0.4 * np.sin(2 * math.pi * now / DAY + columns["phase"][rows])
+            sigma = columns["burstiness"][rows]
+            burst = np.exp(self.rng.standard_normal(len(rows)) * sigma - sigma * sigma / 2)
+            loads[object_type] = (rows, diurnal, columns["peak_iops"][rows] * diurnal * burst)
+
+        # Pool utilization from the IOPS of all objects in each pool
+        pools = len(self.pool_ids)
+        pool_iops = np.zeros(pools, dtype=np.float64)
+        for object_type, (rows, _, iops) in loads.items():
+            pool_iops += np.bincount(self.populations[object_type].columns["pool"][rows], iops, minlength=pools)
+        base_latency, pool_capacity = self._pool_profiles(tiers_by_pool)
+        utilization = np.minimum(pool_iops / pool_capacity, MAX_UTILIZATION)
+        pool_latency = base_latency / (1.0 - utilization)
+
+        totals = np.zeros((len(STORAGE_PROCESSORS), 4), dtype=np.float64)
+        pool_totals = np.zeros((pools, 4), dtype=np.float64)
+        for object_type, (rows, diurnal, iops) in loads.items():
+            population = self.populations[object_type]
+            columns = population.columns
+            pool = columns["pool"][rows]
+            reads = iops * columns["read_fraction"][rows]
+            writes = iops - reads
+            rates = np.stack([reads, writes, reads * columns["io_size"][rows], writes * columns["io_size"][rows]], 1)
+            response = pool_latency[pool]
+            self._record(population, rows, now, rates, response, iops)
+            for column in range(4):
+                pool_totals[:, column] += np.bincount(pool, rates[:, column], minlength=pools)
+                totals[:, column] += np.bincount(rows % len(STORAGE_PROCESSORS), rates[:, column], minlength=2)
+            if elapsed:
+                self._grow(population, rows, diurnal, elapsed)
+
+        if live_pools:
+            block = self.store.block("pool")
+            values = np.column_stack([pool_totals[pool_codes], pool_latency[pool_codes]])
+            block.record(now, block.rows_for(live_pools), values)
+        self._record_storage_processors(now, totals)
+        for follower in self.followers:
+            follower(now)
+        self.ledger.sample(now)
+
+    def _record(
+        self,
+        population: _Population,
+        rows: np.ndarray,
+        now: float,
+        rates: np.ndarray,
+        response: np.ndarray,
+        iops: np.ndarray,
+    ) -> None:
+        if population.object_type not in self.store.blocks:
+            return
+        block: MetricBlock = self.store.block(population.object_type)
+        metric_rows = population.columns["metric_row"][rows]
+        tracked = metric_rows >= 0
+        # Little's law: requests in flight = arrival rate * time in system
+        columns = [rates[:, 0], rates[:, 1], rates[:, 2], rates[:, 3], response, iops * response / 1e6]
+        values = np.full((block.capacity, len(block.metrics)), np.nan, dtype=np.float32)
+        values[metric_rows[tracked]] = np.stack(columns[: len(block.metrics)], 1)[tracked]
+        block.record(now, None, values)
+
+    def _record_storage_processors(self, now: float, totals: np.ndarray) -> None:
+        block = self.store.block("sp")
+        iops = totals[:, 0] + totals[:, 1]
+        utilization = np.minimum(100.0 * iops / SP_MAX_IOPS, 100.0)
+        block.record(now, block.rows_for(STORAGE_PROCESSORS), np.column_stack([utilization, totals]))
+
+    def _grow(self, population: _Population, rows: np.ndarray, diurnal: np.ndarray, elapsed: float) -> None:
+        """Write new data to thin objects and write back those that needed another slice."""
+        columns = population.columns
+        thin = columns["thin"][rows]
+        rows, diurnal = rows[thin], diurnal[thin]
+        size = columns["size"][rows]
+        used = np.minimum(columns["used"][rows] + columns["growth_rate"][rows] * diurnal * elapsed, size)
+        allocated = columns["allocated"][rows]
+        wanted = np.minimum(np.maximum(allocated, np.ceil(used / self.slice_size) * self.slice_size), size)
+        columns["used"][rows] = np.minimum(used, wanted)
+        changed = np.flatnonzero(wanted != allocated)
+        if not len(changed):
+            return
+        target = self.targets.get(population.object_type)
+        if target is None:
+            columns["allocated"][rows[changed]] = wanted[changed]
+            return
+        rows = rows[changed]
+        obj_ids = [population.ids[row] for row in rows.tolist()]
+        applied = np.asarray(
+            target.apply(obj_ids, wanted[changed].astype(np.int64).tolist(), used[changed].astype(np.int64).tolist()),
+            dtype=np.float64,
+        )
+        columns["allocated"][rows] = applied
+        # Objects refused more space by a full pool cannot write past what they have
+        columns["used"][rows] = np.minimum(columns["used"][rows], applied)
+
+    def iops(self, object_type: str, obj_ids: Sequence[str]) -> np.ndarray:
+        """Return the mean IOPS over a day of each object, 0 for objects not simulated."""
+        iops = np.zeros(len(obj_ids), dtype=np.float64)
+        population = self.populations.get(object_type)
+        if population is None:
+            return iops
+        for index, obj_id in enumerate(obj_ids):
+            row = population.rows.get(obj_id)
+            if row is not None:
+                iops[index] = population.columns["peak_iops"][row]
+        # The diurnal curve averages to 0.6 of the peak, and bursts to 1
+        return 0.6 * iops
+
+    def write_rates(self, object_type: str, obj_ids: Sequence[str]) -> np.ndarray:
+        """Return the mean bytes written per second over a day to each object, 0 for objects not simulated."""
+        rates = np.zeros(len(obj_ids), dtype=np.float64)
+        population = self.populations.get(object_type)
+        if population is None:
+            return rates
+        columns = population.columns
+        for index, obj_id in enumerate(obj_ids):
+            row = population.rows.get(obj_id)
+            if row is not None:
+                writes = columns["peak_iops"][row] * (1.0 - columns["read_fraction"][row])
+                rates[index] = writes * columns["io_size"][row]
+        return 0.6 * rates
+
+    # Running
+
+    def sample(self, block: MetricBlock, timestamp: float) -> None:
+        """Make sure a sample at ``timestamp`` has been recorded; lets the simulator serve real-time queries."""
+        self.tick(timestamp)
+
+    async def run(self, interval: float) -> None:
+        """Tick every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Workload simulator tick failed")
+
+    def clear(self) -> None:
+        for population in self.populations.values():
+            population.clear()
+        self.pool_codes.clear()
+        self.pool_ids.clear()
+        self.last_time = None
+        self._seq = 0
+        self._synced = False
+
+
+workload_simulator = WorkloadSimulator()
@@ -1,35 +1,49 @@
 """Main FastAPI application module for Dell Unisphere Mock API."""
 
+import asyncio
 import logging
 import logging.config
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import Depends, FastAPI, Request, routing
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
+from dell_unisphere_mock_api.core.alerts import alert_engine
 from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.snap_schedules import snap_schedule_engine
+from dell_unisphere_mock_api.core.tiering import tiering_engine
+from dell_unisphere_mock_api.core.workload import workload_simulator
+from dell_unisphere_mock_api.middleware.compression import CompressionMiddleware
 from dell_unisphere_mock_api.middleware.csrf import CSRFMiddleware
 from dell_unisphere_mock_api.middleware.response_headers import ResponseHeaderMiddleware as ResponseHeadersMiddleware
 from dell_unisphere_mock_api.middleware.response_wrapper import ResponseWrapperMiddleware
 from dell_unisphere_mock_api.routers import (
     acl_user,
+    alert,
+    batch,
+    changes,
     cifs_server,
     disk,
     disk_group,
     filesystem,
     job,
     lun,
+    metric,
     nas_server,
     nfs_share,
     pool,
     pool_unit,
     quota,
     session,
+    snap,
+    snap_schedule,
     storage_resource,
+    system_capacity,
     system_info,
     tenant,
     user,
@@ -216,6 +230,24 @@ def custom_openapi():
         raise
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Run the workload simulator, the alert engine, FAST VP relocation windows and snapshot schedules while serving."""
+    simulator = relocations = schedules = None
+    if settings.WORKLOAD_TICK_S > 0:
+        simulator = asyncio.create_task(workload_simulator.run(settings.WORKLOAD_TICK_S))
+    if settings.FASTVP_RELOCATION_INTERVAL_S > 0:
+        relocations = asyncio.create_task(tiering_engine.run(settings.FASTVP_RELOCATION_INTERVAL_S))
+    if settings.SNAP_SCHEDULE_TICK_S > 0:
+        schedules = asyncio.create_task(snap_schedule_engine.run(settings.SNAP_SCHEDULE_TICK_S))
+    alerts = asyncio.create_task(alert_engine.run(settings.ALERT_POLL_INTERVAL_S))
+    yield
+    for task in (simulator, relocations, schedules):
+        if task is not None:
+            task.cancel()
+    alerts.cancel()
+
+
 def create_application() -> FastAPI:
     """Create FastAPI application.
 
@@ -226,6 +258,7 @@ def create_application() -> FastAPI:
         title="Dell Unisphere Mock API",
         description="Mock API for Dell Unisphere",
         version=get_version(),
+        lifespan=lifespan,
     )
 
     # Add middleware
@@ -236,7 +269,7 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    application.add_middleware(GZipMiddleware)
+    application.add_middleware(CompressionMiddleware)
     application.add_middleware(ResponseHeadersMiddleware)
     application.add_middleware(ResponseWrapperMiddleware)
     application.add_middleware(CSRFMiddleware)
@@ -301,6 +334,9 @@ def create_application() -> FastAPI:
 
     application.include_router(user.router, tags=["User"], dependencies=[Depends(get_current_user)], prefix="/api")
     application.include_router(system_info.router, tags=["System Info"], prefix="/api")
+    application.include_router(
+        system_capacity.router, tags=["System Capacity"], dependencies=[Depends(get_current_user)], prefix="/api"
+    )
     application.include_router(
         cifs_server.router, tags=["CIFS Server"], dependencies=[Depends(get_current_user)], prefix="/api"
     )
@@ -317,6 +353,14 @@ def create_application() -> FastAPI:
         acl_user.router, tags=["ACL User"], dependencies=[Depends(get_current_user)], prefix="/api"
     )
     application.include_router(tenant.router, tags=["Tenant"], dependencies=[Depends(get_current_user)], prefix="/api")
+    application.include_router(changes.router, tags=["Changes"], dependencies=[Depends(get_current_user)], prefix="/api")
+    application.include_router(metric.router, tags=["Metric"], dependencies=[Depends(get_current_user)], prefix="/api")
+    application.include_router(alert.router, tags=["Alert"], dependencies=[Depends(get_current_user)], prefix="/api")
+    application.include_router(snap.router, tags=["Snap"], dependencies=[Depends(get_current_user)], prefix="/api")
+    application.include_router(
+        snap_schedule.router, tags=["Snap Schedule"], dependencies=[Depends(get_current_user)], prefix="/api"
+    )
+    application.include_router(batch.router, tags=["Batch"], prefix="/api")
 
     return application
 
@@ -147,7 +147,8 @@ class ResponseHeaderMiddleware(BaseHTTPMiddleware):
             response.headers["Expires"] = expires.strftime("%a, %d %b %Y %H:%M:%S GMT")
             response.headers["Content-Language"] = "en-US"
             response.headers["Vary"] = "Accept-Encoding"
-            response.headers["Content-Type"] = "application/json; version=1.0;charset=UTF-8"
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                response.headers["Content-Type"] = "application/json; version=1.0;charset=UTF-8"
 
             # Set cookie
             response.set_cookie(
@@ -44,10 +44,11 @@ class ResponseWrapperMiddleware(BaseHTTPMiddleware):
         try:
             response = await call_next(request)
 
-            # Skip OpenAPI endpoints and 204 No Content responses
+            # Skip OpenAPI endpoints, 204 No Content responses and event streams
             if (request.url.path.startswith("/docs") or 
                 request.url.path.startswith("/openapi.json") or
-                response.status_code == 204):
+                response.status_code == 204 or
+                response.headers.get("content-type", "").startswith("text/event-stream")):
                 return response
 
             # Get response body
@@ -1,12 +1,57 @@
 from typing import Dict, List, Optional, Union
 
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.disk_inventory import DiskInventory
 from dell_unisphere_mock_api.schemas.disk import Disk, DiskTierEnum, DiskTypeEnum
 
 
 class DiskModel:
-    def __init__(self):
-        self.disks: Dict[str, Disk] = {}
-        self.disk_counter = 0
+    """Model for managing physical disks.
+
+    Disk objects keep the descriptive attributes; sizes, tiers, rpm, pool and disk
+    group membership and health are mirrored in a columnar inventory that serves
+    lookups by pool or disk group and the capacity rollups for pools and disk groups.
+    The tier capacity a disk adds to its pool is posted to the capacity ledger.
+    """
+
+    _instance = None
+    disks: Dict[str, Disk] = {}
+    inventory = DiskInventory()
+    disk_counter = 0
+
+    def __new__(cls) -> "DiskModel":
+        """Singleton pattern implementation."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _place(self, disk_id: str, sign: int) -> None:
+        """Post the tier capacity a disk gives its pool (``sign`` 1) or takes away (-1) to the capacity ledger."""
+        placement = self.inventory.placement(disk_id)
+        if placement is not None and placement[1] != DiskTierEnum.NONE:
+            pool_id, tier, size = placement
+            capacity_ledger.add_tier_capacity(pool_id, tier.value, sign * size)
+
+    def _index(self, disk: Disk) -> None:
+        """Mirror the numeric attributes of a disk into the inventory."""
+        self._place(disk.id, -1)
+        self.inventory.add(
+            disk.id,
+            size=disk.size,
+            tier=disk.tier_type,
+            rpm=disk.rpm,
+            pool_id=disk.pool_id,
+            disk_group_id=disk.disk_group_id,
+            health=disk.health_status,
+        )
+        self._place(disk.id, 1)
+
+    def clear(self) -> None:
+        """Remove all disks."""
+        self.disks.clear()
+        self.inventory.clear()
+        capacity_ledger.clear_tiers()
 
     def _format_disk_content(self, disk: Disk) -> Dict:
         """Helper method to format disk content consistently."""
@@ -52,6 +97,8 @@ class DiskModel:
 
         disk_obj = Disk(id=disk_id, **disk)
         self.disks[disk_id] = disk_obj
+        self._index(disk_obj)
+        change_feed.publish("disk", CREATED, disk_id)
         return self._format_response(disk_obj)
 
     def get(self, disk_id: str) -> Dict:
@@ -71,6 +118,8 @@ class DiskModel:
             for key, value in disk_update.items():
                 if hasattr(current_disk, key):
                     setattr(current_disk, key, value)
+            self._index(current_disk)
+            change_feed.publish("disk", MODIFIED, disk_id)
             return self._format_response(current_disk)
         return {"entries": []}
 
@@ -78,17 +127,20 @@ class DiskModel:
         """Delete a disk."""
         if disk_id in self.disks:
             del self.disks[disk_id]
+            self._place(disk_id, -1)
+            self.inventory.remove(disk_id)
+            change_feed.publish("disk", DELETED, disk_id)
             return True
         return False
 
     def get_by_pool(self, pool_id: str) -> Dict:
         """Get all disks associated with a specific pool."""
-        matching_disks = [disk for disk in self.disks.values() if disk.pool_id == pool_id]
+        matching_disks = [self.disks[disk_id] for disk_id in self.inventory.ids_in_pool(pool_id)]
         return self._format_response(matching_disks)
 
     def get_by_disk_group(self, disk_group_id: str) -> Dict:
         """Get all disks associated with a specific disk group."""
-        matching_disks = [disk for disk in self.disks.values() if disk.disk_group_id == disk_group_id]
+        matching_disks = [self.disks[disk_id] for disk_id in self.inventory.ids_in_disk_group(disk_group_id)]
         return self._format_response(matching_disks)
 
     def validate_disk_type(self, disk_type: str) -> bool:
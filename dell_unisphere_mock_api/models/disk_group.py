@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+from dell_unisphere_mock_api.models.disk import DiskModel
 from dell_unisphere_mock_api.schemas.disk_group import RaidStripeWidthEnum, RaidTypeEnum
 
 
@@ -8,9 +9,11 @@ class DiskGroupModel:
         self.disk_groups: Dict[str, dict] = {}
         self.next_id = 1
 
-    def _format_disk_group_content(self, disk_group: dict) -> dict:
+    def _format_disk_group_content(self, disk_group: dict, capacity: Optional[Tuple[int, int]] = None) -> dict:
         """Helper method to format disk group content consistently."""
-        return {
+        if capacity is None:
+            capacity = DiskModel.inventory.disk_group_capacity(disk_group["id"])
+        content = {
             "id": disk_group["id"],
             "name": disk_group.get("name", ""),
             "description": disk_group.get("description", ""),
@@ -23,6 +26,12 @@ class DiskGroupModel:
             "size_used": disk_group.get("size_used", 0),
             "size_free": disk_group.get("size_free", 0),
         }
+        size_total, disk_count = capacity
+        if disk_count:
+            # Capacity of groups with registered disks comes from the disk inventory
+            content["size_total"] = size_total
+            content["size_free"] = max(size_total - content["size_used"], 0)
+        return content
 
     def _format_response(self, disk_group: Optional[Union[dict, List[dict]]]) -> dict:
         """Helper method to format response consistently."""
@@ -30,7 +39,11 @@ class DiskGroupModel:
             return {"entries": []}
 
         if isinstance(disk_group, list):
-            entries = [{"content": self._format_disk_group_content(dg)} for dg in disk_group]
+            capacities = DiskModel.inventory.capacity_by_disk_group()
+            entries = [
+                {"content": self._format_disk_group_content(dg, capacities.get(dg["id"], (0, 0)))}
+                for dg in disk_group
+            ]
         else:
             entries = [{"content": self._format_disk_group_content(disk_group)}]
 
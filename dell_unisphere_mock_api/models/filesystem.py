@@ -2,6 +2,10 @@ import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.metrics import metric_store
+
 
 class FilesystemModel:
     def __init__(self):
@@ -27,7 +31,12 @@ class FilesystemModel:
         else:
             filesystem["sizeAllocated"] = filesystem["size"]
 
+        capacity_ledger.post(
+            filesystem["pool"], subscribed=filesystem["size"], allocated=filesystem["sizeAllocated"], objects=1
+        )
         self.filesystems[filesystem_id] = filesystem
+        metric_store.track("filesystem", [filesystem_id])
+        change_feed.publish("filesystem", CREATED, filesystem_id)
         return filesystem
 
     def get_filesystem(self, filesystem_id: str) -> Optional[dict]:
@@ -42,13 +51,23 @@ class FilesystemModel:
 
         filesystem = self.filesystems[filesystem_id]
 
-        # Handle size increase
-        if "size" in update_data and update_data["size"] > filesystem["size"]:
-            size_increase = update_data["size"] - filesystem["size"]
-            if filesystem.get("isThinEnabled", True):
-                filesystem["sizeAllocated"] += size_increase // 10
-            else:
-                filesystem["sizeAllocated"] += size_increase
+        # Charge the pool for growth, and credit it for shrinking, before applying anything; thin
+        # filesystems allocate a tenth of their growth and thick ones all of it, and neither keeps
+        # more allocated than its size
+        size = update_data.get("size") or filesystem["size"]
+        is_thin = update_data.get("isThinEnabled")
+        is_thin = filesystem.get("isThinEnabled", True) if is_thin is None else is_thin
+        growth = size - filesystem["size"]
+        allocated = min(filesystem["sizeAllocated"] + max(growth, 0) // 10, size) if is_thin else size
+        if growth or allocated != filesystem["sizeAllocated"]:
+            capacity_ledger.post(
+                filesystem["pool"],
+                subscribed=growth,
+                allocated=allocated - filesystem["sizeAllocated"],
+                required=max(growth, allocated - filesystem["sizeAllocated"]),
+            )
+            filesystem["sizeAllocated"] = allocated
+            filesystem["sizeUsed"] = min(filesystem["sizeUsed"], allocated)
 
         # Update other fields
         for key, value in update_data.items():
@@ -56,14 +75,64 @@ class FilesystemModel:
                 filesystem[key] = value
 
         filesystem["modified"] = datetime.now(timezone.utc)
+        change_feed.publish("filesystem", MODIFIED, filesystem_id)
         return filesystem
 
+    def set_allocations(
+        self, filesystem_ids: List[str], sizes_allocated: List[int], sizes_used: List[int]
+    ) -> List[int]:
+        """Record the space written to several thin filesystems as one change.
+
+        Filesystems whose pool runs out of space only get what it has left.
+        Returns the allocation of each filesystem afterwards, 0 for unknown ones.
+        """
+        applied, changed = [], []
+        now = datetime.now(timezone.utc)
+        for filesystem_id, size_allocated, size_used in zip(filesystem_ids, sizes_allocated, sizes_used):
+            filesystem = self.filesystems.get(filesystem_id)
+            if filesystem is None:
+                applied.append(0)
+                continue
+            growth = min(size_allocated, filesystem["size"]) - filesystem["sizeAllocated"]
+            free = capacity_ledger.free(filesystem["pool"])
+            if free is not None:
+                growth = min(growth, max(free, 0))
+            capacity_ledger.post(filesystem["pool"], allocated=growth)
+            filesystem["sizeAllocated"] += growth
+            filesystem["sizeUsed"] = min(size_used, filesystem["sizeAllocated"])
+            filesystem["modified"] = now
+            changed.append(filesystem_id)
+            applied.append(filesystem["sizeAllocated"])
+        if changed:
+            change_feed.publish_batch("filesystem", MODIFIED, changed)
+        return applied
+
+    def _release(self, filesystem: dict) -> None:
+        capacity_ledger.post(
+            filesystem["pool"], subscribed=-filesystem["size"], allocated=-filesystem["sizeAllocated"], objects=-1
+        )
+
     def delete_filesystem(self, filesystem_id: str) -> bool:
         if filesystem_id in self.filesystems:
-            del self.filesystems[filesystem_id]
+            self._release(self.filesystems.pop(filesystem_id))
+            metric_store.forget("filesystem", [filesystem_id])
+            change_feed.publish("filesystem", DELETED, filesystem_id)
             return True
         return False
 
+    def delete_filesystems(self, filesystem_ids: List[str]) -> List[str]:
+        """Delete several filesystems as one change. Returns the IDs that were deleted."""
+        deleted = []
+        for filesystem_id in filesystem_ids:
+            filesystem = self.filesystems.pop(filesystem_id, None)
+            if filesystem is not None:
+                self._release(filesystem)
+                deleted.append(filesystem_id)
+        if deleted:
+            metric_store.forget("filesystem", deleted)
+            change_feed.publish_batch("filesystem", DELETED, deleted)
+        return deleted
+
     def add_share(self, filesystem_id: str, share_id: str, share_type: str) -> bool:
         if filesystem_id not in self.filesystems:
             return False
@@ -78,6 +147,7 @@ class FilesystemModel:
         else:
             return False
 
+        change_feed.publish("filesystem", MODIFIED, filesystem_id)
         return True
 
     def remove_share(self, filesystem_id: str, share_id: str, share_type: str) -> bool:
@@ -94,4 +164,5 @@ class FilesystemModel:
         else:
             return False
 
+        change_feed.publish("filesystem", MODIFIED, filesystem_id)
         return True
@@ -1,14 +1,46 @@
+import asyncio
+import heapq
+import itertools
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.config import settings
 from dell_unisphere_mock_api.schemas.job import Job, JobCreate, JobState
 
+TERMINAL_STATES = frozenset({JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED})
+# Most finished jobs evicted by a single store operation
+EVICTION_BATCH = 256
+
 
 class JobModel:
-    def __init__(self):
-        """Initialize the job model."""
-        self._jobs: Dict[str, Job] = {}
+    """Model for managing jobs.
+
+    Jobs are indexed by state, and finished jobs are evicted once there are more
+    than ``max_count`` jobs or they finished more than ``max_age`` seconds ago.
+    Finished jobs wait in a heap ordered by completion time; every store
+    operation evicts at most ``EVICTION_BATCH`` of them, so a large backlog is
+    worked off over several calls instead of in one long pause.
+
+    Callers can wait for the state of a job to change; each waited-on job has
+    an asyncio event that is set and dropped on its next state change.
+    """
+
+    _instance = None
+    jobs: Dict[str, Job] = {}
+    max_count: int = settings.JOB_RETENTION_MAX_COUNT
+    max_age: float = settings.JOB_RETENTION_MAX_AGE_S
+    _by_state: Dict[JobState, Dict[str, Job]] = {state: {} for state in JobState}
+    _expiry: List[Tuple[float, int, str]] = []
+    _sequence = itertools.count()
+    _state_events: Dict[str, asyncio.Event] = {}
+
+    def __new__(cls) -> "JobModel":
+        """Singleton pattern implementation."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     async def create_job(self, job_data: JobCreate) -> Job:
         """Create a new job."""
@@ -23,45 +55,136 @@ class JobModel:
             modified=now,
             progressPct=0,
         )
-        self._jobs[job_id] = job
+        self.jobs[job_id] = job
+        self._by_state[job.state][job_id] = job
+        change_feed.publish("job", CREATED, job_id)
+        self.evict()
         return job
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """Get a job by ID."""
-        return self._jobs.get(job_id)
+        return self.jobs.get(job_id)
 
-    async def update_job_state(self, job_id: str, state: JobState) -> Optional[Job]:
+    async def update_job_state(
+        self, job_id: str, state: JobState, error_message: Optional[str] = None
+    ) -> Optional[Job]:
         """Update the state of a job.
 
         Args:
             job_id: The ID of the job to update
             state: The new state to set
+            error_message: Reason for a FAILED state
 
         Returns:
             Optional[Job]: The updated job if found, None otherwise
         """
-        if job_id not in self._jobs:
+        if job_id not in self.jobs:
             return None
 
-        job = self._jobs[job_id]
+        job = self.jobs[job_id]
+        now = datetime.now(timezone.utc)
+        del self._by_state[job.state][job_id]
+        self._by_state[state][job_id] = job
         job.state = state
-        job.modified = datetime.now(timezone.utc)
+        self._notify(job_id)
+        change_feed.publish("job", MODIFIED, job_id)
+        job.modified = now
 
-        # Update progress based on state
-        if state == JobState.RUNNING:
-            job.progressPct = 50
-        elif state == JobState.COMPLETED:
-            job.progressPct = 100
+        if state == JobState.RUNNING and job.startTime is None:
+            job.startTime = now
+        elif state in TERMINAL_STATES:
+            job.endTime = now
+            if state == JobState.COMPLETED:
+                job.progressPct = 100
+            if error_message is not None:
+                job.errorMessage = error_message
+            heapq.heappush(self._expiry, (now.timestamp(), next(self._sequence), job_id))
+            self.evict()
 
         return job
 
-    async def list_jobs(self) -> List[Job]:
-        """List all jobs."""
-        return list(self._jobs.values())
+    async def wait_for_state_change(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Wait up to ``timeout`` seconds for the state of an unfinished job to change.
+
+        Returns:
+            Optional[Job]: The job as of when the wait ended, None if it does not exist
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.state in TERMINAL_STATES or timeout <= 0:
+            return job
+        event = self._state_events.get(job_id)
+        if event is None:
+            event = self._state_events[job_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.jobs.get(job_id)
+
+    def _notify(self, job_id: str) -> None:
+        event = self._state_events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def set_progress(self, job_id: str, progress_pct: float) -> Optional[Job]:
+        """Record the progress of a running job."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.progressPct = round(progress_pct, 1)
+        job.modified = datetime.now(timezone.utc)
+        return job
+
+    async def list_jobs(self, state: Optional[JobState] = None) -> List[Job]:
+        """List all jobs, or only those in ``state``."""
+        self.evict()
+        if state is not None:
+            return list(self._by_state[state].values())
+        return list(self.jobs.values())
 
     async def delete_job(self, job_id: str) -> bool:
         """Delete a job."""
-        if job_id in self._jobs:
-            del self._jobs[job_id]
-            return True
-        return False
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        del self._by_state[job.state][job_id]
+        self._notify(job_id)
+        change_feed.publish("job", DELETED, job_id)
+        return True
+
+    def evict(self, limit: int = EVICTION_BATCH) -> int:
+        """Evict up to ``limit`` finished jobs that are over the count or age limit.
+
+        Returns:
+            int: The number of jobs evicted
+        """
+        expiry = self._expiry
+        cutoff = datetime.now(timezone.utc).timestamp() - self.max_age
+        evicted = 0
+        while expiry and limit > 0:
+            finished_at, _, job_id = expiry[0]
+            job = self.jobs.get(job_id)
+            # Skip entries of jobs that were deleted or finished again later
+            if job is None or job.state not in TERMINAL_STATES or job.endTime.timestamp() != finished_at:
+                heapq.heappop(expiry)
+                limit -= 1
+                continue
+            if len(self.jobs) <= self.max_count and finished_at > cutoff:
+                break
+            heapq.heappop(expiry)
+            del self.jobs[job_id]
+            del self._by_state[job.state][job_id]
+            self._notify(job_id)
+            change_feed.publish("job", DELETED, job_id)
+            evicted += 1
+            limit -= 1
+        return evicted
+
+    def clear(self) -> None:
+        """Remove all jobs."""
+        self.jobs.clear()
+        for jobs in self._by_state.values():
+            jobs.clear()
+        self._expiry.clear()
+        for job_id in list(self._state_events):
+            self._notify(job_id)
@@ -3,20 +3,53 @@ import random
 from typing import Dict, List, Optional
 from uuid import uuid4
 
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.compact import compact_record_type
+from dell_unisphere_mock_api.core.metrics import metric_store
+from dell_unisphere_mock_api.core.trusted import trusted
 from dell_unisphere_mock_api.schemas.lun import LUN, LUNCreate, LUNHealth, LUNUpdate
 
+# Every healthy LUN shares this health object in storage
+DEFAULT_LUN_HEALTH = LUNHealth(
+    value=5,
+    descriptionIds=["ALRT_COMPONENT_OK"],
+    descriptions=["The component is operating normally."],
+)
+
+WWN_PREFIX = "60060160372045"
+
+# LUNs are stored as compact records and materialized as LUN on the way out
+LUNRecord = compact_record_type(
+    LUN,
+    shared={"health": DEFAULT_LUN_HEALTH},
+    sparse={
+        "description": None,
+        "isCompressionEnabled": False,
+        "isDataReductionEnabled": False,
+        "hostAccess": [],
+        "defaultNode": 0,
+        "currentNode": 0,
+        "sizeAllocated": 0,
+    },
+    interned=("pool_id", "size"),
+)
+
 
 class LUNModel:
     """Model for managing LUNs (Logical Unit Numbers)."""
 
     _instance = None
-    luns: Dict[str, LUN]  # Class-level type annotation
+    luns: Dict[str, LUNRecord]  # Class-level type annotation
+    # LUN name -> ID; entries are checked against ``luns`` on lookup, since tests clear ``luns`` directly
+    _names: Dict[str, str]
 
     def __new__(cls) -> "LUNModel":
         """Singleton pattern implementation."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.luns = {}  # Initialize in __new__
+            cls._instance._names = {}
         return cls._instance
 
     def __init__(self) -> None:
@@ -26,39 +59,90 @@ class LUNModel:
 
     def _generate_wwn(self) -> str:
         """Generate a random World Wide Name for a LUN."""
-        prefix = "60060160372045"
-        suffix = "".join([random.choice("0123456789ABCDEF") for _ in range(18)])
-        return f"{prefix}{suffix}"
+        return f"{WWN_PREFIX}{random.getrandbits(72):018X}"
+
+    def _allocate_ids(self, count: int) -> List[str]:
+        """Return ``count`` unused LUN IDs, continuing from the number of stored LUNs."""
+        ids: List[str] = []
+        candidate = len(self.luns)
+        while len(ids) < count:
+            candidate += 1
+            if str(candidate) not in self.luns:
+                ids.append(str(candidate))
+        return ids
+
+    def _index_name(self, name: str, lun_id: str) -> None:
+        self._names[name] = lun_id
+
+    def _unindex_name(self, name: str, lun_id: str) -> None:
+        if self._names.get(name) == lun_id:
+            del self._names[name]
+
+    def name_in_use(self, name: str) -> bool:
+        """Return True if a stored LUN has this name."""
+        return self._lookup_name(name) is not None
+
+    def id_by_name(self, name: str) -> Optional[str]:
+        """Return the ID of the LUN with this name."""
+        record = self._lookup_name(name)
+        return record.id if record else None
+
+    def _lookup_name(self, name: str) -> Optional[LUNRecord]:
+        lun_id = self._names.get(name)
+        if lun_id is None:
+            return None
+        record = self.luns.get(lun_id)
+        if record is None or record.name != name:
+            del self._names[name]
+            return None
+        return record
 
     def _create_default_health(self) -> LUNHealth:
         """Create a default health status for a new LUN."""
-        return LUNHealth(
-            value=5,
-            descriptionIds=["ALRT_COMPONENT_OK"],
-            descriptions=["The component is operating normally."],
-        )
+        return DEFAULT_LUN_HEALTH.model_copy(deep=True)
 
     def create_lun(self, lun_create: LUNCreate) -> LUN:
-        """Create a new LUN."""
+        """Create a new LUN.
+
+        Raises:
+            InsufficientCapacity: If the pool has less free space than the LUN's size
+        """
         logging.debug(f"LUN model: Creating LUN with name: {lun_create.name}")
-        lun_dict = lun_create.model_dump()
-        logging.debug(f"LUN model: Initial LUN data: {lun_dict}")
+        return self._store(lun_create, self._allocate_ids(1)[0])
+
+    def create_luns(self, lun_creates: List[LUNCreate]) -> List[LUN]:
+        """Create several LUNs, allocating their IDs in one pass.
 
-        # Generate new ID
-        lun_id = str(len(self.luns) + 1)
+        The caller is expected to have checked names and pool capacity in aggregate.
+        """
+        logging.debug(f"LUN model: Creating {len(lun_creates)} LUNs")
+        lun_ids = self._allocate_ids(len(lun_creates))
+        luns = [self._store(lun_create, lun_id, track=False) for lun_create, lun_id in zip(lun_creates, lun_ids)]
+        metric_store.track("lun", [lun.id for lun in luns])
+        return luns
+
+    def _store(self, lun_create: LUNCreate, lun_id: str, track: bool = True) -> LUN:
+        lun_dict = lun_create.model_dump()
         lun_dict["id"] = lun_id
         lun_dict["pool_id"] = str(lun_dict["pool_id"])  # Ensure pool_id is string
         lun_dict["wwn"] = self._generate_wwn()
         lun_dict["health"] = self._create_default_health()
         lun_dict["currentNode"] = lun_dict.get("defaultNode", 0)
-        lun_dict["sizeAllocated"] = 0  # Initially no space allocated for thin provisioning
+        # Thin LUNs allocate space as data is written, thick LUNs all of it up front
+        lun_dict["sizeAllocated"] = 0 if lun_create.isThinEnabled else lun_create.size
 
-        # Create LUN object
-        lun = LUN(**lun_dict)
-        logging.debug(f"LUN model: Created LUN object: {lun}")
+        # Create LUN object; the client fields were validated by LUNCreate
+        lun = trusted(LUN, **lun_dict)
 
-        # Store in dictionary
-        self.luns[lun_id] = lun
+        # Thin LUNs are admitted only if their full size is free now, as before
+        capacity_ledger.post(
+            lun.pool_id, subscribed=lun.size, allocated=lun.sizeAllocated, objects=1, required=lun.size
+        )
+        self.luns[lun_id] = LUNRecord.from_model(lun)
+        self._index_name(lun.name, lun_id)
+        if track:
+            metric_store.track("lun", [lun_id])
+        change_feed.publish("lun", CREATED, lun_id)
         logging.debug(f"LUN model: Stored LUN with ID {lun_id}")
 
         return lun
@@ -66,25 +150,24 @@ class LUNModel:
     def get_lun(self, lun_id: str) -> Optional[LUN]:
         """Get a LUN by ID."""
         logging.debug(f"LUN model: Getting LUN with ID: {lun_id}")
-        return self.luns.get(lun_id)
+        record = self.luns.get(lun_id)
+        return record.to_model() if record else None
 
     def get_lun_by_name(self, name: str) -> Optional[LUN]:
         """Get a LUN by name."""
         logging.debug(f"LUN model: Getting LUN with name: {name}")
-        for lun in self.luns.values():
-            if lun.name == name:
-                return lun
-        return None
+        record = self._lookup_name(name)
+        return record.to_model() if record else None
 
     def list_luns(self) -> List[LUN]:
         """List all LUNs."""
         logging.debug("LUN model: Listing all LUNs")
-        return list(self.luns.values())
+        return [record.to_model() for record in self.luns.values()]
 
     def get_luns_by_pool(self, pool_id: str) -> List[LUN]:
         """Get all LUNs in a pool."""
         logging.debug(f"LUN model: Getting LUNs in pool with ID: {pool_id}")
-        return [lun for lun in self.luns.values() if str(lun.pool_id) == str(pool_id)]
+        return [record.to_model() for record in self.luns.values() if str(record.pool_id) == str(pool_id)]
 
     def update_lun(self, lun_id: str, lun_update: LUNUpdate) -> Optional[LUN]:
         """Update a LUN."""
@@ -92,27 +175,101 @@ class LUNModel:
         if lun_id not in self.luns:
             return None
 
-        current_lun = self.luns[lun_id]
-        update_data = lun_update.model_dump(exclude_unset=True)
+        # Charge the pool for growth before applying anything
+        record = self.luns[lun_id]
+        changes = lun_update.model_dump(exclude_unset=True)
+        size = changes.get("size") or record.size
+        is_thin = record.isThinEnabled if changes.get("isThinEnabled") is None else changes["isThinEnabled"]
+        allocated = min(record.sizeAllocated, size) if is_thin else size
+        if size != record.size or allocated != record.sizeAllocated:
+            capacity_ledger.post(
+                record.pool_id,
+                subscribed=size - record.size,
+                allocated=allocated - record.sizeAllocated,
+                required=max(size - record.size, allocated - record.sizeAllocated),
+            )
+            changes["sizeAllocated"] = allocated
 
-        # Update fields
-        updated_dict = current_lun.model_dump()
-        updated_dict.update(update_data)
+        # Validate and apply only the changed fields
+        old_name = record.name
+        record.update(changes)
+        if record.name != old_name:
+            self._unindex_name(old_name, lun_id)
+            self._index_name(record.name, lun_id)
+        change_feed.publish("lun", MODIFIED, lun_id)
+        return record.to_model()
 
-        # Create new LUN object with updated data
-        updated_lun = LUN(**updated_dict)
-        self.luns[lun_id] = updated_lun
+    def set_allocated(self, lun_id: str, size_allocated: int) -> Optional[LUN]:
+        """Record how much of a thin LUN has been written to.
 
-        return updated_lun
+        Raises:
+            InsufficientCapacity: If the pool cannot supply the additional allocation
+        """
+        record = self.luns.get(lun_id)
+        if record is None:
+            return None
+        size_allocated = min(size_allocated, record.size) if record.isThinEnabled else record.size
+        if size_allocated != record.sizeAllocated:
+            capacity_ledger.post(record.pool_id, allocated=size_allocated - record.sizeAllocated)
+            record.update({"sizeAllocated": size_allocated})
+            change_feed.publish("lun", MODIFIED, lun_id)
+        return record.to_model()
+
+    def set_allocations(self, lun_ids: List[str], sizes_allocated: List[int]) -> List[int]:
+        """Record how much of several thin LUNs has been written to, as one change.
+
+        LUNs whose pool runs out of space only get what it has left.
+        Returns the allocation of each LUN afterwards, 0 for unknown LUNs.
+        """
+        applied, changed = [], []
+        for lun_id, size_allocated in zip(lun_ids, sizes_allocated):
+            record = self.luns.get(lun_id)
+            if record is None:
+                applied.append(0)
+                continue
+            size_allocated = min(size_allocated, record.size) if record.isThinEnabled else record.size
+            growth = size_allocated - record.sizeAllocated
+            free = capacity_ledger.free(record.pool_id)
+            if free is not None:
+                growth = min(growth, max(free, 0))
+            if growth:
+                capacity_ledger.post(record.pool_id, allocated=growth)
+                record.update({"sizeAllocated": record.sizeAllocated + growth})
+                changed.append(lun_id)
+            applied.append(record.sizeAllocated)
+        if changed:
+            change_feed.publish_batch("lun", MODIFIED, changed)
+        return applied
+
+    def _release(self, record: LUNRecord) -> None:
+        capacity_ledger.post(record.pool_id, subscribed=-record.size, allocated=-record.sizeAllocated, objects=-1)
 
     def delete_lun(self, lun_id: str) -> bool:
         """Delete a LUN."""
         logging.debug(f"LUN model: Deleting LUN with ID: {lun_id}")
         if lun_id in self.luns:
-            del self.luns[lun_id]
+            record = self.luns.pop(lun_id)
+            self._unindex_name(record.name, lun_id)
+            self._release(record)
+            metric_store.forget("lun", [lun_id])
+            change_feed.publish("lun", DELETED, lun_id)
             return True
         return False
 
+    def delete_luns(self, lun_ids: List[str]) -> List[str]:
+        """Delete several LUNs as one change. Returns the IDs that were deleted."""
+        deleted = []
+        for lun_id in lun_ids:
+            record = self.luns.pop(lun_id, None)
+            if record is not None:
+                self._unindex_name(record.name, lun_id)
+                self._release(record)
+                deleted.append(lun_id)
+        if deleted:
+            metric_store.forget("lun", deleted)
+            change_feed.publish_batch("lun", DELETED, deleted)
+        return deleted
+
     def delete_lun_by_name(self, name: str) -> bool:
         """Delete a LUN by name."""
         lun = self.get_lun_by_name(name)
@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from ipaddress import IPv4Address, IPv6Address
 from typing import Dict, List, Optional, Union
 
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+
 
 class NasServerModel:
     def __init__(self):
@@ -42,6 +44,7 @@ class NasServerModel:
         }
         self.nas_servers[nas_server_id] = nas_server
         self._name_to_id[nas_server["name"]] = nas_server_id
+        change_feed.publish("nasServer", CREATED, nas_server_id)
         return nas_server
 
     def get_nas_server(self, identifier: str) -> Optional[dict]:
@@ -75,6 +78,7 @@ class NasServerModel:
                     self._name_to_id[value] = nas_server_id
 
         nas_server["updated_at"] = datetime.now(timezone.utc)
+        change_feed.publish("nasServer", MODIFIED, nas_server["id"])
         return nas_server
 
     def delete_nas_server(self, identifier: str) -> bool:
@@ -87,6 +91,7 @@ class NasServerModel:
             del self.nas_servers[nas_id]
             if nas_server["name"] in self._name_to_id:
                 del self._name_to_id[nas_server["name"]]
+            change_feed.publish("nasServer", DELETED, nas_id)
             return True
         return False
 
@@ -114,6 +119,7 @@ class NasServerModel:
 
         nas_server["user_mapping"] = mapping_data
         nas_server["updated_at"] = datetime.now(timezone.utc)
+        change_feed.publish("nasServer", MODIFIED, nas_server["id"])
         return nas_server
 
     def refresh_configuration(self, nas_server_id: str) -> Optional[dict]:
@@ -123,6 +129,7 @@ class NasServerModel:
 
         nas_server["configuration_status"] = "OK"
         nas_server["updated_at"] = datetime.now(timezone.utc)
+        change_feed.publish("nasServer", MODIFIED, nas_server["id"])
         return nas_server
 
     def ping(
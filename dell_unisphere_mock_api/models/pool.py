@@ -1,24 +1,96 @@
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.compact import compact_record_type
+from dell_unisphere_mock_api.core.data_reduction import data_reduction
+from dell_unisphere_mock_api.core.metrics import metric_store
+from dell_unisphere_mock_api.core.tiering import tiering_engine
+from dell_unisphere_mock_api.core.trusted import trusted
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.schemas.disk import DiskTierEnum
 from dell_unisphere_mock_api.schemas.pool import (
+    FastVPRelocationRateEnum,
+    FastVPStatusEnum,
     HarvestStateEnum,
     Pool,
     PoolAutoConfigurationResponse,
     PoolCreate,
+    PoolFASTVP,
+    PoolTier,
     PoolUpdate,
     RaidTypeEnum,
     StorageConfiguration,
+    TierTypeEnum,
 )
 
+# Pools are stored as compact records and materialized as Pool on the way out.
+# Most counters and optional settings stay at these values for the life of a pool.
+PoolRecord = compact_record_type(
+    Pool,
+    sparse={
+        "description": None,
+        "sizePreallocated": 0,
+        "dataReductionSizeSaved": 0,
+        "dataReductionPercent": 0,
+        "dataReductionRatio": 1.0,
+        "flashPercentage": 100,
+        "hasDataReductionEnabledLuns": False,
+        "hasDataReductionEnabledFs": False,
+        "isFASTCacheEnabled": False,
+        "poolFastVP": None,
+        "tiers": [],
+        "isHarvestEnabled": False,
+        "harvestState": HarvestStateEnum.IDLE,
+        "isSnapHarvestEnabled": False,
+        "poolSpaceHarvestHighThreshold": None,
+        "poolSpaceHarvestLowThreshold": None,
+        "snapSpaceHarvestHighThreshold": None,
+        "snapSpaceHarvestLowThreshold": None,
+        "metadataSizeSubscribed": 0,
+        "snapSizeSubscribed": 0,
+        "nonBaseSizeSubscribed": 0,
+        "metadataSizeUsed": 0,
+        "snapSizeUsed": 0,
+        "nonBaseSizeUsed": 0,
+        "rebalanceProgress": None,
+    },
+    interned=("type", "sizeTotal"),
+)
+
+DISK_TIER_TYPES = {
+    DiskTierEnum.EXTREME_PERFORMANCE: (TierTypeEnum.EXTREME_PERFORMANCE, "Extreme Performance"),
+    DiskTierEnum.PERFORMANCE: (TierTypeEnum.PERFORMANCE, "Performance"),
+    DiskTierEnum.CAPACITY: (TierTypeEnum.CAPACITY, "Capacity"),
+}
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
+def _fast_vp(fields: Dict[str, Any]) -> PoolFASTVP:
+    """Build the FAST VP state of a pool from the tiering engine's fields."""
+    return PoolFASTVP.model_construct(
+        **{
+            **fields,
+            "status": FastVPStatusEnum(fields["status"]),
+            "relocationRate": FastVPRelocationRateEnum(fields["relocationRate"]),
+            "relocationDurationEstimate": _timestamp(fields["relocationDurationEstimate"]),
+            "lastStartTime": _timestamp(fields["lastStartTime"]),
+            "lastEndTime": _timestamp(fields["lastEndTime"]),
+        }
+    )
+
 
 class PoolModel:
     """Model for managing storage pools."""
 
     _instance = None
-    pools: Dict[str, Pool] = {}  # Initialize as class variable
+    pools: Dict[str, PoolRecord] = {}  # Initialize as class variable
 
     def __new__(cls) -> "PoolModel":
         """Singleton pattern implementation."""
@@ -31,6 +103,60 @@ class PoolModel:
         # No initialization needed as it's handled in __new__
         pass
 
+    def _materialize(
+        self, record: PoolRecord, capacity: Optional[Dict[DiskTierEnum, Tuple[int, int]]] = None
+    ) -> Pool:
+        """Build the Pool for a record, with tiers from its disks and space from the ledger and data reduction model."""
+        pool = record.to_model()
+        usage = capacity_ledger.usage(pool.id)
+        if usage is not None:
+            pool.sizeSubscribed = usage.subscribed
+            pool.sizeUsed = usage.used
+            pool.sizeFree = usage.free
+            pool.snapSizeUsed = usage.snapshot
+            pool.metadataSizeUsed = usage.metadata
+            pool.isEmpty = not usage.objects
+        pool.dataReductionSizeSaved, pool.dataReductionPercent, pool.dataReductionRatio = data_reduction.pool_summary(
+            pool.id
+        )
+        if capacity is None:
+            capacity = DiskModel.inventory.pool_capacity(pool.id)
+        # Slices placed in each tier by FAST VP, and planned to move
+        tier_usage = tiering_engine.tier_usage(pool.id)
+        if tier_usage:
+            pool.poolFastVP = _fast_vp(tiering_engine.fast_vp(pool.id))
+        tiers = []
+        for disk_tier, (size, disk_count) in capacity.items():
+            if disk_tier not in DISK_TIER_TYPES:
+                continue
+            tier_type, name = DISK_TIER_TYPES[disk_tier]
+            used, moving_up, moving_down = tier_usage.get(tier_type.value, (0, 0, 0))
+            tiers.append(
+                PoolTier.model_construct(
+                    tierType=tier_type,
+                    stripeWidth=0,
+                    raidType=pool.raidType,
+                    sizeTotal=size,
+                    sizeUsed=used,
+                    sizeFree=max(size - used, 0),
+                    sizeMovingDown=moving_down,
+                    sizeMovingUp=moving_up,
+                    sizeMovingWithin=0,
+                    name=name,
+                    poolUnits=[],
+                    diskCount=disk_count,
+                    spareDriveCount=0,
+                    raidStripeWidthInfo=[],
+                )
+            )
+        if tiers:
+            total = sum(tier.sizeTotal for tier in tiers)
+            flash = capacity.get(DiskTierEnum.EXTREME_PERFORMANCE, (0, 0))[0]
+            pool.tiers = tiers
+            pool.flashPercentage = round(100 * flash / total) if total else 0
+            pool.isAllFlash = bool(total) and flash == total
+        return pool
+
     def create_pool(self, pool_create: PoolCreate) -> Pool:
         """Create a new storage pool."""
         logging.debug(f"Pool model: Creating pool with name: {pool_create.name}")
@@ -59,8 +185,9 @@ class PoolModel:
         pool_dict["hasDataReductionEnabledLuns"] = False
         pool_dict["hasDataReductionEnabledFs"] = False
         pool_dict["isFASTCacheEnabled"] = pool_dict.get("isFASTCacheEnabled", False)
-        pool_dict["creationTime"] = datetime.now(timezone.utc)
-        pool_dict["modificationTime"] = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+        pool_dict["creationTime"] = now
+        pool_dict["modificationTime"] = now
         pool_dict["isEmpty"] = True
         pool_dict["poolFastVP"] = None
         pool_dict["tiers"] = []
@@ -81,12 +208,15 @@ class PoolModel:
         pool_dict["type"] = pool_dict.get("type", "dynamic")
         pool_dict["isAllFlash"] = True
 
-        # Create pool object
-        pool = Pool(**pool_dict)
+        # Create pool object; the client fields were validated by PoolCreate
+        pool = trusted(Pool, **pool_dict)
         logging.debug(f"Pool model: Created pool object: {pool}")
 
         # Store in dictionary
-        self.pools[pool_id] = pool
+        self.pools[pool_id] = PoolRecord.from_model(pool)
+        capacity_ledger.add_pool(pool_id, pool.sizeTotal)
+        metric_store.track("pool", [pool_id])
+        change_feed.publish("pool", CREATED, pool_id)
         logging.debug(f"Pool model: Stored pool with ID {pool_id}")
 
         return pool
@@ -94,56 +224,49 @@ class PoolModel:
     def get_pool(self, pool_id: str) -> Optional[Pool]:
         """Get a pool by ID."""
         logging.debug(f"Pool model: Getting pool with ID: {pool_id}")
-        return self.pools.get(pool_id)
+        record = self.pools.get(pool_id)
+        return self._materialize(record) if record else None
 
     def get_pool_by_name(self, name: str) -> Optional[Pool]:
         """Get a pool by name."""
         logging.debug(f"Pool model: Getting pool with name: {name}")
-        for pool in self.pools.values():
-            if pool.name == name:
-                return pool
+        for record in self.pools.values():
+            if record.name == name:
+                return self._materialize(record)
         return None
 
     def list_pools(self) -> List[Pool]:
         """List all pools."""
         logging.debug("Pool model: Listing pools")
-        # Convert to list and ensure all items are Pool objects
-        pools = []
-        for pool_data in self.pools.values():
-            if isinstance(pool_data, dict):
-                pools.append(Pool(**pool_data))
-            else:
-                pools.append(pool_data)
-        return pools
+        capacities = DiskModel.inventory.capacity_by_pool()
+        return [self._materialize(record, capacities.get(pool_id, {})) for pool_id, record in self.pools.items()]
 
     def update_pool(self, pool_id: str, pool_update: PoolUpdate) -> Optional[Pool]:
         """Update a pool."""
         logging.debug(f"Pool model: Updating pool with ID: {pool_id}")
-        pool = self.pools.get(pool_id)
-        if not pool:
+        record = self.pools.get(pool_id)
+        if not record:
             return None
 
-        # Update fields
-        update_dict = pool_update.model_dump(exclude_unset=True)
-        pool_dict = pool.model_dump()
-        pool_dict.update(update_dict)
-        pool_dict["modificationTime"] = datetime.now(timezone.utc)
-
-        # Create updated pool object
-        updated_pool = Pool(**pool_dict)
-        logging.debug(f"Pool model: Updated pool object: {updated_pool}")
-
-        # Store in dictionary
-        self.pools[pool_id] = updated_pool
-        logging.debug(f"Pool model: Stored updated pool with ID {pool_id}")
+        # Validate and apply only the changed fields
+        changes = pool_update.model_dump(exclude_unset=True)
+        changes["modificationTime"] = datetime.now(timezone.utc)
+        record.update(changes)
+        if "sizeTotal" in changes:
+            capacity_ledger.resize_pool(pool_id, record.sizeTotal)
+        change_feed.publish("pool", MODIFIED, pool_id)
+        logging.debug(f"Pool model: Updated pool with ID {pool_id}: {changes}")
 
-        return updated_pool
+        return self._materialize(record)
 
     def delete_pool(self, pool_id: str) -> bool:
         """Delete a pool."""
         logging.debug(f"Pool model: Deleting pool with ID: {pool_id}")
         if pool_id in self.pools:
             del self.pools[pool_id]
+            capacity_ledger.remove_pool(pool_id)
+            metric_store.forget("pool", [pool_id])
+            change_feed.publish("pool", DELETED, pool_id)
             logging.debug(f"Pool model: Deleted pool with ID {pool_id}")
             return True
         return False
@@ -151,9 +274,12 @@ class PoolModel:
     def delete_pool_by_name(self, name: str) -> bool:
         """Delete a pool by name."""
         logging.debug(f"Pool model: Deleting pool with name: {name}")
-        for pool_id, pool in self.pools.items():
-            if pool.name == name:
+        for pool_id, record in self.pools.items():
+            if record.name == name:
                 del self.pools[pool_id]
+                capacity_ledger.remove_pool(pool_id)
+                metric_store.forget("pool", [pool_id])
+                change_feed.publish("pool", DELETED, pool_id)
                 logging.debug(f"Pool model: Deleted pool with ID {pool_id}")
                 return True
         return False
@@ -1,17 +1,95 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
-
+from typing import Any, Dict, List, Optional
+
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, change_feed
+from dell_unisphere_mock_api.core.compact import compact_record_type
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.data_reduction import data_reduction, summary
+from dell_unisphere_mock_api.core.trusted import trusted
 from dell_unisphere_mock_api.schemas.storage_resource import (
+    RelocationPolicyEnum,
     StorageResourceCreate,
+    StorageResourceHealthEnum,
     StorageResourceResponse,
+    StorageResourceTypeEnum,
     StorageResourceUpdate,
+    ThinStatusEnum,
+    TieringPolicyEnum,
 )
 
+# Storage resources are stored as compact records and materialized on the way out.
+# Host access is kept keyed by host so single-host edits are O(1).
+StorageResourceRecord = compact_record_type(
+    StorageResourceResponse,
+    sparse={
+        "description": None,
+        "type": StorageResourceTypeEnum.LUN,
+        "health": StorageResourceHealthEnum.OK,
+        "isThinEnabled": True,
+        "thinStatus": ThinStatusEnum.True_,
+        "isCompressionEnabled": False,
+        "isAdvancedDedupEnabled": False,
+        "sizeUsed": 0,
+        "tieringPolicy": None,
+        "relocationPolicy": None,
+        "esxFilesystemMajorVersion": None,
+        "metadataSize": 0,
+        "metadataSizeAllocated": 0,
+        "snapCount": 0,
+        "snapSize": 0,
+        "snapSizeAllocated": 0,
+        "dataReductionSizeSaved": 0,
+        "dataReductionPercent": 0,
+        "dataReductionRatio": 1.0,
+        "hostAccess": [],
+        "perTierSizeUsed": {},
+    },
+    interned=("pool", "sizeTotal", "sizeAllocated"),
+    keyed={"hostAccess": "host"},
+)
+
+# Fields charged to the pool's capacity ledger, and the ledger counter each goes to;
+# the pool is charged for the allocation less what data reduction saves
+CAPACITY_FIELDS = {
+    "sizeTotal": "subscribed",
+    "sizeAllocated": "allocated",
+    "snapSizeAllocated": "snapshot",
+    "metadataSizeAllocated": "metadata",
+}
+
+# Fields that change what data reduction saves on a storage resource
+REDUCTION_FIELDS = ("sizeAllocated", "isCompressionEnabled", "isAdvancedDedupEnabled")
+
+
+def _setting(update_data: Dict[str, Any], record, field: str) -> Any:
+    """A field of a storage resource after an update."""
+    value = update_data.get(field)
+    return getattr(record, field) if value is None else value
+
+
+def _capacity(resource, sign: int = 1) -> Dict[str, int]:
+    """Ledger counters of a storage resource record or model."""
+    counters = {counter: sign * getattr(resource, field) for field, counter in CAPACITY_FIELDS.items()}
+    counters["allocated"] -= sign * resource.dataReductionSizeSaved
+    return counters
+
+
+def _optional_enum(enum: type, value: Any) -> Any:
+    """The member of ``enum`` for a value given as a member or its string, or None."""
+    return None if value is None else enum(value)
+
+
+def _reduction_fields(size_allocated: int, saved: int) -> Dict[str, Any]:
+    """Data reduction fields of a storage resource that saves ``saved`` of its allocation."""
+    saved, percent, ratio = summary(size_allocated, saved)
+    return {"dataReductionSizeSaved": saved, "dataReductionPercent": percent, "dataReductionRatio": ratio}
+
 
 class StorageResourceModel:
     def __init__(self):
-        self.storage_resources: Dict[str, dict] = {}
+        self.storage_resources: Dict[str, StorageResourceRecord] = {}
 
     def create_storage_resource(self, resource_data: dict | StorageResourceCreate) -> StorageResourceResponse:
         resource_id = str(uuid.uuid4())
@@ -24,25 +102,33 @@ class StorageResourceModel:
         size_total = resource_data.get("sizeTotal", 0)
         is_thin = resource_data.get("isThinEnabled", True)
 
-        # Calculate initial allocated size
-        size_allocated = size_total // 10 if is_thin else size_total
+        # Thin resources start with one slice of their size, thick ones with all of it; the pool
+        # is charged for what remains after data reduction
+        size_allocated = min(settings.WORKLOAD_SLICE_BYTES, size_total) if is_thin else size_total
         size_used = 0  # Initially no space is used
-
-        # Create base resource with required fields
-        resource = StorageResourceResponse(
+        compression = resource_data.get("isCompressionEnabled", False)
+        dedup = resource_data.get("isAdvancedDedupEnabled", False)
+        saved = int(data_reduction.savings([resource_id], [size_allocated], [compression], [dedup])[0])
+        now = datetime.now(timezone.utc)
+
+        # Create base resource with required fields; the API validates client data with
+        # StorageResourceCreate, other callers pass data built by the mock itself
+        resource = trusted(
+            StorageResourceResponse,
             id=resource_id,
             name=resource_data.get("name"),
             description=resource_data.get("description"),
-            type=resource_data.get("type", "LUN"),
+            type=StorageResourceTypeEnum(resource_data.get("type", StorageResourceTypeEnum.LUN)),
             pool=resource_data.get("pool", "default_pool"),
             sizeTotal=size_total,
             sizeUsed=size_used,
             sizeAllocated=size_allocated,
             isThinEnabled=is_thin,
-            isCompressionEnabled=resource_data.get("isCompressionEnabled", False),
-            isAdvancedDedupEnabled=resource_data.get("isAdvancedDedupEnabled", False),
-            health="OK",
-            thinStatus="True" if is_thin else "False",
+            isCompressionEnabled=compression,
+            isAdvancedDedupEnabled=dedup,
+            **_reduction_fields(size_allocated, saved),
+            health=StorageResourceHealthEnum.OK,
+            thinStatus=ThinStatusEnum.True_ if is_thin else ThinStatusEnum.False_,
             metadataSize=0,
             metadataSizeAllocated=0,
             snapCount=0,
@@ -50,17 +136,24 @@ class StorageResourceModel:
             snapSizeAllocated=0,
             hostAccess=[],
             perTierSizeUsed={},
-            created=datetime.now(timezone.utc),
-            modified=datetime.now(timezone.utc),
-            tieringPolicy=resource_data.get("tieringPolicy"),
-            relocationPolicy=resource_data.get("relocationPolicy"),
+            created=now,
+            modified=now,
+            tieringPolicy=_optional_enum(TieringPolicyEnum, resource_data.get("tieringPolicy")),
+            relocationPolicy=_optional_enum(RelocationPolicyEnum, resource_data.get("relocationPolicy")),
         )
 
         # Add VMware-specific fields if applicable
         if resource.type in ["VMwareFS", "VVolDatastoreFS"]:
             resource.esxFilesystemMajorVersion = "6"
 
-        self.storage_resources[resource_id] = resource.model_dump()
+        try:
+            capacity_ledger.post(resource.pool, objects=1, **_capacity(resource))
+        except Exception:
+            data_reduction.forget([resource_id])
+            raise
+        data_reduction.record([resource_id], [resource.pool], [size_allocated], [saved], [compression])
+        self.storage_resources[resource_id] = StorageResourceRecord.from_model(resource)
+        change_feed.publish("storageResource", CREATED, resource_id)
         return resource
 
     def update_storage_resource(
@@ -73,73 +166,213 @@ class StorageResourceModel:
         if not isinstance(update_data, dict):
             update_data = update_data.model_dump(exclude_unset=True)
 
-        # Get current resource data
-        current_data = self.storage_resources[resource_id]
-
-        # Update the fields
-        current_data.update(update_data)
-        current_data["modified"] = datetime.now(timezone.utc)
-
-        # Create updated resource
-        resource = StorageResourceResponse(**current_data)
-        self.storage_resources[resource_id] = resource.model_dump()
-        return resource
+        # Charge the pool for any change in size before applying it
+        record = self.storage_resources[resource_id]
+        thick_resize = update_data.get("sizeTotal") is not None and not _setting(update_data, record, "isThinEnabled")
+        if thick_resize:
+            # Thick resources stay fully allocated, as LUNs do
+            update_data = {**update_data, "sizeAllocated": int(update_data["sizeTotal"])}
+        deltas = {
+            counter: int(update_data[field]) - getattr(record, field)
+            for field, counter in CAPACITY_FIELDS.items()
+            if update_data.get(field) is not None
+        }
+        # Growing a thick resource needs free space for all of its growth, before data reduction
+        required = deltas["allocated"] + deltas.get("snapshot", 0) + deltas.get("metadata", 0) if thick_resize else None
+
+        # Toggling compression or deduplication, or a new allocation, changes what this resource saves
+        reduction = None
+        if any(update_data.get(field) is not None for field in REDUCTION_FIELDS):
+            size_allocated = int(_setting(update_data, record, "sizeAllocated"))
+            compression = _setting(update_data, record, "isCompressionEnabled")
+            dedup = _setting(update_data, record, "isAdvancedDedupEnabled")
+            saved = int(data_reduction.savings([resource_id], [size_allocated], [compression], [dedup])[0])
+            reduction = (size_allocated, saved, compression)
+            deltas["allocated"] = deltas.get("allocated", 0) - (saved - record.dataReductionSizeSaved)
+            update_data = {**update_data, **_reduction_fields(size_allocated, saved)}
+        if any(deltas.values()):
+            capacity_ledger.post(record.pool, required=required, **deltas)
+
+        # Validate and apply only the changed fields
+        changes = {**update_data, "modified": datetime.now(timezone.utc)}
+        try:
+            record.update(changes)
+        except ValueError:
+            if any(deltas.values()):
+                capacity_ledger.post(record.pool, **{counter: -delta for counter, delta in deltas.items()})
+            raise
+        if reduction is not None:
+            size_allocated, saved, compression = reduction
+            data_reduction.record([resource_id], [record.pool], [size_allocated], [saved], [compression])
+        change_feed.publish("storageResource", MODIFIED, resource_id)
+        return record.to_model()
+
+    def set_allocations(
+        self, resource_ids: List[str], sizes_allocated: List[int], sizes_used: List[int]
+    ) -> List[int]:
+        """Record the space written to several thin storage resources as one change.
+
+        The pool is charged for each allocation after data reduction, with the
+        savings of all resources computed in one pass; resources whose pool runs
+        out of space only get what it has left. Returns the allocation of each
+        resource afterwards, 0 for unknown ones.
+        """
+        found = [
+            (resource_id, record, min(size_allocated, record.sizeTotal), size_used)
+            for resource_id, size_allocated, size_used in zip(resource_ids, sizes_allocated, sizes_used)
+            if (record := self.storage_resources.get(resource_id)) is not None
+        ]
+        if not found:
+            return [0] * len(resource_ids)
+        ids = [resource_id for resource_id, _, _, _ in found]
+        compression = [record.isCompressionEnabled for _, record, _, _ in found]
+        dedup = [record.isAdvancedDedupEnabled for _, record, _, _ in found]
+        savings = data_reduction.savings(ids, [wanted for _, _, wanted, _ in found], compression, dedup).tolist()
+
+        allocations, recorded = {}, []
+        now = datetime.now(timezone.utc)
+        for (resource_id, record, size_allocated, size_used), saved in zip(found, savings):
+            growth = (size_allocated - saved) - (record.sizeAllocated - record.dataReductionSizeSaved)
+            free = capacity_ledger.free(record.pool)
+            if free is not None and growth > max(free, 0):
+                # Allocate only as much as fits in what the pool has left after reduction
+                physical = record.sizeAllocated - record.dataReductionSizeSaved + max(free, 0)
+                ratio = data_reduction.ratio(resource_id, record.isCompressionEnabled, record.isAdvancedDedupEnabled)
+                size_allocated = max(min(size_allocated, int(physical * ratio)), record.sizeAllocated)
+                saved = int(
+                    data_reduction.savings(
+                        [resource_id], [size_allocated], [record.isCompressionEnabled], [record.isAdvancedDedupEnabled]
+                    )[0]
+                )
+                growth = (size_allocated - saved) - (record.sizeAllocated - record.dataReductionSizeSaved)
+            capacity_ledger.post(record.pool, allocated=growth)
+            record.update(
+                {
+                    "sizeAllocated": size_allocated,
+                    "sizeUsed": min(size_used, size_allocated),
+                    **_reduction_fields(size_allocated, saved),
+                    "modified": now,
+                }
+            )
+            allocations[resource_id] = size_allocated
+            recorded.append((record.pool, size_allocated, saved, record.isCompressionEnabled))
+        data_reduction.record(ids, *zip(*recorded))
+        change_feed.publish_batch("storageResource", MODIFIED, ids)
+        return [allocations.get(resource_id, 0) for resource_id in resource_ids]
+
+    def set_tier_usage(self, resource_ids: List[str], per_tier: List[Dict[str, int]]) -> None:
+        """Record where several storage resources' slices are, by tier, as one change."""
+        changed = []
+        now = datetime.now(timezone.utc)
+        for resource_id, tier_usage in zip(resource_ids, per_tier):
+            record = self.storage_resources.get(resource_id)
+            if record is not None:
+                record.update({"perTierSizeUsed": tier_usage, "modified": now})
+                changed.append(resource_id)
+        if changed:
+            change_feed.publish_batch("storageResource", MODIFIED, changed)
+
+    def set_snapshot_usage(
+        self, resource_ids: List[str], counts: List[int], sizes: List[int], sizes_allocated: List[int]
+    ) -> None:
+        """Record the snapshots of several storage resources and the space they hold as one change.
+
+        The pool is charged for the change in allocated snapshot space; a pool
+        that runs out of space is charged only what it has left.
+        """
+        changed = []
+        now = datetime.now(timezone.utc)
+        for resource_id, count, size, size_allocated in zip(resource_ids, counts, sizes, sizes_allocated):
+            record = self.storage_resources.get(resource_id)
+            if record is None:
+                continue
+            growth = size_allocated - record.snapSizeAllocated
+            free = capacity_ledger.free(record.pool)
+            if free is not None and growth > max(free, 0):
+                growth = max(free, 0)
+            capacity_ledger.post(record.pool, snapshot=growth)
+            record.update(
+                {
+                    "snapCount": count,
+                    "snapSize": size,
+                    "snapSizeAllocated": record.snapSizeAllocated + growth,
+                    "modified": now,
+                }
+            )
+            changed.append(resource_id)
+        if changed:
+            change_feed.publish_batch("storageResource", MODIFIED, changed)
 
     def get_storage_resource(self, resource_id: str) -> Optional[StorageResourceResponse]:
-        resource = self.storage_resources.get(resource_id)
-        if not resource:
+        record = self.storage_resources.get(resource_id)
+        if not record:
             return None
-        return StorageResourceResponse(**resource)
+        return record.to_model()
 
     def list_storage_resources(self, resource_type: Optional[str] = None) -> List[StorageResourceResponse]:
         resources = []
-        for resource in self.storage_resources.values():
-            if not resource_type or resource.get("type") == resource_type:
-                resources.append(StorageResourceResponse(**resource))
+        for record in self.storage_resources.values():
+            if not resource_type or record.type == resource_type:
+                resources.append(record.to_model())
         return resources
 
     def delete_storage_resource(self, resource_id: str) -> bool:
-        if resource_id not in self.storage_resources:
+        record = self.storage_resources.pop(resource_id, None)
+        if record is None:
             return False
-        del self.storage_resources[resource_id]
+        capacity_ledger.post(record.pool, objects=-1, **_capacity(record, -1))
+        data_reduction.forget([resource_id])
+        change_feed.publish("storageResource", DELETED, resource_id)
         return True
 
+    def delete_storage_resources(self, resource_ids: List[str]) -> List[str]:
+        """Delete several storage resources as one change. Returns the IDs that were deleted."""
+        deleted = []
+        for resource_id in resource_ids:
+            record = self.storage_resources.pop(resource_id, None)
+            if record is not None:
+                capacity_ledger.post(record.pool, objects=-1, **_capacity(record, -1))
+                deleted.append(resource_id)
+        if deleted:
+            data_reduction.forget(deleted)
+            change_feed.publish_batch("storageResource", DELETED, deleted)
+        return deleted
+
+    def _touch(self, resource_id: str) -> None:
+        self.storage_resources[resource_id].update({"modified": datetime.now(timezone.utc)})
+        change_feed.publish("storageResource", MODIFIED, resource_id)
+
     def add_host_access(self, resource_id: str, host_id: str, access_type: str) -> bool:
-        if resource_id not in self.storage_resources:
+        record = self.storage_resources.get(resource_id)
+        if record is None:
             return False
 
-        resource = self.storage_resources[resource_id]
-        host_access = resource.get("hostAccess", [])
-        host_access.append({"host": host_id, "accessType": access_type})
-        resource["hostAccess"] = host_access
-        resource["modified"] = datetime.now(timezone.utc).isoformat()
+        record.put_item("hostAccess", {"host": host_id, "accessType": access_type})
+        self._touch(resource_id)
         return True
 
     def update_host_access(self, resource_id: str, host_id: str, access_type: str) -> bool:
-        if resource_id not in self.storage_resources:
+        record = self.storage_resources.get(resource_id)
+        if record is None:
             return False
 
-        resource = self.storage_resources[resource_id]
-        host_access = resource.get("hostAccess", [])
-        for access in host_access:
-            if access["host"] == host_id:
-                access["accessType"] = access_type
-                resource["modified"] = datetime.now(timezone.utc).isoformat()
-                return True
-        return False
+        access = record.get_item("hostAccess", host_id)
+        if access is None:
+            return False
+        access["accessType"] = access_type
+        record.put_item("hostAccess", access)
+        self._touch(resource_id)
+        return True
 
     def remove_host_access(self, resource_id: str, host_id: str) -> bool:
-        if resource_id not in self.storage_resources:
+        record = self.storage_resources.get(resource_id)
+        if record is None:
             return False
 
-        resource = self.storage_resources[resource_id]
-        host_access = resource.get("hostAccess", [])
-        for i, access in enumerate(host_access):
-            if access["host"] == host_id:
-                del host_access[i]
-                resource["modified"] = datetime.now(timezone.utc).isoformat()
-                return True
-        return False
+        if record.pop_item("hostAccess", host_id) is None:
+            return False
+        self._touch(resource_id)
+        return True
 
     def manage_host_access(
         self, resource_id: str, host_access: List[Dict[str, str]]
@@ -147,10 +380,14 @@ class StorageResourceModel:
         if resource_id not in self.storage_resources:
             return None
 
-        resource = self.storage_resources[resource_id]
-        resource["hostAccess"] = host_access
-        resource["modified"] = datetime.now(timezone.utc).isoformat()
-        return StorageResourceResponse(**resource)
+        return self.update_storage_resource(resource_id, {"hostAccess": host_access})
+
+    def update_usage_stats(self, resource_id: str, size_used: int, tier_usage: Dict[str, int]) -> bool:
+        if resource_id not in self.storage_resources:
+            return False
+
+        self.update_storage_resource(resource_id, {"sizeUsed": size_used, "perTierSizeUsed": tier_usage})
+        return True
 
     def create_lun(self, lun_data: StorageResourceCreate) -> StorageResourceResponse:
         # Validate required fields
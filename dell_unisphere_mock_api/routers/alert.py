@@ -0,0 +1,78 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from dell_unisphere_mock_api.controllers.alert_controller import AlertController
+from dell_unisphere_mock_api.controllers.alert_sources import (
+    DiskAlertSource,
+    FilesystemAlertSource,
+    JobAlertSource,
+    LUNAlertSource,
+    PoolAlertSource,
+)
+from dell_unisphere_mock_api.core.alerts import alert_engine
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.job import JobModel
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.routers import filesystem
+
+router = APIRouter()
+controller = AlertController()
+
+# The alert engine evaluates its rules on the objects behind the REST API
+alert_engine.sources = {
+    "pool": PoolAlertSource(PoolModel()),
+    "disk": DiskAlertSource(DiskModel()),
+    "lun": LUNAlertSource(LUNModel()),
+    "filesystem": FilesystemAlertSource(filesystem.filesystem_controller.filesystem_model),
+    "job": JobAlertSource(JobModel()),
+}
+
+
+@router.get("/types/alert/instances", response_model=ApiResponse)
+async def list_alerts(
+    request: Request,
+    filter: Optional[str] = Query(None, description="Conditions such as severity lt 4 and isAcknowledged eq false"),
+    _: dict = Depends(get_current_user),
+):
+    """List alerts."""
+    return await controller.list_alerts(request, filter)
+
+
+@router.get("/instances/alert/{alert_id}", response_model=ApiResponse)
+async def get_alert(request: Request, alert_id: int, _: dict = Depends(get_current_user)):
+    """Get an alert by ID."""
+    return await controller.get_alert(alert_id, request)
+
+
+@router.post("/instances/alert/{alert_id}/action/acknowledge", status_code=204)
+async def acknowledge_alert(alert_id: int, _: dict = Depends(get_current_user)):
+    """Acknowledge an alert."""
+    await controller.acknowledge_alert(alert_id)
+    return Response(status_code=204)
+
+
+@router.delete("/instances/alert/{alert_id}", status_code=204)
+async def delete_alert(alert_id: int, _: dict = Depends(get_current_user)):
+    """Delete an alert."""
+    await controller.delete_alert(alert_id)
+    return Response(status_code=204)
+
+
+@router.get("/types/event/instances", response_model=ApiResponse)
+async def list_events(
+    request: Request,
+    filter: Optional[str] = Query(None, description="Conditions such as severity lt 5"),
+    _: dict = Depends(get_current_user),
+):
+    """List logged events."""
+    return await controller.list_events(request, filter)
+
+
+@router.get("/instances/event/{event_id}", response_model=ApiResponse)
+async def get_event(request: Request, event_id: int, _: dict = Depends(get_current_user)):
+    """Get an event by ID."""
+    return await controller.get_event(event_id, request)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Request
+
+from dell_unisphere_mock_api.controllers.batch_controller import BatchController
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.schemas.batch import BatchRequest, BatchResult
+
+router = APIRouter()
+controller = BatchController()
+
+
+@router.post("/batch")
+async def run_batch(
+    batch: BatchRequest, request: Request, current_user: dict = Depends(get_current_user)
+) -> ApiResponse[BatchResult]:
+    """Run many API operations in one request.
+
+    Authentication, CSRF and the response middleware apply once to the batch as a
+    whole. Each operation gets its own status and body in the response, in order.
+    """
+    return await controller.execute(batch, request, current_user)
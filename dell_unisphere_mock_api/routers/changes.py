@@ -0,0 +1,69 @@
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.changes import OBJECT_TYPES, Change, ChangeSubscription, change_feed
+from dell_unisphere_mock_api.core.config import settings
+
+router = APIRouter()
+
+
+def format_change(change: Change) -> str:
+    """Format a change as a server-sent event whose ID is its sequence number.
+
+    A batch change lists the IDs of all objects it affected under ``ids``.
+    """
+    seq, obj_type, action, obj_id, timestamp = change
+    event = {"seq": seq, "type": obj_type, "action": action}
+    if isinstance(obj_id, tuple):
+        event["ids"] = list(obj_id)
+    else:
+        event["id"] = obj_id
+    event["time"] = timestamp
+    data = json.dumps(event)
+    return f"id: {seq}\nevent: change\ndata: {data}\n\n"
+
+
+async def stream_changes(request: Request, subscription: ChangeSubscription) -> AsyncIterator[str]:
+    """Yield server-sent events for a subscription until the client disconnects."""
+    yield "retry: 3000\n\n"
+    while not await request.is_disconnected():
+        if subscription.overflowed():
+            missed = subscription.skip_overflow()
+            data = json.dumps({"firstMissedSeq": missed, "resumeSeq": subscription.cursor})
+            yield f"event: overflow\ndata: {data}\n\n"
+        changes = subscription.poll()
+        if changes:
+            yield "".join(format_change(change) for change in changes)
+        elif subscription.lag == 0 and not await subscription.wait(settings.CHANGE_FEED_HEARTBEAT_S):
+            yield ": keep-alive\n\n"
+
+
+@router.get("/changes")
+async def get_changes(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated object types to follow, e.g. pool,lun"),
+    since: Optional[int] = Query(None, ge=0, description="Resume after this sequence number"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream changes to pools, LUNs, storage resources, filesystems, NAS servers, tenants and jobs.
+
+    Each change is a server-sent ``change`` event with the object type, ID and
+    action (created, modified or deleted). Without ``since`` or a
+    ``Last-Event-ID`` header only changes made after connecting are sent. An
+    ``overflow`` event means changes were missed and the client should re-list.
+    """
+    selected = {name.strip() for name in types.split(",") if name.strip()} if types else None
+    if selected and not selected <= OBJECT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown object types: {', '.join(sorted(selected - OBJECT_TYPES))}")
+
+    subscription = change_feed.subscribe(selected, since if since is not None else last_event_id)
+    return StreamingResponse(
+        stream_changes(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
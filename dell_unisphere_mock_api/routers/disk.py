@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 
 from dell_unisphere_mock_api.core.auth import get_current_user
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.trusted import trusted, trusted_many
 from dell_unisphere_mock_api.models.disk import DiskModel
 from dell_unisphere_mock_api.schemas.disk import Disk, DiskCreate, DiskUpdate
 
@@ -25,7 +26,7 @@ async def create_disk(request: Request, disk: DiskCreate, current_user: dict = D
 
     # Create disk and return
     result = disk_model.create(disk_data)
-    disk_obj = Disk(**result["entries"][0]["content"])
+    disk_obj = trusted(Disk, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([disk_obj])
 
@@ -34,7 +35,7 @@ async def create_disk(request: Request, disk: DiskCreate, current_user: dict = D
 async def list_disks(request: Request, current_user: dict = Depends(get_current_user)):
     """List all disks."""
     result = disk_model.list()
-    disks = [Disk(**entry["content"]) for entry in result["entries"]]
+    disks = trusted_many(Disk, (entry["content"] for entry in result["entries"]))
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(disks)
 
@@ -45,7 +46,7 @@ async def get_disk(request: Request, disk_id: str, current_user: dict = Depends(
     result = disk_model.get(disk_id)
     if not result or not result["entries"]:
         raise HTTPException(status_code=404, detail="Disk not found")
-    disk = Disk(**result["entries"][0]["content"])
+    disk = trusted(Disk, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([disk])
 
@@ -56,7 +57,7 @@ async def update_disk(request: Request, disk_id: str, disk: DiskUpdate, current_
     result = disk_model.update(disk_id, disk.model_dump(exclude_unset=True))
     if not result or not result["entries"]:
         raise HTTPException(status_code=404, detail="Disk not found")
-    updated_disk = Disk(**result["entries"][0]["content"])
+    updated_disk = trusted(Disk, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([updated_disk])
 
@@ -72,7 +73,7 @@ async def delete_disk(disk_id: str, current_user: dict = Depends(get_current_use
 async def get_disks_by_pool(request: Request, pool_id: str, current_user: dict = Depends(get_current_user)):
     """Get all disks associated with a specific pool."""
     result = disk_model.get_by_pool(pool_id)
-    disks = [Disk(**entry["content"]) for entry in result["entries"]]
+    disks = trusted_many(Disk, (entry["content"] for entry in result["entries"]))
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(disks)
 
@@ -81,6 +82,6 @@ async def get_disks_by_pool(request: Request, pool_id: str, current_user: dict =
 async def get_disks_by_disk_group(request: Request, disk_group_id: str, current_user: dict = Depends(get_current_user)):
     """Get all disks associated with a specific disk group."""
     result = disk_model.get_by_disk_group(disk_group_id)
-    disks = [Disk(**entry["content"]) for entry in result["entries"]]
+    disks = trusted_many(Disk, (entry["content"] for entry in result["entries"]))
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(disks)
@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 
 from dell_unisphere_mock_api.core.auth import get_current_user
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
+from dell_unisphere_mock_api.core.trusted import trusted, trusted_many
 from dell_unisphere_mock_api.models.disk_group import DiskGroupModel
 from dell_unisphere_mock_api.schemas.disk_group import DiskGroup, DiskGroupCreate, DiskGroupUpdate
 
@@ -29,7 +30,7 @@ async def create_disk_group(
             detail="Invalid RAID configuration for the given stripe width and number of disks",
         )
     result = disk_group_model.create(disk_group.model_dump())
-    created_disk_group = DiskGroup(**result["entries"][0]["content"])
+    created_disk_group = trusted(DiskGroup, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([created_disk_group])
 
@@ -38,7 +39,7 @@ async def create_disk_group(
 async def list_disk_groups(request: Request, current_user: dict = Depends(get_current_user)):
     """List all disk groups."""
     result = disk_group_model.list()
-    disk_groups = [DiskGroup(**entry["content"]) for entry in result["entries"]]
+    disk_groups = trusted_many(DiskGroup, (entry["content"] for entry in result["entries"]))
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(disk_groups)
 
@@ -49,7 +50,7 @@ async def get_disk_group(request: Request, disk_group_id: str, current_user: dic
     result = disk_group_model.get(disk_group_id)
     if not result["entries"]:
         raise HTTPException(status_code=404, detail="Disk group not found")
-    disk_group = DiskGroup(**result["entries"][0]["content"])
+    disk_group = trusted(DiskGroup, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([disk_group])
 
@@ -65,7 +66,7 @@ async def update_disk_group(
     result = disk_group_model.update(disk_group_id, disk_group.model_dump(exclude_unset=True))
     if not result["entries"]:
         raise HTTPException(status_code=404, detail="Disk group not found")
-    updated_disk_group = DiskGroup(**result["entries"][0]["content"])
+    updated_disk_group = trusted(DiskGroup, **result["entries"][0]["content"])
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([updated_disk_group])
 
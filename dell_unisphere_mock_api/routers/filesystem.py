@@ -1,10 +1,12 @@
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from dell_unisphere_mock_api.controllers.filesystem_controller import FilesystemController
 from dell_unisphere_mock_api.core.auth import get_current_user
 from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
 from dell_unisphere_mock_api.schemas.filesystem import FilesystemCreate, FilesystemResponse, FilesystemUpdate
 
 router = APIRouter()
@@ -33,14 +35,31 @@ async def create_filesystem(
 async def list_filesystems(
     request: Request,
     response: Response,
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
     current_user: dict = Depends(get_current_user),
 ) -> ApiResponse[FilesystemResponse]:
     """
-    List all filesystem instances.
+    List all filesystem instances, or only those changed since a point.
     """
     response.headers["Accept"] = "application/json"
     response.headers["Content-Type"] = "application/json"
-    return await filesystem_controller.list_filesystems(request)
+    return await filesystem_controller.list_filesystems(request, change_seq=changeSeq, modified_since=modifiedSince)
+
+
+@router.post("/types/filesystem/action/bulkDelete", response_model=ApiResponse[BulkDeleteResponse])
+async def bulk_delete_filesystems(
+    bulk_delete: BulkDeleteRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+) -> ApiResponse[BulkDeleteResponse]:
+    """
+    Delete the filesystems given by ID or matching a filter.
+    """
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to delete filesystems")
+
+    return await filesystem_controller.delete_filesystems(request, bulk_delete)
 
 
 @router.get("/instances/filesystem/{filesystem_id}", response_model=ApiResponse[FilesystemResponse])
@@ -1,62 +1,90 @@
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
 from dell_unisphere_mock_api.controllers.job_controller import JobController
+from dell_unisphere_mock_api.controllers.job_tasks import JobTaskDispatcher
 from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
-from dell_unisphere_mock_api.schemas.job import Job, JobCreate, JobState
+from dell_unisphere_mock_api.routers import filesystem, lun, nas_server, pool, storage_resource
+from dell_unisphere_mock_api.schemas.job import JobCreate, JobState
 
-router = APIRouter(prefix="/types/job", tags=["Job"])
+router = APIRouter(tags=["Job"])
 controller = JobController()
 
+# Job tasks run against the same controllers and stores that serve the REST API
+controller.engine.dispatcher = JobTaskDispatcher(
+    pool_controller=pool.pool_controller,
+    lun_controller=lun.lun_controller,
+    filesystem_controller=filesystem.filesystem_controller,
+    storage_resource_model=storage_resource.storage_resource_model,
+    nas_server_model=nas_server.nas_server_model,
+)
 
-@router.post("/instances", response_model=ApiResponse, status_code=status.HTTP_202_ACCEPTED)
+
+@router.post("/types/job/instances", response_model=ApiResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_job(
     job_data: JobCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     current_user: dict = Depends(get_current_user),
 ):
     """Create a new job."""
     job = await controller.create_job(job_data)
-    background_tasks.add_task(simulate_job_processing, job.id)
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(
         [job], entry_links={0: [{"rel": "self", "href": f"/api/types/job/instances/{job.id}"}]}
     )
 
 
-@router.get("/instances/{job_id}", response_model=ApiResponse)
+@router.get("/types/job/instances/{job_id}", response_model=ApiResponse)
 async def get_job(
     job_id: str,
     request: Request,
+    waitTimeout: Optional[float] = Query(
+        None,
+        ge=0,
+        le=settings.JOB_MAX_WAIT_TIMEOUT_S,
+        description="Seconds to wait for the job state to change before responding",
+    ),
     current_user: dict = Depends(get_current_user),
 ):
-    """Get the status of a job."""
-    job = await controller.get_job(job_id)
+    """Get the status of a job.
+
+    With ``waitTimeout``, an unfinished job is returned as soon as its state
+    changes or the timeout expires, instead of the client polling in a loop.
+    """
+    job = await controller.get_job(job_id, waitTimeout)
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection(
         [job], entry_links={0: [{"rel": "self", "href": f"/api/types/job/instances/{job.id}"}]}
     )
 
 
-@router.get("/instances", response_model=ApiResponse)
+@router.get("/types/job/instances", response_model=ApiResponse)
 async def list_jobs(
     request: Request,
+    state: Optional[JobState] = Query(None, description="Only list jobs in this state"),
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
     current_user: dict = Depends(get_current_user),
 ):
     """List all jobs."""
-    jobs = await controller.list_jobs()
+    changes = changes_since("job", changeSeq, modifiedSince)
+    jobs = await controller.list_jobs(state, changes)
     formatter = UnityResponseFormatter(request)
-    return await formatter.format_collection(
+    response = await formatter.format_collection(
         jobs,
         entry_links={i: [{"rel": "self", "href": f"/api/types/job/instances/{job.id}"}] for i, job in enumerate(jobs)},
     )
+    response.metadata = change_metadata(changes)
+    return response
 
 
-@router.delete("/instances/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/types/job/instances/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_job(
     job_id: str,
     current_user: dict = Depends(get_current_user),
@@ -65,8 +93,22 @@ async def delete_job(
     await controller.delete_job(job_id)
 
 
-async def simulate_job_processing(job_id: str):
-    """Simulate job processing with progress updates."""
-    await controller.update_job_state(job_id, JobState.RUNNING)
-    # Simulate some work
-    await controller.update_job_state(job_id, JobState.COMPLETED)
+@router.post("/instances/job/{job_id}/action/cancel", response_model=ApiResponse)
+async def cancel_job(
+    job_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+):
+    """Cancel a queued or running job."""
+    job = await controller.cancel_job(job_id)
+    formatter = UnityResponseFormatter(request)
+    return await formatter.format_collection(
+        [job], entry_links={0: [{"rel": "self", "href": f"/api/types/job/instances/{job.id}"}]}
+    )
+
+
+@router.get("/types/job/metrics", response_model=ApiResponse)
+async def get_job_metrics(request: Request, current_user: dict = Depends(get_current_user)):
+    """Get job engine queue depth, throughput and wait/run time metrics."""
+    formatter = UnityResponseFormatter(request)
+    return await formatter.format_collection([controller.get_metrics()])
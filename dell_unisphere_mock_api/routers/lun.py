@@ -1,11 +1,13 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from dell_unisphere_mock_api.controllers.lun_controller import LUNController
 from dell_unisphere_mock_api.core.auth import get_current_user
 from dell_unisphere_mock_api.core.response_models import ApiResponse
-from dell_unisphere_mock_api.schemas.lun import LUN, LUNCreate, LUNUpdate
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
+from dell_unisphere_mock_api.schemas.lun import LUN, LUNBulkCreate, LUNBulkCreateResponse, LUNCreate, LUNUpdate
 
 router = APIRouter()
 
@@ -18,6 +20,25 @@ async def create_lun(request: Request, lun: LUNCreate, _: dict = Depends(get_cur
     return await lun_controller.create_lun(lun, request)
 
 
+@router.post("/types/lun/action/bulkCreate", status_code=201)
+async def bulk_create_luns(
+    request: Request, response: Response, bulk_create: LUNBulkCreate, _: dict = Depends(get_current_user)
+) -> ApiResponse[LUNBulkCreateResponse]:
+    """Create many LUNs in one request, all-or-nothing or best-effort."""
+    result = await lun_controller.create_luns(bulk_create, request)
+    if not result.entries[0].content.created:
+        response.status_code = 400
+    return result
+
+
+@router.post("/types/lun/action/bulkDelete")
+async def bulk_delete_luns(
+    request: Request, bulk_delete: BulkDeleteRequest, _: dict = Depends(get_current_user)
+) -> ApiResponse[BulkDeleteResponse]:
+    """Delete the LUNs given by ID or matching a filter."""
+    return await lun_controller.delete_luns(bulk_delete, request)
+
+
 @router.get("/instances/lun/name:{name}")
 async def get_lun_by_name(request: Request, name: str, _: dict = Depends(get_current_user)) -> ApiResponse[LUN]:
     """Get a LUN by name."""
@@ -31,9 +52,14 @@ async def get_lun(request: Request, lun_id: str, _: dict = Depends(get_current_u
 
 
 @router.get("/types/lun/instances")
-async def list_luns(request: Request, _: dict = Depends(get_current_user)) -> ApiResponse[List[LUN]]:
+async def list_luns(
+    request: Request,
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
+    _: dict = Depends(get_current_user),
+) -> ApiResponse[List[LUN]]:
     """List all LUNs."""
-    return await lun_controller.list_luns(request)
+    return await lun_controller.list_luns(request, change_seq=changeSeq, modified_since=modifiedSince)
 
 
 @router.patch("/instances/lun/{lun_id}")
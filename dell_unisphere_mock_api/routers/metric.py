@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from dell_unisphere_mock_api.controllers.metric_controller import MetricController
+from dell_unisphere_mock_api.controllers.workload_targets import (
+    FilesystemWorkloadTarget,
+    LUNWorkloadTarget,
+    StorageResourceWorkloadTarget,
+    pool_tiers,
+)
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.metrics import RAW
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.workload import workload_simulator
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.routers import filesystem, storage_resource
+from dell_unisphere_mock_api.schemas.metric import MetricRealTimeQueryCreate
+
+router = APIRouter()
+controller = MetricController()
+
+# The workload simulator drives the metrics and thin space growth of the objects behind the REST API,
+# and produces the samples of real-time queries
+workload_simulator.targets = {
+    "lun": LUNWorkloadTarget(LUNModel()),
+    "filesystem": FilesystemWorkloadTarget(filesystem.filesystem_controller.filesystem_model),
+    "storageResource": StorageResourceWorkloadTarget(storage_resource.storage_resource_model),
+}
+workload_simulator.pool_tiers = pool_tiers
+controller.scheduler.sampler = workload_simulator
+
+
+@router.get("/types/metric/instances", response_model=ApiResponse)
+async def list_metrics(request: Request, _: dict = Depends(get_current_user)):
+    """List the metrics that can be queried."""
+    return await controller.list_metrics(request)
+
+
+@router.get("/instances/metric/{metric_id}", response_model=ApiResponse)
+async def get_metric(request: Request, metric_id: int, _: dict = Depends(get_current_user)):
+    """Get a metric by ID."""
+    return await controller.get_metric(metric_id, request)
+
+
+@router.get("/types/metricValue/instances", response_model=ApiResponse)
+async def list_metric_values(
+    request: Request,
+    filter: Optional[str] = Query(None, description="Metric path, as path eq 'sp.*.storage.lun.*.readsRate'"),
+    startTime: Optional[datetime] = Query(None, description="Only values sampled at or after this time"),
+    endTime: Optional[datetime] = Query(None, description="Only values sampled at or before this time"),
+    interval: int = Query(RAW, description="0 for raw samples, 300 or 3600 for rollups"),
+    _: dict = Depends(get_current_user),
+):
+    """Query the values of a metric over a time range."""
+    return await controller.query_values(request, filter, startTime, endTime, interval)
+
+
+@router.post("/types/metricRealTimeQuery/instances", response_model=ApiResponse, status_code=201)
+async def create_real_time_query(
+    request: Request, query: MetricRealTimeQueryCreate, _: dict = Depends(get_current_user)
+):
+    """Start sampling metric paths in real time."""
+    return await controller.create_query(request, query)
+
+
+@router.get("/types/metricRealTimeQuery/instances", response_model=ApiResponse)
+async def list_real_time_queries(request: Request, _: dict = Depends(get_current_user)):
+    """List the active real-time queries."""
+    return await controller.list_queries(request)
+
+
+@router.get("/instances/metricRealTimeQuery/{query_id}", response_model=ApiResponse)
+async def get_real_time_query(request: Request, query_id: int, _: dict = Depends(get_current_user)):
+    """Get a real-time query by ID."""
+    return await controller.get_query(query_id, request)
+
+
+@router.delete("/instances/metricRealTimeQuery/{query_id}", status_code=204)
+async def delete_real_time_query(query_id: int, _: dict = Depends(get_current_user)):
+    """Stop a real-time query."""
+    await controller.delete_query(query_id)
+    return Response(status_code=204)
+
+
+@router.get("/types/metricQueryResult/instances", response_model=ApiResponse)
+async def list_query_results(
+    request: Request,
+    filter: Optional[str] = Query(None, description="Query to return the results of, as queryId eq 5"),
+    _: dict = Depends(get_current_user),
+):
+    """Return the recent results of a real-time query."""
+    return await controller.list_query_results(request, filter)
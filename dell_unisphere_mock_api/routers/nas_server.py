@@ -1,8 +1,13 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
+from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.models.nas_server import NasServerModel
 from dell_unisphere_mock_api.schemas.nas_server import (
     NasServerCreate,
@@ -36,10 +41,29 @@ async def create_nas_server(nas_server_data: NasServerCreate, current_user: dict
 
 @router.get("/types/nasServer/instances", response_model=List[NasServerResponse])
 async def list_nas_servers(
+    request: Request,
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
     current_user: dict = Depends(get_current_user),
-) -> List[dict]:
-    """List all NAS server instances."""
-    return nas_server_model.list_nas_servers()
+) -> Union[List[dict], JSONResponse]:
+    """List all NAS server instances, or only those changed since a point.
+
+    Incremental listings are returned as a formatted collection whose metadata
+    carries the IDs of deleted NAS servers and the current change sequence number.
+    """
+    changes = changes_since("nasServer", changeSeq, modifiedSince)
+    if changes is None:
+        return nas_server_model.list_nas_servers()
+
+    nas_servers = [
+        NasServerResponse.model_validate(nas_server)
+        for nas_server in map(nas_server_model.get_nas_server, changes.modified)
+        if nas_server is not None
+    ]
+    formatter = UnityResponseFormatter(request)
+    response = await formatter.format_collection(nas_servers)
+    response.metadata = change_metadata(changes)
+    return JSONResponse(content=jsonable_encoder(response.model_dump(by_alias=True)))
 
 
 @router.get("/instances/nasServer/{nas_id}", response_model=NasServerResponse)
@@ -6,16 +6,35 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 
 from dell_unisphere_mock_api.controllers.pool_controller import PoolController
+from dell_unisphere_mock_api.controllers.tiering_targets import StorageResourceTieringTarget, pool_tier_capacity
 from dell_unisphere_mock_api.core.auth import get_current_user
 from dell_unisphere_mock_api.core.config import settings
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
-from dell_unisphere_mock_api.schemas.pool import Pool, PoolAutoConfigurationResponse, PoolCreate, PoolUpdate
+from dell_unisphere_mock_api.core.tiering import tiering_engine
+from dell_unisphere_mock_api.core.workload import workload_simulator
+from dell_unisphere_mock_api.routers import storage_resource
+from dell_unisphere_mock_api.schemas.pool import (
+    Pool,
+    PoolAutoConfigurationResponse,
+    PoolCreate,
+    PoolStartRelocation,
+    PoolUpdate,
+)
 
 router = APIRouter()
 
 pool_controller = PoolController()
 
+# FAST VP tiers the slices of the storage resources behind the REST API by their simulated workload,
+# and relocates them in jobs
+tiering_engine.targets = {
+    "storageResource": StorageResourceTieringTarget(storage_resource.storage_resource_model),
+}
+tiering_engine.pool_capacity = pool_tier_capacity
+tiering_engine.heat = workload_simulator.iops
+tiering_engine.schedule = pool_controller.schedule_relocation
+
 
 @router.post("/types/pool/instances", status_code=201)
 async def create_pool(
@@ -77,10 +96,14 @@ async def list_pools(
     page: Optional[int] = Query(1),
     per_page: Optional[int] = Query(2000),
     orderby: Optional[str] = Query(None),
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
     _: dict = Depends(get_current_user),
 ) -> ApiResponse[List[Pool]]:
     """List all pools with filtering and pagination."""
-    return await pool_controller.list_pools(request, compact, fields, page, per_page, orderby)
+    return await pool_controller.list_pools(
+        request, compact, fields, page, per_page, orderby, change_seq=changeSeq, modified_since=modifiedSince
+    )
 
 
 @router.patch("/instances/pool/{pool_id}")
@@ -111,3 +134,37 @@ async def recommend_auto_configuration(
 ) -> ApiResponse[PoolAutoConfigurationResponse]:
     """Get recommended pool configurations based on available drives."""
     return await pool_controller.recommend_auto_configuration(request)
+
+
+@router.get("/types/pool/action/forecast", response_model=ApiResponse)
+async def forecast_pools(request: Request, _: dict = Depends(get_current_user)):
+    """Get the capacity forecast of every pool, fitted to its used space history."""
+    return await pool_controller.forecast_pools(request)
+
+
+@router.get("/instances/pool/{pool_id}/action/forecast", response_model=ApiResponse)
+async def forecast_pool(request: Request, pool_id: str, _: dict = Depends(get_current_user)):
+    """Get the capacity forecast of a pool, fitted to its used space history."""
+    return await pool_controller.forecast_pool(pool_id, request)
+
+
+@router.post("/instances/pool/{pool_id}/action/startRelocation", response_model=ApiResponse, status_code=202)
+async def start_relocation(
+    request: Request,
+    pool_id: str,
+    relocation: Optional[PoolStartRelocation] = None,
+    _: dict = Depends(get_current_user),
+):
+    """Start a FAST VP relocation of the pool's slices; returns the job that runs it."""
+    job = await pool_controller.start_relocation(pool_id, relocation)
+    formatter = UnityResponseFormatter(request)
+    return await formatter.format_collection(
+        [job], entry_links={0: [{"rel": "self", "href": f"/api/types/job/instances/{job.id}"}]}
+    )
+
+
+@router.post("/instances/pool/{pool_id}/action/stopRelocation", status_code=204)
+async def stop_relocation(pool_id: str, _: dict = Depends(get_current_user)):
+    """Stop a running FAST VP relocation of the pool after its current batch of slices."""
+    await pool_controller.stop_relocation(pool_id)
+    return Response(status_code=204)
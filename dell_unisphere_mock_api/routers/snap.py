@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from dell_unisphere_mock_api.controllers.snap_controller import SnapController
+from dell_unisphere_mock_api.controllers.snapshot_targets import StorageResourceSnapshotTarget
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.core.snapshots import snapshot_engine
+from dell_unisphere_mock_api.core.workload import workload_simulator
+from dell_unisphere_mock_api.routers import storage_resource
+from dell_unisphere_mock_api.schemas.snap import SnapCreate, SnapRestore
+
+router = APIRouter()
+controller = SnapController()
+
+# Snapshots are taken of the storage resources behind the REST API, which change blocks at the rate
+# their simulated workload writes; the space snapshots hold is accounted on every workload tick
+snapshot_engine.target = StorageResourceSnapshotTarget(storage_resource.storage_resource_model)
+snapshot_engine.write_rate = lambda obj_ids: workload_simulator.write_rates("storageResource", obj_ids)
+# Writes are accounted on the snapshot engine's clock, which snapshot schedules may have fast-forwarded
+workload_simulator.followers.append(lambda _: snapshot_engine.advance())
+
+
+@router.get("/types/snap/instances", response_model=ApiResponse)
+async def list_snaps(
+    request: Request,
+    filter: Optional[str] = Query(None, description="Conditions such as storageResource eq 'sr_1'"),
+    _: dict = Depends(get_current_user),
+):
+    """List snapshots."""
+    return await controller.list_snaps(request, filter)
+
+
+@router.post("/types/snap/instances", response_model=ApiResponse, status_code=201)
+async def create_snap(request: Request, snap_create: SnapCreate, _: dict = Depends(get_current_user)):
+    """Take a snapshot of a storage resource."""
+    return await controller.create_snap(request, snap_create)
+
+
+@router.get("/instances/snap/{snap_id}", response_model=ApiResponse)
+async def get_snap(request: Request, snap_id: str, _: dict = Depends(get_current_user)):
+    """Get a snapshot by ID."""
+    return await controller.get_snap(snap_id, request)
+
+
+@router.delete("/instances/snap/{snap_id}", status_code=204)
+async def delete_snap(snap_id: str, _: dict = Depends(get_current_user)):
+    """Delete a snapshot."""
+    await controller.delete_snap(snap_id)
+    return Response(status_code=204)
+
+
+@router.post("/instances/snap/{snap_id}/action/restore", response_model=ApiResponse)
+async def restore_snap(
+    request: Request, snap_id: str, restore: Optional[SnapRestore] = None, _: dict = Depends(get_current_user)
+):
+    """Restore the storage resource of a snapshot to the snapshot."""
+    return await controller.restore_snap(snap_id, restore or SnapRestore(), request)
+
+
+@router.post("/instances/snap/{snap_id}/action/attach", status_code=204)
+async def attach_snap(snap_id: str, _: dict = Depends(get_current_user)):
+    """Give hosts access to a snapshot."""
+    await controller.attach_snap(snap_id)
+    return Response(status_code=204)
+
+
+@router.post("/instances/snap/{snap_id}/action/detach", status_code=204)
+async def detach_snap(snap_id: str, _: dict = Depends(get_current_user)):
+    """Take hosts' access to a snapshot away."""
+    await controller.detach_snap(snap_id)
+    return Response(status_code=204)
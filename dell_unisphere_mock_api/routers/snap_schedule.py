@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Request, Response
+
+from dell_unisphere_mock_api.controllers.snap_schedule_controller import SnapScheduleController
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+from dell_unisphere_mock_api.routers import storage_resource
+from dell_unisphere_mock_api.schemas.snap_schedule import SnapScheduleCreate, SnapScheduleModify
+
+router = APIRouter()
+# Schedules protect the storage resources behind the REST API
+controller = SnapScheduleController(resources=storage_resource.storage_resource_model)
+
+
+@router.get("/types/snapSchedule/instances", response_model=ApiResponse)
+async def list_snap_schedules(request: Request, _: dict = Depends(get_current_user)):
+    """List snapshot schedules."""
+    return await controller.list_schedules(request)
+
+
+@router.post("/types/snapSchedule/instances", response_model=ApiResponse, status_code=201)
+async def create_snap_schedule(
+    request: Request, schedule_create: SnapScheduleCreate, _: dict = Depends(get_current_user)
+):
+    """Create a snapshot schedule."""
+    return await controller.create_schedule(request, schedule_create)
+
+
+@router.get("/instances/snapSchedule/{schedule_id}", response_model=ApiResponse)
+async def get_snap_schedule(request: Request, schedule_id: str, _: dict = Depends(get_current_user)):
+    """Get a snapshot schedule by ID."""
+    return await controller.get_schedule(schedule_id, request)
+
+
+@router.post("/instances/snapSchedule/{schedule_id}/action/modify", status_code=204)
+async def modify_snap_schedule(schedule_id: str, modify: SnapScheduleModify, _: dict = Depends(get_current_user)):
+    """Change the name, rules or storage resources of a snapshot schedule."""
+    await controller.modify_schedule(schedule_id, modify)
+    return Response(status_code=204)
+
+
+@router.delete("/instances/snapSchedule/{schedule_id}", status_code=204)
+async def delete_snap_schedule(schedule_id: str, _: dict = Depends(get_current_user)):
+    """Delete a snapshot schedule; the snapshots it took are kept."""
+    await controller.delete_schedule(schedule_id)
+    return Response(status_code=204)
@@ -1,12 +1,17 @@
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.bulk import select_for_delete
+from dell_unisphere_mock_api.core.capacity import InsufficientCapacity
+from dell_unisphere_mock_api.core.incremental import change_metadata, changes_since
 from dell_unisphere_mock_api.core.response import UnityResponseFormatter
 from dell_unisphere_mock_api.core.response_models import ApiResponse
 from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel, StorageResourceResponse
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse
+from dell_unisphere_mock_api.schemas.storage_resource import StorageResourceCreate
 
 router = APIRouter()
 storage_resource_model = StorageResourceModel()
@@ -14,7 +19,10 @@ storage_resource_model = StorageResourceModel()
 
 @router.post("/types/storageResource/instances", response_model=ApiResponse[StorageResourceResponse], status_code=201)
 async def create_storage_resource(
-    resource_data: dict, request: Request, response: Response, current_user: dict = Depends(get_current_user)
+    resource_data: StorageResourceCreate,
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
 ) -> ApiResponse[StorageResourceResponse]:
     """Create a new storage resource instance."""
     if not current_user:
@@ -29,7 +37,10 @@ async def create_storage_resource(
     response.headers["Accept"] = "application/json"
     response.headers["Content-Type"] = "application/json"
 
-    resource = storage_resource_model.create_storage_resource(resource_data)
+    try:
+        resource = storage_resource_model.create_storage_resource(resource_data)
+    except InsufficientCapacity:
+        raise HTTPException(status_code=400, detail="Pool does not have enough free space")
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([resource])
 
@@ -38,15 +49,27 @@ async def create_storage_resource(
 async def list_storage_resources(
     request: Request,
     response: Response,
+    changeSeq: Optional[int] = Query(None, ge=0, description="Only list objects changed after this sequence number"),
+    modifiedSince: Optional[datetime] = Query(None, description="Only list objects changed after this time"),
     current_user: dict = Depends(get_current_user),
 ) -> ApiResponse[StorageResourceResponse]:
-    """List all storage resource instances."""
+    """List all storage resource instances, or only those changed since a point."""
     response.headers["Accept"] = "application/json"
     response.headers["Content-Type"] = "application/json"
 
-    resources = storage_resource_model.list_storage_resources()
+    changes = changes_since("storageResource", changeSeq, modifiedSince)
+    if changes is None:
+        resources = storage_resource_model.list_storage_resources()
+    else:
+        resources = [
+            resource
+            for resource in map(storage_resource_model.get_storage_resource, changes.modified)
+            if resource is not None
+        ]
     formatter = UnityResponseFormatter(request)
-    return await formatter.format_collection(resources)
+    result = await formatter.format_collection(resources)
+    result.metadata = change_metadata(changes)
+    return result
 
 
 @router.get("/instances/storageResource/{resource_id}", response_model=ApiResponse[StorageResourceResponse])
@@ -80,7 +103,10 @@ async def update_storage_resource(
     response.headers["Accept"] = "application/json"
     response.headers["Content-Type"] = "application/json"
 
-    resource = storage_resource_model.update_storage_resource(resource_id, update_data)
+    try:
+        resource = storage_resource_model.update_storage_resource(resource_id, update_data)
+    except InsufficientCapacity:
+        raise HTTPException(status_code=400, detail="Pool does not have enough free space")
     if not resource:
         raise HTTPException(status_code=404, detail="Storage resource not found")
 
@@ -125,7 +151,10 @@ async def modify_host_access(
     response.headers["Accept"] = "application/json"
     response.headers["Content-Type"] = "application/json"
 
-    resource = storage_resource_model.modify_host_access(resource_id, host_access)
+    try:
+        resource = storage_resource_model.manage_host_access(resource_id, host_access.get("hostAccess", []))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not resource:
         raise HTTPException(status_code=404, detail="Storage resource not found")
 
@@ -218,3 +247,22 @@ async def delete_storage_resource_action(
 
     formatter = UnityResponseFormatter(request)
     return await formatter.format_collection([resource])
+
+
+@router.post("/types/storageResource/action/bulkDelete", response_model=ApiResponse[BulkDeleteResponse])
+async def bulk_delete_storage_resources(
+    bulk_delete: BulkDeleteRequest, request: Request, current_user: dict = Depends(get_current_user)
+) -> ApiResponse[BulkDeleteResponse]:
+    """Delete the storage resources given by ID or matching a filter, skipping those with snapshots."""
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to delete storage resources")
+
+    resource_ids, skipped, not_found = select_for_delete(
+        bulk_delete,
+        storage_resource_model.storage_resources,
+        blocked=lambda record: "Storage resource has snapshots" if record.snapCount else None,
+    )
+    deleted = storage_resource_model.delete_storage_resources(resource_ids)
+
+    formatter = UnityResponseFormatter(request)
+    return await formatter.format_collection([BulkDeleteResponse(deleted=deleted, skipped=skipped, notFound=not_found)])
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Request
+
+from dell_unisphere_mock_api.controllers.system_capacity_controller import SystemCapacityController
+from dell_unisphere_mock_api.core.auth import get_current_user
+from dell_unisphere_mock_api.core.response_models import ApiResponse
+
+router = APIRouter()
+controller = SystemCapacityController()
+
+
+@router.get("/types/systemCapacity/instances", response_model=ApiResponse)
+async def list_system_capacity(request: Request, _: dict = Depends(get_current_user)):
+    """Get the capacity of the system."""
+    return await controller.list_system_capacity(request)
+
+
+@router.get("/instances/systemCapacity/{capacity_id}", response_model=ApiResponse)
+async def get_system_capacity(request: Request, capacity_id: str, _: dict = Depends(get_current_user)):
+    """Get the capacity of the system by ID."""
+    return await controller.get_system_capacity(capacity_id, request)
+
+
+@router.get("/types/systemTierCapacity/instances", response_model=ApiResponse)
+async def list_system_tier_capacity(request: Request, _: dict = Depends(get_current_user)):
+    """Get the capacity of every storage tier of the system."""
+    return await controller.list_tier_capacity(request)
+
+
+@router.get("/instances/systemTierCapacity/{tier_id}", response_model=ApiResponse)
+async def get_system_tier_capacity(request: Request, tier_id: str, _: dict = Depends(get_current_user)):
+    """Get the capacity of one storage tier of the system."""
+    return await controller.get_tier_capacity(tier_id, request)
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class AlertComponent(BaseModel):
+    """Object an alert or event is about."""
+
+    id: str = Field(..., description="ID of the object")
+    resource: str = Field(..., description="Type of the object")
+
+
+class Alert(BaseModel):
+    """An alert raised by a condition of a storage object."""
+
+    id: int = Field(..., description="Unique identifier of the alert")
+    timestamp: datetime = Field(..., description="Time the alert was raised")
+    severity: int = Field(..., description="Severity, from 2 (critical) to 6 (informational)")
+    component: AlertComponent = Field(..., description="Object the alert is about")
+    messageId: str = Field(..., description="ID of the alert message")
+    message: str = Field(..., description="Alert message")
+    state: int = Field(..., description="1 while the condition holds, 2 once it has cleared")
+    isAcknowledged: bool = Field(False, description="Whether the alert has been acknowledged")
+
+
+class Event(BaseModel):
+    """An entry of the system event log."""
+
+    id: int = Field(..., description="Unique identifier of the event")
+    node: str = Field("spa", description="Storage processor that logged the event")
+    creationTime: datetime = Field(..., description="Time the event was logged")
+    severity: int = Field(..., description="Severity, from 2 (critical) to 6 (informational)")
+    messageId: str = Field(..., description="ID of the event message")
+    message: str = Field(..., description="Event message")
+    category: str = Field("Alert", description="Category of the event")
+    source: AlertComponent = Field(..., description="Object the event is about")
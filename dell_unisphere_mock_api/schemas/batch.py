@@ -0,0 +1,22 @@
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchOperation(BaseModel):
+    """One request of a batch."""
+
+    method: Literal["GET", "POST", "PATCH", "PUT", "DELETE"] = Field(..., description="HTTP method")
+    path: str = Field(..., description="Request path under /api, with an optional query string")
+    body: Optional[Any] = Field(None, description="JSON request body")
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., description="Operations to run, in order", min_length=1)
+
+
+class BatchResult(BaseModel):
+    """Response to one operation of a batch."""
+
+    status: int = Field(..., description="HTTP status code of the operation")
+    body: Optional[Any] = Field(None, description="JSON response body of the operation")
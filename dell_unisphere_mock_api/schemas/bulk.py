@@ -0,0 +1,29 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class BulkDeleteRequest(BaseModel):
+    """Objects to delete, given either by ID or by a filter expression."""
+
+    ids: Optional[List[str]] = Field(None, description="IDs of the objects to delete")
+    filter: Optional[str] = Field(None, description="Filter expression, e.g. \"name eq 'test_*' and size gt 100\"")
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "BulkDeleteRequest":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Exactly one of ids or filter must be given")
+        return self
+
+
+class BulkDeleteSkipped(BaseModel):
+    id: str = Field(..., description="ID of the object that was not deleted")
+    reason: str = Field(..., description="Why the object was not deleted")
+
+
+class BulkDeleteResponse(BaseModel):
+    deleted: List[str] = Field(default_factory=list, description="IDs of the deleted objects")
+    skipped: List[BulkDeleteSkipped] = Field(
+        default_factory=list, description="Objects that matched but could not be deleted"
+    )
+    notFound: List[str] = Field(default_factory=list, description="Requested IDs that do not exist")
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class JobState(str, Enum):
@@ -22,6 +22,7 @@ class JobTask(BaseModel):
     object: str
     action: str
     parametersIn: Dict
+    parametersOut: Optional[Dict] = None
     description: Optional[str] = None
     descriptionArg: Optional[str] = None
 
@@ -32,6 +33,7 @@ class JobCreate(BaseModel):
     description: str
     tasks: List[JobTask]
     timeout: Optional[int] = None
+    priority: int = Field(0, description="Scheduling priority; jobs with higher values run first")
 
 
 class Job(BaseModel):
@@ -45,6 +47,8 @@ class Job(BaseModel):
     errorMessage: Optional[str] = None
     created: datetime
     modified: datetime
+    startTime: Optional[datetime] = None
+    endTime: Optional[datetime] = None
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -64,3 +68,28 @@ class Job(BaseModel):
             }
         }
     )
+
+
+class JobLatencyStats(BaseModel):
+    """Summary of recent job wait or run times."""
+
+    count: int
+    meanMs: float
+    p50Ms: float
+    p95Ms: float
+    maxMs: float
+
+
+class JobEngineMetrics(BaseModel):
+    """Queue and latency metrics of the job engine."""
+
+    workers: int
+    queueDepth: int
+    maxQueueDepth: int
+    running: int
+    submitted: int
+    completed: int
+    failed: int
+    cancelled: int
+    waitTime: JobLatencyStats
+    runTime: JobLatencyStats
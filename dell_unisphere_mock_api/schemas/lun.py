@@ -99,3 +99,24 @@ class LUN(LUNInDB):
             }
         },
     )
+
+
+class LUNBulkCreate(BaseModel):
+    luns: List[LUNCreate] = Field(..., description="LUNs to create", min_length=1)
+    atomic: bool = Field(
+        True, description="Create all LUNs or none; otherwise create the valid ones and report the rest"
+    )
+
+
+class LUNBulkCreateResult(BaseModel):
+    index: int = Field(..., description="Position of the LUN in the request")
+    id: Optional[str] = Field(None, description="ID of the created LUN")
+    wwn: Optional[str] = Field(None, description="World Wide Name of the created LUN")
+    status: int = Field(..., description="HTTP status the LUN would have got from a single create")
+    error: Optional[str] = Field(None, description="Why the LUN was not created")
+
+
+class LUNBulkCreateResponse(BaseModel):
+    created: int = Field(..., description="Number of LUNs created")
+    failed: int = Field(..., description="Number of LUNs not created")
+    results: List[LUNBulkCreateResult] = Field(default_factory=list, description="Outcome per requested LUN")
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class Metric(BaseModel):
+    """A metric that can be queried."""
+
+    id: int = Field(..., description="Unique identifier of the metric")
+    name: str = Field(..., description="Name of the metric")
+    path: str = Field(..., description="Path of the metric; '*' segments stand for any storage processor or object")
+    description: str = Field(..., description="Description of the metric")
+    unitDisplayString: str = Field(..., description="Unit of the metric values")
+    isHistoricalAvailable: bool = Field(True, description="Whether historical values can be queried")
+    isRealtimeAvailable: bool = Field(True, description="Whether real-time values can be queried")
+
+
+class MetricValue(BaseModel):
+    """Values of a metric for every matching object at one point in time."""
+
+    path: str = Field(..., description="Metric path that was queried")
+    timestamp: datetime = Field(..., description="Time of the sample, or start of the interval for rollups")
+    interval: int = Field(..., description="Seconds covered by each value; 0 for raw samples")
+    values: Dict[str, float] = Field(default_factory=dict, description="Value per object ID")
+
+
+class MetricRealTimeQueryCreate(BaseModel):
+    """Request to sample metrics in real time."""
+
+    paths: List[str] = Field(..., min_length=1, description="Metric paths to sample")
+    interval: int = Field(..., ge=5, description="Sampling interval in seconds")
+
+
+class MetricRealTimeQuery(BaseModel):
+    """A real-time metric query."""
+
+    id: int = Field(..., description="Unique identifier of the query")
+    paths: List[str] = Field(..., description="Metric paths sampled")
+    interval: int = Field(..., description="Sampling interval in seconds")
+    expiration: datetime = Field(..., description="Time the query expires unless its results are polled")
+
+
+class MetricQueryResult(BaseModel):
+    """Values of one metric path sampled for a real-time query."""
+
+    queryId: int = Field(..., description="ID of the query")
+    path: str = Field(..., description="Metric path")
+    timestamp: datetime = Field(..., description="Time of the sample")
+    values: Dict[str, float] = Field(default_factory=dict, description="Value per object ID")
@@ -302,3 +302,21 @@ class PoolAutoConfigurationResponse(BaseModel):
     isMaxSizeLimitExceeded: bool = False
     isMaxDiskNumberLimitExceeded: bool = False
     isRPMMixed: bool = False
+
+
+class PoolStartRelocation(BaseModel):
+    """Arguments of starting a FAST VP relocation of a pool."""
+
+    relocationRate: Optional[FastVPRelocationRateEnum] = Field(None, description="Default: the pool's current rate")
+
+
+class PoolCapacityForecast(BaseModel):
+    """Projected growth of a pool, fitted to its used space history."""
+
+    id: str
+    sizeTotal: int
+    sizeUsed: int
+    growthPerDay: float = Field(..., description="Bytes per day; negative if the pool is shrinking")
+    daysToFull: Optional[float] = Field(None, description="Not set if the pool is not growing")
+    fullTime: Optional[datetime] = None
+    sampleCount: int
@@ -0,0 +1,57 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SnapCreatorTypeEnum(str, Enum):
+    User = "User"
+    Scheduler = "Scheduler"
+    System = "System"
+
+
+class SnapStateEnum(str, Enum):
+    Ready = "Ready"
+
+
+class SnapReference(BaseModel):
+    """Reference to another object by ID."""
+
+    id: str = Field(..., description="ID of the object")
+
+
+class SnapCreate(BaseModel):
+    storageResource: SnapReference = Field(..., description="Storage resource to take a snapshot of")
+    name: Optional[str] = Field(None, description="Snapshot name; defaults to the creation time")
+    description: Optional[str] = Field(None, description="User-specified description")
+    retentionDuration: Optional[int] = Field(None, gt=0, description="Seconds to keep the snapshot for")
+    isReadOnly: bool = Field(False, description="Whether hosts can only read the snapshot once attached")
+    isAutoDelete: Optional[bool] = Field(None, description="Whether the system may delete the snapshot for space")
+
+
+class SnapRestore(BaseModel):
+    copyName: Optional[str] = Field(None, description="Name of the snapshot taken of the resource before restoring")
+
+
+class SnapRestoreResult(BaseModel):
+    backup: SnapReference = Field(..., description="Snapshot taken of the resource before restoring")
+
+
+class Snap(BaseModel):
+    """A point-in-time copy of a storage resource."""
+
+    id: str = Field(..., description="Unique identifier of the snapshot")
+    name: str = Field(..., description="Snapshot name")
+    description: Optional[str] = Field(None, description="User-specified description")
+    storageResource: SnapReference = Field(..., description="Storage resource the snapshot was taken of")
+    creationTime: datetime = Field(..., description="Time the snapshot was taken")
+    expirationTime: Optional[datetime] = Field(None, description="Time the snapshot expires")
+    creatorType: SnapCreatorTypeEnum = Field(..., description="Who took the snapshot")
+    isSystemSnap: bool = Field(False, description="Whether the system took the snapshot for its own use")
+    isReadOnly: bool = Field(False, description="Whether hosts can only read the snapshot")
+    isAutoDelete: bool = Field(False, description="Whether the system may delete the snapshot for space")
+    state: SnapStateEnum = Field(SnapStateEnum.Ready, description="State of the snapshot")
+    size: int = Field(..., description="Size of the storage resource when the snapshot was taken, in bytes")
+    attachedWWN: Optional[str] = Field(None, description="WWN hosts access the snapshot at while it is attached")
+    lastWritableTime: Optional[datetime] = Field(None, description="Time the snapshot was last detached")
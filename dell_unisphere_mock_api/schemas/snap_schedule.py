@@ -0,0 +1,77 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from dell_unisphere_mock_api.schemas.snap import SnapReference
+
+
+class SnapScheduleTypeEnum(str, Enum):
+    N_HOURS_AT_MM = "N_HOURS_AT_MM"
+    DAY_AT_HHMM = "DAY_AT_HHMM"
+    SELDAYS_AT_HHMM = "SELDAYS_AT_HHMM"
+
+
+class DayOfWeekEnum(str, Enum):
+    Monday = "Monday"
+    Tuesday = "Tuesday"
+    Wednesday = "Wednesday"
+    Thursday = "Thursday"
+    Friday = "Friday"
+    Saturday = "Saturday"
+    Sunday = "Sunday"
+
+
+class SnapScheduleRuleCreate(BaseModel):
+    type: SnapScheduleTypeEnum = Field(..., description="Every few hours, daily or on selected days of the week")
+    minute: int = Field(0, ge=0, le=59, description="Minute of the hour to take snapshots at")
+    hours: List[int] = Field([], description="Hours of the day to take snapshots at, for daily and weekly rules")
+    interval: int = Field(1, ge=1, le=24, description="Hours between snapshots, for N_HOURS_AT_MM rules")
+    daysOfWeek: List[DayOfWeekEnum] = Field([], description="Days to take snapshots on, for SELDAYS_AT_HHMM rules")
+    retentionTime: Optional[int] = Field(None, gt=0, description="Seconds to keep the snapshots for")
+    isAutoDelete: bool = Field(False, description="Whether the system may delete the snapshots for space")
+
+    @field_validator("hours", mode="after")
+    @classmethod
+    def validate_hours(cls, v: List[int]) -> List[int]:
+        if any(hour < 0 or hour > 23 for hour in v):
+            raise ValueError("Hours must be between 0 and 23")
+        return v
+
+    @model_validator(mode="after")
+    def check_times(self) -> "SnapScheduleRuleCreate":
+        if self.type != SnapScheduleTypeEnum.N_HOURS_AT_MM and not self.hours:
+            raise ValueError(f"{self.type.value} rules need the hours to take snapshots at")
+        if self.type == SnapScheduleTypeEnum.SELDAYS_AT_HHMM and not self.daysOfWeek:
+            raise ValueError("SELDAYS_AT_HHMM rules need the days to take snapshots on")
+        return self
+
+
+class SnapScheduleRule(SnapScheduleRuleCreate):
+    id: str = Field(..., description="Unique identifier of the rule")
+
+
+class SnapScheduleCreate(BaseModel):
+    name: str = Field(..., description="Schedule name")
+    rules: List[SnapScheduleRuleCreate] = Field(..., min_length=1, description="When to take snapshots")
+    storageResources: List[SnapReference] = Field([], description="Storage resources to protect")
+
+
+class SnapScheduleModify(BaseModel):
+    name: Optional[str] = None
+    addRules: List[SnapScheduleRuleCreate] = Field([], description="Rules to add")
+    removeRuleIds: List[str] = Field([], description="IDs of rules to remove")
+    addStorageResources: List[SnapReference] = Field([], description="Storage resources to start protecting")
+    removeStorageResources: List[SnapReference] = Field([], description="Storage resources to stop protecting")
+
+
+class SnapSchedule(BaseModel):
+    """Rules taking snapshots of a set of storage resources."""
+
+    id: str = Field(..., description="Unique identifier of the schedule")
+    name: str = Field(..., description="Schedule name")
+    isDefault: bool = Field(False, description="Whether the schedule is one of the system's defaults")
+    rules: List[SnapScheduleRule] = Field(..., description="When to take snapshots")
+    storageResources: List[SnapReference] = Field([], description="Storage resources the schedule protects")
+    nextSnapTime: Optional[datetime] = Field(None, description="Time the schedule takes its next snapshots at")
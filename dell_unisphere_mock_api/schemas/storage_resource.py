@@ -55,7 +55,7 @@ class StorageResourceBase(BaseModel):
 
 
 class StorageResourceCreate(StorageResourceBase):
-    pass
+    sizeTotal: int = Field(0, ge=0, description="Total size in bytes")
 
 
 class StorageResourceUpdate(BaseModel):
@@ -78,6 +78,9 @@ class StorageResourceResponse(StorageResourceBase):
     thinStatus: ThinStatusEnum = Field(..., description="Thin provisioning status")
     isCompressionEnabled: bool = Field(False, description="Whether compression is enabled")
     isAdvancedDedupEnabled: bool = Field(False, description="Whether advanced deduplication is enabled")
+    dataReductionSizeSaved: int = Field(0, description="Allocated space saved by data reduction in bytes")
+    dataReductionPercent: int = Field(0, description="Percentage of allocated space saved by data reduction")
+    dataReductionRatio: float = Field(1.0, description="Ratio of allocated space before and after data reduction")
     tieringPolicy: Optional[TieringPolicyEnum] = Field(None, description="Storage tiering policy")
     relocationPolicy: Optional[RelocationPolicyEnum] = Field(None, description="Data relocation policy")
     esxFilesystemMajorVersion: Optional[str] = Field(
@@ -0,0 +1,27 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from dell_unisphere_mock_api.schemas.pool import TierTypeEnum
+
+
+class SystemTierCapacity(BaseModel):
+    """Capacity of one storage tier across all pools of the system."""
+
+    id: str = Field(..., description="Unique identifier of the tier capacity; the tier type")
+    tierType: TierTypeEnum = Field(..., description="Storage tier")
+    sizeTotal: int = Field(..., description="Healthy disk capacity of the tier in pools, in bytes")
+    sizeUsed: int = Field(..., description="Used space of the pools apportioned to the tier, in bytes")
+    sizeFree: int = Field(..., description="Free space of the tier, in bytes")
+
+
+class SystemCapacity(BaseModel):
+    """Capacity of all pools of the system."""
+
+    id: str = Field(..., description="Unique identifier of the system capacity")
+    sizeTotal: int = Field(..., description="Total size of all pools, in bytes")
+    sizeUsed: int = Field(..., description="Used space of all pools, in bytes")
+    sizeFree: int = Field(..., description="Free space of all pools, in bytes")
+    sizeSubscribed: int = Field(..., description="Size subscribed by all storage objects, in bytes")
+    sizePreallocated: int = Field(0, description="Space reserved but not yet used by storage objects, in bytes")
+    tiers: List[SystemTierCapacity] = Field(default_factory=list, description="Capacity per storage tier")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the cost of a small PATCH against objects of increasing width.
+
+Usage:
+    python scripts/benchmark_record_updates.py --iterations 20000
+
+For each width a synthetic schema with that many integer and string fields
+is generated. Two update paths are timed for a two-field patch (a counter and
+a modification timestamp, like a usage-stats update):
+
+* rebuild: ``model_dump()`` the stored model, merge the patch and construct
+  and validate a new model, which is what the models used to do
+* record: ``CompactRecord.update`` validates and rewrites only the changed
+  fields
+
+The record path should stay flat as the width grows.
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from dell_unisphere_mock_api.core.compact import compact_record_type
+
+WIDTHS = (8, 32, 128, 512)
+
+
+def wide_model(width: int) -> Type[BaseModel]:
+    fields: Dict[str, Any] = {"modified": (datetime, ...), "sizeUsed": (int, 0)}
+    for i in range(width - 2):
+        fields[f"field_{i}"] = (int, 0) if i % 2 else (str, "")
+    return create_model(f"Wide{width}", **fields)
+
+
+def instance(model: Type[BaseModel]) -> BaseModel:
+    values: Dict[str, Any] = {"modified": datetime.now(timezone.utc), "sizeUsed": 0}
+    for name in model.model_fields:
+        if name.startswith("field_"):
+            values[name] = int(name[6:]) if int(name[6:]) % 2 else f"value {name}"
+    return model(**values)
+
+
+def time_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="patches applied per width and path")
+    args = parser.parse_args()
+
+    results: List[Tuple[int, float, float]] = []
+    for width in WIDTHS:
+        model = wide_model(width)
+        stored = instance(model)
+        record = compact_record_type(model).from_model(stored)
+
+        def rebuild(i: int) -> None:
+            nonlocal stored
+            data = stored.model_dump()
+            data.update({"sizeUsed": i, "modified": datetime.now(timezone.utc)})
+            stored = model(**data)
+
+        def update(i: int) -> None:
+            record.update({"sizeUsed": i, "modified": datetime.now(timezone.utc)})
+
+        results.append((width, time_per_call(rebuild, args.iterations), time_per_call(update, args.iterations)))
+
+    print(f"{'fields':>8}{'rebuild us/patch':>18}{'record us/patch':>17}")
+    for width, rebuild_us, update_us in results:
+        print(f"{width:>8}{rebuild_us:>18.2f}{update_us:>17.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
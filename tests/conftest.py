@@ -6,6 +6,17 @@ from fastapi.testclient import TestClient
 from dell_unisphere_mock_api.controllers.cifs_server_controller import CIFSServerController
 from dell_unisphere_mock_api.controllers.nfs_share_controller import NFSShareController
 from dell_unisphere_mock_api.controllers.quota_controller import QuotaController
+from dell_unisphere_mock_api.core.alerts import alert_engine
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.changes import change_feed
+from dell_unisphere_mock_api.core.data_reduction import data_reduction
+from dell_unisphere_mock_api.core.forecast import capacity_forecaster
+from dell_unisphere_mock_api.core.metric_queries import metric_query_scheduler
+from dell_unisphere_mock_api.core.metrics import metric_store
+from dell_unisphere_mock_api.core.snap_schedules import snap_schedule_engine
+from dell_unisphere_mock_api.core.snapshots import snapshot_engine
+from dell_unisphere_mock_api.core.tiering import tiering_engine
+from dell_unisphere_mock_api.core.workload import workload_simulator
 from dell_unisphere_mock_api.main import app
 from dell_unisphere_mock_api.models.disk import DiskModel
 from dell_unisphere_mock_api.models.disk_group import DiskGroupModel
@@ -30,8 +41,7 @@ def clear_data():
     # Clear all data
     pool_model.pools.clear()
     lun_model.luns.clear()
-    if hasattr(disk_model, "disks"):
-        disk_model.disks.clear()
+    disk_model.clear()
     if hasattr(disk_group_model, "disk_groups"):
         disk_group_model.disk_groups.clear()
     if hasattr(pool_unit_model, "pool_units"):
@@ -49,8 +59,18 @@ def clear_data():
 
     # Clear job data
     job_model = JobModel()
-    if hasattr(job_model, "jobs"):
-        job_model.jobs.clear()
+    job_model.clear()
+    change_feed.clear()
+    capacity_ledger.clear()
+    capacity_forecaster.clear()
+    data_reduction.clear()
+    alert_engine.clear()
+    metric_store.clear()
+    metric_query_scheduler.clear()
+    workload_simulator.clear()
+    tiering_engine.clear()
+    snapshot_engine.clear()
+    snap_schedule_engine.clear()
     yield
 
 
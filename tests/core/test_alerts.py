@@ -0,0 +1,162 @@
+import asyncio
+
+from dell_unisphere_mock_api.core.alerts import ACTIVE, CRITICAL, INACTIVE, WARNING, AlertEngine, AlertStore
+from dell_unisphere_mock_api.core.capacity import CapacityHistory, CapacityLedger
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, ChangeFeed
+
+
+class DictSource:
+    def __init__(self, feed, object_type):
+        self.feed = feed
+        self.object_type = object_type
+        self.objects = {}
+        self.described = []
+
+    def set(self, obj_id, **facts):
+        action = MODIFIED if obj_id in self.objects else CREATED
+        self.objects[obj_id] = facts
+        self.feed.publish(self.object_type, action, obj_id)
+
+    def remove(self, obj_id):
+        del self.objects[obj_id]
+        self.feed.publish(self.object_type, DELETED, obj_id)
+
+    def ids(self):
+        return list(self.objects)
+
+    def describe(self, obj_ids):
+        self.described.extend(obj_ids)
+        return [self.objects.get(obj_id) for obj_id in obj_ids]
+
+
+class LedgerPools:
+    """Pool facts computed from a capacity ledger, as the pool source does."""
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.described = []
+
+    def ids(self):
+        return list(self.ledger.pools)
+
+    def describe(self, obj_ids):
+        self.described.extend(obj_ids)
+        facts = []
+        for pool_id in obj_ids:
+            usage = self.ledger.usage(pool_id)
+            facts.append(
+                None
+                if usage is None
+                else {
+                    "name": pool_id,
+                    "percentUsed": 100.0 * usage.used / usage.size_total,
+                    "alertThreshold": 70,
+                    "harvestHighThreshold": None,
+                    "fullThreshold": 100.0,
+                }
+            )
+        return facts
+
+
+def make_engine():
+    feed = ChangeFeed(capacity=64)
+    ledger = CapacityLedger(CapacityHistory(samples=4))
+    engine = AlertEngine(store=AlertStore(max_alerts=3, max_events=4), feed=feed, ledger=ledger)
+    pools = LedgerPools(ledger)
+    disks = DictSource(feed, "disk")
+    engine.sources = {"pool": pools, "disk": disks}
+    return engine, ledger, pools, disks
+
+
+def test_pool_threshold_alert_with_hysteresis():
+    engine, ledger, pools, _ = make_engine()
+    for pool_id in ("pool_1", "pool_2"):
+        ledger.add_pool(pool_id, 1000)
+    engine.process()
+
+    ledger.post("pool_1", allocated=720)
+    engine.process()
+    (alert,) = engine.store.alerts.values()
+    assert (alert.object_id, alert.rule, alert.severity, alert.state) == ("pool_1", "spaceThreshold", WARNING, ACTIVE)
+
+    # Dropping below the threshold but within the hysteresis margin keeps the alert active
+    ledger.post("pool_1", allocated=-40)
+    engine.process()
+    assert alert.state == ACTIVE and len(engine.store.alerts) == 1
+
+    ledger.post("pool_1", allocated=-50)
+    engine.process()
+    assert alert.state == INACTIVE
+
+    ledger.post("pool_1", allocated=370)
+    engine.process()
+    rules = [(alert.rule, alert.severity, alert.state) for alert in engine.store.alerts.values()]
+    assert rules == [
+        ("spaceThreshold", WARNING, INACTIVE),
+        ("spaceThreshold", WARNING, ACTIVE),
+        ("full", CRITICAL, ACTIVE),
+    ]
+    # Only the pool that changed was looked at after the first sync
+    assert pools.described.count("pool_2") == 1
+
+
+def test_health_alerts_follow_changed_and_deleted_objects():
+    engine, _, _, disks = make_engine()
+    disks.set("1", name="disk_1", health="OK")
+    disks.set("2", name="disk_2", health="OK")
+    engine.process()
+    assert not engine.store.alerts
+
+    disks.set("1", name="disk_1", health="FAULTED")
+    engine.process()
+    (alert,) = engine.store.alerts.values()
+    assert alert.message == "Disk disk_1 has faulted: health status FAULTED."
+    assert disks.described == ["1", "2", "1"]
+
+    # Evaluating again without changes raises nothing new
+    engine.process()
+    assert len(engine.store.alerts) == 1
+
+    disks.remove("1")
+    engine.process()
+    assert alert.state == INACTIVE
+    assert [event.message_id for event in engine.store.events] == ["13200001", "13200001"]
+
+
+def test_store_is_bounded_and_supports_acknowledge_and_delete():
+    store = AlertStore(max_alerts=3, max_events=4)
+    for i in range(5):
+        store.add(WARNING, "disk", str(i), "health", "13200001", f"Disk {i} faulted")
+
+    assert list(store.alerts) == [3, 4, 5]
+    assert [event.id for event in store.events] == [2, 3, 4, 5]
+    assert store.event(1) is None and store.event(4).object_id == "3"
+
+    assert store.acknowledge(4).acknowledged
+    assert store.acknowledge(1) is None
+    assert store.delete(5) and not store.delete(5)
+    assert list(store.alerts) == [3, 4]
+
+
+def test_run_keeps_evaluating_after_a_failed_wait():
+    engine, _, _, disks = make_engine()
+    waits = []
+    wait = engine.feed.wait
+
+    async def failing_wait(after, timeout):
+        waits.append(after)
+        if len(waits) == 1:
+            raise RuntimeError("bound to a different event loop")
+        return await wait(after, timeout)
+
+    engine.feed.wait = failing_wait
+    disks.set("disk_1", health=5)
+
+    async def run_briefly():
+        task = asyncio.create_task(engine.run(0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(run_briefly())
+    assert len(waits) > 1
+    assert engine.evaluated >= 1
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from dell_unisphere_mock_api.core.bulk import select_for_delete
+from dell_unisphere_mock_api.schemas.bulk import BulkDeleteRequest
+
+STORE = {
+    "1": {"id": "1", "name": "test_a", "size": 100, "shares": []},
+    "2": {"id": "2", "name": "test_b", "size": 200, "shares": ["share_1"]},
+    "3": {"id": "3", "name": "other", "size": 300, "shares": []},
+}
+
+
+def blocked(obj):
+    return "Has shares" if obj["shares"] else None
+
+
+def test_select_by_ids_reports_missing_and_blocked():
+    bulk = BulkDeleteRequest(ids=["1", "2", "9", "1"])
+
+    to_delete, skipped, not_found = select_for_delete(bulk, STORE, get=dict.get, blocked=blocked)
+
+    assert to_delete == ["1"]
+    assert [(s.id, s.reason) for s in skipped] == [("2", "Has shares")]
+    assert not_found == ["9"]
+
+
+def test_select_by_filter_with_wildcards_and_comparisons():
+    bulk = BulkDeleteRequest(filter="name eq 'test_*' and size lt 150")
+
+    assert select_for_delete(bulk, STORE, get=dict.get)[0] == ["1"]
+    assert select_for_delete(BulkDeleteRequest(filter="name ne 'test_*'"), STORE, get=dict.get)[0] == ["3"]
+
+
+def test_select_by_exact_name_uses_index():
+    lookups = []
+
+    def name_index(name):
+        lookups.append(name)
+        return "3"
+
+    bulk = BulkDeleteRequest(filter="name eq 'other'")
+
+    assert select_for_delete(bulk, STORE, get=dict.get, name_index=name_index)[0] == ["3"]
+    assert lookups == ["other"]
+
+
+def test_invalid_selection_rejected():
+    with pytest.raises(ValidationError):
+        BulkDeleteRequest()
+    with pytest.raises(ValidationError):
+        BulkDeleteRequest(ids=["1"], filter="name eq 'x'")
+    with pytest.raises(HTTPException) as exc_info:
+        select_for_delete(BulkDeleteRequest(filter="not a filter"), STORE, get=dict.get)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "expression", ["name eq 'test_*' and size ge 100", "name eq 'test_*' and size gt 50 and size lt 150"]
+)
+def test_filter_never_widened(expression):
+    # An unsupported operator, or a second condition on a field, would be dropped by lenient parsing
+    with pytest.raises(HTTPException) as exc_info:
+        select_for_delete(BulkDeleteRequest(filter=expression), STORE, get=dict.get)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,67 @@
+import pytest
+
+from dell_unisphere_mock_api.core.capacity import CapacityLedger, InsufficientCapacity
+
+
+def test_posts_update_pool_and_system_counters():
+    ledger = CapacityLedger()
+    ledger.add_pool("1", 1000)
+    ledger.add_pool("2", 500)
+
+    ledger.post("1", subscribed=2000, allocated=300, objects=1, required=0)
+    ledger.post("2", subscribed=100, allocated=100, snapshot=50, metadata=10, objects=1)
+
+    pool = ledger.usage("1")
+    assert (pool.subscribed, pool.allocated, pool.used, pool.free, pool.objects) == (2000, 300, 300, 700, 1)
+    assert ledger.free("2") == 340
+    assert ledger.system.size_total == 1500
+    assert ledger.system.used == 460
+
+    ledger.post("1", subscribed=-2000, allocated=-300, objects=-1)
+    ledger.remove_pool("2")
+    assert ledger.system.used == 0
+    assert ledger.system.size_total == 1000
+
+
+def test_admission_refused_without_applying():
+    ledger = CapacityLedger()
+    ledger.add_pool("1", 1000)
+    ledger.post("1", allocated=900)
+
+    with pytest.raises(InsufficientCapacity) as exc_info:
+        ledger.post("1", subscribed=200, allocated=200)
+
+    assert exc_info.value.free == 100
+    assert ledger.usage("1").subscribed == 0
+    assert ledger.usage("1").allocated == 900
+
+
+def test_untracked_pools_are_ignored():
+    ledger = CapacityLedger()
+
+    ledger.post("default_pool", allocated=10**15)
+
+    assert ledger.free("default_pool") is None
+    assert ledger.system.allocated == 0
+
+
+def test_tier_capacity_follows_disks_and_pool_usage():
+    ledger = CapacityLedger()
+    # Disks may be placed before their pool is tracked
+    ledger.add_tier_capacity("1", "Extreme_Performance", 300)
+    ledger.add_pool("1", 1000)
+    ledger.add_tier_capacity("1", "Capacity", 700)
+
+    ledger.post("1", allocated=500)
+    flash, capacity = ledger.tiers["Extreme_Performance"], ledger.tiers["Capacity"]
+    assert (flash.size_total, flash.size_used, flash.free) == (300, 150, 150)
+    assert (capacity.size_total, capacity.size_used) == (700, 350)
+
+    # Removing a disk re-apportions the pool's used space over the remaining tiers
+    ledger.add_tier_capacity("1", "Extreme_Performance", -300)
+    assert "Extreme_Performance" not in ledger.pool_tiers["1"]
+    assert (flash.size_total, flash.size_used) == (0, 0)
+    assert capacity.size_used == 500
+
+    ledger.remove_pool("1")
+    assert (capacity.size_total, capacity.size_used) == (0, 0)
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from dell_unisphere_mock_api.core.changes import (
+    CREATED,
+    DELETED,
+    MODIFIED,
+    ChangeFeed,
+    ChangeHistoryExpired,
+    ChangeLog,
+    change_feed,
+)
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.routers.changes import stream_changes
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, PoolUpdate
+
+
+def test_subscribers_read_filtered_changes_at_their_own_pace():
+    feed = ChangeFeed(capacity=8)
+    everything = feed.subscribe(since=0)
+    luns = feed.subscribe(types=["lun"], since=0)
+    feed.publish("pool", CREATED, "1")
+    feed.publish("lun", CREATED, "1")
+    feed.publish("lun", DELETED, "1")
+
+    assert [change[:4] for change in everything.poll(limit=2)] == [(1, "pool", CREATED, "1"), (2, "lun", CREATED, "1")]
+    assert [change[0] for change in everything.poll()] == [3]
+    assert [change[:3] for change in luns.poll()] == [(2, "lun", CREATED), (3, "lun", DELETED)]
+    assert everything.poll() == [] and everything.lag == 0
+
+    # New subscribers start from now unless they resume from a sequence number
+    assert feed.subscribe().poll() == []
+    assert [change[0] for change in feed.subscribe(since=2).poll()] == [3]
+
+
+def test_slow_subscriber_overflows_without_blocking_writers():
+    feed = ChangeFeed(capacity=4)
+    slow = feed.subscribe(since=0)
+    for i in range(10):
+        feed.publish("job", MODIFIED, str(i))
+
+    assert slow.overflowed()
+    assert slow.skip_overflow() == 1
+    assert [change[0] for change in slow.poll()] == [7, 8, 9, 10]
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_on_publish():
+    feed = ChangeFeed(capacity=4)
+    subscription = feed.subscribe()
+
+    assert not await subscription.wait(0.01)
+    waiter = asyncio.create_task(subscription.wait(5))
+    await asyncio.sleep(0)
+    feed.publish("tenant", CREATED, "t1")
+    assert await asyncio.wait_for(waiter, 1)
+
+
+def test_wait_works_in_each_event_loop():
+    feed = ChangeFeed(capacity=4)
+
+    async def wait_for_change():
+        waiter = asyncio.create_task(feed.wait(feed.last_seq, 5))
+        await asyncio.sleep(0.01)
+        feed.publish("tenant", CREATED, "t1")
+        return await waiter
+
+    # A wait that timed out in one event loop, as at the end of an app's lifespan, does not break the next
+    assert not asyncio.run(feed.wait(0, 0.01))
+    assert asyncio.run(wait_for_change())
+    feed.clear()
+    assert asyncio.run(wait_for_change())
+
+
+class ConnectedRequest:
+    def __init__(self, events: int):
+        self.remaining = events
+
+    async def is_disconnected(self) -> bool:
+        self.remaining -= 1
+        return self.remaining < 0
+
+
+@pytest.mark.asyncio
+async def test_model_changes_are_streamed_as_events():
+    subscription = change_feed.subscribe(types=["pool"])
+    model = PoolModel()
+    pool = model.create_pool(PoolCreate(name="feed_pool", raidType="RAID5", sizeTotal=1000))
+    model.update_pool(pool.id, PoolUpdate(description="changed"))
+
+    events = [event async for event in stream_changes(ConnectedRequest(1), subscription)]
+
+    assert events[0].startswith("retry:")
+    assert events[1].count("event: change") == 2
+    assert f'"action": "created", "id": "{pool.id}"' in events[1]
+    assert '"action": "modified"' in events[1]
+
+
+def test_change_log_reports_latest_changes_and_tombstones():
+    feed = ChangeFeed(capacity=4)
+    feed.publish("lun", CREATED, "1")
+    feed.publish("lun", CREATED, "2")
+    baseline = feed.last_seq
+    feed.publish("lun", MODIFIED, "1")
+    feed.publish("lun", DELETED, "2")
+    feed.publish("lun", CREATED, "3")
+    feed.publish("pool", CREATED, "1")
+
+    changes = feed.changes_since("lun", baseline)
+
+    assert changes.modified == ["1", "3"]
+    assert changes.deleted == ["2"]
+    assert changes.changeSeq == 6
+    assert feed.changes_since("lun", changes.changeSeq).modified == []
+    assert feed.changes_since("lun", modified_since=datetime.fromtimestamp(0, timezone.utc)).modified == ["1", "3"]
+
+
+def test_change_log_forgets_old_tombstones():
+    log = ChangeLog(max_tombstones=2)
+    for seq, obj_id in enumerate(["a", "b", "c"], start=1):
+        log.record(seq, obj_id, float(seq), deleted=True)
+
+    assert log.since(1) == ([], ["b", "c"])
+    with pytest.raises(ChangeHistoryExpired):
+        log.since(0)
+
+
+def test_batch_is_one_change_with_all_ids():
+    feed = ChangeFeed(capacity=8)
+    subscription = feed.subscribe()
+
+    seq = feed.publish_batch("lun", DELETED, ["1", "2", "3"])
+
+    assert feed.last_seq == seq == 1
+    assert subscription.poll() == [(1, "lun", DELETED, ("1", "2", "3"), pytest.approx(time.time(), abs=5))]
+    assert feed.changes_since("lun", 0).deleted == ["1", "2", "3"]
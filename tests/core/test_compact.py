@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from dell_unisphere_mock_api.core.compact import compact_record_type
+
+
+class Health(BaseModel):
+    value: int
+
+
+class Item(BaseModel):
+    id: str
+    pool: str
+    size: int
+    description: Optional[str] = None
+    tags: List[str] = []
+    attrs: Dict[str, int] = {}
+    health: Health
+
+
+DEFAULT_HEALTH = Health(value=5)
+
+ItemRecord = compact_record_type(
+    Item,
+    shared={"health": DEFAULT_HEALTH},
+    sparse={"description": None, "attrs": {}},
+    interned=("pool", "size"),
+)
+
+
+def make_item(**overrides) -> Item:
+    values = {"id": "1", "pool": "pool_1", "size": 1024, "health": Health(value=5)}
+    values.update(overrides)
+    return Item(**values)
+
+
+def test_record_roundtrips_to_equal_model():
+    item = make_item(description="first", tags=["a", "b"], attrs={"x": 1})
+    record = ItemRecord.from_model(item)
+
+    assert record.to_model() == item
+    assert record.to_dict()["tags"] == ["a", "b"]
+
+
+def test_record_has_no_instance_dict():
+    record = ItemRecord.from_model(make_item())
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unknown
+
+
+def test_equal_defaults_share_one_instance():
+    first = ItemRecord.from_model(make_item(id="1"))
+    second = ItemRecord.from_model(make_item(id="2"))
+
+    assert first.health is DEFAULT_HEALTH
+    assert second.health is DEFAULT_HEALTH
+    assert first.tags is second.tags
+
+
+def test_materialized_shared_values_are_copies():
+    first = ItemRecord.from_model(make_item(id="1"))
+    second = ItemRecord.from_model(make_item(id="2"))
+
+    model = first.to_model()
+    model.health.value = 20
+    assert second.to_model().health.value == 5
+    assert DEFAULT_HEALTH.value == 5 and first.health is DEFAULT_HEALTH
+
+
+def test_sparse_fields_only_stored_when_changed():
+    record = ItemRecord.from_model(make_item())
+    assert record._extra is None
+    assert record.description is None
+
+    record._set("description", "changed")
+    assert record.description == "changed"
+    assert record._extra == {"description": "changed"}
+
+    record._set("description", None)
+    assert record._extra is None
+
+
+def test_materialized_containers_are_independent():
+    record = ItemRecord.from_model(make_item())
+
+    model = record.to_model()
+    model.attrs["x"] = 1
+    model.tags.append("t")
+
+    assert record.to_model().attrs == {}
+    assert record.to_model().tags == []
+
+
+def test_materialized_nested_values_are_copies():
+    record = ItemRecord.from_model(make_item(attrs={"x": 1}, health=Health(value=7)))
+
+    model = record.to_model()
+    model.attrs["x"] = 2
+    model.health.value = 8
+    record.to_dict()["attrs"]["y"] = 3
+
+    assert record.to_model().attrs == {"x": 1}
+    assert record.to_model().health.value == 7
+
+
+def test_unknown_field_names_rejected():
+    with pytest.raises(ValueError):
+        compact_record_type(Item, sparse={"missing": None})
+
+
+def test_update_validates_and_applies_only_changed_fields():
+    record = ItemRecord.from_model(make_item(tags=["a"]))
+    tags = record.tags
+
+    record.update({"size": "2048", "description": "patched", "not_a_field": 1})
+
+    assert record.size == 2048
+    assert record.description == "patched"
+    assert record.tags is tags
+
+
+def test_invalid_update_is_not_applied():
+    record = ItemRecord.from_model(make_item())
+
+    with pytest.raises(ValidationError) as exc_info:
+        record.update({"description": "patched", "size": "large"})
+
+    assert exc_info.value.errors()[0]["loc"] == ("size",)
+    assert record.description is None
+    assert record.size == 1024
+
+
+class Resource(BaseModel):
+    id: str
+    hostAccess: List[Dict] = []
+
+
+ResourceRecord = compact_record_type(Resource, sparse={"hostAccess": []}, keyed={"hostAccess": "host"})
+
+
+def test_keyed_field_entries_edited_by_key():
+    record = ResourceRecord.from_model(Resource(id="1"))
+    other = ResourceRecord.from_model(Resource(id="2"))
+
+    record.put_item("hostAccess", {"host": "h1", "accessType": "READ_ONLY"})
+    record.put_item("hostAccess", {"host": "h2", "accessType": "READ_ONLY"})
+    record.put_item("hostAccess", {"host": "h1", "accessType": "READ_WRITE"})
+
+    assert record.to_model().hostAccess == [
+        {"host": "h1", "accessType": "READ_WRITE"},
+        {"host": "h2", "accessType": "READ_ONLY"},
+    ]
+    assert other.to_model().hostAccess == []
+
+    assert record.pop_item("hostAccess", "h1") == {"host": "h1", "accessType": "READ_WRITE"}
+    assert record.pop_item("hostAccess", "h1") is None
+    assert record.get_item("hostAccess", "h2") == {"host": "h2", "accessType": "READ_ONLY"}
+    record.pop_item("hostAccess", "h2")
+    assert record._extra is None
+
+
+def test_keyed_field_replaced_from_list():
+    record = ResourceRecord.from_model(Resource(id="1", hostAccess=[{"host": "h1", "accessType": "READ_ONLY"}]))
+
+    record.update({"hostAccess": [{"host": "h2", "accessType": "READ_WRITE"}]})
+
+    assert record.get_item("hostAccess", "h1") is None
+    assert record.to_dict()["hostAccess"] == [{"host": "h2", "accessType": "READ_WRITE"}]
+
+
+def test_keyed_field_entries_are_copies():
+    record = ResourceRecord.from_model(Resource(id="1", hostAccess=[{"host": "h1", "options": {"snap": False}}]))
+
+    record.to_model().hostAccess[0]["options"]["snap"] = True
+    record.get_item("hostAccess", "h1")["options"]["snap"] = True
+
+    assert record.to_dict()["hostAccess"] == [{"host": "h1", "options": {"snap": False}}]
+
+
+def test_keyed_field_entries_need_their_key():
+    record = ResourceRecord.from_model(Resource(id="1"))
+
+    with pytest.raises(ValidationError) as exc_info:
+        record.update({"hostAccess": [{"host": "h1"}, {"accessType": "READ_ONLY"}]})
+
+    assert exc_info.value.errors()[0]["loc"] == ("hostAccess", 1, "host")
+    assert record.to_dict()["hostAccess"] == []
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from dell_unisphere_mock_api.core.data_reduction import DataReductionModel, summary
+
+
+def test_savings_follow_compression_and_dedup_settings():
+    model = DataReductionModel(seed=1)
+    ids = ["a", "b", "c", "d"]
+    logical = [1000, 1000, 1000, 1000]
+
+    saved = model.savings(ids, logical, [False, True, True, False], [False, False, True, True])
+
+    assert saved[0] == 0
+    # Deduplication without compression does nothing
+    assert saved[3] == 0
+    compression, dedup = model.ratios[[model.rows["b"], model.rows["c"]]].T
+    assert saved[1] == 1000 - np.ceil(1000 / compression[0])
+    assert saved[2] == 1000 - np.ceil(1000 / (compression[1] * dedup[1]))
+    # Ratios are drawn once per resource
+    assert model.savings(["b"], [1000], [True], [False])[0] == saved[1]
+
+
+def test_pool_totals_follow_recorded_and_forgotten_resources():
+    model = DataReductionModel(seed=2)
+    model.record(["a", "b"], ["pool_1", "pool_1"], [1000, 500], [600, 200], [True, True])
+    model.record(["c"], ["pool_2"], [800], [0], [False])
+
+    assert model.pool_summary("pool_1") == summary(1500, 800) == (800, 53, 2.14)
+    assert model.pool_summary("pool_2") == (0, 0, 1.0)
+
+    # Recording a resource again replaces what it contributed
+    model.record(["a"], ["pool_1"], [1000], [0], [False])
+    assert model.pool_summary("pool_1") == (200, 40, 1.67)
+
+    model.forget(["b"])
+    assert model.pool_summary("pool_1") == (0, 0, 1.0)
+    assert model.pool_summary("unknown") == (0, 0, 1.0)
+
+
+def test_rows_are_reused_and_columns_grow():
+    model = DataReductionModel(seed=3, capacity=2)
+    ids = [f"r{index}" for index in range(5)]
+    model.record(ids, ["pool_1"] * 5, [100] * 5, [50] * 5, [True] * 5)
+    assert model.pool_summary("pool_1") == (250, 50, 2.0)
+
+    model.forget(ids[:2])
+    model.record(["r5"], ["pool_1"], [100], [10], [True])
+    assert len(model.pool) == 8
+    assert model.rows["r5"] in (0, 1)
+    assert model.pool_summary("pool_1") == pytest.approx((160, 40, 1.67))
@@ -0,0 +1,68 @@
+from dell_unisphere_mock_api.core.disk_inventory import DiskInventory
+from dell_unisphere_mock_api.schemas.disk import DiskTierEnum
+
+
+def make_inventory() -> DiskInventory:
+    inventory = DiskInventory(capacity=2)
+    inventory.add("1", 100, DiskTierEnum.EXTREME_PERFORMANCE, pool_id="pool_1", disk_group_id="dg_1")
+    inventory.add("2", 200, DiskTierEnum.PERFORMANCE, rpm=10000, pool_id="pool_1", disk_group_id="dg_1")
+    inventory.add("3", 400, DiskTierEnum.CAPACITY, rpm=7200, pool_id="pool_2", disk_group_id="dg_2")
+    inventory.add("4", 800, DiskTierEnum.CAPACITY, rpm=7200, pool_id="pool_2", health="FAULTED")
+    inventory.add("5", 50, DiskTierEnum.PERFORMANCE)
+    return inventory
+
+
+def test_lookup_by_pool_and_disk_group():
+    inventory = make_inventory()
+
+    assert inventory.ids_in_pool("pool_1") == ["1", "2"]
+    assert inventory.ids_in_pool("pool_2") == ["3", "4"]
+    assert inventory.ids_in_disk_group("dg_1") == ["1", "2"]
+    assert inventory.ids_in_pool("missing") == []
+
+
+def test_capacity_rollups_skip_unhealthy_disks():
+    inventory = make_inventory()
+
+    assert inventory.capacity_by_tier()[DiskTierEnum.CAPACITY] == 400
+    assert inventory.capacity_by_pool() == {
+        "pool_1": {DiskTierEnum.EXTREME_PERFORMANCE: (100, 1), DiskTierEnum.PERFORMANCE: (200, 1)},
+        "pool_2": {DiskTierEnum.CAPACITY: (400, 2)},
+    }
+    assert inventory.pool_capacity("pool_2") == {DiskTierEnum.CAPACITY: (400, 2)}
+    assert inventory.capacity_by_disk_group() == {"dg_1": (300, 2), "dg_2": (400, 1)}
+    assert inventory.disk_group_capacity("dg_2") == (400, 1)
+
+
+def test_update_and_remove_keep_rows_consistent():
+    inventory = make_inventory()
+
+    inventory.add("3", 400, DiskTierEnum.CAPACITY, pool_id="pool_1")
+    assert inventory.remove("1")
+    assert not inventory.remove("1")
+
+    assert len(inventory) == 4
+    assert inventory.ids_in_pool("pool_1") == ["2", "3"]
+    assert inventory.pool_capacity("pool_1") == {
+        DiskTierEnum.PERFORMANCE: (200, 1),
+        DiskTierEnum.CAPACITY: (400, 1),
+    }
+
+    inventory.clear()
+    assert inventory.capacity_by_pool() == {}
+
+
+def test_remove_moves_the_last_disk_into_the_freed_row():
+    inventory = make_inventory()
+
+    assert inventory.remove("2")
+
+    assert inventory.ids == ["1", "5", "3", "4"]
+    assert {disk_id: inventory.rows[disk_id] for disk_id in inventory.ids} == {"1": 0, "5": 1, "3": 2, "4": 3}
+    assert inventory.placement("5") is None
+    assert inventory.column("size").tolist() == [100, 50, 400, 800]
+    assert inventory.pool_capacity("pool_1") == {DiskTierEnum.EXTREME_PERFORMANCE: (100, 1)}
+
+    assert inventory.remove("4")
+    assert inventory.ids == ["1", "5", "3"]
+    assert inventory.ids_in_pool("pool_2") == ["3"]
@@ -0,0 +1,88 @@
+import pytest
+
+from dell_unisphere_mock_api.core.capacity import CapacityHistory, CapacityLedger
+from dell_unisphere_mock_api.core.forecast import DAY, CapacityForecaster
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _ledger(clock=None):
+    return CapacityLedger(CapacityHistory(samples=8, interval=3600.0, columns=1), clock)
+
+
+def test_fits_growth_of_every_pool_at_once():
+    clock = Clock()
+    ledger = _ledger(clock)
+    ledger.add_pool("growing", 1000)
+    ledger.add_pool("flat", 1000)
+    ledger.add_pool("shrinking", 1000)
+    ledger.post("shrinking", allocated=500)
+    for day in range(4):
+        # Changes posted during the day are sampled once, at its start
+        clock.now = day * DAY
+        ledger.post("growing", allocated=100)
+        ledger.post("shrinking", allocated=-50)
+
+    forecaster = CapacityForecaster(ledger)
+    growing, flat, shrinking = forecaster.forecast(now=4 * DAY)
+
+    assert growing.growth_per_day == pytest.approx(100.0)
+    assert growing.days_to_full == pytest.approx(6.0)
+    assert growing.full_time == pytest.approx(10 * DAY)
+    assert growing.samples == 5
+    assert flat.growth_per_day == pytest.approx(0.0)
+    assert flat.days_to_full is None
+    assert shrinking.growth_per_day == pytest.approx(-50.0)
+    assert shrinking.days_to_full is None
+    assert forecaster.fits == 1
+
+
+def test_forecasts_are_cached_until_the_pool_changes():
+    ledger = _ledger(Clock())
+    ledger.add_pool("1", 1000)
+    ledger.add_pool("2", 1000)
+    ledger.sample(0.0)
+    forecaster = CapacityForecaster(ledger)
+
+    forecaster.forecast(now=DAY)
+    forecaster.forecast(now=DAY)
+    assert forecaster.fits == 1
+
+    # Within the history interval: only the changed pool is refitted
+    ledger.post("1", allocated=100)
+    assert [forecast.pool_id for forecast in forecaster.forecast(now=DAY)] == ["1", "2"]
+    assert forecaster.fits == 2
+    assert forecaster.forecast(["1"])[0].size_used == 100
+
+    ledger.resize_pool("2", 2000)
+    assert forecaster.forecast(["2"], now=DAY)[0].size_total == 2000
+    assert forecaster.fits == 3
+
+
+def test_history_ring_and_reused_columns():
+    ledger = _ledger()
+    ledger.add_pool("1", 1000)
+    for hour in range(10):
+        ledger.sample(hour * 3600.0)
+    ledger.sample(9.5 * 3600.0)
+    assert ledger.history.written == 10
+
+    ledger.remove_pool("1")
+    ledger.add_pool("2", 1000)
+    ledger.add_pool("3", 1000)
+    times, used = ledger.history.series(["2", "3"])
+    assert times.tolist() == [hour * 3600.0 for hour in range(2, 10)]
+    assert used.shape == (8, 2)
+    # The reused column does not carry over the removed pool's samples
+    assert not (used == used).any()
+
+    forecast = CapacityForecaster(ledger).forecast(["2", "unknown"], now=10 * 3600.0)
+    assert len(forecast) == 1
+    assert forecast[0].samples == 1
+    assert forecast[0].growth_per_day == 0.0
@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from dell_unisphere_mock_api.core.job_engine import JobEngine, TaskProfile
+from dell_unisphere_mock_api.models.job import JobModel
+from dell_unisphere_mock_api.schemas.job import JobCreate, JobState, JobTask
+
+
+def job_data(name: str, tasks: int = 1, priority: int = 0, obj: str = "lun") -> JobCreate:
+    return JobCreate(
+        description=name,
+        priority=priority,
+        tasks=[
+            JobTask(name=f"{name}_{i}", object=obj, action="create", parametersIn={}) for i in range(tasks)
+        ],
+    )
+
+
+async def submit(engine: JobEngine, data: JobCreate):
+    job = await engine.store.create_job(data)
+    engine.submit(job.id, data.priority)
+    return job
+
+
+async def wait_for(job, *states, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while job.state not in states:
+        assert asyncio.get_running_loop().time() < deadline, f"job stuck in {job.state}"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def engine():
+    engine = JobEngine(JobModel(), workers=1, seed=1)
+    engine.default_profile = TaskProfile(distribution="fixed", mean_ms=20)
+    yield engine
+    engine.reset()
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_by_priority(engine):
+    blocker = await submit(engine, job_data("blocker"))
+    await wait_for(blocker, JobState.RUNNING)
+    low = await submit(engine, job_data("low"))
+    high = await submit(engine, job_data("high", priority=5))
+
+    await wait_for(low, JobState.COMPLETED)
+
+    assert blocker.state == high.state == JobState.COMPLETED
+    assert blocker.endTime <= high.endTime <= low.endTime
+    assert low.progressPct == 100
+
+
+@pytest.mark.asyncio
+async def test_progress_advances_incrementally(engine):
+    job = await submit(engine, job_data("steps", tasks=4))
+    seen = set()
+    while job.state != JobState.COMPLETED:
+        seen.add(job.progressPct)
+        await asyncio.sleep(0.005)
+
+    assert any(0 < pct < 100 for pct in seen)
+    assert job.startTime is not None and job.endTime >= job.startTime
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_and_queued_jobs(engine):
+    running = await submit(engine, job_data("running", tasks=50))
+    queued = await submit(engine, job_data("queued"))
+    await wait_for(running, JobState.RUNNING)
+
+    assert await engine.cancel(queued.id)
+    assert await engine.cancel(running.id)
+    assert not await engine.cancel(running.id)
+
+    assert running.state == JobState.CANCELLED
+    assert queued.state == JobState.CANCELLED
+    assert engine.metrics()["queueDepth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_injection(engine):
+    engine.set_profile("filesystem", "create", TaskProfile(distribution="fixed", mean_ms=0, failure_rate=1.0))
+    job = await submit(engine, job_data("broken", obj="filesystem"))
+
+    await wait_for(job, JobState.FAILED)
+
+    assert "injected failure" in job.errorMessage
+    assert engine.metrics()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_track_queue_depth_and_wait_time(engine):
+    jobs = [await submit(engine, job_data(f"job_{i}")) for i in range(3)]
+
+    await wait_for(jobs[-1], JobState.COMPLETED)
+    metrics = engine.metrics()
+
+    assert metrics["maxQueueDepth"] == 3
+    assert metrics["completed"] == 3
+    assert metrics["waitTime"]["count"] == 3
+    assert metrics["waitTime"]["maxMs"] >= 20
+
+
+class RecordingDispatcher:
+    """Dispatcher that echoes its parameters and records concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    def handles(self, task):
+        return task.object == "item"
+
+    async def run(self, task, parameters):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.calls.append((task.name, parameters))
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        if parameters.get("fail"):
+            raise RuntimeError("boom")
+        return {"id": f"id_{task.name}", **parameters}
+
+
+def item_task(name: str, **parameters) -> JobTask:
+    return JobTask(name=name, object="item", action="create", parametersIn=parameters)
+
+
+@pytest.mark.asyncio
+async def test_dispatched_tasks_resolve_references(engine):
+    engine.dispatcher = dispatcher = RecordingDispatcher()
+    data = JobCreate(
+        description="refs",
+        tasks=[
+            item_task("child", parent="@parent.id", size="@parent.nested.size"),
+            item_task("parent", nested={"size": 5}),
+        ],
+    )
+    job = await submit(engine, data)
+
+    await wait_for(job, JobState.COMPLETED)
+
+    assert [name for name, _ in dispatcher.calls] == ["parent", "child"]
+    assert dispatcher.calls[1][1] == {"parent": "id_parent", "size": 5}
+    assert job.tasks[0].parametersOut == {"id": "id_child"}
+
+
+@pytest.mark.asyncio
+async def test_independent_tasks_run_with_bounded_concurrency(engine):
+    engine.dispatcher = dispatcher = RecordingDispatcher()
+    engine.task_concurrency = 3
+    job = await submit(engine, JobCreate(description="wide", tasks=[item_task(f"t{i}") for i in range(1000)]))
+
+    await wait_for(job, JobState.COMPLETED)
+
+    assert len(dispatcher.calls) == 1000
+    assert dispatcher.max_active == 3
+    assert job.progressPct == 100
+
+
+@pytest.mark.asyncio
+async def test_bad_references_and_task_errors_fail_the_job(engine):
+    engine.dispatcher = RecordingDispatcher()
+    unknown = await submit(engine, JobCreate(description="unknown", tasks=[item_task("a", x="@missing.id")]))
+    cycle = await submit(
+        engine, JobCreate(description="cycle", tasks=[item_task("a", x="@b.id"), item_task("b", x="@a.id")])
+    )
+    broken = await submit(engine, JobCreate(description="broken", tasks=[item_task("a", fail=True)]))
+
+    await wait_for(broken, JobState.FAILED)
+
+    assert unknown.state == cycle.state == JobState.FAILED
+    assert "unknown task missing" in unknown.errorMessage
+    assert "Circular" in cycle.errorMessage
+    assert broken.errorMessage == "boom"
@@ -0,0 +1,74 @@
+from dell_unisphere_mock_api.core.metric_queries import MetricQueryScheduler, RandomWalkSampler
+from dell_unisphere_mock_api.core.metrics import MetricStore
+
+LUN_READS = "sp.*.storage.lun.*.readsRate"
+LUN_WRITES = "sp.*.storage.lun.*.writesRate"
+SP_CPU = "sp.*.cpu.summary.utilization"
+
+
+class CountingSampler(RandomWalkSampler):
+    def __init__(self):
+        super().__init__(seed=1)
+        self.calls = []
+
+    def sample(self, block, timestamp):
+        self.calls.append((block.object_type, timestamp))
+        super().sample(block, timestamp)
+
+
+def make_scheduler():
+    store = MetricStore(raw_slots=4, rollup_slots=4, max_objects=1000)
+    store.track("lun", ["sv_1", "sv_2"])
+    sampler = CountingSampler()
+    return MetricQueryScheduler(store, sampler, idle_timeout=60), sampler
+
+
+def test_due_queries_share_one_sample_per_type():
+    scheduler, sampler = make_scheduler()
+    queries = [scheduler.create([LUN_READS, LUN_WRITES], 5, now=1000.0 + i / 100) for i in range(100)]
+    scheduler.create([SP_CPU], 5, now=1001.0)
+
+    assert scheduler.tick(1004.0) == 0
+    assert scheduler.tick(1005.0) == 3
+
+    assert sorted(sampler.calls) == [("lun", 1005.0), ("sp", 1005.0)]
+    first, last = scheduler.results(queries[0].id, now=1005.0), scheduler.results(queries[-1].id, now=1005.0)
+    assert [(timestamp, path) for timestamp, path, _ in first] == [(1005.0, LUN_READS), (1005.0, LUN_WRITES)]
+    assert sorted(first[0][2]) == ["sv_1", "sv_2"]
+    assert first[0][2] is last[0][2]
+
+
+def test_queries_follow_their_interval_and_object_paths():
+    scheduler, _ = make_scheduler()
+    fast = scheduler.create(["sp.*.storage.lun.sv_2.readsRate"], 5, now=1000.0)
+    slow = scheduler.create([LUN_READS], 10, now=1000.0)
+
+    for now in (1005.0, 1010.0, 1015.0, 1020.0):
+        scheduler.tick(now)
+
+    assert [timestamp for timestamp, _, _ in scheduler.results(fast.id, now=1020.0)] == [1005, 1010, 1015, 1020]
+    assert [timestamp for timestamp, _, _ in scheduler.results(slow.id, now=1020.0)] == [1010, 1020]
+    assert list(scheduler.results(fast.id, now=1020.0)[0][2]) == ["sv_2"]
+
+
+def test_idle_queries_expire():
+    scheduler, sampler = make_scheduler()
+    polled = scheduler.create([LUN_READS], 5, now=1000.0)
+    idle = scheduler.create([SP_CPU], 5, now=1000.0)
+
+    scheduler.results(polled.id, now=1050.0)
+    scheduler.tick(1065.0)
+
+    assert scheduler.get(idle.id, now=1065.0) is None
+    assert scheduler.get(polled.id, now=1065.0) is polled
+    assert scheduler.counters["expired"] == 1
+    assert ("sp", 1065.0) not in sampler.calls
+
+
+def test_deleted_query_is_not_sampled():
+    scheduler, sampler = make_scheduler()
+    query = scheduler.create([LUN_READS], 5, now=1000.0)
+
+    assert scheduler.delete(query.id)
+    assert scheduler.tick(1005.0) == 0
+    assert sampler.calls == []
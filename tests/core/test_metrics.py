@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from dell_unisphere_mock_api.core.metrics import FIVE_MINUTES, MetricBlock, MetricStore, MetricStoreFull, resolve_path
+
+LUN_READS = "sp.*.storage.lun.*.readsRate"
+
+
+def lun_values(store: MetricStore, value: float, objects: int = 1) -> np.ndarray:
+    return np.full((objects, len(store.block("lun").metrics)), value)
+
+
+def test_raw_ring_keeps_latest_samples():
+    store = MetricStore(raw_slots=4, rollup_slots=4, max_objects=8)
+    for t in range(10):
+        store.record("lun", 60.0 * t, ["sv_1"], lun_values(store, t))
+
+    _, times, ids, values = store.query(LUN_READS, 0, 1e9)
+
+    assert times.tolist() == [360.0, 420.0, 480.0, 540.0]
+    assert ids == ["sv_1"]
+    assert values.tolist() == [[6.0, 7.0, 8.0, 9.0]]
+
+
+def test_rollups_hold_bucket_means():
+    store = MetricStore(raw_slots=4, rollup_slots=4, max_objects=8)
+    for t in range(0, 900, 60):
+        store.record("lun", float(t), ["sv_1", "sv_2"], np.stack([lun_values(store, t)[0], lun_values(store, 1)[0]]))
+
+    _, times, ids, values = store.query(LUN_READS, 0, 1e9, FIVE_MINUTES)
+
+    # The bucket in progress is not reported until it is complete
+    assert times.tolist() == [0.0, 300.0]
+    assert ids == ["sv_1", "sv_2"]
+    assert values.tolist() == [[120.0, 420.0], [1.0, 1.0]]
+
+
+def test_query_by_object_path_and_time_range():
+    store = MetricStore(raw_slots=8, rollup_slots=4, max_objects=8)
+    for t in range(5):
+        store.record("lun", 60.0 * t, ["sv_1", "sv_2"], lun_values(store, t, objects=2))
+
+    _, times, ids, values = store.query("sp.*.storage.lun.sv_2.readsRate", 60, 180)
+
+    assert times.tolist() == [60.0, 120.0, 180.0]
+    assert ids == ["sv_2"]
+    assert values.tolist() == [[1.0, 2.0, 3.0]]
+
+
+def test_forgotten_rows_are_reused_and_cleared():
+    block = MetricStore(raw_slots=4, rollup_slots=4, max_objects=8).block("lun")
+    rows = block.rows_for(["a", "b"])
+    block.record(0.0, rows, np.ones((2, len(block.metrics))))
+
+    block.forget(["a"])
+    reused = block.rows_for(["c"])
+
+    assert reused[0] == rows[0]
+    _, ids, values = block.query("readsRate", 0, 1e9)
+    assert ids == ["c", "b"]
+    assert np.isnan(values[0]).all()
+    assert values[1].tolist() == [1.0]
+
+
+def test_block_memory_is_bounded():
+    block = MetricBlock("lun", MetricStore().block("lun").metrics, 4, 4, max_objects=100, rows=16)
+    block.rows_for([str(i) for i in range(100)])
+    size = block.nbytes
+
+    with pytest.raises(MetricStoreFull):
+        block.rows_for(["one too many"])
+    assert block.capacity == 100
+    assert block.nbytes == size
+
+
+def test_resolve_path():
+    metric, obj_id = resolve_path("sp.*.storage.lun.sv_7.writesRate")
+    assert (metric.object_type, metric.name, obj_id) == ("lun", "writesRate", "sv_7")
+    assert resolve_path(LUN_READS)[1] is None
+    with pytest.raises(KeyError):
+        resolve_path("sp.*.storage.lun.*.unknown")
@@ -0,0 +1,103 @@
+import random
+
+from dell_unisphere_mock_api.core.changes import ChangeFeed
+from dell_unisphere_mock_api.core.snap_schedules import (
+    DAILY,
+    HOURLY,
+    WEEKLY,
+    ScheduleRule,
+    SnapScheduleEngine,
+    TimerWheel,
+)
+from dell_unisphere_mock_api.core.snapshots import SCHEDULER, SnapshotEngine
+
+HOUR = 3600.0
+
+
+class DictTarget:
+    def __init__(self, resources):
+        self.resources = resources
+        self.usage = {}
+
+    def describe(self, obj_ids):
+        return [self.resources.get(obj_id) for obj_id in obj_ids]
+
+    def apply(self, obj_ids, counts, sizes, allocated):
+        self.usage.update(zip(obj_ids, zip(counts, sizes, allocated)))
+
+
+def test_timer_wheel_fires_items_at_their_ticks():
+    rng = random.Random(0)
+    wheel = TimerWheel(now=10)
+    due = {}
+    for item in range(500):
+        when = 10 + rng.choice([rng.randrange(64), rng.randrange(5000), rng.randrange(20_000_000)])
+        due[item] = when
+        wheel.add(when, item)
+    # Items already due fire at the next tick
+    wheel.add(0, "late")
+    fired = {}
+    for tick, items in wheel.advance(100_000):
+        for item in items:
+            fired[item] = tick
+    # Items added mid-way are placed against the current tick
+    wheel.add(150_000, "added")
+    for tick, items in wheel.advance(30_000_000):
+        for item in items:
+            fired[item] = tick
+    assert fired.pop("late") == 10 and fired.pop("added") == 150_000
+    assert fired == due
+    assert len(wheel) == 0
+
+
+def test_rules_fire_at_their_next_minute():
+    hourly = ScheduleRule("r1", HOURLY, minute=15, interval=6)
+    assert [hourly.next_after(0), hourly.next_after(15)] == [15, 6 * 60 + 15]
+    daily = ScheduleRule("r2", DAILY, minute=30, hours=[20, 2])
+    assert [daily.next_after(0), daily.next_after(150), daily.next_after(1230)] == [150, 1230, 1440 + 150]
+    # 5 January 1970 was a Monday
+    weekly = ScheduleRule("r3", WEEKLY, hours=[0], days=[0])
+    assert [weekly.next_after(0), weekly.next_after(4 * 1440)] == [4 * 1440, 11 * 1440]
+
+
+def make_engines():
+    snapshots = SnapshotEngine(feed=ChangeFeed(capacity=1024), slice_size=100, clock=lambda: 0.0)
+    target = DictTarget({"sr_1": (2000, 1000), "sr_2": (2000, 1000)})
+    snapshots.target = target
+    return SnapScheduleEngine(snapshots, clock=lambda: 0.0), snapshots, target
+
+
+def test_fast_forward_takes_and_expires_scheduled_snapshots():
+    engine, snapshots, target = make_engines()
+    schedule = engine.create("hourly", [{"type": HOURLY, "retention": 6 * HOUR}], ["sr_1", "sr_2"])
+    assert engine.next_snap_time(schedule) == HOUR
+
+    assert engine.fast_forward(24 * HOUR) == 48
+    # Only the snapshots of the last six hours are kept
+    assert [snap.creator for snap in snapshots.snapshots("sr_1")] == [SCHEDULER] * 6
+    assert target.usage["sr_2"][0] == 6
+    assert engine.next_snap_time(schedule) == 25 * HOUR
+
+    # A resource follows one schedule; removed rules and deleted schedules take no more snapshots
+    daily = engine.create("daily", [{"type": DAILY, "hours": [12]}], ["sr_2"])
+    assert list(schedule.resources) == ["sr_1"] and engine.schedule_of["sr_2"] == daily.id
+    engine.modify(schedule.id, remove_rule_ids=list(schedule.rules))
+    assert engine.fast_forward(24 * HOUR) == 1
+    engine.delete(daily.id)
+    assert engine.fast_forward(7 * 24 * HOUR) == 0
+    assert engine.schedule_of == {"sr_1": schedule.id}
+    assert [len(list(snapshots.snapshots(resource_id))) for resource_id in ("sr_1", "sr_2")] == [0, 1]
+
+
+def test_snapshots_share_the_fast_forwarded_time():
+    engine, snapshots, _ = make_engines()
+    engine.create("hourly", [{"type": HOURLY}], ["sr_2"])
+    engine.fast_forward(30 * 24 * HOUR)
+
+    snap = snapshots.create("sr_1", "by_hand", retention=HOUR)
+    assert snap.created == engine.now() and snap.expires == engine.now() + HOUR
+    # The next schedule ticks do not expire it early
+    engine.fast_forward(30 * 60)
+    assert snap.id in snapshots.snaps
+    engine.fast_forward(HOUR)
+    assert snap.id not in snapshots.snaps
@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+import pytest
+
+from dell_unisphere_mock_api.core.changes import MODIFIED, ChangeFeed
+from dell_unisphere_mock_api.core.snapshots import SYSTEM, SnapshotEngine, SnapshotLimitExceeded
+
+ALLOCATED = 1000.0
+
+
+class DictTarget:
+    def __init__(self, feed):
+        self.feed = feed
+        self.resources = {}
+        self.usage = {}
+
+    def put(self, resource_id, size, allocated):
+        self.resources[resource_id] = (size, allocated)
+        self.feed.publish("storageResource", MODIFIED, resource_id)
+
+    def describe(self, obj_ids):
+        return [self.resources.get(obj_id) for obj_id in obj_ids]
+
+    def apply(self, obj_ids, counts, sizes, allocated):
+        self.usage.update(zip(obj_ids, zip(counts, sizes, allocated)))
+
+
+def make_engine(rates=None, max_per_resource=None):
+    feed = ChangeFeed(capacity=1024)
+    engine = SnapshotEngine(feed=feed, slice_size=100, max_per_resource=max_per_resource, clock=lambda: 0.0)
+    target = DictTarget(feed)
+    engine.target = target
+    if rates is not None:
+        engine.write_rate = lambda obj_ids: np.array([rates.get(obj_id, 0.0) for obj_id in obj_ids])
+    target.put("sr_1", 2000, int(ALLOCATED))
+    return engine, target
+
+
+def changed(written, already=0.0):
+    return ALLOCATED - (ALLOCATED - already) * math.exp(-written / ALLOCATED)
+
+
+def test_snapshots_hold_what_changed_after_them():
+    engine, target = make_engine()
+    first = engine.create("sr_1", "first")
+    assert first.size == 2000
+    assert target.usage["sr_1"] == (1, 0, 0)
+
+    engine.write("sr_1", 500)
+    second = engine.create("sr_1", "second")
+    engine.write("sr_1", 200)
+    engine.write("sr_1", 300)
+    held_first, held_second = changed(500), changed(500)
+    assert engine.held(first) == round(held_first)
+    assert engine.held(second) == round(held_second)
+    # Shared blocks are counted once, and the space is written back in whole slices
+    count, size, allocated = target.usage["sr_1"]
+    assert (count, size, allocated) == (2, round(held_first + held_second), 800)
+    assert engine.usage("sr_1") == (2, size)
+
+    # Blocks of the newest snapshot not yet overwritten before it was taken move to the previous one
+    engine.delete(second.id)
+    merged = held_first + held_second - held_first * held_second / ALLOCATED
+    assert engine.held(first) == round(merged)
+    assert engine.usage("sr_1") == (1, round(merged))
+    assert [snap.id for snap in engine.snapshots("sr_1")] == [first.id]
+
+    engine.delete(first.id)
+    assert target.usage["sr_1"] == (0, 0, 0)
+    assert engine.usage("sr_1") == (0, 0)
+    assert engine.snaps == {}
+
+
+def test_writes_accounted_from_workload_rates():
+    engine, target = make_engine(rates={"sr_1": 10.0})
+    oldest = engine.create("sr_1", now=0.0)
+    middle = engine.create("sr_1", now=10.0)
+    newest = engine.create("sr_1", now=20.0)
+    engine.advance(30.0)
+    assert [engine.held(snap) for snap in (oldest, middle, newest)] == [round(changed(100))] * 3
+
+    # Deleting the oldest snapshot frees all it holds; growing the resource is picked up from the feed
+    engine.delete(oldest.id, now=30.0)
+    assert engine.usage("sr_1") == (2, round(2 * changed(100)))
+    target.put("sr_1", 2000, 2000)
+    engine.advance(40.0)
+    assert engine.allocated[engine.rows["sr_1"]] == 2000
+    assert engine.held(newest) > round(changed(100))
+
+
+def test_restore_takes_backup_holding_what_changed():
+    engine, target = make_engine(max_per_resource=3)
+    snap = engine.create("sr_1")
+    engine.write("sr_1", 400)
+    backup = engine.restore(snap.id, "backup")
+    assert backup.creator == SYSTEM
+    assert [entry.name for entry in engine.snapshots("sr_1")][1] == "backup"
+    # Rewriting the blocks changed since the snapshot leaves them held by the backup
+    assert engine.held(backup) == round(changed(400))
+    assert target.usage["sr_1"][0] == 2
+
+    engine.create("sr_1")
+    with pytest.raises(SnapshotLimitExceeded):
+        engine.create("sr_1")
+    with pytest.raises(KeyError):
+        engine.create("missing")
@@ -0,0 +1,106 @@
+import asyncio
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, MODIFIED, ChangeFeed
+from dell_unisphere_mock_api.core.tiering import COMPLETED, TieringEngine
+
+CAPACITY = {"EXTREME_PERFORMANCE": 10, "PERFORMANCE": 20, "CAPACITY": 100}
+
+
+class DictTarget:
+    def __init__(self, feed):
+        self.feed = feed
+        self.objects = {}
+        self.per_tier = {}
+
+    def put(self, obj_id, allocated, policy=None, pool="pool_1"):
+        action = MODIFIED if obj_id in self.objects else CREATED
+        self.objects[obj_id] = (pool, allocated, policy)
+        self.feed.publish("storageResource", action, obj_id)
+
+    def remove(self, obj_id):
+        del self.objects[obj_id]
+        self.feed.publish("storageResource", DELETED, obj_id)
+
+    def ids(self):
+        return list(self.objects)
+
+    def describe(self, obj_ids):
+        return [self.objects.get(obj_id) for obj_id in obj_ids]
+
+    def apply(self, obj_ids, per_tier):
+        self.per_tier.update(zip(obj_ids, per_tier))
+
+
+def make_engine(heat=None):
+    feed = ChangeFeed(capacity=1024)
+    engine = TieringEngine(feed=feed, slice_size=1, seed=3)
+    target = DictTarget(feed)
+    engine.targets = {"storageResource": target}
+    engine.pool_capacity = lambda pool_id: CAPACITY
+    if heat is not None:
+        engine.heat = lambda object_type, obj_ids: np.array([heat[obj_id] for obj_id in obj_ids], dtype=np.float64)
+    engine.step_interval = 0
+    return engine, target
+
+
+def test_new_slices_fill_tiers_by_policy():
+    engine, target = make_engine()
+    target.put("high", 15)
+    target.put("low", 30, "LowestAvailable")
+    engine.sync()
+
+    assert target.per_tier["high"] == {"EXTREME_PERFORMANCE": 10, "PERFORMANCE": 5}
+    assert target.per_tier["low"] == {"CAPACITY": 30}
+    assert engine.tier_usage("pool_1")["CAPACITY"] == (30, 0, 0)
+
+    # Shrinking frees the slowest slices first; deleting frees them all
+    target.put("high", 8)
+    target.remove("low")
+    engine.sync()
+    assert target.per_tier["high"] == {"EXTREME_PERFORMANCE": 8}
+    assert [used for used, _, _ in engine.tier_usage("pool_1").values()] == [8, 0, 0]
+
+
+def test_relocation_moves_hot_slices_up_in_batches():
+    engine, target = make_engine(heat={"cold": 0.0, "hot": 5000.0, "pinned": 0.0})
+    target.put("cold", 10)
+    target.put("pinned", 5, "NoData")
+    engine.sync()
+    target.put("hot", 10)
+    engine.sync()
+    # The flash tier was taken by the first object, so the hot one started lower
+    assert target.per_tier["hot"] == {"PERFORMANCE": 10}
+
+    assert engine.plan("pool_1") > 0
+    up, down = engine.movement("pool_1")
+    # Hot slices leave the performance tier upwards, cold ones leave flash downwards
+    assert up[1] > 0 and down[0] > 0 and up[0] == down[2] == 0
+
+    moved = asyncio.run(engine.relocate("pool_1", rate="LOW"))
+    assert moved == engine.relocation("pool_1").moved > 0
+    assert engine.pending("pool_1") == 0
+    assert engine.fast_vp("pool_1")["status"] == COMPLETED
+    assert engine.fast_vp("pool_1")["percentComplete"] == 100
+    # 90% of the flash tier is filled, hottest first; the pinned object does not move
+    assert target.per_tier["hot"]["EXTREME_PERFORMANCE"] == 9
+    assert target.per_tier["pinned"] == {"PERFORMANCE": 5}
+    assert engine.tier_usage("pool_1")["EXTREME_PERFORMANCE"][0] == 9
+
+
+def test_step_moves_whole_objects_within_budget():
+    engine, target = make_engine(heat={f"r{index}": float(index) for index in range(6)})
+    for index in range(6):
+        target.put(f"r{index}", 5, "LowestAvailable")
+    engine.sync()
+    for index in range(6):
+        target.put(f"r{index}", 5, "HighestAvailable")
+    engine.sync()
+
+    # The tiers are filled to 90% from the fastest down; the last 3 slices stay where they are
+    assert engine.plan("pool_1") == 27
+    # Objects start moving until the budget runs out; the second one still completes
+    assert engine.step("pool_1", 7) == 10
+    assert engine.pending("pool_1") == 17
+    assert sum(target.per_tier[f"r{index}"].get("CAPACITY", 0) for index in range(6)) == 20
@@ -0,0 +1,29 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from dell_unisphere_mock_api.core.config import settings
+from dell_unisphere_mock_api.core.trusted import trusted, trusted_many
+
+
+class Item(BaseModel):
+    id: str
+    size: int = 0
+
+
+def test_trusted_skips_validation(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATE_INTERNAL", False)
+
+    item = trusted(Item, id="1", size="not a number")
+
+    assert item.size == "not a number"
+    assert [i.id for i in trusted_many(Item, [{"id": "1"}, {"id": "2"}])] == ["1", "2"]
+
+
+def test_validate_internal_debug_mode(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATE_INTERNAL", True)
+
+    assert trusted(Item, id="1", size="10").size == 10
+    with pytest.raises(ValidationError):
+        trusted(Item, id="1", size="not a number")
+    with pytest.raises(ValidationError):
+        trusted_many(Item, [{"id": 1}])
@@ -0,0 +1,116 @@
+import numpy as np
+
+from dell_unisphere_mock_api.core.changes import CREATED, DELETED, ChangeFeed
+from dell_unisphere_mock_api.core.metrics import MetricStore
+from dell_unisphere_mock_api.core.workload import TB, WorkloadSimulator
+
+GB = 1024**3
+SLICE = 256 * 1024**2
+
+
+class DictTarget:
+    def __init__(self, feed, object_type, limit=None):
+        self.feed = feed
+        self.object_type = object_type
+        self.objects = {}
+        self.limit = limit
+        self.applied = []
+
+    def add(self, obj_id, pool="pool_1", size=100 * GB, allocated=0, thin=True):
+        self.objects[obj_id] = (pool, size, allocated, allocated, thin)
+        self.feed.publish(self.object_type, CREATED, obj_id)
+
+    def remove(self, obj_id):
+        del self.objects[obj_id]
+        self.feed.publish(self.object_type, DELETED, obj_id)
+
+    def ids(self):
+        return list(self.objects)
+
+    def describe(self, obj_ids):
+        return [self.objects.get(obj_id) for obj_id in obj_ids]
+
+    def apply(self, obj_ids, allocated, used):
+        self.applied.append(list(obj_ids))
+        result = []
+        for obj_id, size in zip(obj_ids, allocated):
+            pool, total, current, _, thin = self.objects[obj_id]
+            if self.limit is not None:
+                size = min(size, self.limit)
+            self.objects[obj_id] = (pool, total, size, min(used[len(result)], size), thin)
+            result.append(size)
+        return result
+
+
+def make_simulator(limit=None):
+    feed = ChangeFeed(capacity=1024)
+    store = MetricStore(raw_slots=8, rollup_slots=4, max_objects=1000)
+    simulator = WorkloadSimulator(store=store, feed=feed, seed=7, slice_size=SLICE)
+    luns = DictTarget(feed, "lun", limit)
+    simulator.targets = {"lun": luns}
+    simulator.pool_tiers = lambda: {"pool_1": {"EXTREME_PERFORMANCE": TB}, "pool_2": {"CAPACITY": 100 * TB}}
+    return simulator, luns, store
+
+
+def test_tick_records_metrics_for_objects_pools_and_storage_processors():
+    simulator, luns, store = make_simulator()
+    luns.add("sv_1")
+    luns.add("sv_2", pool="pool_2")
+
+    simulator.tick(1000.0)
+
+    _, ids, values = store.block("lun").latest()
+    assert ids == ["sv_1", "sv_2"]
+    reads, writes, read_bytes, _, response, _ = values.T
+    assert (reads > 0).all() and (writes > 0).all() and (read_bytes >= 4096 * reads).all()
+    # Flash responds faster than nearline disks
+    assert response[0] < response[1]
+    _, pool_ids, pool_values = store.block("pool").latest()
+    assert pool_ids == ["pool_1", "pool_2"]
+    assert np.allclose(pool_values[:, 0], reads)
+    _, sp_ids, sp_values = store.block("sp").latest()
+    assert np.isclose(sp_values[:, 1].sum(), reads.sum())
+
+
+def test_thin_objects_grow_in_slices():
+    simulator, luns, _ = make_simulator()
+    luns.add("thin", size=1000 * GB)
+    luns.add("thick", size=1000 * GB, allocated=1000 * GB, thin=False)
+
+    for day in range(4):
+        simulator.tick(86400.0 * day)
+
+    pool, size, allocated, used, _ = luns.objects["thin"]
+    assert 0 < used <= allocated <= size
+    assert allocated % SLICE == 0
+    assert luns.objects["thick"][2] == 1000 * GB
+    assert all(obj_ids == ["thin"] for obj_ids in luns.applied)
+
+
+def test_growth_stops_when_pool_refuses_space():
+    simulator, luns, _ = make_simulator(limit=SLICE)
+    luns.add("sv_1", size=1000 * GB)
+
+    for day in range(10):
+        simulator.tick(86400.0 * day)
+
+    population = simulator.populations["lun"]
+    row = population.rows["sv_1"]
+    assert luns.objects["sv_1"][2] == SLICE
+    assert population.columns["used"][row] <= SLICE
+
+
+def test_follows_created_and_deleted_objects():
+    simulator, luns, store = make_simulator()
+    luns.add("sv_1")
+    simulator.tick(1000.0)
+
+    luns.remove("sv_1")
+    luns.add("sv_2")
+    simulator.tick(1060.0)
+
+    assert list(simulator.populations["lun"].rows) == ["sv_2"]
+    store.forget("lun", ["sv_1"])
+    _, ids, values = store.block("lun").latest()
+    assert ids == ["sv_2"]
+    assert not np.isnan(values).any()
@@ -0,0 +1,48 @@
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.schemas.disk import DiskTierEnum, DiskTypeEnum
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+
+def test_alerts_raised_by_pool_usage_and_disk_faults(test_client, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(
+        PoolCreate(name="alert_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=1000, alertThreshold=60)
+    )
+    disk = DiskModel().create(
+        {"disk_type": DiskTypeEnum.SAS, "tier_type": DiskTierEnum.PERFORMANCE, "size": 1000, "slot_number": 0}
+    )
+    disk_id = disk["entries"][0]["content"]["id"]
+    assert test_client.get("/api/types/alert/instances", headers=headers).json()["entries"] == []
+
+    capacity_ledger.post(pool.id, allocated=700)
+    DiskModel().update(disk_id, {"health_status": "FAULTED"})
+
+    response = test_client.get("/api/types/alert/instances", headers=headers)
+    assert response.status_code == 200
+    alerts = {entry["content"]["component"]["resource"]: entry["content"] for entry in response.json()["entries"]}
+    assert alerts["pool"]["component"]["id"] == pool.id
+    assert alerts["pool"]["severity"] == 4
+    assert alerts["disk"]["severity"] == 2
+    assert alerts["disk"]["state"] == 1
+
+    disk_alert = alerts["disk"]["id"]
+    response = test_client.post(f"/api/instances/alert/{disk_alert}/action/acknowledge", headers=headers)
+    assert response.status_code == 204
+    response = test_client.get("/api/types/alert/instances?filter=isAcknowledged eq false", headers=headers)
+    assert [entry["content"]["id"] for entry in response.json()["entries"]] == [alerts["pool"]["id"]]
+    response = test_client.get("/api/types/alert/instances?filter=isAcknowledged eq TRUE", headers=headers)
+    assert [entry["content"]["id"] for entry in response.json()["entries"]] == [disk_alert]
+    response = test_client.get("/api/types/alert/instances?filter=severity lt 3", headers=headers)
+    assert [entry["content"]["id"] for entry in response.json()["entries"]] == [disk_alert]
+
+    assert test_client.delete(f"/api/instances/alert/{disk_alert}", headers=headers).status_code == 204
+    assert test_client.get(f"/api/instances/alert/{disk_alert}", headers=headers).status_code == 404
+
+    response = test_client.get("/api/types/event/instances", headers=headers)
+    events = response.json()["entries"]
+    assert len(events) == 2
+    event_id = events[0]["content"]["id"]
+    response = test_client.get(f"/api/instances/event/{event_id}", headers=headers)
+    assert response.json()["entries"][0]["content"]["messageId"] == events[0]["content"]["messageId"]
@@ -0,0 +1,53 @@
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+
+def create_pool():
+    return PoolModel().create_pool(PoolCreate(name="batch_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=10**12))
+
+
+def test_batch_runs_operations_in_order(test_client, auth_headers):
+    headers, _ = auth_headers
+    pool = create_pool()
+    lun = {"name": "lun_1", "pool_id": pool.id, "size": 1}
+    operations = [
+        {"method": "POST", "path": "/api/types/lun/instances", "body": lun},
+        {"method": "GET", "path": "/api/instances/lun/name:lun_1"},
+        {"method": "GET", "path": f"/api/instances/pool/{pool.id}"},
+        {"method": "DELETE", "path": "/api/instances/lun/1"},
+        {"method": "GET", "path": "/api/instances/lun/name:lun_1"},
+    ]
+
+    response = test_client.post("/api/batch", json={"operations": operations}, headers=headers)
+
+    assert response.status_code == 200
+    results = [entry["content"] for entry in response.json()["entries"]]
+    assert [result["status"] for result in results] == [201, 200, 200, 204, 404]
+    assert results[1]["body"]["entries"][0]["content"]["name"] == "lun_1"
+    assert results[2]["body"]["entries"][0]["content"]["id"] == pool.id
+    assert results[4]["body"]["httpStatusCode"] == 404
+    assert LUNModel().get_lun_by_name("lun_1") is None
+
+
+def test_batch_reports_invalid_operations(test_client, auth_headers):
+    headers, _ = auth_headers
+    operations = [
+        {"method": "GET", "path": "/api/no/such/path"},
+        {"method": "POST", "path": "/api/types/lun/instances", "body": {"name": "lun_1"}},
+        {"method": "POST", "path": "/api/batch", "body": {"operations": []}},
+    ]
+
+    response = test_client.post("/api/batch", json={"operations": operations}, headers=headers)
+
+    assert [entry["content"]["status"] for entry in response.json()["entries"]] == [404, 422, 400]
+
+
+def test_batch_requires_authentication(test_client):
+    response = test_client.post(
+        "/api/batch",
+        json={"operations": [{"method": "GET", "path": "/api/types/lun/instances"}]},
+        headers={"X-EMC-REST-CLIENT": "true", "EMC-CSRF-TOKEN": "token"},
+    )
+
+    assert response.status_code == 401
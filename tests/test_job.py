@@ -1,3 +1,4 @@
+import asyncio
 import base64
 
 import httpx
@@ -5,7 +6,9 @@ import pytest
 import pytest_asyncio
 
 from dell_unisphere_mock_api.main import app
-from dell_unisphere_mock_api.schemas.job import JobCreate, JobTask
+from dell_unisphere_mock_api.models.job import JobModel
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.schemas.job import JobCreate, JobState, JobTask
 
 
 @pytest_asyncio.fixture
@@ -118,3 +121,184 @@ async def test_delete_job(async_test_client, sample_job_data, auth_headers):
         headers=headers_without_csrf,
     )
     assert get_response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_job_runs_to_completion(async_test_client, auth_headers):
+    headers_with_csrf, headers_without_csrf = auth_headers
+    job_data = JobCreate(
+        description="Create pool",
+        tasks=[
+            JobTask(
+                name="CreatePool",
+                object="pool",
+                action="create",
+                parametersIn={"name": "job_pool", "raidType": "RAID5", "sizeTotal": 1000000000},
+            )
+        ],
+    )
+    create_response = await async_test_client.post(
+        "/api/types/job/instances",
+        json=job_data.model_dump(),
+        headers=headers_with_csrf,
+    )
+    job_id = create_response.json()["entries"][0]["content"]["id"]
+
+    for _ in range(200):
+        response = await async_test_client.get(f"/api/types/job/instances/{job_id}", headers=headers_without_csrf)
+        content = response.json()["entries"][0]["content"]
+        if content["state"] == "COMPLETED":
+            break
+        await asyncio.sleep(0.01)
+
+    assert content["state"] == "COMPLETED"
+    assert content["progressPct"] == 100
+
+    # Finished jobs cannot be cancelled
+    cancel_response = await async_test_client.post(
+        f"/api/instances/job/{job_id}/action/cancel", headers=headers_with_csrf
+    )
+    assert cancel_response.status_code == 409
+
+    metrics_response = await async_test_client.get("/api/types/job/metrics", headers=headers_without_csrf)
+    metrics = metrics_response.json()["entries"][0]["content"]
+    assert metrics["completed"] >= 1
+    assert metrics["queueDepth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_job_tasks_execute_with_references(async_test_client, auth_headers):
+    headers_with_csrf, headers_without_csrf = auth_headers
+    tasks = [
+        JobTask(
+            name="CreatePool",
+            object="pool",
+            action="create",
+            parametersIn={"name": "bulk_pool", "raidType": "RAID5", "sizeTotal": 1000000000000},
+        )
+    ]
+    tasks += [
+        JobTask(
+            name=f"CreateLun{i}",
+            object="lun",
+            action="create",
+            parametersIn={"name": f"bulk_lun_{i}", "pool_id": "@CreatePool.id", "size": 1024},
+        )
+        for i in range(100)
+    ]
+    create_response = await async_test_client.post(
+        "/api/types/job/instances",
+        json=JobCreate(description="Create pool and LUNs", tasks=tasks).model_dump(),
+        headers=headers_with_csrf,
+    )
+    job_id = create_response.json()["entries"][0]["content"]["id"]
+
+    for _ in range(200):
+        response = await async_test_client.get(f"/api/types/job/instances/{job_id}", headers=headers_without_csrf)
+        content = response.json()["entries"][0]["content"]
+        if content["state"] != "RUNNING" and content["state"] != "PENDING":
+            break
+        await asyncio.sleep(0.01)
+
+    assert content["state"] == "COMPLETED", content["errorMessage"]
+    pool_id = content["tasks"][0]["parametersOut"]["id"]
+    luns = LUNModel().list_luns()
+    assert len(luns) == 100
+    assert all(lun.pool_id == pool_id for lun in luns)
+
+
+async def finished_jobs(model: JobModel, count: int, state: JobState = JobState.COMPLETED):
+    jobs = []
+    for i in range(count):
+        job = await model.create_job(JobCreate(description=f"job {i}", tasks=[]))
+        await model.update_job_state(job.id, JobState.RUNNING)
+        await model.update_job_state(job.id, state)
+        jobs.append(job)
+    return jobs
+
+
+@pytest.mark.asyncio
+async def test_job_store_evicts_oldest_finished_jobs_over_max_count(monkeypatch):
+    model = JobModel()
+    monkeypatch.setattr(JobModel, "max_count", 5)
+    active = await model.create_job(JobCreate(description="active", tasks=[]))
+    jobs = await finished_jobs(model, 8)
+
+    assert len(model.jobs) == 5
+    assert active.id in model.jobs
+    assert [job.id for job in await model.list_jobs(JobState.COMPLETED)] == [job.id for job in jobs[-4:]]
+    assert await model.list_jobs(JobState.PENDING) == [active]
+
+
+@pytest.mark.asyncio
+async def test_job_store_evicts_expired_jobs_incrementally(monkeypatch):
+    model = JobModel()
+    await finished_jobs(model, 10, JobState.FAILED)
+    running = await model.create_job(JobCreate(description="running", tasks=[]))
+    await model.update_job_state(running.id, JobState.RUNNING)
+    monkeypatch.setattr(JobModel, "max_age", 0)
+
+    assert model.evict(limit=4) == 4
+    assert len(model.jobs) == 7
+    assert model.evict() == 6
+    assert await model.list_jobs() == [running]
+    assert await model.list_jobs(JobState.RUNNING) == [running]
+
+
+@pytest.mark.asyncio
+async def test_get_job_waits_for_state_change(async_test_client, auth_headers):
+    headers_with_csrf, headers_without_csrf = auth_headers
+    job_data = JobCreate(
+        description="Simulated job",
+        tasks=[JobTask(name="Sleep", object="host", action="simulate", parametersIn={})],
+    )
+    create_response = await async_test_client.post(
+        "/api/types/job/instances", json=job_data.model_dump(), headers=headers_with_csrf
+    )
+    job_id = create_response.json()["entries"][0]["content"]["id"]
+
+    states = []
+    while not states or states[-1] not in ("COMPLETED", "FAILED"):
+        response = await async_test_client.get(
+            f"/api/types/job/instances/{job_id}", params={"waitTimeout": 5}, headers=headers_without_csrf
+        )
+        states.append(response.json()["entries"][0]["content"]["state"])
+        assert len(states) <= 3
+
+    assert states[-1] == "COMPLETED"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_state_change_times_out_and_wakes():
+    model = JobModel()
+    job = await model.create_job(JobCreate(description="idle", tasks=[]))
+
+    assert (await model.wait_for_state_change(job.id, 0.01)).state == JobState.PENDING
+
+    waiter = asyncio.create_task(model.wait_for_state_change(job.id, 5))
+    await asyncio.sleep(0)
+    await model.update_job_state(job.id, JobState.RUNNING)
+    assert (await asyncio.wait_for(waiter, 1)).state == JobState.RUNNING
+    assert await model.wait_for_state_change("missing", 5) is None
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_changed_since_sequence_number(async_test_client, auth_headers):
+    _, headers_without_csrf = auth_headers
+    model = JobModel()
+    kept = await model.create_job(JobCreate(description="kept", tasks=[]))
+    removed = await model.create_job(JobCreate(description="removed", tasks=[]))
+    full = await async_test_client.get("/api/types/job/instances", headers=headers_without_csrf)
+    change_seq = full.json()["metadata"]["changeSeq"]
+
+    await model.delete_job(removed.id)
+    added = await model.create_job(JobCreate(description="added", tasks=[]))
+    response = await async_test_client.get(
+        "/api/types/job/instances", params={"changeSeq": change_seq}, headers=headers_without_csrf
+    )
+
+    body = response.json()
+    assert [entry["content"]["id"] for entry in body["entries"]] == [added.id]
+    assert body["metadata"]["deleted"] == [removed.id]
+    assert body["metadata"]["changeSeq"] > change_seq
+    assert kept.id not in body["metadata"]["deleted"]
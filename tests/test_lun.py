@@ -1,7 +1,22 @@
+import asyncio
+
+import httpx
 import pytest
+import pytest_asyncio
 
+from dell_unisphere_mock_api.main import app
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
 from dell_unisphere_mock_api.schemas.lun import HostAccessEnum, LUNCreate, LUNTypeEnum, LUNUpdate, TieringPolicyEnum
-from dell_unisphere_mock_api.schemas.pool import RaidTypeEnum
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+
+@pytest_asyncio.fixture
+async def async_test_client():
+    """Fixture to provide an async test client."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(base_url="http://testserver", transport=transport) as client:
+        yield client
 
 
 @pytest.fixture
@@ -292,3 +307,121 @@ def test_delete_lun_by_name(test_client, sample_pool_data, sample_lun_data, auth
     # Verify LUN is deleted
     get_response = test_client.get(f"/api/instances/lun/name:{lun_create.name}", headers=headers)
     assert get_response.status_code == 404
+
+
+def test_bulk_create_luns(test_client, sample_pool_data, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(**sample_pool_data))
+    luns = [{"name": f"bulk_lun_{i}", "pool_id": pool.id, "size": 1000000000} for i in range(500)]
+
+    response = test_client.post("/api/types/lun/action/bulkCreate", json={"luns": luns}, headers=headers)
+
+    assert response.status_code == 201
+    summary = response.json()["entries"][0]["content"]
+    assert summary["created"] == 500
+    assert summary["failed"] == 0
+    ids = [result["id"] for result in summary["results"]]
+    assert len(set(ids)) == 500
+    assert LUNModel().get_lun_by_name("bulk_lun_499").id == ids[-1]
+
+
+def test_bulk_create_luns_atomic_and_best_effort(test_client, sample_pool_data, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(**sample_pool_data))
+    LUNModel().create_lun(LUNCreate(name="existing", pool_id=pool.id, size=1000))
+    luns = [
+        {"name": "fits", "pool_id": pool.id, "size": 1500000000000},
+        {"name": "existing", "pool_id": pool.id, "size": 1000},
+        {"name": "too_big", "pool_id": pool.id, "size": 1000000000000},
+        {"name": "no_pool", "pool_id": "missing", "size": 1000},
+    ]
+
+    response = test_client.post("/api/types/lun/action/bulkCreate", json={"luns": luns}, headers=headers)
+
+    assert response.status_code == 400
+    summary = response.json()["entries"][0]["content"]
+    assert summary["created"] == 0
+    assert [result["status"] for result in summary["results"]] == [400, 409, 400, 404]
+    assert LUNModel().get_lun_by_name("fits") is None
+
+    response = test_client.post(
+        "/api/types/lun/action/bulkCreate", json={"luns": luns, "atomic": False}, headers=headers
+    )
+
+    assert response.status_code == 201
+    summary = response.json()["entries"][0]["content"]
+    assert summary["created"] == 1
+    assert [result["status"] for result in summary["results"]] == [201, 409, 400, 404]
+    assert LUNModel().get_lun_by_name("fits").id == summary["results"][0]["id"]
+
+
+def test_bulk_delete_luns(test_client, sample_pool_data, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(**sample_pool_data))
+    lun_model = LUNModel()
+    luns = lun_model.create_luns([LUNCreate(name=f"bulk_{i}", pool_id=pool.id, size=1000) for i in range(100)])
+    lun_model.create_lun(LUNCreate(name="kept", pool_id=pool.id, size=1000))
+
+    # A condition that cannot be parsed rejects the whole delete rather than being ignored
+    response = test_client.post(
+        "/api/types/lun/action/bulkDelete", json={"filter": "name eq 'bulk_*' and size ge 100"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert len(lun_model.list_luns()) == 101
+
+    response = test_client.post(
+        "/api/types/lun/action/bulkDelete", json={"filter": "name eq 'bulk_*'"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    result = response.json()["entries"][0]["content"]
+    assert sorted(result["deleted"]) == sorted(lun.id for lun in luns)
+    assert [lun.name for lun in lun_model.list_luns()] == ["kept"]
+    assert lun_model.get_lun_by_name("bulk_1") is None
+
+    response = test_client.post("/api/types/lun/action/bulkDelete", json={"ids": [luns[0].id]}, headers=headers)
+    assert response.json()["entries"][0]["content"]["notFound"] == [luns[0].id]
+
+
+def test_lun_changes_are_charged_to_pool(sample_pool_data):
+    pool_model = PoolModel()
+    lun_model = LUNModel()
+    pool = pool_model.create_pool(PoolCreate(**sample_pool_data))
+    size = 100000000000
+
+    thin = lun_model.create_lun(LUNCreate(name="thin", pool_id=pool.id, size=size))
+    thick = lun_model.create_lun(LUNCreate(name="thick", pool_id=pool.id, size=size, isThinEnabled=False))
+    lun_model.set_allocated(thin.id, size // 4)
+    lun_model.update_lun(thick.id, LUNUpdate(size=2 * size))
+
+    usage = pool_model.get_pool(pool.id)
+    assert usage.sizeSubscribed == 3 * size
+    assert usage.sizeUsed == size // 4 + 2 * size
+    assert usage.sizeFree == pool.sizeTotal - usage.sizeUsed
+    assert usage.isEmpty is False
+
+    lun_model.delete_luns([thin.id, thick.id])
+    usage = pool_model.get_pool(pool.id)
+    assert (usage.sizeSubscribed, usage.sizeUsed, usage.sizeFree) == (0, 0, pool.sizeTotal)
+    assert usage.isEmpty is True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lun_creates_cannot_overcommit_pool(async_test_client, sample_pool_data, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(**sample_pool_data))
+    size = pool.sizeTotal // 3
+
+    responses = await asyncio.gather(
+        *(
+            async_test_client.post(
+                "/api/types/lun/instances",
+                json={"name": f"thick_{i}", "pool_id": pool.id, "size": size, "isThinEnabled": False},
+                headers=headers,
+            )
+            for i in range(5)
+        )
+    )
+
+    assert sorted(response.status_code for response in responses) == [201, 201, 201, 400, 400]
+    assert PoolModel().get_pool(pool.id).sizeFree == pool.sizeTotal - 3 * size
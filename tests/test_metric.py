@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+
+from dell_unisphere_mock_api.core.metric_queries import metric_query_scheduler
+from dell_unisphere_mock_api.core.metrics import metric_store
+from dell_unisphere_mock_api.core.workload import workload_simulator
+from dell_unisphere_mock_api.models.lun import LUNModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.schemas.lun import LUNCreate
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+
+def test_list_metrics(test_client, auth_headers):
+    headers, _ = auth_headers
+
+    response = test_client.get("/api/types/metric/instances", headers=headers)
+
+    assert response.status_code == 200
+    paths = [entry["content"]["path"] for entry in response.json()["entries"]]
+    assert "sp.*.storage.lun.*.readsRate" in paths
+    assert test_client.get("/api/instances/metric/1", headers=headers).json()["entries"][0]["content"]["id"] == 1
+    assert test_client.get("/api/instances/metric/999", headers=headers).status_code == 404
+
+
+def test_query_metric_values(test_client, auth_headers):
+    headers, _ = auth_headers
+    metrics = len(metric_store.block("lun").metrics)
+    for t in range(3):
+        metric_store.record("lun", 1_700_000_000.0 + 60 * t, ["sv_1", "sv_2"], np.full((2, metrics), float(t)))
+    params = {
+        "filter": "path eq 'sp.*.storage.lun.*.readsRate'",
+        "startTime": "2023-11-14T22:14:00Z",
+        "endTime": "2023-11-14T22:15:30Z",
+    }
+
+    response = test_client.get("/api/types/metricValue/instances", params=params, headers=headers)
+
+    assert response.status_code == 200
+    values = [entry["content"] for entry in response.json()["entries"]]
+    assert [value["values"] for value in values] == [{"sv_1": 1.0, "sv_2": 1.0}, {"sv_1": 2.0, "sv_2": 2.0}]
+
+    params["filter"] = "path eq 'sp.*.storage.lun.*.unknown'"
+    assert test_client.get("/api/types/metricValue/instances", params=params, headers=headers).status_code == 404
+    assert test_client.get("/api/types/metricValue/instances", headers=headers).status_code == 400
+
+
+def test_real_time_query_results(test_client, auth_headers):
+    headers, _ = auth_headers
+    body = {"paths": ["sp.*.cpu.summary.utilization"], "interval": 5}
+
+    response = test_client.post("/api/types/metricRealTimeQuery/instances", json=body, headers=headers)
+
+    assert response.status_code == 201
+    query_id = response.json()["entries"][0]["content"]["id"]
+    metric_query_scheduler.tick(time.time() + 5)
+    params = {"filter": f"queryId eq {query_id}"}
+    results = test_client.get("/api/types/metricQueryResult/instances", params=params, headers=headers).json()
+    result = results["entries"][0]["content"]
+    assert result["path"] == body["paths"][0]
+    assert sorted(result["values"]) == ["spa", "spb"]
+
+    assert test_client.delete(f"/api/instances/metricRealTimeQuery/{query_id}", headers=headers).status_code == 204
+    assert test_client.get("/api/types/metricQueryResult/instances", params=params, headers=headers).status_code == 404
+    body["paths"] = ["sp.*.unknown"]
+    assert test_client.post("/api/types/metricRealTimeQuery/instances", json=body, headers=headers).status_code == 400
+
+
+def test_workload_grows_thin_luns_and_their_pool():
+    pool = PoolModel().create_pool(PoolCreate(name="workload_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=10**13))
+    lun_model = LUNModel()
+    lun = lun_model.create_lun(LUNCreate(name="thin", pool_id=pool.id, size=10**12))
+    workload_simulator.rng = np.random.default_rng(1)
+
+    workload_simulator.tick(1_700_000_000.0)
+    workload_simulator.tick(1_700_000_000.0 + 3 * 86400)
+
+    allocated = lun_model.get_lun(lun.id).sizeAllocated
+    assert 0 < allocated < lun.size
+    assert PoolModel().get_pool(pool.id).sizeUsed == allocated
+    _, ids, values = metric_store.block("lun").latest()
+    assert ids == [lun.id]
+    assert (values[0, :2] > 0).all()
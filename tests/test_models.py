@@ -2,9 +2,12 @@ from datetime import datetime
 
 import pytest
 
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
 from dell_unisphere_mock_api.models.filesystem import FilesystemModel
 from dell_unisphere_mock_api.models.nas_server import NasServerModel
+from dell_unisphere_mock_api.models.pool import PoolModel
 from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
 
 
 class TestStorageResourceModel:
@@ -132,6 +135,22 @@ class TestFilesystemModel:
         filesystems = model.list_filesystems()
         assert len(filesystems) == 2
 
+    @pytest.mark.parametrize("is_thin", [False, True])
+    def test_resize_then_delete_returns_capacity(self, model, sample_filesystem_data, is_thin):
+        gib = 1024**3
+        pool = PoolModel().create_pool(PoolCreate(name="fs_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=1000 * gib))
+        fs = model.create_filesystem({**sample_filesystem_data, "pool": pool.id, "isThinEnabled": is_thin})
+
+        model.update_filesystem(fs["id"], {"size": 200 * gib})
+        model.update_filesystem(fs["id"], {"size": 50 * gib})
+        usage = capacity_ledger.usage(pool.id)
+        assert fs["size"] == usage.subscribed == 50 * gib
+        assert fs["sizeAllocated"] == usage.allocated <= fs["size"]
+
+        model.delete_filesystem(fs["id"])
+        usage = capacity_ledger.usage(pool.id)
+        assert (usage.subscribed, usage.allocated, usage.objects) == (0, 0, 0)
+
 
 class TestNasServerModel:
     @pytest.fixture
@@ -1,7 +1,21 @@
+import time
+
+import numpy as np
 import pytest
+from fastapi import HTTPException
 from pydantic import ValidationError
 
+from dell_unisphere_mock_api.controllers.pool_controller import PoolController
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.data_reduction import data_reduction
+from dell_unisphere_mock_api.core.forecast import DAY
+from dell_unisphere_mock_api.core.tiering import tiering_engine
 from dell_unisphere_mock_api.main import app
+from dell_unisphere_mock_api.models.job import JobModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.models.storage_resource import StorageResourceModel
+from dell_unisphere_mock_api.routers.storage_resource import storage_resource_model
+from dell_unisphere_mock_api.schemas.job import JobCreate, JobState, JobTask
 from dell_unisphere_mock_api.schemas.pool import (
     FastVPRelocationRateEnum,
     FastVPStatusEnum,
@@ -291,3 +305,120 @@ def test_pool_auto_configuration_response():
     assert config.storageConfiguration.stripeWidth == 4
     assert not config.isFastCacheEnabled
     assert not config.isFASTVpScheduleEnabled
+
+
+def test_forecast_pools(test_client, auth_headers, monkeypatch):
+    _, headers = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(name="forecast_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=1000))
+    now = time.time()
+    capacity_ledger.sample(now - 2 * DAY)
+    monkeypatch.setattr(capacity_ledger, "clock", lambda: now - DAY)
+    capacity_ledger.post(pool.id, allocated=100)
+    monkeypatch.setattr(capacity_ledger, "clock", time.time)
+    capacity_ledger.post(pool.id, allocated=100)
+
+    response = test_client.get("/api/types/pool/action/forecast", headers=headers)
+    assert response.status_code == 200
+    entries = response.json()["entries"]
+    assert len(entries) == 1
+    forecast = entries[0]["content"]
+    assert forecast["id"] == pool.id
+    assert forecast["sizeUsed"] == 200
+    assert forecast["growthPerDay"] == pytest.approx(100.0, rel=0.01)
+    assert forecast["daysToFull"] == pytest.approx(8.0, rel=0.01)
+
+    response = test_client.get(f"/api/instances/pool/{pool.id}/action/forecast", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["entries"][0]["content"]["sampleCount"] == 4
+
+    response = test_client.get("/api/instances/pool/missing/action/forecast", headers=headers)
+    assert response.status_code == 404
+
+
+def test_data_reduction_rolls_up_to_pool():
+    # Some resources compress at a ratio of 1; fix the draws so this one does not
+    data_reduction.rng = np.random.default_rng(0)
+    pools = PoolModel()
+    pool = pools.create_pool(PoolCreate(name="reduction_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=10**12))
+    resources = StorageResourceModel()
+    plain = resources.create_storage_resource({"name": "plain", "pool": pool.id, "sizeTotal": 10**10})
+    compressed = resources.create_storage_resource(
+        {"name": "compressed", "pool": pool.id, "sizeTotal": 10**10, "isCompressionEnabled": True}
+    )
+    resources.set_allocations([plain.id, compressed.id], [4 * 10**9, 4 * 10**9], [10**9, 10**9])
+
+    compressed = resources.get_storage_resource(compressed.id)
+    saved = compressed.dataReductionSizeSaved
+    assert saved > 0
+    assert resources.get_storage_resource(plain.id).dataReductionSizeSaved == 0
+    # The pool is charged for allocations after reduction
+    assert capacity_ledger.usage(pool.id).allocated == 8 * 10**9 - saved
+
+    rolled_up = pools.get_pool(pool.id)
+    assert rolled_up.dataReductionSizeSaved == saved
+    assert rolled_up.dataReductionRatio == compressed.dataReductionRatio > 1.0
+
+    # Turning compression off gives the space back to the pool
+    resources.update_storage_resource(compressed.id, {"isCompressionEnabled": False})
+    assert capacity_ledger.usage(pool.id).allocated == 8 * 10**9
+    assert pools.get_pool(pool.id).dataReductionSizeSaved == 0
+
+    resources.update_storage_resource(compressed.id, {"isCompressionEnabled": True})
+    assert resources.get_storage_resource(compressed.id).dataReductionSizeSaved == saved
+    resources.delete_storage_resource(compressed.id)
+    assert capacity_ledger.usage(pool.id).allocated == 4 * 10**9
+
+
+def test_start_relocation_runs_as_job(test_client, auth_headers, monkeypatch):
+    headers, base_headers = auth_headers
+    monkeypatch.setattr(tiering_engine, "step_interval", 0)
+    pools = PoolModel()
+    pool = pools.create_pool(PoolCreate(name="tiered_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=10**13))
+    resource = storage_resource_model.create_storage_resource(
+        {"name": "tiered", "pool": pool.id, "sizeTotal": 10**10, "isThinEnabled": False}
+    )
+
+    response = test_client.post(
+        f"/api/instances/pool/{pool.id}/action/startRelocation", json={"relocationRate": "HIGH"}, headers=headers
+    )
+    assert response.status_code == 202
+    job_id = response.json()["entries"][0]["content"]["id"]
+    for _ in range(3):
+        response = test_client.get(f"/api/types/job/instances/{job_id}", params={"waitTimeout": 5}, headers=headers)
+        job = response.json()["entries"][0]["content"]
+        if job["state"] not in ("PENDING", "RUNNING"):
+            break
+    assert job["state"] == "COMPLETED", job["errorMessage"]
+
+    # A pool without disks keeps every slice in one tier
+    slices = -(-(10**10) // tiering_engine.slice_size)
+    resource = storage_resource_model.get_storage_resource(resource.id)
+    assert resource.perTierSizeUsed == {"PERFORMANCE": slices * tiering_engine.slice_size}
+    fast_vp = pools.get_pool(pool.id).poolFastVP
+    assert fast_vp.status == "COMPLETED"
+    assert fast_vp.relocationRate == "HIGH"
+
+    response = test_client.post(f"/api/instances/pool/{pool.id}/action/stopRelocation", headers=headers)
+    assert response.status_code == 409
+    response = test_client.post("/api/instances/pool/missing/action/startRelocation", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_queued_relocation_blocks_new_starts():
+    pool = PoolModel().create_pool(PoolCreate(name="queued_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=10**13))
+    controller = PoolController()
+    task = JobTask(name="Relocate", object="pool", action="relocate", parametersIn={"id": pool.id})
+    job = await JobModel().create_job(JobCreate(description="Queued relocation", tasks=[task]))
+    tiering_engine.relocation(pool.id).job = job.id
+
+    # The relocation has not started, but its job is queued
+    assert tiering_engine.relocation(pool.id).status == "IDLE"
+    with pytest.raises(HTTPException) as error:
+        await controller.start_relocation(pool.id)
+    assert error.value.status_code == 409
+    assert await controller.schedule_relocation(pool.id) is None
+
+    await JobModel().update_job_state(job.id, JobState.CANCELLED)
+    assert not await controller._relocation_active(pool.id)
+    assert tiering_engine.relocation(pool.id).job is None
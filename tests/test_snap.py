@@ -0,0 +1,64 @@
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.core.snapshots import snapshot_engine
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.routers.storage_resource import storage_resource_model
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+GB = 1024**3
+
+
+def test_snapshots_account_space_on_resource_and_pool(test_client, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(name="snap_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=1000 * GB))
+    resource = storage_resource_model.create_storage_resource(
+        {"name": "snapped", "type": "LUN", "pool": pool.id, "sizeTotal": 100 * GB}
+    )
+    storage_resource_model.set_allocations([resource.id], [10 * GB], [10 * GB])
+
+    response = test_client.post(
+        "/api/types/snap/instances",
+        json={"storageResource": {"id": resource.id}, "name": "before", "retentionDuration": 3600},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    snap = response.json()["entries"][0]["content"]
+    assert snap["storageResource"]["id"] == resource.id
+    assert snap["creatorType"] == "User" and snap["expirationTime"] is not None
+    assert storage_resource_model.get_storage_resource(resource.id).snapCount == 1
+    response = test_client.post(
+        "/api/types/snap/instances", json={"storageResource": {"id": "missing"}}, headers=headers
+    )
+    assert response.status_code == 404
+
+    # Overwritten blocks are held by the snapshot and charged to the pool's snapshot space
+    snapshot_engine.write(resource.id, 5 * GB)
+    record = storage_resource_model.get_storage_resource(resource.id)
+    assert 0 < record.snapSize <= record.snapSizeAllocated
+    assert capacity_ledger.usage(pool.id).snapshot == record.snapSizeAllocated
+    assert PoolModel().get_pool(pool.id).snapSizeUsed == record.snapSizeAllocated
+
+    # Attached snapshots can be neither restored nor deleted
+    assert test_client.post(f"/api/instances/snap/{snap['id']}/action/attach", headers=headers).status_code == 204
+    attached = test_client.get(f"/api/instances/snap/{snap['id']}", headers=headers).json()["entries"][0]["content"]
+    assert attached["attachedWWN"].startswith("60:06:01:60")
+    assert test_client.delete(f"/api/instances/snap/{snap['id']}", headers=headers).status_code == 409
+    assert test_client.post(f"/api/instances/snap/{snap['id']}/action/detach", headers=headers).status_code == 204
+
+    response = test_client.post(
+        f"/api/instances/snap/{snap['id']}/action/restore", json={"copyName": "after"}, headers=headers
+    )
+    assert response.status_code == 200
+    backup = response.json()["entries"][0]["content"]["backup"]["id"]
+    response = test_client.get(f"/api/types/snap/instances?filter=storageResource eq '{resource.id}'", headers=headers)
+    assert [entry["content"]["name"] for entry in response.json()["entries"]] == ["before", "after"]
+    response = test_client.get("/api/types/snap/instances?filter=isReadOnly eq false", headers=headers)
+    assert [entry["content"]["name"] for entry in response.json()["entries"]] == ["before", "after"]
+    response = test_client.get("/api/types/snap/instances?filter=isReadOnly eq true", headers=headers)
+    assert response.json()["entries"] == []
+
+    for snap_id in (snap["id"], backup):
+        assert test_client.delete(f"/api/instances/snap/{snap_id}", headers=headers).status_code == 204
+    record = storage_resource_model.get_storage_resource(resource.id)
+    assert (record.snapCount, record.snapSize, record.snapSizeAllocated) == (0, 0, 0)
+    assert capacity_ledger.usage(pool.id).snapshot == 0
+    assert test_client.get(f"/api/instances/snap/{backup}", headers=headers).status_code == 404
@@ -0,0 +1,52 @@
+from dell_unisphere_mock_api.core.snap_schedules import snap_schedule_engine
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.routers.storage_resource import storage_resource_model
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+GB = 1024**3
+HOUR = 3600
+
+
+def test_snap_schedule_takes_snapshots_of_its_resources(test_client, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(name="sched_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=1000 * GB))
+    resource = storage_resource_model.create_storage_resource(
+        {"name": "scheduled", "type": "LUN", "pool": pool.id, "sizeTotal": 100 * GB}
+    )
+    rule = {"type": "N_HOURS_AT_MM", "interval": 4, "minute": 30, "retentionTime": 12 * HOUR}
+
+    response = test_client.post(
+        "/api/types/snapSchedule/instances",
+        json={"name": "every4h", "rules": [rule], "storageResources": [{"id": resource.id}]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    schedule = response.json()["entries"][0]["content"]
+    assert schedule["rules"][0]["interval"] == 4 and schedule["nextSnapTime"] is not None
+    for body, status_code in (
+        ({"name": "every4h", "rules": [rule]}, 409),
+        ({"name": "other", "rules": [rule], "storageResources": [{"id": "missing"}]}, 404),
+        ({"name": "other", "rules": [{"type": "DAY_AT_HHMM"}]}, 422),
+    ):
+        response = test_client.post("/api/types/snapSchedule/instances", json=body, headers=headers)
+        assert response.status_code == status_code
+
+    # A day of schedule takes six snapshots and keeps the last three
+    assert snap_schedule_engine.fast_forward(24 * HOUR) == 6
+    response = test_client.get(f"/api/types/snap/instances?filter=storageResource eq '{resource.id}'", headers=headers)
+    assert [entry["content"]["creatorType"] for entry in response.json()["entries"]] == ["Scheduler"] * 3
+    assert storage_resource_model.get_storage_resource(resource.id).snapCount == 3
+
+    url = f"/api/instances/snapSchedule/{schedule['id']}"
+    modify = {"removeRuleIds": [schedule["rules"][0]["id"]]}
+    assert test_client.post(f"{url}/action/modify", json=modify, headers=headers).status_code == 400
+    modify["addRules"] = [{"type": "DAY_AT_HHMM", "hours": [3]}]
+    modify["removeStorageResources"] = [{"id": resource.id}]
+    assert test_client.post(f"{url}/action/modify", json=modify, headers=headers).status_code == 204
+    modified = test_client.get(url, headers=headers).json()["entries"][0]["content"]
+    assert [rule["type"] for rule in modified["rules"]] == ["DAY_AT_HHMM"]
+    assert modified["storageResources"] == [] and modified["nextSnapTime"] is None
+
+    assert test_client.delete(url, headers=headers).status_code == 204
+    assert test_client.get(url, headers=headers).status_code == 404
+    assert test_client.get("/api/types/snapSchedule/instances", headers=headers).json()["entries"] == []
@@ -0,0 +1,65 @@
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.routers.storage_resource import storage_resource_model
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+GB = 1024**3
+
+
+def test_thick_storage_resources_are_charged_for_their_size(test_client, auth_headers):
+    headers, _ = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(name="thick_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=100 * GB))
+    thick = {"name": "thick", "type": "LUN", "pool": pool.id, "isThinEnabled": False}
+
+    response = test_client.post(
+        "/api/types/storageResource/instances", json={**thick, "sizeTotal": 200 * GB}, headers=headers
+    )
+    assert response.status_code == 400
+    response = test_client.post(
+        "/api/types/storageResource/instances", json={**thick, "sizeTotal": 50 * GB}, headers=headers
+    )
+    assert response.status_code == 201
+    resource_id = response.json()["entries"][0]["content"]["id"]
+    assert capacity_ledger.usage(pool.id).allocated == 50 * GB
+
+    # Expanding a thick resource allocates the growth, and needs the pool to have room for it
+    url = f"/api/instances/storageResource/{resource_id}"
+    assert test_client.patch(url, json={"sizeTotal": 500 * GB}, headers=headers).status_code == 400
+    response = test_client.patch(url, json={"sizeTotal": 80 * GB}, headers=headers)
+    assert response.status_code == 200
+    resource = response.json()["entries"][0]["content"]
+    assert resource["sizeTotal"] == resource["sizeAllocated"] == 80 * GB
+    assert capacity_ledger.usage(pool.id).allocated == 80 * GB
+
+
+def test_create_validates_client_input(test_client, auth_headers, recwarn):
+    headers, _ = auth_headers
+    url = "/api/types/storageResource/instances"
+    stored = len(storage_resource_model.storage_resources)
+    for body in ({"name": "x", "type": "bogus", "pool": "pool_1", "sizeTotal": 10}, {"type": "LUN", "pool": "pool_1"}):
+        assert test_client.post(url, json=body, headers=headers).status_code == 422
+    assert len(storage_resource_model.storage_resources) == stored
+
+    body = {"name": "valid", "type": "VMwareFS", "pool": "pool_1", "sizeTotal": 10 * GB, "tieringPolicy": "Autotier"}
+    response = test_client.post(url, json=body, headers=headers)
+    assert response.status_code == 201
+    resource = response.json()["entries"][0]["content"]
+    assert (resource["type"], resource["thinStatus"], resource["sizeTotal"]) == ("VMwareFS", "True", 10 * GB)
+    # Enum fields are stored as members, so serializing them warns about nothing
+    assert not [warning for warning in recwarn if "serializer warnings" in str(warning.message)]
+
+
+def test_host_access_entries_need_a_host(test_client, auth_headers):
+    headers, _ = auth_headers
+    resource = storage_resource_model.create_storage_resource({"name": "shared", "type": "LUN", "sizeTotal": GB})
+    url = f"/api/instances/storageResource/{resource.id}/action/modifyHostAccess"
+
+    response = test_client.post(url, json={"hostAccess": [{"accessType": "READ_WRITE"}]}, headers=headers)
+    assert response.status_code == 400
+    assert storage_resource_model.get_storage_resource(resource.id).hostAccess == []
+
+    response = test_client.post(
+        url, json={"hostAccess": [{"host": "host_1", "accessType": "READ_WRITE"}]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["entries"][0]["content"]["hostAccess"] == [{"host": "host_1", "accessType": "READ_WRITE"}]
@@ -0,0 +1,40 @@
+from dell_unisphere_mock_api.core.capacity import capacity_ledger
+from dell_unisphere_mock_api.models.disk import DiskModel
+from dell_unisphere_mock_api.models.pool import PoolModel
+from dell_unisphere_mock_api.schemas.disk import DiskTierEnum, DiskTypeEnum
+from dell_unisphere_mock_api.schemas.pool import PoolCreate, RaidTypeEnum
+
+
+def _add_disk(pool_id, tier, size, slot):
+    disk_type = DiskTypeEnum.SAS_FLASH if tier == DiskTierEnum.EXTREME_PERFORMANCE else DiskTypeEnum.NL_SAS
+    return DiskModel().create(
+        {"disk_type": disk_type, "tier_type": tier, "size": size, "slot_number": slot, "pool_id": pool_id}
+    )
+
+
+def test_system_and_tier_capacity(test_client, auth_headers):
+    _, headers = auth_headers
+    pool = PoolModel().create_pool(PoolCreate(name="capacity_pool", raidType=RaidTypeEnum.RAID5, sizeTotal=4000))
+    _add_disk(pool.id, DiskTierEnum.EXTREME_PERFORMANCE, 1000, 0)
+    capacity_disk = _add_disk(pool.id, DiskTierEnum.CAPACITY, 3000, 1)["entries"][0]["content"]["id"]
+    capacity_ledger.post(pool.id, subscribed=2000, allocated=1000, objects=1)
+
+    response = test_client.get("/api/types/systemCapacity/instances", headers=headers)
+    assert response.status_code == 200
+    system = response.json()["entries"][0]["content"]
+    assert (system["sizeTotal"], system["sizeUsed"], system["sizeFree"]) == (4000, 1000, 3000)
+    assert system["sizeSubscribed"] == 2000
+    tiers = {tier["tierType"]: tier for tier in system["tiers"]}
+    assert (tiers["EXTREME_PERFORMANCE"]["sizeTotal"], tiers["EXTREME_PERFORMANCE"]["sizeUsed"]) == (1000, 250)
+    assert (tiers["CAPACITY"]["sizeTotal"], tiers["CAPACITY"]["sizeUsed"]) == (3000, 750)
+    assert tiers["PERFORMANCE"]["sizeTotal"] == 0
+
+    DiskModel().update(capacity_disk, {"health_status": "FAULTED"})
+    response = test_client.get("/api/instances/systemTierCapacity/CAPACITY", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["entries"][0]["content"]["sizeTotal"] == 0
+
+    response = test_client.get("/api/types/systemTierCapacity/instances", headers=headers)
+    assert len(response.json()["entries"]) == 3
+    assert test_client.get("/api/instances/systemCapacity/0", headers=headers).status_code == 200
+    assert test_client.get("/api/instances/systemCapacity/1", headers=headers).status_code == 404